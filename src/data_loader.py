@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import logging
 
+from src.runtime.kernels import gap_indices
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,64 +22,64 @@ logger = logging.getLogger(__name__)
 def load_raw_csv(abs_path):
     """
     Load raw CSV data from absolute path
-        
-        Args:
+    
+    Args:
         abs_path (str): Absolute path to CSV file
-            
-        Returns:
+        
+    Returns:
         pd.DataFrame: Loaded data with standardized columns
-        """
-        try:
-            # 🔥 BUG FIX: Fixed ALL indentation errors!
-            # Load CSV with common column mappings
-            df = pd.read_csv(abs_path)
+    """
+    try:
+        # 🔥 BUG FIX: Fixed ALL indentation errors!
+        # Load CSV with common column mappings
+        df = pd.read_csv(abs_path)
+        
+        # Standardize column names (case insensitive)
+        column_mapping = {}
+        for col in df.columns:
+            col_lower = col.lower()
+            if 'timestamp' in col_lower or 'time' in col_lower:
+                column_mapping[col] = 'timestamp'
+            elif 'open' in col_lower:
+                column_mapping[col] = 'open'
+            elif 'high' in col_lower:
+                column_mapping[col] = 'high'
+            elif 'low' in col_lower:
+                column_mapping[col] = 'low'
+            elif 'close' in col_lower:
+                column_mapping[col] = 'close'
+            elif 'volume' in col_lower:
+                column_mapping[col] = 'volume'
+        
+        df = df.rename(columns=column_mapping)
             
-            # Standardize column names (case insensitive)
-            column_mapping = {}
-            for col in df.columns:
-                col_lower = col.lower()
-                if 'timestamp' in col_lower or 'time' in col_lower:
-                    column_mapping[col] = 'timestamp'
-                elif 'open' in col_lower:
-                    column_mapping[col] = 'open'
-                elif 'high' in col_lower:
-                    column_mapping[col] = 'high'
-                elif 'low' in col_lower:
-                    column_mapping[col] = 'low'
-                elif 'close' in col_lower:
-                    column_mapping[col] = 'close'
-                elif 'volume' in col_lower:
-                    column_mapping[col] = 'volume'
+        # Convert timestamp to datetime
+        if 'timestamp' in df.columns:
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            df = df.set_index('timestamp')
             
-            df = df.rename(columns=column_mapping)
-                
-            # Convert timestamp to datetime
-            if 'timestamp' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                df = df.set_index('timestamp')
-                
-            # Ensure numeric columns are float
-            numeric_cols = ['open', 'high', 'low', 'close', 'volume']
-            for col in numeric_cols:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
+        # Ensure numeric columns are float
+        numeric_cols = ['open', 'high', 'low', 'close', 'volume']
+        for col in numeric_cols:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+        
+        logger.info(f"Loaded {len(df)} rows from {abs_path}")
+        return df
             
-            logger.info(f"Loaded {len(df)} rows from {abs_path}")
-            return df
-                
-        except Exception as e:
-            logger.error(f"Error loading {abs_path}: {e}")
-            raise
+    except Exception as e:
+        logger.error(f"Error loading {abs_path}: {e}")
+        raise
     
 def aggregate_to_tf(df, target_tf):
-        """
-        Aggregate data to target timeframe
-        
-        Args:
+    """
+    Aggregate data to target timeframe
+    
+    Args:
         df (pd.DataFrame): Input data with OHLCV columns
         target_tf (str): Target timeframe ('5m', '15m', '1h', '4h', 'daily')
-            
-        Returns:
+        
+    Returns:
         pd.DataFrame: Aggregated data
     """
     if target_tf == '5m':
@@ -134,7 +136,7 @@ def validate_continuity(df, timeframe):
     Returns:
         dict: Validation results with gap information
     """
-        if len(df) < 2:
+    if len(df) < 2:
         return {"valid": False, "reason": "insufficient_data", "gaps": []}
     
     # Calculate expected time intervals
@@ -149,17 +151,15 @@ def validate_continuity(df, timeframe):
     expected_interval = timeframes.get(timeframe, timedelta(minutes=5))
     max_gap = expected_interval * 2  # Allow 2x timeframe as max gap
     
-    # Find gaps
+    # Find gaps (kernel scans the int64 nanosecond timestamps; the index unit may be coarser than ns)
     gaps = []
-    for i in range(1, len(df)):
-        time_diff = df.index[i] - df.index[i-1]
-        if time_diff > max_gap:
-            # 🔥 BUG FIX: Fixed incorrect indentation!
-            gaps.append({
-                "start": df.index[i-1],
-                "end": df.index[i],
-                "duration": str(time_diff)
-            })
+    times = df.index.values.astype('datetime64[ns]').view(np.int64)
+    for i in gap_indices(times, pd.Timedelta(max_gap).value):
+        gaps.append({
+            "start": df.index[i-1],
+            "end": df.index[i],
+            "duration": str(df.index[i] - df.index[i-1])
+        })
     
     # Calculate gap percentage
     total_periods = len(df)
@@ -179,13 +179,13 @@ def validate_continuity(df, timeframe):
 def process_symbol_data(symbol, raw_data_dir="data/raw", processed_data_dir="data/processed"):
     """
     Process data for a single symbol through all timeframes
-        
-        Args:
+    
+    Args:
         symbol (str): Symbol name (e.g., 'BTCUSDT')
         raw_data_dir (str): Raw data directory
         processed_data_dir (str): Processed data directory
-            
-        Returns:
+        
+    Returns:
         dict: Processing results
     """
     results = {
@@ -219,8 +219,8 @@ def process_symbol_data(symbol, raw_data_dir="data/raw", processed_data_dir="dat
         timeframes = ['5m', '15m', '1h', '4h', 'daily']
             
         for tf in timeframes:
-                try:
-                    # Aggregate to timeframe
+            try:
+                # Aggregate to timeframe
                 tf_df = aggregate_to_tf(df, tf)
                 
                 # Validate continuity
@@ -259,16 +259,16 @@ def process_symbol_data(symbol, raw_data_dir="data/raw", processed_data_dir="dat
                 
                 logger.info(f"Processed {symbol} {tf}: {len(tf_df)} rows")
                     
-                except Exception as e:
+            except Exception as e:
                 error_msg = f"Error processing {symbol} {tf}: {e}"
-                    logger.error(error_msg)
+                logger.error(error_msg)
                 results["errors"].append(error_msg)
         
         return results
             
-        except Exception as e:
+    except Exception as e:
         error_msg = f"Error loading raw data for {symbol}: {e}"
-                    logger.error(error_msg)
+        logger.error(error_msg)
         results["errors"].append(error_msg)
         return results
 
@@ -282,10 +282,10 @@ def update_manifest(processed_files, manifest_file="data/processed/manifest.json
     """
     manifest = {}
     
-            # Load existing manifest
+    # Load existing manifest
     if os.path.exists(manifest_file):
         with open(manifest_file, 'r') as f:
-                    manifest = json.load(f)
+            manifest = json.load(f)
     
     # Update with new files
     for file_info in processed_files:
@@ -305,7 +305,7 @@ def update_manifest(processed_files, manifest_file="data/processed/manifest.json
     
     # Save updated manifest
     with open(manifest_file, 'w') as f:
-                json.dump(manifest, f, indent=2)
+        json.dump(manifest, f, indent=2)
                 
 def main():
     """Main data processing function"""
@@ -14,6 +14,8 @@ import json
 import logging
 from datetime import datetime, timedelta
 import warnings
+from src.runtime.transport import get_transport
+from src.runtime.kline_codec import OPEN_TIME, OPEN, HIGH, LOW, CLOSE, VOLUME, decode_klines
 warnings.filterwarnings('ignore')
 
 logger = logging.getLogger(__name__)
@@ -34,6 +36,9 @@ class PaperTradingSystem:
         else:
             self.base_url = "https://api.binance.com"
         
+        # Shared pooled keep-alive HTTP sessions
+        self.transport = get_transport()
+        
         # Paper trading state
         self.initial_capital = 10000.0
         self.current_capital = 10000.0
@@ -261,25 +266,24 @@ class PaperTradingSystem:
                 'limit': limit
             }
             
-            response = requests.get(url, params=params)
-            data = response.json()
+            response = self.transport.get(url, params=params)
+            if response is None:
+                logger.error(f"No response getting historical data for {symbol}")
+                return None
+            # Single-pass decode into an (N, 6) float64 array
+            klines = decode_klines(response.content)
             
             # Convert to DataFrame
-            df = pd.DataFrame(data, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_asset_volume', 'number_of_trades',
-                'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-            ])
-            
-            # Convert to numeric
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = pd.to_numeric(df[col])
-            
-            # Convert timestamp
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+            df = pd.DataFrame({
+                'open': klines[:, OPEN],
+                'high': klines[:, HIGH],
+                'low': klines[:, LOW],
+                'close': klines[:, CLOSE],
+                'volume': klines[:, VOLUME],
+            }, index=pd.to_datetime(klines[:, OPEN_TIME].astype(np.int64), unit='ms'))
+            df.index.name = 'timestamp'
             
-            return df[['open', 'high', 'low', 'close', 'volume']]
+            return df
             
         except Exception as e:
             logger.error(f"Error getting historical data: {e}")
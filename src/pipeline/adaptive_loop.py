@@ -17,6 +17,9 @@ import warnings
 from typing import Dict, List, Tuple, Optional
 import logging
 
+from src.runtime.feature_store import FeatureSet, FeatureStore
+from src.runtime.kernels import signal_trades
+
 # Advanced ML imports
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.linear_model import Ridge
@@ -80,21 +83,23 @@ class AdvancedFeatureEngineer:
     def __init__(self):
         self.scalers = {}
         
-    def engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Generate comprehensive feature set"""
+    def engineer_features(self, df: pd.DataFrame, features: Optional[FeatureSet] = None) -> pd.DataFrame:
+        """Generate comprehensive feature set (rolling series come from the shared feature store)"""
+        if features is None:
+            features = FeatureStore(None).dataset("", "", df)
         
         # Basic price features
-        df['price_change'] = df['close'].pct_change()
+        df['price_change'] = features['returns']
         df['high_low_ratio'] = df['high'] / df['low']
         df['open_close_ratio'] = df['open'] / df['close']
         
         # Technical indicators
-        df['rsi'] = self._calculate_rsi(df['close'], 14)
-        df['rsi_30'] = self._calculate_rsi(df['close'], 30)
+        df['rsi'] = features['rsi_14']
+        df['rsi_30'] = features['rsi_30']
         
         # EMAs
         for period in [8, 21, 50, 100, 200]:
-            df[f'ema_{period}'] = df['close'].ewm(span=period).mean()
+            df[f'ema_{period}'] = features[f'ema_{period}']
         
         # MACD
         df['macd'] = df['ema_12'] - df['ema_26'] if 'ema_12' in df.columns else df['ema_8'] - df['ema_21']
@@ -102,37 +107,37 @@ class AdvancedFeatureEngineer:
         df['macd_histogram'] = df['macd'] - df['macd_signal']
         
         # Bollinger Bands
-        df['bb_middle'] = df['close'].rolling(20).mean()
-        bb_std = df['close'].rolling(20).std()
+        df['bb_middle'] = features['sma_20']
+        bb_std = features['std_20']
         df['bb_upper'] = df['bb_middle'] + (bb_std * 2)
         df['bb_lower'] = df['bb_middle'] - (bb_std * 2)
         df['bb_position'] = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
         df['bb_width'] = (df['bb_upper'] - df['bb_lower']) / df['bb_middle']
         
         # ATR and volatility
-        df['atr'] = self._calculate_atr(df, 14)
+        df['atr'] = features['atr_14']
         df['atr_ratio'] = df['atr'] / df['close']
-        df['volatility'] = df['close'].pct_change().rolling(20).std()
+        df['volatility'] = features['volatility_20']
         df['volatility_ratio'] = df['volatility'] / df['volatility'].rolling(50).mean()
         
         # OBV and volume indicators
-        df['obv'] = self._calculate_obv(df)
-        df['volume_sma'] = df['volume'].rolling(20).mean()
+        df['obv'] = features['obv']
+        df['volume_sma'] = features['volume_sma_20']
         df['volume_ratio'] = df['volume'] / df['volume_sma']
         df['volume_price_trend'] = df['volume'] * df['price_change']
         
         # Momentum indicators
         for period in [5, 10, 20, 50]:
-            df[f'momentum_{period}'] = df['close'].pct_change(period)
+            df[f'momentum_{period}'] = features[f'momentum_{period}']
             df[f'roc_{period}'] = (df['close'] / df['close'].shift(period) - 1) * 100
         
         # Trend strength
-        df['trend_strength'] = (df['close'] - df['close'].rolling(50).mean()) / df['close'].rolling(50).std()
+        df['trend_strength'] = (df['close'] - features['sma_50']) / features['std_50']
         df['trend_direction'] = np.where(df['ema_8'] > df['ema_21'], 1, -1)
         
         # Support and resistance levels
-        df['resistance'] = df['high'].rolling(20).max()
-        df['support'] = df['low'].rolling(20).min()
+        df['resistance'] = features['highest_20']
+        df['support'] = features['lowest_20']
         df['price_position'] = (df['close'] - df['support']) / (df['resistance'] - df['support'])
         
         # Lagged features
@@ -151,29 +156,6 @@ class AdvancedFeatureEngineer:
         df = df.fillna(method='ffill').fillna(0)
         
         return df
-    
-    def _calculate_rsi(self, prices, period=14):
-        """Calculate RSI indicator"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    
-    def _calculate_atr(self, df, period=14):
-        """Calculate Average True Range"""
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        return true_range.rolling(period).mean()
-    
-    def _calculate_obv(self, df):
-        """Calculate On-Balance Volume"""
-        obv = np.where(df['close'] > df['close'].shift(1), df['volume'],
-                      np.where(df['close'] < df['close'].shift(1), -df['volume'], 0))
-        return pd.Series(obv, index=df.index).cumsum()
 
 class EnsembleModel:
     """Advanced ensemble model with LSTM + XGBoost + LightGBM + Meta-learner"""
@@ -413,56 +395,39 @@ class WalkForwardBacktester:
     
     def _simulate_trading(self, df, signals, risk_controller):
         """Simulate trading with dynamic risk control"""
-        trades = []
-        position = 0
-        entry_price = 0
-        
-        for i, (idx, row) in enumerate(df.iterrows()):
-            if i < 1:  # Skip first row
-                continue
-            
-            current_price = row['close']
+        closes = df['close'].to_numpy(dtype=np.float64)
+        # Position replay runs in a compiled/vectorized kernel instead of iterrows
+        entries, exits, sides, pnls = signal_trades(closes, np.asarray(signals)[:len(closes)])
+        
+        # Calculate position size and risk levels for every opened position
+        atrs = df['atr'].to_numpy() if 'atr' in df.columns else closes * 0.02
+        volatilities = df['volatility'].to_numpy() if 'volatility' in df.columns else np.full(len(closes), 0.02)
+        for i in entries:
             signal = signals[i]
-            atr = row.get('atr', current_price * 0.02)
-            volatility = row.get('volatility', 0.02)
+            current_price = closes[i]
+            signal_strength = abs(signal)
+            win_rate = 0.5  # Placeholder - would be calculated from historical data
+            avg_win = 0.02
+            avg_loss = 0.01
             
-            # Close existing position if signal changes
-            if position != 0 and signal != position:
-                if position > 0:  # Close long
-                    exit_price = current_price
-                    pnl = (exit_price - entry_price) / entry_price
-                else:  # Close short
-                    exit_price = current_price
-                    pnl = (entry_price - exit_price) / entry_price
-                
-                trades.append({
-                    'entry_price': entry_price,
-                    'exit_price': exit_price,
-                    'position': position,
-                    'pnl': pnl,
-                    'entry_time': df.index[i-1],
-                    'exit_time': idx
-                })
-                position = 0
+            position_size = risk_controller.calculate_position_size(
+                signal_strength, win_rate, avg_win, avg_loss, atrs[i], current_price
+            )
             
-            # Open new position
-            if signal != 0 and position == 0:
-                position = signal
-                entry_price = current_price
-                
-                # Calculate position size and risk levels
-                signal_strength = abs(signal)
-                win_rate = 0.5  # Placeholder - would be calculated from historical data
-                avg_win = 0.02
-                avg_loss = 0.01
-                
-                position_size = risk_controller.calculate_position_size(
-                    signal_strength, win_rate, avg_win, avg_loss, atr, current_price
-                )
-                
-                stop_price, take_price, stop_loss, take_profit = risk_controller.calculate_stop_loss_take_profit(
-                    entry_price, signal, atr, volatility
-                )
+            stop_price, take_price, stop_loss, take_profit = risk_controller.calculate_stop_loss_take_profit(
+                current_price, signal, atrs[i], volatilities[i]
+            )
+        
+        trades = []
+        for k, i in enumerate(exits):
+            trades.append({
+                'entry_price': closes[entries[k]],
+                'exit_price': closes[i],
+                'position': signals[i - 1],
+                'pnl': pnls[k],
+                'entry_time': df.index[i-1],
+                'exit_time': df.index[i]
+            })
         
         return trades
     
@@ -573,7 +538,7 @@ class AdvancedAdaptiveLoop:
         # 2. Detect market regimes
         df = self.regime_detector.detect_regimes(df)
         
-        # 3. Engineer features
+        # 3. Engineer features (every download is new data: not cached in the process-wide feature store)
         df = self.feature_engineer.engineer_features(df)
         
         # 4. Create target variable
@@ -11,27 +11,36 @@ import json
 from datetime import datetime
 import logging
 
+from src.runtime.feature_store import FeatureStore, get_feature_store
+from src.runtime.kernels import run_lengths
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def calculate_technical_indicators(df):
-    """Calculate technical indicators for regime detection"""
+def calculate_technical_indicators(df, features=None):
+    """Calculate technical indicators for regime detection
+    
+    Args:
+        df (pd.DataFrame): OHLCV data
+        features (FeatureSet): Shared feature columns of ``df`` (computed here if None)
+    """
+    if features is None:
+        features = FeatureStore(None).dataset("", "", df)
     df = df.copy()
     
     # Price-based indicators
-    # 🔥 BUG FIX: Fixed incorrect indentation!
-    df['returns'] = df['close'].pct_change()
-    df['volatility'] = df['returns'].rolling(window=20).std()
-    df['price_change'] = df['close'].pct_change(20)  # 20-period price change
+    df['returns'] = features['returns']
+    df['volatility'] = features['volatility_20']
+    df['price_change'] = features['momentum_20']  # 20-period price change
     
     # Volume indicators
-    df['volume_ma'] = df['volume'].rolling(window=20).mean()
+    df['volume_ma'] = features['volume_sma_20']
     df['volume_ratio'] = df['volume'] / df['volume_ma']
     
     # Trend indicators
-    df['sma_20'] = df['close'].rolling(window=20).mean()
-    df['sma_50'] = df['close'].rolling(window=50).mean()
+    df['sma_20'] = features['sma_20']
+    df['sma_50'] = features['sma_50']
     df['trend'] = (df['sma_20'] - df['sma_50']) / df['sma_50']
     
     # Volatility regime
@@ -149,24 +158,8 @@ def analyze_regime_stability(df, window=50):
     total_periods = len(df)
     change_rate = regime_changes / total_periods
     
-    # Calculate regime durations
-    regime_durations = []
-    current_regime = None
-    current_duration = 0
-    
-    for regime in df['regime']:
-        if regime == current_regime:
-            # 🔥 BUG FIX: Fixed incorrect indentation!
-            current_duration += 1
-        else:
-            if current_regime is not None:
-                regime_durations.append(current_duration)
-            # 🔥 BUG FIX: Fixed incorrect indentation!
-            current_regime = regime
-            current_duration = 1
-    
-    if current_regime is not None:
-        regime_durations.append(current_duration)
+    # Calculate regime durations (lengths of runs of the same regime)
+    regime_durations = run_lengths(df['regime'].to_numpy(dtype=np.float64)).tolist()
     
     # Calculate stability metrics
     avg_duration = np.mean(regime_durations) if regime_durations else 0
@@ -234,8 +227,9 @@ def process_symbol_regime(symbol, data_dir="data/processed"):
                     df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
                     df = df.set_index('timestamp')
         
-        # Calculate technical indicators
-        df = calculate_technical_indicators(df)
+        # Calculate technical indicators (shared feature columns, cached next to the parquet)
+        features = get_feature_store(data_dir).dataset(symbol, "5m", df)
+        df = calculate_technical_indicators(df, features)
         
         # Try HMM first, fallback to simple method
         df_with_regimes = hmm_regime_detection(df)
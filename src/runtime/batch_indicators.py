@@ -0,0 +1,297 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.runtime.indicator_engine import BB_DEV, BB_PERIOD
+from src.runtime.kline_codec import OPEN_TIME, CLOSE, HIGH, LOW, VOLUME
+
+
+# Same parameters as calculate_indicators() (BB_PERIOD / BB_DEV are shared with it and the streaming engine)
+EMA_PERIODS = (9, 21, 50, 200)
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+VOLUME_PERIOD = 20
+
+INDICATOR_KEYS = (
+	"rsi", "ema_9", "ema_21", "ema_50", "ema_200", "macd", "macd_signal", "macd_hist",
+	"bb_upper", "bb_middle", "bb_lower", "atr", "atr_pct", "volume_avg", "volume_current",
+	"volume_ratio", "momentum_3", "momentum_10",
+)
+
+
+def pad_rows(rows_list: Sequence[Optional[np.ndarray]], width: Optional[int] = None) -> Tuple[np.ndarray, ...]:
+	"""(N_i, 6) kline arrays -> right-aligned (symbols x width) closes, highs, lows, volumes + lengths.
+
+	Shorter histories (newly listed coins, None) are NaN-padded on the left;
+	``lengths`` holds the number of real candles per row.
+	"""
+	lengths = np.array([0 if rows is None else len(rows) for rows in rows_list], dtype=np.int64)
+	width = int(width if width is not None else (lengths.max() if len(lengths) else 0))
+	lengths = np.minimum(lengths, width)
+	# HIGH, LOW, CLOSE, VOLUME are adjacent columns: one (4, width) slice per symbol
+	fields = slice(HIGH, VOLUME + 1)
+	if width and (lengths == width).all():
+		# Common case: every symbol has the whole window -> a single stack, no padding
+		block = np.stack([rows[-width:, fields].T for rows in rows_list])
+	else:
+		block = np.full((len(rows_list), VOLUME + 1 - HIGH, width), np.nan)
+		for i in np.flatnonzero(lengths):
+			size = lengths[i]
+			block[i, :, width - size:] = rows_list[i][-size:, fields].T
+	highs, lows, closes, volumes = (block[:, field - HIGH] for field in (HIGH, LOW, CLOSE, VOLUME))
+	return closes, highs, lows, volumes, lengths
+
+
+def _smoothing_weights(width: int, start: int, period: int, alpha: float) -> np.ndarray:
+	"""(width, width) matrix W: column t holds the input weights of the smoothed value at t.
+
+	SMA-seeded exponential smoothing (TA-Lib EMA, or Wilder with ``alpha = 1 / period``)
+	is linear in its inputs: seeded at ``s = start + period - 1`` with the mean of
+	the first ``period`` values, the value at t >= s is
+	``(1 - alpha) ** (t - s) * mean(x[start:s + 1]) + sum(alpha * (1 - alpha) ** (t - j) * x[j], s < j <= t)``.
+	Columns before the seed are NaN.
+	"""
+	seed_at = start + period - 1
+	j = np.arange(width)[:, None]
+	t = np.arange(width)[None, :]
+	with np.errstate(invalid="ignore"):
+		weights = np.where(j > seed_at, alpha * (1.0 - alpha) ** (t - j), (1.0 - alpha) ** (t - seed_at) / period)
+	weights[(j < start) | (j > t)] = 0.0
+	weights[:, :seed_at] = np.nan
+	return weights
+
+
+@lru_cache(maxsize=64)
+def close_weights(width: int, start: int) -> np.ndarray:
+	"""(width, 6) weights turning a close row into [ema_9, ema_21, ema_50, ema_200, macd, macd_signal].
+
+	MACD and its signal line are linear in the closes too (TA-Lib starts the fast
+	EMA ``slow - fast`` candles late so both are seeded on the same candle), so
+	every close-based indicator of a row is one product with this matrix. Cached
+	per (width, start): histories rarely change length between scans.
+	"""
+	last = width - 1
+	columns = [_smoothing_weights(width, start, period, 2.0 / (period + 1))[:, last] for period in EMA_PERIODS]
+	macd = (_smoothing_weights(width, start + MACD_SLOW - MACD_FAST, MACD_FAST, 2.0 / (MACD_FAST + 1))
+			- _smoothing_weights(width, start, MACD_SLOW, 2.0 / (MACD_SLOW + 1)))
+	signal_start = start + MACD_SLOW - 1
+	signal = _smoothing_weights(width, signal_start, MACD_SIGNAL, 2.0 / (MACD_SIGNAL + 1))[:, last]
+	if np.isnan(signal).any():
+		columns += [np.full(width, np.nan)] * 2
+	else:
+		# MACD is NaN before its first candle; the signal only weights candles from signal_start on
+		columns += [macd[:, last], np.nan_to_num(macd[:, signal_start:]) @ signal[signal_start:]]
+	weights = np.column_stack(columns)
+	weights.flags.writeable = False
+	return weights
+
+
+@lru_cache(maxsize=64)
+def wilder_weights(width: int, start: int, period: int) -> np.ndarray:
+	"""(width,) weights of the last Wilder average of per-candle values starting at ``start``."""
+	weights = _smoothing_weights(width, start, period, 1.0 / period)[:, width - 1]
+	weights.flags.writeable = False
+	return weights
+
+
+# Columns of a closed-candle summary (see closed_summary)
+SUMMARY_CLOSE = slice(0, 6)  # ema_9, ema_21, ema_50, ema_200, macd, macd_signal partial sums
+SUMMARY_WILDER = slice(6, 9)  # gain, loss, true range partial sums
+SUMMARY_BB_SUM, SUMMARY_BB_SQUARES, SUMMARY_VOLUME_SUM, SUMMARY_PREV_CLOSE, SUMMARY_BASE_3, SUMMARY_BASE_10 = range(9, 15)
+SUMMARY_FIELDS = 15
+
+
+def _start_groups(lengths: np.ndarray, width: int):
+	"""(start, rows) per distinct history length; ``rows`` is a slice when there is only one."""
+	starts = width - lengths
+	unique = np.unique(starts)
+	if len(unique) == 1:
+		return [(int(unique[0]), slice(None))]
+	return [(int(start), np.flatnonzero(starts == start)) for start in unique]
+
+
+def closed_summary(closes: np.ndarray, highs: np.ndarray, lows: np.ndarray, volumes: np.ndarray,
+				   lengths: np.ndarray) -> np.ndarray:
+	"""(symbols, SUMMARY_FIELDS) closed-candle part of every indicator.
+
+	The last column of the (symbols x width) matrices is the forming candle and
+	is ignored: every indicator is a weighted sum over candles, so the closed
+	part can be kept until the next candle closes and only the forming candle's
+	terms are added on each scan (``finish``).
+	"""
+	count, width = closes.shape
+	lengths = np.asarray(lengths, dtype=np.int64)
+	summary = np.full((count, SUMMARY_FIELDS), np.nan)
+	if width < 2:
+		return summary
+
+	# Per-candle inputs of the Wilder averages (gain, loss, true range); padding -> 0
+	previous = np.empty_like(closes)
+	previous[:, 0] = np.nan
+	previous[:, 1:] = closes[:, :-1]
+	change = closes - previous
+	wilder_inputs = np.stack([
+		np.fmax(change, 0.0),
+		np.fmax(-change, 0.0),
+		np.fmax(highs - lows, np.fmax(np.abs(highs - previous), np.abs(lows - previous))),
+	])[:, :, :-1]
+	np.nan_to_num(wilder_inputs, copy=False)
+	filled = np.nan_to_num(closes[:, :-1])
+
+	for start, rows in _start_groups(lengths, width):
+		summary[rows, SUMMARY_CLOSE] = filled[rows] @ close_weights(width, start)[:-1]
+		summary[rows, SUMMARY_WILDER] = (wilder_inputs[:, rows] @ wilder_weights(width, start + 1, RSI_PERIOD)[:-1]).T
+
+	window = closes[:, -BB_PERIOD:-1]
+	summary[:, SUMMARY_BB_SUM] = window.sum(axis=1)
+	summary[:, SUMMARY_BB_SQUARES] = (window * window).sum(axis=1)
+	summary[:, SUMMARY_VOLUME_SUM] = np.nan_to_num(volumes[:, -VOLUME_PERIOD:-1]).sum(axis=1)
+	summary[:, SUMMARY_PREV_CLOSE] = closes[:, -2]
+	summary[:, SUMMARY_BASE_3] = closes[:, -3] if width >= 3 else np.nan
+	summary[:, SUMMARY_BASE_10] = closes[:, -10] if width >= 10 else np.nan
+	return summary
+
+
+def finish(summary: np.ndarray, close: np.ndarray, high: np.ndarray, low: np.ndarray, volume: np.ndarray,
+		   lengths: np.ndarray, width: int) -> Dict[str, np.ndarray]:
+	"""Last-candle indicators from closed summaries plus the forming candle's values.
+
+	Returns one (symbols,) array per ``INDICATOR_KEYS`` entry; values that need
+	more history than a row has are NaN.
+	"""
+	count = len(close)
+	lengths = np.asarray(lengths, dtype=np.int64)
+	values: Dict[str, np.ndarray] = {}
+	if not width:
+		return {key: np.full(count, np.nan) for key in INDICATOR_KEYS}
+
+	previous = summary[:, SUMMARY_PREV_CLOSE]
+	change = close - previous
+	forming_wilder = np.nan_to_num(np.stack([
+		np.fmax(change, 0.0),
+		np.fmax(-change, 0.0),
+		np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous))),
+	], axis=1))
+	from_closes = np.empty((count, 6))
+	wilder = np.empty((count, 3))
+	for start, rows in _start_groups(lengths, width):
+		from_closes[rows] = summary[rows, SUMMARY_CLOSE] + close[rows, None] * close_weights(width, start)[-1]
+		if start + 1 + RSI_PERIOD <= width:
+			wilder[rows] = summary[rows, SUMMARY_WILDER] + forming_wilder[rows] * wilder_weights(width, start + 1, RSI_PERIOD)[-1]
+		else:
+			wilder[rows] = np.nan
+
+	avg_gain, avg_loss, atr = wilder.T
+	total = avg_gain + avg_loss
+	with np.errstate(divide="ignore", invalid="ignore"):
+		values["rsi"] = np.where(np.abs(total) < 1e-8, 0.0, 100.0 * avg_gain / total)
+	for i, period in enumerate(EMA_PERIODS):
+		values[f"ema_{period}"] = from_closes[:, i]
+	values["macd_signal"] = from_closes[:, 5]
+	values["macd"] = np.where(np.isnan(values["macd_signal"]), np.nan, from_closes[:, 4])
+	values["macd_hist"] = values["macd"] - values["macd_signal"]
+
+	if width >= BB_PERIOD:
+		middle = (summary[:, SUMMARY_BB_SUM] + close) / BB_PERIOD
+		variance = (summary[:, SUMMARY_BB_SQUARES] + close * close) / BB_PERIOD - middle * middle
+		deviation = np.sqrt(np.where(variance >= 1e-8, variance, 0.0))
+	else:
+		middle = deviation = np.full(count, np.nan)
+	values["bb_upper"] = middle + BB_DEV * deviation
+	values["bb_middle"] = middle
+	values["bb_lower"] = middle - BB_DEV * deviation
+
+	# ATR uses the same period as RSI (14), so it shares the Wilder weights
+	values["atr"] = atr
+	with np.errstate(divide="ignore", invalid="ignore"):
+		values["atr_pct"] = np.where(close > 0, atr / close * 100, 2.0)
+
+		volume_avg = (summary[:, SUMMARY_VOLUME_SUM] + np.nan_to_num(volume)) / np.clip(np.minimum(lengths, VOLUME_PERIOD), 1, None)
+		values["volume_avg"] = volume_avg
+		values["volume_current"] = volume
+		values["volume_ratio"] = np.where(volume_avg > 0, volume / volume_avg, 1.0)
+
+		for key, column, needed in (("momentum_3", SUMMARY_BASE_3, 4), ("momentum_10", SUMMARY_BASE_10, 11)):
+			base = summary[:, column]
+			values[key] = np.where((lengths >= needed) & (base > 0), (close - base) / base * 100, 0.0)
+	return {key: values[key] for key in INDICATOR_KEYS}
+
+
+def compute_batch(closes: np.ndarray, highs: np.ndarray, lows: np.ndarray, volumes: np.ndarray,
+				  lengths: np.ndarray) -> Dict[str, np.ndarray]:
+	"""Last-candle indicators for every row of right-aligned (symbols x candles) matrices.
+
+	Rows are grouped by history length and each group costs a handful of
+	matrix products, whatever the universe size.
+	"""
+	summary = closed_summary(closes, highs, lows, volumes, lengths)
+	width = closes.shape[1]
+	if not width:
+		return finish(summary, *np.full((4, len(closes)), np.nan), lengths, width)
+	return finish(summary, closes[:, -1], highs[:, -1], lows[:, -1], volumes[:, -1], lengths, width)
+
+
+def indicator_dicts(values: Dict[str, np.ndarray], close: np.ndarray, lengths: np.ndarray,
+					min_length: int = 200) -> List[Optional[Dict[str, float]]]:
+	"""Per-symbol dicts shaped like calculate_indicators() (same NaN fallbacks); None below ``min_length``."""
+	if not len(lengths):
+		return []
+	fallbacks = {"rsi": 50.0, "macd": 0.0, "macd_signal": 0.0, "macd_hist": 0.0, "bb_upper": close * 1.02,
+				 "bb_middle": close, "bb_lower": close * 0.98, "atr": close * 0.02}
+	fallbacks.update({f"ema_{period}": close for period in EMA_PERIODS})
+	values = dict(values)
+	for key, default in fallbacks.items():
+		values[key] = np.where(np.isnan(values[key]), default, values[key])
+	with np.errstate(divide="ignore", invalid="ignore"):
+		values["atr_pct"] = np.where(close > 0, values["atr"] / close * 100, 2.0)
+	table = np.column_stack([values[key] for key in INDICATOR_KEYS]).tolist()
+	return [dict(zip(INDICATOR_KEYS, row)) if size >= min_length and size else None
+			for row, size in zip(table, np.asarray(lengths).tolist())]
+
+
+def batch_indicators(rows_list: Sequence[Optional[np.ndarray]], min_length: int = 200,
+					 width: Optional[int] = None, memo=None,
+					 series: Optional[Sequence] = None) -> List[Optional[Dict[str, float]]]:
+	"""calculate_indicators()-compatible dicts for many (N, 6) kline arrays in one vectorized pass.
+
+	With an ``IndicatorMemo`` (and one ``series`` key per row) closed-candle
+	summaries are reused until the row's next candle closes, so between closes
+	only the forming candle is processed.
+	"""
+	lengths = np.array([0 if rows is None else len(rows) for rows in rows_list], dtype=np.int64)
+	width = int(width if width is not None else (lengths.max() if len(lengths) else 0))
+	lengths = np.minimum(lengths, width)
+	if memo is None or series is None or width < 2:
+		closes, highs, lows, volumes, lengths = pad_rows(rows_list, width)
+		return indicator_dicts(compute_batch(closes, highs, lows, volumes, lengths), closes[:, -1] if width else
+							   np.full(len(lengths), np.nan), lengths, min_length)
+
+	forming = np.full((len(rows_list), 4), np.nan)  # close, high, low, volume
+	summary = np.full((len(rows_list), SUMMARY_FIELDS), np.nan)
+	closed_times: List[Optional[float]] = [None] * len(rows_list)
+	missing = []
+	for i, rows in enumerate(rows_list):
+		if not lengths[i]:
+			continue
+		last = rows[-1]
+		forming[i] = (last[CLOSE], last[HIGH], last[LOW], last[VOLUME])
+		if lengths[i] < 2:
+			missing.append(i)
+			continue
+		closed_times[i] = float(rows[-2, OPEN_TIME])
+		cached = memo.get(series[i], closed_times[i], "batch_summary", (width, int(lengths[i])))
+		if cached is None:
+			missing.append(i)
+		else:
+			summary[i] = cached
+	if missing:
+		padded = pad_rows([rows_list[i] for i in missing], width)
+		fresh = closed_summary(*padded)
+		summary[missing] = fresh
+		for i, row in zip(missing, fresh):
+			memo.put(series[i], closed_times[i], "batch_summary", (width, int(lengths[i])), row.copy())
+
+	close, high, low, volume = forming.T
+	return indicator_dicts(finish(summary, close, high, low, volume, lengths, width), close, lengths, min_length)
@@ -0,0 +1,402 @@
+import os
+import copy
+import json
+import time
+import bisect
+import logging
+import operator
+import threading
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+Number = Union[int, float]
+
+
+# ---------------------------------------------------------------- tables
+#
+# A table scores one side ("BUY"/"SELL") as the sum of its rules, then clips the
+# total (plus a base) to ``clip`` and divides it by ``divide``. Rules are either
+#
+#   ladder:    {"name", "feature", "edges": [e1 < e2 < ...], "points": [p0, p1, ...]}
+#              points[i] is given for values between edge i and edge i+1; a value equal
+#              to an edge stays in the lower bucket ("edge": "lower", i.e. ``value > e``)
+#              or moves up ("edge": "upper", ``value >= e``); single edges can override
+#              it as [e, "upper"]. NaN values get ``missing`` (default 0).
+#   condition: {"name", "all": [[a, op, b], ...], "points": p}
+#              p when every comparison holds (an empty list always holds); operands are
+#              feature names or numbers. A comparison with NaN never holds.
+#
+# "both" rules apply to either side. Features missing from the input take ``defaults``
+# (a number or the name of another feature); without a default they raise KeyError.
+# The defaults reproduce calculate_signal_confidence / calculate_target_confidence.
+
+DEFAULT_TABLES: Dict[str, Dict[str, Any]] = {
+	"signal": {
+		"clip": [30, 95],
+		"divide": 100,
+		"defaults": {},
+		"rules": {
+			"BUY": [
+				{"name": "rsi", "feature": "rsi", "edges": [25, 30, 35, 40, 45], "edge": "upper",
+				 "points": [20, 15, 12, 8, 5, 0]},
+				{"name": "trend", "all": [["ema_9", ">", "ema_21"]], "points": 6},
+				{"name": "trend", "all": [["ema_9", ">", "ema_21"], ["ema_21", ">", "ema_50"]], "points": 6},
+				{"name": "macd", "all": [["macd", ">", "macd_signal"]], "points": 4},
+				{"name": "macd", "all": [["macd", ">", "macd_signal"], ["macd_strength", ">", 10]], "points": 4},
+				{"name": "momentum", "all": [["momentum_3", ">", 0]], "points": 3},
+				{"name": "momentum", "all": [["momentum_10", ">", 0]], "points": 3},
+			],
+			"SELL": [
+				{"name": "rsi", "feature": "rsi", "edges": [55, 60, 65, 70, 75], "points": [0, 5, 8, 12, 15, 20]},
+				{"name": "trend", "all": [["ema_9", "<", "ema_21"]], "points": 6},
+				{"name": "trend", "all": [["ema_9", "<", "ema_21"], ["ema_21", "<", "ema_50"]], "points": 6},
+				{"name": "macd", "all": [["macd", "<", "macd_signal"]], "points": 4},
+				{"name": "macd", "all": [["macd", "<", "macd_signal"], ["macd_strength", ">", 10]], "points": 4},
+				{"name": "momentum", "all": [["momentum_3", "<", 0]], "points": 3},
+				{"name": "momentum", "all": [["momentum_10", "<", 0]], "points": 3},
+			],
+			"both": [
+				{"name": "volume", "feature": "volume_ratio", "edges": [1.2, 1.5, 2.0, 2.5], "points": [0, 4, 8, 12, 15]},
+				{"name": "volatility", "feature": "atr_pct", "edges": [3, 5], "points": [0, -3, -5]},
+			],
+		},
+	},
+	"target": {
+		"clip": [0, 100],
+		"divide": None,
+		"defaults": {"momentum_3": 0, "momentum_10": 0, "volume_ratio": 1.0, "rsi": 50,
+					 "ema_9": "price", "ema_21": "price", "ema_50": "price"},
+		"rules": {
+			"BUY": [
+				{"name": "momentum", "feature": "momentum_10", "edges": [0, 1], "points": [0, 8, 15]},
+				{"name": "momentum", "all": [["momentum_10", ">", 2], ["momentum_3", ">", 0]], "points": 10},
+				{"name": "trend", "all": [], "points": 3},
+				{"name": "trend", "all": [["ema_9", ">", "ema_21"]], "points": 7},
+				{"name": "trend", "all": [["ema_9", ">", "ema_21"], ["ema_21", ">", "ema_50"]], "points": 10},
+				{"name": "rsi", "feature": "rsi", "edges": [40, [70, "upper"], [75, "upper"]], "points": [5, 10, 5, 0]},
+			],
+			"SELL": [
+				{"name": "momentum", "feature": "momentum_10", "edges": [-1, 0], "edge": "upper", "points": [15, 8, 0]},
+				{"name": "momentum", "all": [["momentum_10", "<", -2], ["momentum_3", "<", 0]], "points": 10},
+				{"name": "trend", "all": [], "points": 3},
+				{"name": "trend", "all": [["ema_9", "<", "ema_21"]], "points": 7},
+				{"name": "trend", "all": [["ema_9", "<", "ema_21"], ["ema_21", "<", "ema_50"]], "points": 10},
+				{"name": "rsi", "feature": "rsi", "edges": [25, 30, [60, "upper"]], "points": [0, 5, 10, 5]},
+			],
+			"both": [
+				{"name": "progress", "feature": "progress", "edges": [0.25, 0.5, 0.75], "edge": "upper",
+				 "points": [3, 8, 15, 25], "missing": 3},
+				{"name": "volume", "feature": "volume_ratio", "edges": [0.8, 1.2, 1.5], "points": [0, 5, 12, 20]},
+			],
+		},
+	},
+}
+
+SIDES = ("BUY", "SELL")
+
+
+# ---------------------------------------------------------------- derived features
+
+def _macd_strength(c):
+	return abs(c["macd"] - c["macd_signal"])
+
+
+def _progress(c):
+	"""Share of the entry -> target move already made (0 when the target is the entry)."""
+	with np.errstate(divide="ignore", invalid="ignore"):
+		current_gain = abs((c["price"] - c["entry_price"]) / c["entry_price"] * 100)
+		target_gain = abs((c["target_price"] - c["entry_price"]) / c["entry_price"] * 100)
+		if isinstance(target_gain, np.ndarray):
+			return np.where(target_gain > 0, current_gain / target_gain, 0.0)
+	return (current_gain / target_gain) if target_gain > 0 else 0
+
+
+# name: (inputs, compute(columns or row)); compute works on floats and on arrays
+DERIVED: Dict[str, Tuple[Tuple[str, ...], Callable]] = {
+	"macd_strength": (("macd", "macd_signal"), _macd_strength),
+	"progress": (("price", "entry_price", "target_price"), _progress),
+}
+
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+
+# ---------------------------------------------------------------- compiled rules
+
+class _Ladder:
+	__slots__ = ("name", "feature", "edges", "edge_array", "points", "point_array", "missing")
+
+	def __init__(self, spec: Mapping):
+		self.name = str(spec.get("name") or spec["feature"])
+		self.feature = str(spec["feature"])
+		default_edge = spec.get("edge", "lower")
+		edges = []
+		for item in spec["edges"]:
+			value, edge = (item[0], item[1]) if isinstance(item, (list, tuple)) else (item, default_edge)
+			if edge not in ("lower", "upper"):
+				raise ValueError(f"Rule {self.name}: edge must be 'lower' or 'upper', got {edge!r}")
+			# ``value >= e`` is ``value > previous float of e``: every edge becomes a strict one
+			edges.append(float(np.nextafter(float(value), -np.inf)) if edge == "upper" else float(value))
+		if any(b <= a for a, b in zip(edges, edges[1:])):
+			raise ValueError(f"Rule {self.name}: edges must be ascending")
+		self.points = list(spec["points"])
+		if len(self.points) != len(edges) + 1:
+			raise ValueError(f"Rule {self.name}: needs {len(edges) + 1} points for {len(edges)} edges")
+		self.edges = edges
+		self.edge_array = np.asarray(edges, dtype=np.float64)
+		self.point_array = np.asarray(self.points, dtype=np.float64)
+		self.missing = spec.get("missing", 0)
+
+	def features(self) -> List[str]:
+		return [self.feature]
+
+	def scalar(self, row: Mapping) -> Number:
+		value = row[self.feature]
+		if value != value:
+			return self.missing
+		return self.points[bisect.bisect_left(self.edges, value)]
+
+	def vector(self, columns: Mapping, count: int) -> np.ndarray:
+		values = columns[self.feature]
+		points = self.point_array[np.searchsorted(self.edge_array, values, side="left")]
+		return np.where(np.isnan(values), float(self.missing), points)
+
+
+class _Condition:
+	__slots__ = ("name", "terms", "points", "constants")
+
+	def __init__(self, spec: Mapping):
+		self.name = str(spec["name"])
+		self.terms = []
+		# Numbers become "#<n>" entries of the resolved row, so every operand is a plain lookup
+		self.constants: Dict[str, Number] = {}
+		for term in spec["all"]:
+			left, op, right = term
+			if op not in OPERATORS:
+				raise ValueError(f"Rule {self.name}: unknown operator {op!r}")
+			self.terms.append((self._operand(left), OPERATORS[op], self._operand(right)))
+		self.points = spec["points"]
+
+	def _operand(self, value) -> str:
+		if isinstance(value, str):
+			return value
+		if not isinstance(value, (int, float)) or isinstance(value, bool):
+			raise ValueError(f"Rule {self.name}: operands are feature names or numbers, got {value!r}")
+		key = f"#{value!r}"
+		self.constants[key] = value
+		return key
+
+	def features(self) -> List[str]:
+		return [key for left, _, right in self.terms for key in (left, right) if key not in self.constants]
+
+	def scalar(self, row: Mapping) -> Number:
+		for left, op, right in self.terms:
+			if not op(row[left], row[right]):
+				return 0
+		return self.points
+
+	def vector(self, columns: Mapping, count: int) -> np.ndarray:
+		mask = np.ones(count, dtype=bool)
+		for left, op, right in self.terms:
+			mask &= op(columns[left], columns[right])
+		return np.where(mask, float(self.points), 0.0)
+
+
+class CompiledTable:
+	"""One table's rules per side, ready for scalar (bisect) and batch (searchsorted) scoring."""
+
+	def __init__(self, name: str, spec: Mapping):
+		self.name = name
+		self.low, self.high = spec.get("clip", (None, None))
+		self.divide = spec.get("divide")
+		self.defaults = dict(spec.get("defaults") or {})
+		rules = spec.get("rules") or {}
+		unknown = set(rules) - set(SIDES) - {"both"}
+		if unknown:
+			raise ValueError(f"Table {name}: unknown sides {sorted(unknown)}")
+		shared = [self._compile(rule) for rule in rules.get("both", [])]
+		self.sides = {side: [self._compile(rule) for rule in rules.get(side, [])] + shared for side in SIDES}
+		self.constants = {key: value for side in self.sides.values() for rule in side
+						  for key, value in getattr(rule, "constants", {}).items()}
+		referenced = {feature for side in self.sides.values() for rule in side for feature in rule.features()}
+		self.derived = [name for name in DERIVED if name in referenced]
+		inputs = (referenced - set(self.derived)) | {key for name in self.derived for key in DERIVED[name][0]}
+		inputs |= {value for value in self.defaults.values() if isinstance(value, str)}
+		self.inputs = tuple(sorted(inputs))
+
+	@staticmethod
+	def _compile(rule: Mapping):
+		return _Condition(rule) if "all" in rule else _Ladder(rule)
+
+	def finish(self, total):
+		"""Clip and scale totals (a number or an array) like the scalar functions' last line."""
+		if isinstance(total, np.ndarray):
+			if self.low is not None:
+				total = np.maximum(float(self.low), total)
+			if self.high is not None:
+				total = np.minimum(float(self.high), total)
+			return total / self.divide if self.divide else total
+		if self.low is not None:
+			total = max(self.low, total)
+		if self.high is not None:
+			total = min(self.high, total)
+		return total / self.divide if self.divide else total
+
+	def fill(self, values: Mapping) -> Dict[str, Any]:
+		"""Input row with the defaults of its missing features filled in."""
+		row = dict(values)
+		for key, default in self.defaults.items():
+			if key not in row:
+				row[key] = row[default] if isinstance(default, str) else default
+		return row
+
+	def resolve(self, values: Mapping) -> Dict[str, Any]:
+		"""Input row with defaults and derived features filled in."""
+		row = self.fill(values)
+		row.update(self.constants)
+		for name in self.derived:
+			row[name] = DERIVED[name][1](row)
+		return row
+
+	def resolve_columns(self, columns: Mapping, count: int) -> Dict[str, np.ndarray]:
+		resolved = dict(columns)
+		for key, default in self.defaults.items():
+			if key not in resolved:
+				resolved[key] = resolved[default] if isinstance(default, str) else np.full(count, float(default))
+		resolved.update(self.constants)
+		for name in self.derived:
+			resolved[name] = DERIVED[name][1](resolved)
+		return resolved
+
+
+def compile_tables(specs: Mapping[str, Mapping]) -> Dict[str, CompiledTable]:
+	return {name: CompiledTable(name, spec) for name, spec in specs.items()}
+
+
+# ---------------------------------------------------------------- scorer
+
+class ConfidenceScorer:
+	"""Confidence tables compiled once and reloaded when their JSON file changes.
+
+	``score`` / ``points`` take column arrays and score a whole batch in one call;
+	``score_one`` / ``explain`` take a single indicator dict. The file only needs
+	the tables it changes (``{"signal": {...}}``); the others keep their defaults.
+	"""
+
+	def __init__(self, path: Optional[str] = None, tables: Optional[Mapping[str, Mapping]] = None,
+				 check_interval: float = 5.0):
+		self.path = path
+		self.check_interval = float(check_interval)
+		self._defaults = copy.deepcopy(dict(tables if tables is not None else DEFAULT_TABLES))
+		self._tables = compile_tables(self._defaults)
+		self._mtime: Optional[float] = None
+		self._checked = 0.0
+		self._lock = threading.Lock()
+		self.stats = {"version": 1, "reloads": 0, "reload_errors": 0, "batches": 0, "rows": 0}
+		if path:
+			self.maybe_reload(force=True)
+
+	def table(self, name: str) -> CompiledTable:
+		return self._tables[name]
+
+	# -------------------------------------------------------------- hot reload
+
+	def maybe_reload(self, force: bool = False) -> bool:
+		"""Recompile from ``path`` if it changed (checked at most every ``check_interval``s)."""
+		if not self.path:
+			return False
+		now = time.monotonic()
+		if not force and now - self._checked < self.check_interval:
+			return False
+		self._checked = now
+		try:
+			mtime = os.path.getmtime(self.path)
+		except OSError:
+			mtime = None
+		if mtime == self._mtime:
+			return False
+		self._mtime = mtime
+		return self.load(self._read() if mtime is not None else {})
+
+	def _read(self) -> Optional[Dict]:
+		try:
+			with open(self.path, "r", encoding="utf-8") as f:
+				return json.load(f)
+		except (OSError, ValueError) as e:
+			logger.warning(f"Could not read confidence tables {self.path}: {e}")
+			return None
+
+	def load(self, overrides: Optional[Mapping[str, Mapping]]) -> bool:
+		"""Compile the default tables with ``overrides`` replacing whole tables; keep the old ones on errors."""
+		try:
+			if not isinstance(overrides, Mapping):
+				raise ValueError("expected an object of tables")
+			compiled = compile_tables(dict(self._defaults, **overrides))
+		except (AttributeError, KeyError, TypeError, ValueError, IndexError) as e:
+			logger.warning(f"Keeping current confidence tables, invalid update: {e}")
+			with self._lock:
+				self.stats["reload_errors"] += 1
+			return False
+		self._tables = compiled
+		with self._lock:
+			self.stats["version"] += 1
+			self.stats["reloads"] += 1
+			version = self.stats["version"]
+		logger.info(f"Confidence tables loaded ({', '.join(sorted(overrides)) or 'defaults'}) v{version}")
+		return True
+
+	# -------------------------------------------------------------- scoring
+
+	def points(self, name: str, columns: Mapping[str, np.ndarray], side: str) -> np.ndarray:
+		"""Unclipped rule points for every row of ``columns`` (arrays of equal length)."""
+		table = self._tables[name]
+		count = len(next(iter(columns.values()))) if columns else 0
+		resolved = table.resolve_columns(columns, count)
+		total = np.zeros(count, dtype=np.float64)
+		for rule in table.sides[side]:
+			total += rule.vector(resolved, count)
+		with self._lock:
+			self.stats["batches"] += 1
+			self.stats["rows"] += count
+		return total
+
+	def score(self, name: str, columns: Mapping[str, np.ndarray], side: str, base: Union[Number, np.ndarray] = 0) -> np.ndarray:
+		"""Final confidence for every row: clip(base + points) / divide."""
+		table = self._tables[name]
+		return table.finish(base + self.points(name, columns, side))
+
+	def score_rows(self, name: str, rows: Sequence[Mapping], side: str, base: Union[Number, np.ndarray] = 0) -> np.ndarray:
+		"""``score`` for a list of indicator dicts (missing keys take the table defaults)."""
+		if not rows:
+			return np.zeros(0)
+		table = self._tables[name]
+		filled = [table.fill(row) for row in rows]
+		columns = {key: np.array([row[key] for row in filled], dtype=np.float64) for key in table.inputs}
+		return self.score(name, columns, side, base)
+
+	def explain(self, name: str, values: Mapping, side: str, base: Number = 0) -> Tuple[Number, Dict[str, Number], Dict]:
+		"""(confidence, points per rule name, resolved inputs) for one indicator dict."""
+		table = self._tables[name]
+		row = table.resolve(values)
+		parts: Dict[str, Number] = {}
+		total = base
+		for rule in table.sides[side]:
+			points = rule.scalar(row)
+			parts[rule.name] = parts.get(rule.name, 0) + points
+			total += points
+		return table.finish(total), parts, row
+
+	def score_one(self, name: str, values: Mapping, side: str, base: Number = 0) -> Number:
+		table = self._tables[name]
+		row = table.resolve(values)
+		total = base
+		for rule in table.sides[side]:
+			total += rule.scalar(row)
+		return table.finish(total)
+
+	def get_stats(self) -> Dict:
+		with self._lock:
+			return dict(self.stats, path=self.path, tables=sorted(self._tables))
@@ -0,0 +1,87 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class CycleCache:
+	"""Single-flight memo scoped to one trading cycle.
+
+	Values are keyed by ``key`` and carry a ``size`` (e.g. a kline ``limit``):
+	a request is served from any cached or in-flight value of at least that
+	size, sliced down with ``slicer``. Concurrent callers asking for the same
+	key wait for the one fetch already in flight instead of starting their own.
+	Outside ``begin_cycle`` / ``end_cycle`` every call goes straight to the
+	loader, so nothing is served across cycles.
+	"""
+
+	def __init__(self):
+		self._entries: Dict[Hashable, Dict] = {}
+		self._lock = threading.Lock()
+		self._active = False
+		self.cycle = 0
+		self._counts = self._empty_counts()
+		self.last_cycle: Dict = {}
+
+	@staticmethod
+	def _empty_counts() -> Dict[str, int]:
+		return {"hits": 0, "coalesced": 0, "misses": 0, "failures": 0, "bypassed": 0}
+
+	def begin_cycle(self) -> None:
+		with self._lock:
+			self._entries.clear()
+			self._counts = self._empty_counts()
+			self._active = True
+			self.cycle += 1
+
+	def end_cycle(self) -> Dict:
+		"""Stop caching and return this cycle's counters."""
+		with self._lock:
+			self._entries.clear()
+			self._active = False
+			self.last_cycle = dict(self._counts, cycle=self.cycle)
+			return dict(self.last_cycle)
+
+	def get(self, key: Hashable, size: int, loader: Callable[[int], Any],
+			slicer: Optional[Callable[[Any, int], Any]] = None) -> Any:
+		"""Value for ``key`` with at least ``size`` items; ``loader(size)`` returns None on failure."""
+		with self._lock:
+			if not self._active:
+				self._counts["bypassed"] += 1
+				entry = None
+				owner = False
+			else:
+				entry = self._entries.get(key)
+				if entry is not None and entry["size"] >= size and not entry["failed"]:
+					owner = False
+					self._counts["hits" if entry["done"].is_set() else "coalesced"] += 1
+				else:
+					entry = {"size": size, "value": None, "done": threading.Event(), "failed": False}
+					self._entries[key] = entry
+					owner = True
+					self._counts["misses"] += 1
+
+		if entry is None:
+			return loader(size)
+
+		if owner:
+			try:
+				entry["value"] = loader(size)
+			finally:
+				if entry["value"] is None:
+					entry["failed"] = True
+					with self._lock:
+						self._counts["failures"] += 1
+						if self._entries.get(key) is entry:
+							del self._entries[key]
+				entry["done"].set()
+		else:
+			entry["done"].wait()
+
+		value = entry["value"]
+		if value is None or slicer is None or entry["size"] == size:
+			return value
+		return slicer(value, size)
+
+	def get_stats(self) -> Dict:
+		with self._lock:
+			current = dict(self._counts, cycle=self.cycle, active=self._active, keys=len(self._entries))
+		return {"current": current, "last_cycle": dict(self.last_cycle)}
@@ -0,0 +1,160 @@
+import math
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Collection, Dict, Iterator, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CycleScheduler:
+	"""Trading cycles aligned to wall-clock boundaries, with a time budget per phase.
+
+	Cycles start at ``k * period + offset`` (epoch seconds): with period 60 and
+	offset 3 that is 3s after every 1m candle close (and every 5m one). After a
+	cycle only the time left until the next boundary is slept; boundaries that
+	pass while a cycle is still running are skipped, not caught up.
+
+	Phases listed in ``deferrable`` only run while their budget still fits
+	before the next boundary; the others (position management) always run.
+	Every phase records its duration and whether it overran its budget.
+	"""
+
+	def __init__(self, period: float = 60.0, offset: float = 3.0, budgets: Optional[Mapping[str, float]] = None,
+				 deferrable: Collection[str] = (), clock: Callable[[], float] = time.time,
+				 sleep: Callable[[float], None] = time.sleep):
+		if period <= 0 or not 0 <= offset < period:
+			raise ValueError("period must be > 0 and 0 <= offset < period")
+		self.period = float(period)
+		self.offset = float(offset)
+		self.budgets = dict(budgets or {})
+		self.deferrable = frozenset(deferrable)
+		self.clock = clock
+		self.sleep = sleep
+		self._scheduled: Optional[float] = None
+		self._started: Optional[float] = None
+		self._last_scheduled: Optional[float] = None
+		self._lock = threading.Lock()
+		self.phases: Dict[str, Dict] = {}
+		self.stats = {"cycles": 0, "late_starts": 0, "overruns": 0, "missed_boundaries": 0, "skipped_phases": 0,
+					  "last_duration": 0.0, "max_duration": 0.0, "last_lag": 0.0, "max_lag": 0.0}
+
+	# -------------------------------------------------------------- alignment
+
+	def next_boundary(self, after: float) -> float:
+		"""First cycle start strictly after ``after``."""
+		k = math.floor((after - self.offset) / self.period) + 1
+		return k * self.period + self.offset
+
+	def wait(self, not_before: Optional[float] = None, stop: Optional[Callable[[], bool]] = None) -> float:
+		"""Sleep until the next boundary (at or after ``not_before``) and return it.
+
+		The very first cycle starts immediately. ``stop`` is polled about once a
+		second so shutdown doesn't wait for the boundary.
+		"""
+		now = self.clock()
+		if self._last_scheduled is None and not_before is None:
+			return now
+		target = self.next_boundary(max(now, self._last_scheduled if self._last_scheduled is not None else now))
+		if not_before is not None and target < not_before:
+			target = self.next_boundary(not_before - 1e-6)  # First boundary at or after not_before
+		while True:
+			remaining = target - self.clock()
+			if remaining <= 0 or (stop is not None and stop()):
+				return target
+			self.sleep(min(remaining, 1.0))
+
+	# -------------------------------------------------------------- cycle
+
+	def begin(self, scheduled: Optional[float] = None) -> None:
+		now = self.clock()
+		self._scheduled = now if scheduled is None else scheduled
+		self._started = now
+		self._last_scheduled = self._scheduled
+		lag = max(0.0, now - self._scheduled)
+		with self._lock:
+			self.stats["last_lag"] = round(lag, 3)
+			self.stats["max_lag"] = round(max(self.stats["max_lag"], lag), 3)
+			if lag > 1.0:
+				self.stats["late_starts"] += 1
+
+	@property
+	def deadline(self) -> float:
+		"""When the running cycle should be done: one period after its (aligned) start."""
+		start = self._scheduled if self._scheduled is not None else self.clock()
+		return start + self.period
+
+	def remaining(self) -> float:
+		return self.deadline - self.clock()
+
+	def should_run(self, name: str) -> bool:
+		"""False if ``name`` is deferrable and its budget no longer fits in this cycle."""
+		if name not in self.deferrable or self._scheduled is None:
+			return True
+		return self.remaining() >= self.budgets.get(name, 0.0)
+
+	def _phase_stats(self, name: str) -> Dict:
+		return self.phases.setdefault(name, {"runs": 0, "skipped": 0, "overruns": 0, "last": 0.0, "max": 0.0,
+											 "total": 0.0, "budget": self.budgets.get(name)})
+
+	@contextmanager
+	def phase(self, name: str) -> Iterator[bool]:
+		"""Time a phase; yields False (and the body should not run) when it is deferred."""
+		if not self.should_run(name):
+			remaining = self.remaining()
+			with self._lock:
+				self._phase_stats(name)["skipped"] += 1
+				self.stats["skipped_phases"] += 1
+			logger.warning(f"⏭️ Deferring phase '{name}': {remaining:.1f}s left in cycle, budget {self.budgets.get(name, 0.0):.1f}s")
+			yield False
+			return
+		start = self.clock()
+		try:
+			yield True
+		finally:
+			duration = self.clock() - start
+			budget = self.budgets.get(name)
+			with self._lock:
+				stats = self._phase_stats(name)
+				stats["runs"] += 1
+				stats["last"] = round(duration, 3)
+				stats["max"] = round(max(stats["max"], duration), 3)
+				stats["total"] = round(stats["total"] + duration, 3)
+				overran = budget is not None and duration > budget
+				if overran:
+					stats["overruns"] += 1
+			if overran:
+				logger.warning(f"⏱️ Phase '{name}' overran its budget: {duration:.2f}s > {budget:.2f}s")
+
+	def run(self, name: str, fn: Callable, *args, **kwargs):
+		"""``fn(*args, **kwargs)`` as phase ``name``; returns None without calling it when deferred."""
+		with self.phase(name) as allowed:
+			if allowed:
+				return fn(*args, **kwargs)
+		return None
+
+	def end(self) -> Dict:
+		"""Close the running cycle: {'duration', 'lag', 'overran', 'next'}."""
+		now = self.clock()
+		scheduled = self._scheduled if self._scheduled is not None else now
+		started = self._started if self._started is not None else now
+		deadline = scheduled + self.period
+		duration = now - started
+		overran = now > deadline
+		missed = math.floor((now - deadline) / self.period) + 1 if overran else 0
+		with self._lock:
+			self.stats["cycles"] += 1
+			self.stats["last_duration"] = round(duration, 3)
+			self.stats["max_duration"] = round(max(self.stats["max_duration"], duration), 3)
+			if overran:
+				self.stats["overruns"] += 1
+				self.stats["missed_boundaries"] += missed
+		self._scheduled = self._started = None
+		return {"duration": duration, "lag": max(0.0, started - scheduled), "overran": overran,
+				"next": self.next_boundary(max(now, scheduled))}
+
+	def get_stats(self) -> Dict:
+		with self._lock:
+			return dict(self.stats, period=self.period, offset=self.offset,
+						phases={name: dict(stats) for name, stats in self.phases.items()})
@@ -3,13 +3,16 @@ import json
 import threading
 import requests
 import random
-import math
 import logging
 import numpy as np
 from datetime import datetime
 from typing import Dict, Iterator, List, Optional
 from websocket import WebSocketApp
 
+from src.runtime.transport import get_transport
+from src.runtime.kline_codec import OPEN_TIME, OPEN, VOLUME, loads, rows_to_array
+from src.runtime.kernels import gbm_path
+
 
 class LiveDataFeed:
 	def __init__(self, config: Dict):
@@ -37,6 +40,7 @@ class LiveDataFeed:
 		self._sim_prices: Dict[str, float] = {s: 20000.0 for s in self.symbols}
 		self._rng = random.Random(self.simulate_seed)
 		self._data_lock = threading.Lock()  # Protect shared data access
+		self._transport = get_transport()  # Pooled keep-alive REST sessions
 		self.clear_cache()
 
 	def start(self) -> None:
@@ -140,12 +144,10 @@ class LiveDataFeed:
 			dt = max(1e-6, float(self.gbm_dt_ms) / 1000.0)
 			mu = self.gbm_mu
 			sigma = max(1e-9, self.gbm_sigma)
-			# Box-Muller transform for standard normal
+			# Box-Muller uniforms for one standard normal step (same kernel as the backfill)
 			u1 = max(1e-12, self._rng.random())
 			u2 = max(1e-12, self._rng.random())
-			z = ( (-2.0 * math.log(u1)) ** 0.5 ) * math.cos(2.0 * math.pi * u2 )
-			growth = (mu - 0.5 * sigma * sigma) * dt + sigma * (dt ** 0.5) * z
-			base = max(0.01, base * math.exp(growth))
+			base = float(gbm_path(base, (u1, u2), mu, sigma, dt)[0])
 		else:
 			# Fallback to bounded random walk
 			step = 1 if self._rng.random() >= 0.5 else -1
@@ -155,10 +157,13 @@ class LiveDataFeed:
 
 	def _fetch_price(self, symbol: str) -> float:
 		try:
-			resp = requests.get(
+			resp = self._transport.get(
 				"https://api.binance.com/api/v3/ticker/price",
-				params={"symbol": symbol}, timeout=5
+				params={"symbol": symbol}, timeout=5, max_retries=1
 			)
+			if resp is None:
+				logging.error(f"Network error fetching price for {symbol}: no response")
+				return 0.0
 			resp.raise_for_status()
 			data = resp.json()
 			price = float(data["price"])
@@ -178,49 +183,34 @@ class LiveDataFeed:
 
 	def backfill_klines(self, symbol: str, limit: int = 100) -> List[Dict]:
 		try:
-			resp = requests.get(
+			resp = self._transport.get(
 				"https://api.binance.com/api/v3/klines",
 				params={"symbol": symbol, "interval": self.interval, "limit": limit}, timeout=10
 			)
+			if resp is None:
+				logging.error(f"Network error fetching klines for {symbol}: no response")
+				return []
 			resp.raise_for_status()
-			rows = resp.json()
-			if not isinstance(rows, list):
-				logging.warning(f"Invalid klines data format for {symbol}")
+			try:
+				rows = loads(resp.content)
+				if not isinstance(rows, list):
+					raise ValueError(f"Unexpected klines payload: {str(rows)[:200]}")
+				klines = rows_to_array(rows)
+			except ValueError as e:
+				logging.warning(f"Invalid klines data format for {symbol}: {e}")
 				return []
-			candles: List[Dict] = []
-			for r in rows:
-				try:
-					# Validate data before processing
-					if len(r) < 6:
-						logging.warning(f"Incomplete kline data for {symbol}")
-						continue
-					open_price = float(r[1])
-					high_price = float(r[2])
-					low_price = float(r[3])
-					close_price = float(r[4])
-					volume = float(r[5])
-					
-					# Validate price data
-					if not all(np.isfinite([open_price, high_price, low_price, close_price, volume])):
-						logging.warning(f"Invalid price data in kline for {symbol}")
-						continue
-					if any(p <= 0 for p in [open_price, high_price, low_price, close_price]):
-						logging.warning(f"Non-positive price in kline for {symbol}")
-						continue
-					
-					candles.append({
-						"ts": int(r[0] / 1000),
-						"open": open_price,
-						"high": high_price,
-						"low": low_price,
-						"close": close_price,
-						"volume": volume,
-						"symbol": symbol,
-					})
-				except (ValueError, IndexError) as e:
-					logging.warning(f"Error processing kline data for {symbol}: {e}")
-					continue
-			return candles
+			# Validate price data (all rows at once); truncated rows were already dropped by rows_to_array
+			prices = klines[:, OPEN:VOLUME]
+			valid = np.isfinite(klines).all(axis=1) & (prices > 0).all(axis=1)
+			skipped = len(rows) - int(valid.sum())
+			if skipped:
+				logging.warning(f"Skipped {skipped} invalid kline rows for {symbol}")
+			klines = klines[valid]
+			ts = (klines[:, OPEN_TIME] // 1000).astype(np.int64).tolist()
+			return [
+				{"ts": t, "open": o, "high": h, "low": l, "close": c, "volume": v, "symbol": symbol}
+				for t, (o, h, l, c, v) in zip(ts, klines[:, OPEN:VOLUME + 1].tolist())
+			]
 		except requests.exceptions.RequestException as e:
 			logging.error(f"Network error fetching klines for {symbol}: {e}")
 			return []
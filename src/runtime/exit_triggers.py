@@ -0,0 +1,154 @@
+import time
+import logging
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STOP_LOSS, TAKE_PROFIT, TRAILING_STOP, QUICK_PROFIT = "stop_loss", "take_profit", "trailing_stop", "quick_profit"
+
+# Same order as the checks in manage_positions: the first crossed kind names the exit
+PRIORITY = (QUICK_PROFIT, TRAILING_STOP, STOP_LOSS, TAKE_PROFIT)
+
+# Kinds that fire when price moves against a long (at or below the level); mirrored for shorts
+_AGAINST = frozenset((STOP_LOSS, TRAILING_STOP))
+
+BELOW, ABOVE = "below", "above"
+
+Fired = List[Tuple[str, List[Tuple[str, float]]]]  # [(position_key, [(kind, level), ...] in PRIORITY order)]
+
+
+class _Side:
+	"""Trigger levels of one symbol and direction, kept sorted for bisect."""
+
+	__slots__ = ("levels", "entries")
+
+	def __init__(self):
+		self.levels: List[float] = []
+		self.entries: List[Tuple[float, str, str]] = []  # (level, position_key, kind), same order as levels
+
+	def add(self, level: float, key: str, kind: str) -> None:
+		entry = (level, key, kind)
+		index = bisect_right(self.entries, entry)
+		self.levels.insert(index, level)
+		self.entries.insert(index, entry)
+
+	def remove(self, level: float, key: str, kind: str) -> None:
+		index = bisect_left(self.entries, (level, key, kind))
+		if index < len(self.entries) and self.entries[index] == (level, key, kind):
+			del self.levels[index]
+			del self.entries[index]
+
+
+class ExitTriggerEngine:
+	"""Stop-loss / take-profit / trailing / quick-profit levels indexed by price.
+
+	Each symbol keeps two sorted level lists: triggers that fire when the price
+	falls to them (long stops, short targets) and triggers that fire when it
+	rises to them. A price update bisects both lists, so it only touches the
+	triggers it actually crossed. A position's triggers are disarmed as soon
+	as one of them fires; ``arm`` (or the periodic ``sync``) re-arms it if the
+	exit didn't go through.
+
+	Triggers crossed before ``not_before`` (minimum hold time) stay armed and
+	are ignored. ``on_fire(symbol, price, fired)`` is called outside the lock.
+	"""
+
+	def __init__(self, on_fire: Optional[Callable[[str, float, Fired], None]] = None,
+				 clock: Callable[[], float] = time.time):
+		self.on_fire = on_fire
+		self.clock = clock
+		self._books: Dict[str, Dict[str, _Side]] = {}
+		self._armed: Dict[str, Tuple[str, float, List[Tuple[str, float, str]]]] = {}  # key -> (symbol, not_before, [(side, level, kind)])
+		self._lock = threading.Lock()
+		self.stats = {"updates": 0, "crossed": 0, "fired": 0, "held": 0, "arms": 0, "callback_errors": 0}
+
+	@staticmethod
+	def side_for(action: str, kind: str) -> str:
+		against = kind in _AGAINST
+		return BELOW if (action == "BUY") == against else ABOVE
+
+	def arm(self, key: str, symbol: str, action: str, levels: Mapping[str, Optional[float]],
+			not_before: float = 0.0) -> None:
+		"""(Re)place every trigger of position ``key``; None / non-positive levels are skipped."""
+		with self._lock:
+			self._disarm(key)
+			book = self._books.setdefault(symbol, {BELOW: _Side(), ABOVE: _Side()})
+			placed = []
+			for kind, level in levels.items():
+				if level is None or not level > 0:
+					continue
+				side = self.side_for(action, kind)
+				book[side].add(float(level), key, kind)
+				placed.append((side, float(level), kind))
+			self._armed[key] = (symbol, float(not_before), placed)
+			self.stats["arms"] += 1
+
+	def disarm(self, key: str) -> None:
+		with self._lock:
+			self._disarm(key)
+
+	def _disarm(self, key: str) -> None:
+		armed = self._armed.pop(key, None)
+		if armed is None:
+			return
+		symbol, _, placed = armed
+		book = self._books[symbol]
+		for side, level, kind in placed:
+			book[side].remove(level, key, kind)
+		if not book[BELOW].levels and not book[ABOVE].levels:
+			del self._books[symbol]
+
+	def sync(self, positions: Mapping[str, Tuple[str, str, Mapping[str, Optional[float]], float]]) -> None:
+		"""Make the armed set match ``{key: (symbol, action, levels, not_before)}``."""
+		with self._lock:
+			stale = [key for key in self._armed if key not in positions]
+		for key in stale:
+			self.disarm(key)
+		for key, (symbol, action, levels, not_before) in positions.items():
+			self.arm(key, symbol, action, levels, not_before)
+
+	def on_price(self, symbol: str, price: float, now: Optional[float] = None) -> Fired:
+		"""Fire (and disarm) the positions whose triggers ``price`` crossed."""
+		if symbol not in self._books or not price > 0:  # Unwatched symbol (the common case) or a bad price
+			return []
+		now = self.clock() if now is None else now
+		hits: Dict[str, List[Tuple[str, float]]] = {}
+		with self._lock:
+			self.stats["updates"] += 1
+			book = self._books.get(symbol)
+			if book is None:
+				return []
+			below, above = book[BELOW], book[ABOVE]
+			crossed = below.entries[bisect_left(below.levels, price):] + above.entries[:bisect_right(above.levels, price)]
+			for level, key, kind in crossed:
+				self.stats["crossed"] += 1
+				if now < self._armed[key][1]:
+					self.stats["held"] += 1
+					continue
+				hits.setdefault(key, []).append((kind, level))
+			for key in hits:
+				self._disarm(key)
+			self.stats["fired"] += len(hits)
+		if not hits:
+			return []
+		fired = [(key, sorted(kinds, key=lambda hit: PRIORITY.index(hit[0]))) for key, kinds in hits.items()]
+		if self.on_fire is not None:
+			try:
+				self.on_fire(symbol, price, fired)
+			except Exception as e:
+				with self._lock:
+					self.stats["callback_errors"] += 1
+				logger.error(f"Exit trigger callback failed for {symbol}: {e}")
+		return fired
+
+	def levels(self, key: str) -> Dict[str, float]:
+		with self._lock:
+			armed = self._armed.get(key)
+			return {kind: level for _, level, kind in armed[2]} if armed else {}
+
+	def get_stats(self) -> Dict:
+		with self._lock:
+			return dict(self.stats, positions=len(self._armed), symbols=len(self._books),
+						triggers=sum(len(side.levels) for book in self._books.values() for side in book.values()))
@@ -0,0 +1,313 @@
+import os
+import shutil
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+FEATURE_VERSION = 1  # Bump when a feature definition changes: old files are then never read
+OHLCV = ("open", "high", "low", "close", "volume")
+
+
+# ---------------------------------------------------------------- feature definitions
+#
+# Each family computes a float64 column from the dataset (and other features, which
+# are then cached too). Names are ``family`` or ``family_<n>``: ``ema_21``, ``rsi_14``.
+# The formulas are the ones the research modules used inline, so values are unchanged.
+
+def _series(features: "FeatureSet", name: str) -> pd.Series:
+	return features.series(name)
+
+
+def _returns(features, _):
+	return _series(features, "close").pct_change()
+
+
+def _momentum(features, n):
+	return _series(features, "close").pct_change(n)
+
+
+def _sma(features, n):
+	return _series(features, "close").rolling(n).mean()
+
+
+def _std(features, n):
+	return _series(features, "close").rolling(n).std()
+
+
+def _ema(features, n):
+	return _series(features, "close").ewm(span=n).mean()
+
+
+def _ema_rec(features, n):
+	# Recursive EMA (adjust=False): the live bot's / TA definition
+	return _series(features, "close").ewm(span=n, adjust=False).mean()
+
+
+def _avg_gain(features, n):
+	delta = _series(features, "close").diff()
+	return (delta.where(delta > 0, 0)).rolling(window=n).mean()
+
+
+def _avg_loss(features, n):
+	delta = _series(features, "close").diff()
+	return (-delta.where(delta < 0, 0)).rolling(window=n).mean()
+
+
+def _rsi(features, n):
+	rs = _series(features, f"avg_gain_{n}") / _series(features, f"avg_loss_{n}")
+	return 100 - (100 / (1 + rs))
+
+
+def _atr(features, n):
+	high, low, close = (_series(features, c) for c in ("high", "low", "close"))
+	high_low = high - low
+	high_close = np.abs(high - close.shift())
+	low_close = np.abs(low - close.shift())
+	true_range = np.maximum(high_low, np.maximum(high_close, low_close))
+	return true_range.rolling(n).mean()
+
+
+def _volatility(features, n):
+	return _series(features, "returns").rolling(n).std()
+
+
+def _volume_sma(features, n):
+	return _series(features, "volume").rolling(n).mean()
+
+
+def _highest(features, n):
+	return _series(features, "high").rolling(n).max()
+
+
+def _lowest(features, n):
+	return _series(features, "low").rolling(n).min()
+
+
+def _close_max(features, n):
+	return _series(features, "close").rolling(n).max()
+
+
+def _obv(features, _):
+	close, volume = _series(features, "close"), _series(features, "volume")
+	return np.where(close > close.shift(1), volume, np.where(close < close.shift(1), -volume, 0)).cumsum()
+
+
+FEATURES: Dict[str, Tuple[Callable, bool]] = {
+	# family: (compute(features, n), takes a window)
+	"returns": (_returns, False),
+	"momentum": (_momentum, True),
+	"sma": (_sma, True),
+	"std": (_std, True),
+	"ema": (_ema, True),
+	"ema_rec": (_ema_rec, True),
+	"avg_gain": (_avg_gain, True),
+	"avg_loss": (_avg_loss, True),
+	"rsi": (_rsi, True),
+	"atr": (_atr, True),
+	"volatility": (_volatility, True),
+	"volume_sma": (_volume_sma, True),
+	"highest": (_highest, True),
+	"lowest": (_lowest, True),
+	"close_max": (_close_max, True),
+	"obv": (_obv, False),
+}
+
+
+def parse_feature(name: str) -> Tuple[str, Optional[int]]:
+	"""'ema_21' -> ('ema', 21), 'obv' -> ('obv', None); KeyError for unknown names."""
+	family, _, window = name.rpartition("_")
+	if family in FEATURES and window.isdigit() and FEATURES[family][1] and int(window) > 0:
+		return family, int(window)
+	if name in FEATURES and not FEATURES[name][1]:
+		return name, None
+	raise KeyError(f"Unknown feature: {name}")
+
+
+def dataset_hash(df: pd.DataFrame) -> str:
+	"""Content hash of the OHLCV columns and the index: any changed candle changes it."""
+	digest = hashlib.blake2b(digest_size=12)
+	if isinstance(df.index, pd.DatetimeIndex):
+		digest.update(np.ascontiguousarray(df.index.asi8).tobytes())
+	else:
+		digest.update(str(len(df.index)).encode())
+	for column in OHLCV:
+		if column in df.columns:
+			digest.update(column.encode())
+			digest.update(np.ascontiguousarray(df[column].to_numpy(dtype=np.float64)).tobytes())
+	return f"v{FEATURE_VERSION}-{digest.hexdigest()}"
+
+
+class FeatureSet:
+	"""Lazily computed, read-only feature columns of one dataset.
+
+	``get(name)`` returns a float64 array aligned with the dataset rows: from
+	memory, else memory-mapped from the store's ``.npy`` file (no copy), else
+	computed once and written there. ``series`` / ``frame`` wrap the arrays
+	without copying them.
+	"""
+
+	def __init__(self, store: "FeatureStore", symbol: str, timeframe: str, df: pd.DataFrame, digest: str,
+				 directory: Optional[str]):
+		self.store = store
+		self.symbol = symbol
+		self.timeframe = timeframe
+		self.digest = digest
+		self.directory = directory
+		self.index = df.index
+		self._columns: Dict[str, np.ndarray] = {}
+		for column in OHLCV:
+			if column in df.columns:
+				self._columns[column] = self._freeze(df[column].to_numpy(dtype=np.float64, copy=True))
+		self._lock = threading.RLock()
+
+	def __len__(self) -> int:
+		return len(self.index)
+
+	def __contains__(self, name: str) -> bool:
+		return name in self._columns
+
+	@staticmethod
+	def _freeze(values: np.ndarray) -> np.ndarray:
+		values = np.ascontiguousarray(values, dtype=np.float64)
+		values.flags.writeable = False
+		return values
+
+	def _path(self, name: str) -> Optional[str]:
+		return os.path.join(self.directory, f"{name}.npy") if self.directory else None
+
+	def get(self, name: str) -> np.ndarray:
+		values = self._columns.get(name)
+		if values is not None:
+			self.store._count("hits")
+			return values
+		family, window = parse_feature(name)
+		with self._lock:  # One computation per feature even with concurrent readers
+			values = self._columns.get(name)
+			if values is None:
+				values = self._load(name)
+				if values is None:
+					compute = FEATURES[family][0]
+					values = self._freeze(np.asarray(compute(self, window), dtype=np.float64))
+					if len(values) != len(self.index):
+						raise ValueError(f"Feature {name} has {len(values)} rows, dataset has {len(self.index)}")
+					self.store._count("computed")
+					self._save(name, values)
+				self._columns[name] = values
+			else:
+				self.store._count("hits")
+		return values
+
+	def _load(self, name: str) -> Optional[np.ndarray]:
+		path = self._path(name)
+		if path is None or not os.path.exists(path):
+			return None
+		try:
+			values = np.load(path, mmap_mode="r")
+		except (OSError, ValueError) as e:
+			logger.warning(f"Ignoring unreadable feature file {path}: {e}")
+			return None
+		if values.shape != (len(self.index),) or values.dtype != np.float64:
+			return None
+		self.store._count("loaded")
+		return values
+
+	def _save(self, name: str, values: np.ndarray) -> None:
+		path = self._path(name)
+		if path is None:
+			return
+		tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+		try:
+			os.makedirs(self.directory, exist_ok=True)
+			with open(tmp_path, "wb") as f:
+				np.save(f, values)
+			os.replace(tmp_path, path)
+			self.store._count("written")
+		except OSError as e:
+			logger.warning(f"Could not write feature file {path}: {e}")
+
+	def series(self, name: str) -> pd.Series:
+		return pd.Series(self.get(name), index=self.index, name=name, copy=False)
+
+	def frame(self, names: Iterable[str]) -> pd.DataFrame:
+		"""DataFrame of the requested features (one column per array, no copies)."""
+		names = list(names)
+		return pd.DataFrame({name: self.get(name) for name in names}, index=self.index, columns=names, copy=False)
+
+	def __getitem__(self, name: str) -> pd.Series:
+		return self.series(name)
+
+
+class FeatureStore:
+	"""Feature columns keyed by (symbol, timeframe, dataset hash), shared by every consumer.
+
+	Files live under ``root/<symbol>_<timeframe>/<hash>/<feature>.npy``; with
+	``root=None`` features are only kept in memory. The newest ``keep_versions``
+	hashes per symbol/timeframe are kept on disk, older ones are removed.
+	"""
+
+	def __init__(self, root: Optional[str], max_datasets: int = 256, keep_versions: int = 2):
+		self.root = root
+		self.max_datasets = int(max_datasets)
+		self.keep_versions = int(keep_versions)
+		self._datasets: "OrderedDict[Tuple[str, str, str], FeatureSet]" = OrderedDict()
+		self._lock = threading.Lock()
+		self._stats_lock = threading.Lock()
+		self.stats = {"datasets": 0, "hits": 0, "loaded": 0, "computed": 0, "written": 0}
+
+	def _count(self, name: str) -> None:
+		with self._stats_lock:
+			self.stats[name] += 1
+
+	def dataset(self, symbol: str, timeframe: str, df: pd.DataFrame) -> FeatureSet:
+		"""FeatureSet for ``df`` (identical data -> the same set, within and across processes)."""
+		digest = dataset_hash(df)
+		key = (symbol, timeframe, digest)
+		with self._lock:
+			features = self._datasets.get(key)
+			if features is not None:
+				self._datasets.move_to_end(key)
+				return features
+			directory = None
+			if self.root:
+				directory = os.path.join(self.root, f"{symbol}_{timeframe}", digest)
+				self._prune(os.path.dirname(directory), digest)
+			features = FeatureSet(self, symbol, timeframe, df, digest, directory)
+			self._datasets[key] = features
+			while len(self._datasets) > self.max_datasets:
+				self._datasets.popitem(last=False)
+		self._count("datasets")
+		return features
+
+	def _prune(self, parent: str, current: str) -> None:
+		try:
+			versions = [os.path.join(parent, d) for d in os.listdir(parent) if d != current]
+		except FileNotFoundError:
+			return
+		versions.sort(key=os.path.getmtime, reverse=True)
+		for stale in versions[max(0, self.keep_versions - 1):]:
+			shutil.rmtree(stale, ignore_errors=True)
+
+	def get_stats(self) -> Dict:
+		with self._stats_lock:
+			return dict(self.stats, cached_datasets=len(self._datasets), root=self.root)
+
+
+_stores: Dict[Optional[str], FeatureStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_feature_store(data_dir: Optional[str] = "data/processed") -> FeatureStore:
+	"""Process-wide store whose files sit next to the processed parquet in ``data_dir``."""
+	root = os.path.join(data_dir, "features") if data_dir else None
+	with _stores_lock:
+		if root not in _stores:
+			_stores[root] = FeatureStore(root)
+		return _stores[root]
@@ -0,0 +1,286 @@
+import threading
+from collections import deque
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+
+NAN = float("nan")
+
+# Bollinger Bands for every indicator path (scalar TA-Lib, streaming, batch). Always passed to
+# talib.BBANDS explicitly: its default period is 5 in the 0.4 C library, 20 in recent wrappers
+BB_PERIOD = 20
+BB_DEV = 2.0
+
+
+def _is_zero(value: float) -> bool:
+	# TA-Lib's TA_IS_ZERO
+	return -1e-8 < value < 1e-8
+
+
+class _EMA:
+	"""TA-Lib EMA: seeded with the SMA of the first ``period`` values, then k = 2 / (period + 1)."""
+
+	__slots__ = ("period", "k", "count", "seed", "value")
+
+	def __init__(self, period: int):
+		self.period = period
+		self.k = 2.0 / (period + 1)
+		self.count = 0
+		self.seed = 0.0
+		self.value = NAN
+
+	def step(self, x: float) -> Tuple[int, float, float]:
+		"""State after ``x`` as (count, seed, value), without applying it."""
+		count = min(self.count + 1, self.period + 1)
+		if count < self.period:
+			return count, self.seed + x, NAN
+		if count == self.period:
+			return count, 0.0, (self.seed + x) / self.period
+		return count, 0.0, (x - self.value) * self.k + self.value
+
+	def apply(self, state: Tuple[int, float, float]) -> None:
+		self.count, self.seed, self.value = state
+
+
+class _RSI:
+	"""TA-Lib RSI: Wilder averages seeded with the mean gain / loss of the first ``period`` changes."""
+
+	__slots__ = ("period", "count", "prev", "gain", "loss")
+
+	def __init__(self, period: int = 14):
+		self.period = period
+		self.count = 0
+		self.prev = NAN
+		self.gain = 0.0
+		self.loss = 0.0
+
+	def step(self, x: float) -> Tuple[int, float, float, float, float]:
+		"""(count, prev, gain, loss, rsi) after ``x``."""
+		if self.count == 0:
+			return 1, x, 0.0, 0.0, NAN
+		change = x - self.prev
+		gain = change if change >= 0 else 0.0
+		loss = -change if change < 0 else 0.0
+		count = min(self.count + 1, self.period + 2)
+		if count <= self.period:
+			return count, x, self.gain + gain, self.loss + loss, NAN
+		if count == self.period + 1:
+			avg_gain = (self.gain + gain) / self.period
+			avg_loss = (self.loss + loss) / self.period
+		else:
+			avg_gain = (self.gain * (self.period - 1) + gain) / self.period
+			avg_loss = (self.loss * (self.period - 1) + loss) / self.period
+		total = avg_gain + avg_loss
+		rsi = 100.0 * (avg_gain / total) if not _is_zero(total) else 0.0
+		return count, x, avg_gain, avg_loss, rsi
+
+	def apply(self, state: Tuple[int, float, float, float, float]) -> None:
+		self.count, self.prev, self.gain, self.loss, _ = state
+
+
+class _ATR:
+	"""TA-Lib ATR: SMA of the first ``period`` true ranges, then Wilder smoothing."""
+
+	__slots__ = ("period", "count", "prev_close", "value")
+
+	def __init__(self, period: int = 14):
+		self.period = period
+		self.count = 0
+		self.prev_close = NAN
+		self.value = 0.0
+
+	def step(self, high: float, low: float, close: float) -> Tuple[int, float, float, float]:
+		"""(count, prev_close, sum_or_atr, atr) after one candle."""
+		if self.count == 0:
+			return 1, close, 0.0, NAN
+		true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+		count = min(self.count + 1, self.period + 2)
+		if count <= self.period:
+			return count, close, self.value + true_range, NAN
+		if count == self.period + 1:
+			atr = (self.value + true_range) / self.period
+		else:
+			atr = (self.value * (self.period - 1) + true_range) / self.period
+		return count, close, atr, atr
+
+	def apply(self, state: Tuple[int, float, float, float]) -> None:
+		self.count, self.prev_close, self.value, _ = state
+
+
+class _MACD:
+	"""TA-Lib MACD: the fast EMA starts ``slow - fast`` values late so both are seeded on the same candle."""
+
+	__slots__ = ("count", "skip", "fast", "slow", "signal")
+
+	def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+		self.count = 0
+		self.skip = slow - fast
+		self.fast = _EMA(fast)
+		self.slow = _EMA(slow)
+		self.signal = _EMA(signal)
+
+	def step(self, x: float):
+		"""(count, fast, slow, signal, (macd, signal, hist)) after ``x``."""
+		count = min(self.count + 1, self.skip + 1)
+		fast = self.fast.step(x) if count > self.skip else None
+		slow = self.slow.step(x)
+		macd_line = signal = None
+		if fast is not None and not np.isnan(slow[2]):
+			macd_line = fast[2] - slow[2]
+			signal = self.signal.step(macd_line)
+		if signal is None or np.isnan(signal[2]):
+			return count, fast, slow, signal, (NAN, NAN, NAN)
+		return count, fast, slow, signal, (macd_line, signal[2], macd_line - signal[2])
+
+	def apply(self, state) -> None:
+		self.count, fast, slow, signal, _ = state
+		if fast is not None:
+			self.fast.apply(fast)
+		self.slow.apply(slow)
+		if signal is not None:
+			self.signal.apply(signal)
+
+
+class IndicatorState:
+	"""Running indicator state for one candle series.
+
+	``update`` commits a closed candle in O(1); ``peek`` returns the indicator
+	dict as if a (still forming) candle were appended, without committing it.
+	Values equal TA-Lib's over the full committed history plus the peeked
+	candle (RSI 14, EMA 9/21/50/200, MACD 12/26/9, BBANDS 20/2/2, ATR 14).
+	"""
+
+	__slots__ = ("count", "last_open_time", "rsi", "emas", "macd", "atr", "closes", "volumes")
+
+	EMA_PERIODS = (9, 21, 50, 200)
+	BB_PERIOD = BB_PERIOD
+	BB_DEV = BB_DEV
+	VOLUME_PERIOD = 20
+	MOMENTUM_LOOKBACK = 10
+
+	def __init__(self):
+		self.count = 0
+		self.last_open_time: Optional[float] = None
+		self.rsi = _RSI(14)
+		self.emas = {period: _EMA(period) for period in self.EMA_PERIODS}
+		self.macd = _MACD(12, 26, 9)
+		self.atr = _ATR(14)
+		# Short raw windows: BB and momentum closes, volume average
+		self.closes = deque(maxlen=max(self.BB_PERIOD, self.MOMENTUM_LOOKBACK))
+		self.volumes = deque(maxlen=self.VOLUME_PERIOD - 1)
+
+	def update(self, close: float, high: float, low: float, volume: float, open_time: Optional[float] = None) -> None:
+		self.rsi.apply(self.rsi.step(close))
+		for ema in self.emas.values():
+			ema.apply(ema.step(close))
+		self.macd.apply(self.macd.step(close))
+		self.atr.apply(self.atr.step(high, low, close))
+		self.closes.append(close)
+		self.volumes.append(volume)
+		self.count += 1
+		self.last_open_time = open_time
+
+	def peek(self, close: float, high: float, low: float, volume: float) -> Dict[str, float]:
+		"""Indicator dict (``calculate_indicators`` keys) with this candle appended."""
+		indicators = {"rsi": self.rsi.step(close)[4]}
+		for period, ema in self.emas.items():
+			indicators[f"ema_{period}"] = ema.step(close)[2]
+
+		macd_line, signal, hist = self.macd.step(close)[4]
+		indicators["macd"] = macd_line
+		indicators["macd_signal"] = signal
+		indicators["macd_hist"] = hist
+
+		window = list(self.closes)[-(self.BB_PERIOD - 1):] + [close]
+		if len(window) == self.BB_PERIOD:
+			middle = sum(window) / self.BB_PERIOD
+			variance = sum(c * c for c in window) / self.BB_PERIOD - middle * middle
+			deviation = variance ** 0.5 if variance >= 1e-8 else 0.0
+			indicators["bb_upper"] = middle + self.BB_DEV * deviation
+			indicators["bb_middle"] = middle
+			indicators["bb_lower"] = middle - self.BB_DEV * deviation
+		else:
+			indicators["bb_upper"] = indicators["bb_middle"] = indicators["bb_lower"] = NAN
+
+		atr = self.atr.step(high, low, close)[3]
+		indicators["atr"] = atr
+		indicators["atr_pct"] = (atr / close) * 100 if close > 0 else 2.0
+
+		volume_avg = (sum(self.volumes) + volume) / (len(self.volumes) + 1)
+		indicators["volume_avg"] = volume_avg
+		indicators["volume_current"] = volume
+		indicators["volume_ratio"] = (volume / volume_avg) if volume_avg > 0 else 1.0
+
+		closes = self.closes
+		indicators["momentum_3"] = (close - closes[-2]) / closes[-2] * 100 if len(closes) >= 3 and closes[-2] > 0 else 0.0
+		indicators["momentum_10"] = (close - closes[-9]) / closes[-9] * 100 if len(closes) >= 10 and closes[-9] > 0 else 0.0
+		return indicators
+
+
+class IndicatorEngine:
+	"""Incremental indicators per (symbol, interval) series.
+
+	``update`` takes the newest candle window (oldest first, last candle still
+	forming): candles closed since the previous call are committed, the last
+	one is only peeked. A series is rebuilt from the window when it is new or
+	its last committed candle is no longer in the window (gap / resync).
+	"""
+
+	def __init__(self):
+		self._states: Dict[Hashable, Dict] = {}
+		self._lock = threading.Lock()
+		self.stats = {"seeds": 0, "advanced": 0, "peeks": 0}
+		self._stats_lock = threading.Lock()
+
+	def _count(self, name: str, amount: int = 1) -> None:
+		with self._stats_lock:
+			self.stats[name] += amount
+
+	def _entry(self, key: Hashable) -> Dict:
+		with self._lock:
+			entry = self._states.get(key)
+			if entry is None:
+				entry = {"lock": threading.Lock(), "state": None}
+				self._states[key] = entry
+			return entry
+
+	def update(self, key: Hashable, open_times: np.ndarray, closes: np.ndarray, highs: np.ndarray,
+			   lows: np.ndarray, volumes: np.ndarray) -> Optional[Dict[str, float]]:
+		"""Indicator dict for the window's last candle, or None for an empty window."""
+		size = len(closes)
+		if not size:
+			return None
+		entry = self._entry(key)
+		with entry["lock"]:
+			state = entry["state"]
+			start = 0
+			if state is not None and state.last_open_time is not None:
+				position = int(np.searchsorted(open_times, state.last_open_time))
+				if position < size - 1 and open_times[position] == state.last_open_time:
+					start = position + 1
+				else:
+					state = None
+			if state is None:
+				state = IndicatorState()
+				entry["state"] = state
+				self._count("seeds")
+			else:
+				self._count("advanced", size - 1 - start)
+			for i in range(start, size - 1):
+				state.update(float(closes[i]), float(highs[i]), float(lows[i]), float(volumes[i]), float(open_times[i]))
+			self._count("peeks")
+			return state.peek(float(closes[-1]), float(highs[-1]), float(lows[-1]), float(volumes[-1]))
+
+	def invalidate(self, key: Optional[Hashable] = None) -> None:
+		with self._lock:
+			if key is None:
+				self._states.clear()
+			else:
+				self._states.pop(key, None)
+
+	def get_stats(self) -> Dict:
+		with self._lock:
+			series = len(self._states)
+		with self._stats_lock:
+			return dict(self.stats, series=series)
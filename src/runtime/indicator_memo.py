@@ -0,0 +1,111 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+
+class IndicatorMemo:
+	"""Bounded LRU memo for per-series computations keyed by the last closed candle.
+
+	Entries are keyed by ``(series, closed_open_time, name, params)`` where
+	``series`` is e.g. ``(symbol, interval)``. Results that only depend on closed
+	candles stay valid until the next candle closes; anything that also reads
+	the forming candle must put its inputs in ``params``. When a newer closed
+	candle shows up for a series, that series' older entries are dropped.
+	"""
+
+	def __init__(self, max_entries: int = 4096):
+		self.max_entries = int(max_entries)
+		self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+		self._series_keys: Dict[Hashable, Set[Tuple]] = {}
+		self._closed: Dict[Hashable, float] = {}  # Newest closed open time seen per series
+		self._lock = threading.Lock()
+		self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "invalidations": 0}
+		self._by_name: Dict[str, Dict[str, int]] = {}
+
+	def _count(self, name: str, outcome: str) -> None:
+		self.stats[outcome] += 1
+		counts = self._by_name.setdefault(name, {"hits": 0, "misses": 0})
+		counts[outcome] += 1
+
+	def _drop(self, key: Tuple) -> None:
+		self._entries.pop(key, None)
+		keys = self._series_keys.get(key[0])
+		if keys is not None:
+			keys.discard(key)
+			if not keys:
+				del self._series_keys[key[0]]
+
+	def _advance(self, series: Hashable, closed_time: float) -> bool:
+		"""Track the newest closed candle of ``series``; False if ``closed_time`` is already outdated."""
+		latest = self._closed.get(series)
+		if latest is None or closed_time > latest:
+			self._closed[series] = closed_time
+			# A new candle closed: everything computed for the previous one is stale
+			for key in [k for k in self._series_keys.get(series, ()) if k[1] < closed_time]:
+				self._drop(key)
+				self.stats["invalidations"] += 1
+			return True
+		return closed_time == latest
+
+	def get(self, series: Hashable, closed_time: Optional[float], name: str, params: Hashable = ()) -> Optional[Any]:
+		if closed_time is None:
+			return None
+		key = (series, closed_time, name, params)
+		with self._lock:
+			self._advance(series, closed_time)
+			value = self._entries.get(key)
+			if value is None:
+				self._count(name, "misses")
+				return None
+			self._entries.move_to_end(key)
+			self._count(name, "hits")
+			return value
+
+	def put(self, series: Hashable, closed_time: Optional[float], name: str, params: Hashable, value: Any) -> None:
+		if closed_time is None or value is None:
+			return
+		key = (series, closed_time, name, params)
+		with self._lock:
+			if not self._advance(series, closed_time):
+				return  # A newer candle already closed for this series: never cache the old one
+			self._entries[key] = value
+			self._entries.move_to_end(key)
+			self._series_keys.setdefault(series, set()).add(key)
+			self.stats["stores"] += 1
+			while len(self._entries) > self.max_entries:
+				oldest = next(iter(self._entries))
+				self._drop(oldest)
+				self.stats["evictions"] += 1
+
+	def get_or_compute(self, series: Hashable, closed_time: Optional[float], name: str, params: Hashable,
+					   compute: Callable[[], Any]) -> Any:
+		"""Cached value, or ``compute()`` stored under the key (None results are not cached)."""
+		value = self.get(series, closed_time, name, params)
+		if value is None:
+			value = compute()
+			self.put(series, closed_time, name, params, value)
+		return value
+
+	def invalidate(self, symbol: Optional[str] = None) -> None:
+		"""Drop every entry (or those of series whose first element is ``symbol``)."""
+		with self._lock:
+			for series in list(self._series_keys):
+				if symbol is None or (isinstance(series, tuple) and series[0] == symbol) or series == symbol:
+					for key in list(self._series_keys.get(series, ())):
+						self._drop(key)
+						self.stats["invalidations"] += 1
+					self._closed.pop(series, None)
+
+	def get_stats(self) -> Dict:
+		with self._lock:
+			lookups = self.stats["hits"] + self.stats["misses"]
+			return dict(
+				self.stats,
+				entries=len(self._entries),
+				max_entries=self.max_entries,
+				hit_rate=round(self.stats["hits"] / lookups * 100, 1) if lookups else 0.0,
+				by_name={
+					name: dict(counts, hit_rate=round(counts["hits"] / max(1, counts["hits"] + counts["misses"]) * 100, 1))
+					for name, counts in self._by_name.items()
+				},
+			)
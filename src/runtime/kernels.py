@@ -0,0 +1,267 @@
+"""Numeric kernels for the hot loops of the research and backtest paths.
+
+Every kernel exists twice: a plain loop (compiled with numba when it is
+installed) and a numpy formulation. The backend is picked at import time;
+both are kept importable so tests can check they agree.
+"""
+import math
+from typing import Dict, Tuple
+
+import numpy as np
+
+try:
+	import numba
+	JIT_AVAILABLE = True
+except ImportError:  # Optional dependency: the numpy kernels are used instead
+	numba = None
+	JIT_AVAILABLE = False
+
+
+def _jit(func):
+	if numba is None:
+		return func
+	# error_model="numpy": x / 0.0 gives inf/nan like the numpy kernels instead of raising
+	return numba.njit(cache=True, nogil=True, error_model="numpy")(func)
+
+
+# ---------------------------------------------------------------- rolling extremes
+
+def _rolling(values: np.ndarray, size: int, ufunc: np.ufunc, pad: float) -> np.ndarray:
+	"""``ufunc.reduce(values[k:k + size])`` for every k, in O(n) whatever ``size`` is.
+
+	Van Herk / Gil-Werman: per block of ``size`` values take running prefix and
+	suffix extremes; any window spans at most two blocks, so it is the extreme
+	of one suffix and one prefix value.
+	"""
+	count = len(values) - size + 1
+	if size < 1 or count < 1:
+		return np.empty(0, dtype=np.float64)
+	blocks = -(-len(values) // size)
+	padded = np.full(blocks * size, pad, dtype=np.float64)
+	padded[:len(values)] = values
+	padded = padded.reshape(blocks, size)
+	prefix = ufunc.accumulate(padded, axis=1).ravel()
+	suffix = ufunc.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()
+	return ufunc(suffix[:count], prefix[size - 1:size - 1 + count])
+
+
+def rolling_max(values: np.ndarray, size: int) -> np.ndarray:
+	return _rolling(values, size, np.maximum, -np.inf)
+
+
+def rolling_min(values: np.ndarray, size: int) -> np.ndarray:
+	return _rolling(values, size, np.minimum, np.inf)
+
+
+# ---------------------------------------------------------------- loop kernels
+
+@_jit
+def _pivot_flags_loop(highs, lows, window):
+	count = len(highs)
+	peaks = np.zeros(count, dtype=np.bool_)
+	troughs = np.zeros(count, dtype=np.bool_)
+	for i in range(window, count - window):
+		top = highs[i - window]
+		bottom = lows[i - window]
+		for j in range(i - window + 1, i + window):
+			# NaN wins, as with np.maximum / np.minimum
+			if highs[j] > top or highs[j] != highs[j]:
+				top = highs[j]
+			if lows[j] < bottom or lows[j] != lows[j]:
+				bottom = lows[j]
+		peaks[i] = highs[i] == top
+		troughs[i] = lows[i] == bottom
+	return peaks, troughs
+
+
+@_jit
+def _gap_indices_loop(times, max_gap):
+	out = np.empty(max(0, len(times) - 1), dtype=np.int64)
+	found = 0
+	for i in range(1, len(times)):
+		if times[i] - times[i - 1] > max_gap:
+			out[found] = i
+			found += 1
+	return out[:found]
+
+
+@_jit
+def _run_lengths_loop(values):
+	out = np.empty(len(values), dtype=np.int64)
+	runs = 0
+	for i in range(len(values)):
+		# NaN never equals the previous value: each one is a run of its own
+		if i > 0 and values[i] == values[i - 1]:
+			out[runs - 1] += 1
+		else:
+			out[runs] = 1
+			runs += 1
+	return out[:runs]
+
+
+@_jit
+def _signal_trades_loop(closes, signals):
+	count = len(closes)
+	entries = np.empty(count, dtype=np.int64)
+	exits = np.empty(count, dtype=np.int64)
+	sides = np.empty(count, dtype=np.float64)
+	pnls = np.empty(count, dtype=np.float64)
+	opened = 0
+	closed = 0
+	position = 0.0
+	entry_price = 0.0
+	for i in range(1, count):
+		price = closes[i]
+		signal = signals[i]
+		if position != 0 and signal != position:
+			exits[closed] = i
+			sides[closed] = position
+			if position > 0:
+				pnls[closed] = (price - entry_price) / entry_price
+			else:
+				pnls[closed] = (entry_price - price) / entry_price
+			closed += 1
+			position = 0.0
+		if signal != 0 and position == 0:
+			position = signal
+			entry_price = price
+			entries[opened] = i
+			opened += 1
+	return entries[:opened], exits[:closed], sides[:closed], pnls[:closed]
+
+
+@_jit
+def _gbm_path_loop(start, uniforms, drift, vol, floor):
+	closes = np.empty(len(uniforms), dtype=np.float64)
+	price = start
+	for i in range(len(uniforms)):
+		z = math.sqrt(-2.0 * math.log(uniforms[i, 0])) * math.cos(2.0 * math.pi * uniforms[i, 1])
+		price = max(floor, price * math.exp(drift + vol * z))
+		closes[i] = price
+	return closes
+
+
+# ---------------------------------------------------------------- numpy kernels
+
+def _pivot_flags_numpy(highs, lows, window):
+	count = len(highs)
+	peaks = np.zeros(count, dtype=bool)
+	troughs = np.zeros(count, dtype=bool)
+	inner = count - 2 * window
+	if inner >= 1:
+		centre = slice(window, count - window)
+		peaks[centre] = highs[centre] == rolling_max(highs, 2 * window)[:inner]
+		troughs[centre] = lows[centre] == rolling_min(lows, 2 * window)[:inner]
+	return peaks, troughs
+
+
+def _gap_indices_numpy(times, max_gap):
+	return np.flatnonzero(np.diff(times) > max_gap).astype(np.int64) + 1
+
+
+def _run_lengths_numpy(values):
+	if not len(values):
+		return np.empty(0, dtype=np.int64)
+	starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+	return np.diff(np.append(starts, len(values))).astype(np.int64)
+
+
+def _signal_trades_numpy(closes, signals):
+	# After bar i (i >= 1) the position always equals signals[i]: a change closes
+	# the open trade and a non-zero signal opens the next one on the same bar.
+	held = np.concatenate(([0.0], signals[1:-1]))
+	current = signals[1:]
+	entries = np.flatnonzero((current != 0) & (current != held)) + 1
+	exits = np.flatnonzero((held != 0) & (current != held)) + 1
+	sides = signals[exits - 1]  # What was held going into the exit bar
+	entry_prices = closes[entries[:len(exits)]]
+	exit_prices = closes[exits]
+	with np.errstate(divide="ignore", invalid="ignore"):
+		pnls = np.where(sides > 0, (exit_prices - entry_prices) / entry_prices,
+						(entry_prices - exit_prices) / entry_prices)
+	return entries.astype(np.int64), exits.astype(np.int64), sides.astype(np.float64), pnls
+
+
+def _gbm_path_numpy(start, uniforms, drift, vol, floor):
+	if not len(uniforms):
+		return np.empty(0, dtype=np.float64)
+	z = np.sqrt(-2.0 * np.log(uniforms[:, 0])) * np.cos(2.0 * np.pi * uniforms[:, 1])
+	steps = np.exp(drift + vol * z)
+	closes = np.multiply.accumulate(np.concatenate(([start], steps)))[1:]
+	if closes.min() < floor:
+		# The floor resets the compounding: only a sequential pass reproduces it
+		price = start
+		for i, step in enumerate(steps.tolist()):
+			price = max(floor, price * step)
+			closes[i] = price
+	return closes
+
+
+LOOP_KERNELS: Dict[str, object] = {
+	"pivot_flags": _pivot_flags_loop,
+	"gap_indices": _gap_indices_loop,
+	"run_lengths": _run_lengths_loop,
+	"signal_trades": _signal_trades_loop,
+	"gbm_path": _gbm_path_loop,
+}
+
+NUMPY_KERNELS: Dict[str, object] = {
+	"pivot_flags": _pivot_flags_numpy,
+	"gap_indices": _gap_indices_numpy,
+	"run_lengths": _run_lengths_numpy,
+	"signal_trades": _signal_trades_numpy,
+	"gbm_path": _gbm_path_numpy,
+}
+
+BACKEND = "numba" if JIT_AVAILABLE else "numpy"
+_KERNELS = LOOP_KERNELS if JIT_AVAILABLE else NUMPY_KERNELS
+
+
+# ---------------------------------------------------------------- public API
+
+def pivot_flags(highs: np.ndarray, lows: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+	"""(peaks, troughs): ``highs[i] == max(highs[i - window:i + window])`` (lows/min likewise)
+	for ``window <= i < n - window``; other candles are False."""
+	highs = np.ascontiguousarray(highs, dtype=np.float64)
+	lows = np.ascontiguousarray(lows, dtype=np.float64)
+	window = int(window)
+	if window < 1:
+		return np.zeros(len(highs), dtype=bool), np.zeros(len(lows), dtype=bool)
+	return _KERNELS["pivot_flags"](highs, lows, window)
+
+
+def gap_indices(times: np.ndarray, max_gap: int) -> np.ndarray:
+	"""Indices i with ``times[i] - times[i - 1] > max_gap`` (integer timestamps, e.g. ns)."""
+	return _KERNELS["gap_indices"](np.ascontiguousarray(times, dtype=np.int64), np.int64(max_gap))
+
+
+def run_lengths(values: np.ndarray) -> np.ndarray:
+	"""Lengths of the runs of consecutive equal values, in order (NaNs are runs of one)."""
+	return _KERNELS["run_lengths"](np.ascontiguousarray(values, dtype=np.float64))
+
+
+def signal_trades(closes: np.ndarray, signals: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+	"""Replay a bar-by-bar signal series (bar 0 is skipped) at the close prices.
+
+	A signal different from the held position closes it; a non-zero signal
+	while flat opens one. Returns (entry bars, exit bars, sides, pnls) where
+	the k-th exit closes the k-th entry and pnl is relative to the entry price.
+	"""
+	closes = np.ascontiguousarray(closes, dtype=np.float64)
+	signals = np.ascontiguousarray(signals, dtype=np.float64)
+	if len(closes) < 2:
+		empty = np.empty(0, dtype=np.int64)
+		return empty, empty, np.empty(0), np.empty(0)
+	return _KERNELS["signal_trades"](closes, signals)
+
+
+def gbm_path(start: float, uniforms: np.ndarray, mu: float, sigma: float, dt: float, floor: float = 0.01) -> np.ndarray:
+	"""Closes of a GBM walk from ``start``, one step per row of (u1, u2) uniforms in (0, 1].
+
+	Box-Muller turns each row into Z and the step is
+	``S * exp((mu - 0.5*sigma^2)*dt + sigma*sqrt(dt)*Z)``, floored at ``floor``.
+	"""
+	uniforms = np.ascontiguousarray(uniforms, dtype=np.float64).reshape(-1, 2)
+	drift = (mu - 0.5 * sigma * sigma) * dt
+	vol = sigma * dt ** 0.5
+	return _KERNELS["gbm_path"](float(start), uniforms, float(drift), float(vol), float(floor))
@@ -0,0 +1,314 @@
+import time
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from src.runtime.kline_codec import OPEN_TIME, OPEN, HIGH, LOW, CLOSE, VOLUME, rows_to_array  # noqa: F401 (re-exported)
+
+
+# Binance kline interval lengths in milliseconds
+INTERVAL_MS: Dict[str, int] = {
+	"1m": 60_000,
+	"3m": 3 * 60_000,
+	"5m": 5 * 60_000,
+	"15m": 15 * 60_000,
+	"30m": 30 * 60_000,
+	"1h": 60 * 60_000,
+	"2h": 2 * 60 * 60_000,
+	"4h": 4 * 60 * 60_000,
+	"6h": 6 * 60 * 60_000,
+	"8h": 8 * 60 * 60_000,
+	"12h": 12 * 60 * 60_000,
+	"1d": 24 * 60 * 60_000,
+}
+
+MAX_KLINES_PER_REQUEST = 1000
+
+
+def resample(rows: np.ndarray, interval_ms: int) -> np.ndarray:
+	"""Aggregate ordered (N, 6) rows into ``interval_ms`` candles.
+
+	Buckets are aligned to multiples of ``interval_ms`` since the epoch, which is
+	how the exchange aligns every interval up to 1d.
+	"""
+	if not len(rows):
+		return np.empty((0, 6), dtype=np.float64)
+	buckets = rows[:, OPEN_TIME] // interval_ms * interval_ms
+	starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+	ends = np.r_[starts[1:], len(rows)] - 1
+	out = np.empty((len(starts), 6), dtype=np.float64)
+	out[:, OPEN_TIME] = buckets[starts]
+	out[:, OPEN] = rows[starts, OPEN]
+	out[:, HIGH] = np.maximum.reduceat(rows[:, HIGH], starts)
+	out[:, LOW] = np.minimum.reduceat(rows[:, LOW], starts)
+	out[:, CLOSE] = rows[ends, CLOSE]
+	out[:, VOLUME] = np.add.reduceat(rows[:, VOLUME], starts)
+	return out
+
+
+class KlineRingBuffer:
+	"""Fixed-capacity OHLCV history for one (symbol, interval).
+
+	Columns live in one (6, 2 * capacity) float64 block so every column of the
+	live window is a contiguous slice. New candles are appended at the end; when
+	the block fills up, the newest ``capacity`` rows are moved to the front
+	(amortised O(1) per candle). The last candle is usually still forming and is
+	updated in place when the exchange sends it again.
+	"""
+
+	def __init__(self, capacity: int):
+		self.capacity = int(capacity)
+		self._block = np.zeros((6, 2 * self.capacity), dtype=np.float64)
+		self._start = 0
+		self._end = 0
+
+	def __len__(self) -> int:
+		return self._end - self._start
+
+	@property
+	def last_open_time(self) -> Optional[int]:
+		return int(self._block[OPEN_TIME, self._end - 1]) if len(self) else None
+
+	def clear(self) -> None:
+		self._start = 0
+		self._end = 0
+
+	def merge(self, rows: np.ndarray) -> int:
+		"""Merge (N, 6) rows ordered by open time. Returns number of NEW candles.
+
+		A row with the same open time as the last stored candle replaces it (the
+		forming candle); older rows are ignored. New rows are copied in one block.
+		"""
+		rows = np.asarray(rows, dtype=np.float64)
+		if not len(rows):
+			return 0
+		last = self.last_open_time
+		if last is not None:
+			times = rows[:, OPEN_TIME]
+			same = np.flatnonzero(times == last)
+			if len(same):
+				self._block[:, self._end - 1] = rows[same[-1]]
+			rows = rows[times > last]
+		added = len(rows)
+		if not added:
+			return 0
+		if added >= self.capacity:
+			self._block[:, :self.capacity] = rows[-self.capacity:].T
+			self._start, self._end = 0, self.capacity
+			return added
+		if self._end + added > self._block.shape[1]:
+			# Move the newest rows that will survive to the front (amortised O(1) per candle)
+			keep = min(len(self), self.capacity - added)
+			self._block[:, :keep] = self._block[:, self._end - keep:self._end]
+			self._start, self._end = 0, keep
+		self._block[:, self._end:self._end + added] = rows.T
+		self._end += added
+		self._start = max(self._start, self._end - self.capacity)
+		return added
+
+	def arrays(self, limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+		"""Copies of the newest ``limit`` candles as (closes, highs, lows, volumes, opens)."""
+		start = self._start if limit is None else max(self._start, self._end - int(limit))
+		window = self._block[:, start:self._end]
+		return (window[CLOSE].copy(), window[HIGH].copy(), window[LOW].copy(),
+				window[VOLUME].copy(), window[OPEN].copy())
+
+	def open_times(self, limit: Optional[int] = None) -> np.ndarray:
+		start = self._start if limit is None else max(self._start, self._end - int(limit))
+		return self._block[OPEN_TIME, start:self._end].copy()
+
+	def rows(self, limit: Optional[int] = None) -> np.ndarray:
+		"""Copy of the newest ``limit`` candles as (N, 6) rows (columns stay contiguous, as in ``rows_to_array``)."""
+		start = self._start if limit is None else max(self._start, self._end - int(limit))
+		return self._block[:, start:self._end].copy().T
+
+
+class KlineBufferStore:
+	"""Per-(symbol, interval) ring buffers, seeded once and then topped up.
+
+	``fetcher(symbol, interval, limit, start_time)`` must return an (N, 6) array
+	(see ``rows_to_array``) or None. Steady-state top-ups request only candles
+	from the last stored open time onward, so each refresh transfers one or two
+	rows instead of the whole history.
+
+	Buffers can also be fed by a stream via ``push``; while pushes keep arriving
+	(within ``push_max_age`` seconds) ``get`` serves them without any REST call.
+
+	Intervals listed in ``derived_intervals`` (e.g. ``{"1h": "5m"}``) are seeded
+	once from REST and afterwards rebuilt locally from their base interval's
+	buffer, so only the base interval is ever topped up over the network.
+	"""
+
+	def __init__(self, fetcher: Callable[[str, str, int, Optional[int]], Optional[np.ndarray]],
+				 min_capacity: int = 200, refresh_interval: float = 1.0, push_max_age: float = 10.0,
+				 derived_intervals: Optional[Dict[str, str]] = None):
+		self._fetcher = fetcher
+		self.min_capacity = int(min_capacity)
+		self.refresh_interval = float(refresh_interval)
+		self.push_max_age = float(push_max_age)
+		self.derived_intervals: Dict[str, str] = dict(derived_intervals or {})
+		for interval, base in self.derived_intervals.items():
+			if INTERVAL_MS[interval] % INTERVAL_MS[base]:
+				raise ValueError(f"{interval} candles cannot be built from {base} candles")
+		self._entries: Dict[Tuple[str, str], Dict] = {}
+		self._entries_lock = threading.Lock()
+		self.stats = {"seeds": 0, "topups": 0, "cached": 0, "rows_fetched": 0, "failures": 0,
+					  "pushes": 0, "gaps": 0, "derived": 0}
+		self._stats_lock = threading.Lock()
+
+	def _entry(self, symbol: str, interval: str) -> Dict:
+		key = (symbol, interval)
+		with self._entries_lock:
+			entry = self._entries.get(key)
+			if entry is None:
+				entry = {"lock": threading.Lock(), "buffer": None, "seeded_limit": 0, "refreshed_at": 0.0,
+						 "pushed_at": 0.0, "resync": False}
+				self._entries[key] = entry
+			return entry
+
+	def buffer(self, symbol: str, interval: str) -> Optional[KlineRingBuffer]:
+		with self._entries_lock:
+			entry = self._entries.get((symbol, interval))
+		return entry["buffer"] if entry else None
+
+	def _count(self, name: str, amount: int = 1) -> None:
+		with self._stats_lock:
+			self.stats[name] += amount
+
+	def _seed(self, entry: Dict, symbol: str, interval: str, limit: int) -> bool:
+		capacity = max(limit, self.min_capacity, entry["buffer"].capacity if entry["buffer"] else 0)
+		rows = self._fetcher(symbol, interval, min(capacity, MAX_KLINES_PER_REQUEST), None)
+		if rows is None:
+			self._count("failures")
+			return False
+		buffer = KlineRingBuffer(capacity)
+		buffer.merge(rows)
+		entry["buffer"] = buffer
+		entry["seeded_limit"] = min(capacity, MAX_KLINES_PER_REQUEST)
+		self._count("seeds")
+		self._count("rows_fetched", len(rows))
+		return True
+
+	def _top_up(self, entry: Dict, symbol: str, interval: str) -> bool:
+		buffer: KlineRingBuffer = entry["buffer"]
+		interval_ms = INTERVAL_MS.get(interval)
+		last_open = buffer.last_open_time
+		if interval_ms is None or last_open is None:
+			return self._seed(entry, symbol, interval, entry["seeded_limit"])
+		missing = (int(time.time() * 1000) - last_open) // interval_ms + 1
+		if missing > min(buffer.capacity, MAX_KLINES_PER_REQUEST):
+			# Too far behind (e.g. after an outage): cheaper to re-seed
+			return self._seed(entry, symbol, interval, entry["seeded_limit"])
+		rows = self._fetcher(symbol, interval, int(max(2, missing + 1)), last_open)
+		if rows is None:
+			self._count("failures")
+			return False
+		buffer.merge(rows)
+		self._count("topups")
+		self._count("rows_fetched", len(rows))
+		return True
+
+	def _derive(self, entry: Dict, symbol: str, interval: str) -> bool:
+		"""Rebuild the newest ``interval`` candles from the base interval's buffer."""
+		buffer: KlineRingBuffer = entry["buffer"]
+		last_open = buffer.last_open_time
+		base_interval = self.derived_intervals[interval]
+		base_entry = self._entry(symbol, base_interval)
+		with base_entry["lock"]:
+			if not self._refresh(base_entry, symbol, base_interval, self.min_capacity):
+				return False
+			base_rows = base_entry["buffer"].rows()
+		if last_open is None or not len(base_rows) or base_rows[0, OPEN_TIME] > last_open:
+			# Base history does not reach back to the forming candle's start
+			return self._top_up(entry, symbol, interval)
+		buffer.merge(resample(base_rows[base_rows[:, OPEN_TIME] >= last_open], INTERVAL_MS[interval]))
+		self._count("derived")
+		return True
+
+	def _refresh(self, entry: Dict, symbol: str, interval: str, limit: int) -> bool:
+		"""Bring one buffer up to date (caller holds ``entry["lock"]``)."""
+		now = time.time()
+		if entry["buffer"] is None or limit > entry["seeded_limit"]:
+			ok = self._seed(entry, symbol, interval, limit)
+		elif entry["resync"]:
+			ok = self._top_up(entry, symbol, interval)
+		elif now - entry["pushed_at"] < self.push_max_age or now - entry["refreshed_at"] < self.refresh_interval:
+			ok = True
+			self._count("cached")
+		elif interval in self.derived_intervals:
+			ok = self._derive(entry, symbol, interval)
+		else:
+			ok = self._top_up(entry, symbol, interval)
+		if ok:
+			entry["refreshed_at"] = now
+			entry["resync"] = False
+		return ok
+
+	def get(self, symbol: str, interval: str, limit: int):
+		"""Newest ``limit`` candles as (closes, highs, lows, volumes, opens), or 5x None."""
+		entry = self._entry(symbol, interval)
+		with entry["lock"]:
+			if not self._refresh(entry, symbol, interval, limit):
+				# Never serve stale candles as fresh: callers treat None as a failed fetch
+				return None, None, None, None, None
+			return entry["buffer"].arrays(limit)
+
+	def get_rows(self, symbol: str, interval: str, limit: int) -> Optional[np.ndarray]:
+		"""Newest ``limit`` candles as (N, 6) rows including open times, or None."""
+		entry = self._entry(symbol, interval)
+		with entry["lock"]:
+			if not self._refresh(entry, symbol, interval, limit):
+				return None
+			return entry["buffer"].rows(limit)
+
+	def push(self, symbol: str, interval: str, row: np.ndarray) -> bool:
+		"""Apply one streamed candle (open_time, o, h, l, c, v). Returns False if not applied.
+
+		Candles for buffers that were never seeded are ignored (the first ``get``
+		seeds from REST). A candle that would leave a hole marks the buffer for a
+		REST resync instead of being appended.
+		"""
+		with self._entries_lock:
+			entry = self._entries.get((symbol, interval))
+		if entry is None:
+			return False
+		with entry["lock"]:
+			buffer: KlineRingBuffer = entry["buffer"]
+			if buffer is None:
+				return False
+			last_open = buffer.last_open_time
+			interval_ms = INTERVAL_MS.get(interval)
+			if last_open is not None and interval_ms and int(row[OPEN_TIME]) > last_open + interval_ms:
+				entry["resync"] = True
+				entry["pushed_at"] = 0.0
+				self._count("gaps")
+				return False
+			buffer.merge(np.asarray(row, dtype=np.float64).reshape(1, 6))
+			entry["pushed_at"] = time.time()
+			self._count("pushes")
+			return True
+
+	def mark_stale(self, symbols: Optional[Iterable[str]] = None) -> None:
+		"""Force a REST top-up on the next ``get`` (e.g. after a stream reconnect)."""
+		wanted = set(symbols) if symbols is not None else None
+		with self._entries_lock:
+			entries = [e for (s, _), e in self._entries.items() if wanted is None or s in wanted]
+		for entry in entries:
+			with entry["lock"]:
+				entry["resync"] = True
+				entry["pushed_at"] = 0.0
+
+	def invalidate(self, symbol: Optional[str] = None) -> None:
+		with self._entries_lock:
+			if symbol is None:
+				self._entries.clear()
+			else:
+				for key in [k for k in self._entries if k[0] == symbol]:
+					del self._entries[key]
+
+	def get_stats(self) -> Dict:
+		with self._entries_lock:
+			buffers = len(self._entries)
+		with self._stats_lock:
+			return dict(self.stats, buffers=buffers)
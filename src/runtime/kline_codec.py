@@ -0,0 +1,53 @@
+import json
+from typing import Any, Tuple, Union
+
+import numpy as np
+
+try:
+	import orjson
+except ImportError:  # Optional: stdlib json is used when orjson is not installed
+	orjson = None
+
+
+# Row layout used by every kline array in this package: (N, 6) float64
+OPEN_TIME, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+KLINE_FIELDS = 6
+
+
+def loads(payload: Union[bytes, str]) -> Any:
+	"""Decode JSON with orjson when available (several times faster on kline payloads)."""
+	if orjson is not None:
+		return orjson.loads(payload)
+	return json.loads(payload)
+
+
+def rows_to_array(klines: list) -> np.ndarray:
+	"""Raw /api/v3/klines rows -> (N, 6) float64 [open_time, open, high, low, close, volume].
+
+	Rows are transposed first so only the six needed fields are converted, in
+	one numpy call. The result is the transpose of a (6, N) block: every column
+	(``arr[:, CLOSE]`` ...) is a contiguous view.
+	Rows with fewer than six fields are dropped (zip would cut every row down
+	to the shortest one); callers compare lengths to count them. Raises
+	ValueError when no row is complete or on non-numeric values.
+	"""
+	if not len(klines):
+		return np.empty((0, KLINE_FIELDS), dtype=np.float64)
+	rows = [row for row in klines if isinstance(row, (list, tuple)) and len(row) >= KLINE_FIELDS]
+	if not rows:
+		raise ValueError(f"Malformed kline rows: none of {len(klines)} has {KLINE_FIELDS} fields")
+	fields = list(zip(*rows))[:KLINE_FIELDS]
+	return np.array(fields, dtype=np.float64).T
+
+
+def decode_klines(payload: Union[bytes, str]) -> np.ndarray:
+	"""Raw /api/v3/klines response body -> (N, 6) float64 array."""
+	rows = loads(payload)
+	if not isinstance(rows, list):
+		raise ValueError(f"Unexpected klines payload: {str(rows)[:200]}")
+	return rows_to_array(rows)
+
+
+def columns(array: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+	"""(closes, highs, lows, volumes, opens) views of an (N, 6) kline array (no copies)."""
+	return array[:, CLOSE], array[:, HIGH], array[:, LOW], array[:, VOLUME], array[:, OPEN]
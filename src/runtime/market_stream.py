@@ -0,0 +1,219 @@
+import time
+import json
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from websocket import WebSocketApp
+
+from src.runtime.kline_buffer import KlineBufferStore
+
+
+logger = logging.getLogger(__name__)
+
+# Binance allows up to 1024 streams per connection; stay well below it so URLs stay short
+MAX_STREAMS_PER_CONNECTION = 200
+
+
+class MarketStream:
+	"""Multiplexed market data over Binance combined streams.
+
+	Every symbol gets ``<symbol>@kline_<interval>`` for each interval plus
+	``<symbol>@miniTicker``, packed into as few ``/stream?streams=a/b/c``
+	connections as possible. Kline events are pushed into a ``KlineBufferStore``
+	(live candle buffers), mini tickers keep a last-price table. After a
+	reconnect every buffer served by that connection is marked for a REST
+	resync, and ``get_price`` returns None once a price is older than
+	``price_max_age`` so callers fall back to REST automatically.
+	Listeners added with ``add_listener`` get every price update
+	(``fn(symbol, price)``) on the connection's thread.
+	"""
+
+	def __init__(self, ws_url: str, symbols: Iterable[str], intervals: Iterable[str] = ("1m", "5m"),
+				 kline_store: Optional[KlineBufferStore] = None, max_streams_per_connection: int = MAX_STREAMS_PER_CONNECTION,
+				 price_max_age: float = 5.0, reconnect_backoff: float = 1.0, max_reconnect_backoff: float = 60.0,
+				 ping_interval: float = 20.0, ping_timeout: float = 10.0):
+		self.ws_url = ws_url.rstrip("/")
+		self.symbols: List[str] = list(dict.fromkeys(symbols))  # Keep order, drop duplicates
+		self.intervals: List[str] = list(intervals)
+		self.kline_store = kline_store
+		self.max_streams_per_connection = max(1, int(max_streams_per_connection))
+		self.price_max_age = float(price_max_age)
+		self.reconnect_backoff = float(reconnect_backoff)
+		self.max_reconnect_backoff = float(max_reconnect_backoff)
+		self.ping_interval = float(ping_interval)
+		self.ping_timeout = float(ping_timeout)
+		self._prices: Dict[str, tuple] = {}  # {symbol: (price, received_at)}
+		self._data_lock = threading.Lock()
+		self._stop = threading.Event()
+		self._threads: List[threading.Thread] = []
+		self._apps: Dict[int, WebSocketApp] = {}
+		self._connected: Dict[int, bool] = {}
+		self._last_message_at = 0.0
+		self._listeners: List[Callable[[str, float], None]] = []
+		self.stats = {"messages": 0, "klines": 0, "tickers": 0, "reconnects": 0, "errors": 0, "listener_errors": 0}
+		self._stats_lock = threading.Lock()
+
+	def _count(self, name: str) -> None:
+		with self._stats_lock:
+			self.stats[name] += 1
+
+	def add_listener(self, listener: Callable[[str, float], None]) -> None:
+		"""Call ``listener(symbol, price)`` on every streamed price (keep it fast: it runs on the socket thread)."""
+		self._listeners.append(listener)
+
+	def streams(self) -> List[str]:
+		names: List[str] = []
+		for symbol in self.symbols:
+			lower = symbol.lower()
+			names.extend(f"{lower}@kline_{interval}" for interval in self.intervals)
+			names.append(f"{lower}@miniTicker")
+		return names
+
+	def connection_streams(self) -> List[List[str]]:
+		"""Stream names grouped per connection (a symbol's streams never span two connections)."""
+		per_symbol = len(self.intervals) + 1
+		symbols_per_connection = max(1, self.max_streams_per_connection // per_symbol)
+		names = self.streams()
+		step = symbols_per_connection * per_symbol
+		return [names[i:i + step] for i in range(0, len(names), step)]
+
+	def url_for(self, streams: List[str]) -> str:
+		return f"{self.ws_url}/stream?streams={'/'.join(streams)}"
+
+	def start(self) -> None:
+		if self._threads:
+			return
+		self._stop.clear()
+		for index, streams in enumerate(self.connection_streams()):
+			thread = threading.Thread(target=self._run_connection, args=(index, streams), daemon=True,
+									  name=f"market-stream-{index}")
+			thread.start()
+			self._threads.append(thread)
+		logger.info(f"Market stream started: {len(self.streams())} streams over {len(self._threads)} connection(s)")
+
+	def stop(self) -> None:
+		self._stop.set()
+		for app in list(self._apps.values()):
+			try:
+				app.close()
+			except Exception as e:
+				logger.debug(f"Market stream close error: {e}")
+		for thread in self._threads:
+			thread.join(timeout=5)
+		self._threads = []
+
+	def _run_connection(self, index: int, streams: List[str]) -> None:
+		url = self.url_for(streams)
+		symbols = sorted({name.split("@", 1)[0].upper() for name in streams})
+		backoff = self.reconnect_backoff
+		connected_once = False
+
+		def on_open(_: WebSocketApp):
+			nonlocal backoff, connected_once
+			if connected_once:
+				# Candles may have closed while we were away: refresh them from REST
+				self._count("reconnects")
+				if self.kline_store is not None:
+					self.kline_store.mark_stale(symbols)
+			connected_once = True
+			backoff = self.reconnect_backoff
+			self._connected[index] = True
+
+		def on_message(_: WebSocketApp, message: str):
+			self.handle_message(message)
+
+		def on_error(_: WebSocketApp, error: Exception):
+			self._count("errors")
+			logger.warning(f"Market stream {index} error: {error}")
+
+		def on_close(_: WebSocketApp, *args):
+			self._connected[index] = False
+
+		while not self._stop.is_set():
+			try:
+				app = WebSocketApp(url, on_open=on_open, on_message=on_message, on_error=on_error, on_close=on_close)
+				self._apps[index] = app
+				if self.ping_interval > 0:
+					app.run_forever(ping_interval=self.ping_interval, ping_timeout=self.ping_timeout)
+				else:
+					app.run_forever()
+			except Exception as e:
+				self._count("errors")
+				logger.warning(f"Market stream {index} crashed: {e}")
+			self._connected[index] = False
+			if self._stop.is_set():
+				break
+			logger.warning(f"Market stream {index} disconnected, reconnecting in {backoff:.1f}s")
+			self._stop.wait(backoff)
+			backoff = min(backoff * 2, self.max_reconnect_backoff)
+
+	def handle_message(self, message: str) -> None:
+		"""Apply one combined-stream message ({"stream": ..., "data": {...}})."""
+		try:
+			payload = json.loads(message)
+			data = payload.get("data", payload)
+			event = data.get("e")
+			now = time.time()
+			if event == "kline":
+				k = data["k"]
+				symbol = data["s"]
+				row = np.array([k["t"], k["o"], k["h"], k["l"], k["c"], k["v"]], dtype=np.float64)
+				if self.kline_store is not None:
+					self.kline_store.push(symbol, k["i"], row)
+				self._set_price(symbol, float(k["c"]), now)
+				self._count("klines")
+			elif event == "24hrMiniTicker":
+				self._set_price(data["s"], float(data["c"]), now)
+				self._count("tickers")
+			self._count("messages")
+			self._last_message_at = now
+		except Exception as e:
+			self._count("errors")
+			logger.debug(f"Market stream message parse error: {e}")
+
+	def _set_price(self, symbol: str, price: float, received_at: float) -> None:
+		if price > 0:
+			with self._data_lock:
+				self._prices[symbol] = (price, received_at)
+			for listener in self._listeners:
+				try:
+					listener(symbol, price)
+				except Exception as e:
+					self._count("listener_errors")
+					logger.debug(f"Market stream listener error: {e}")
+
+	def get_price(self, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
+		"""Last streamed price, or None if missing / older than ``max_age`` seconds."""
+		with self._data_lock:
+			entry = self._prices.get(symbol)
+		if entry is None:
+			return None
+		price, received_at = entry
+		if time.time() - received_at > (self.price_max_age if max_age is None else max_age):
+			return None
+		return price
+
+	def is_connected(self) -> bool:
+		return bool(self._connected) and all(self._connected.values())
+
+	def is_healthy(self, max_age: Optional[float] = None) -> bool:
+		"""All connections up and data received within ``max_age`` seconds."""
+		age = time.time() - self._last_message_at if self._last_message_at else float("inf")
+		return self.is_connected() and age <= (self.price_max_age if max_age is None else max_age)
+
+	def get_stats(self) -> Dict:
+		with self._data_lock:
+			prices = len(self._prices)
+		with self._stats_lock:
+			stats = dict(self.stats)
+		return dict(
+			stats,
+			connections=len(self.connection_streams()),
+			connected=sum(1 for up in self._connected.values() if up),
+			streams=len(self.streams()),
+			prices=prices,
+			last_message_age=round(time.time() - self._last_message_at, 2) if self._last_message_at else None,
+			healthy=self.is_healthy(),
+		)
@@ -0,0 +1,298 @@
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ORDER_PATH = "/api/v3/order"
+
+OPEN, CLOSE = "OPEN", "CLOSE"
+
+# Final order states (anything the exchange reports that isn't FILLED/PARTIALLY_FILLED passes through as-is)
+FILLED, REJECTED, UNKNOWN = "FILLED", "REJECTED", "UNKNOWN"
+
+# Rejections worth resending unchanged (clock drift, rate limit); -1007 means the exchange
+# doesn't know whether the order went through, which is handled like a lost response
+RETRYABLE_CODES = frozenset((-1003, -1021))
+AMBIGUOUS_CODES = frozenset((-1001, -1006, -1007))
+ORDER_NOT_FOUND = -2013
+
+# Client order ids remembered as "already sent" (a resubmit of one is looked up before it is POSTed)
+SENT_IDS_KEPT = 10000
+
+ERROR_HINTS = {
+	-1013: "Quantity does not meet LOT_SIZE filter requirements",
+	-1111: "Price does not meet PRICE_FILTER requirements",
+	-1010: "Order value below MIN_NOTIONAL (usually $10-20)",
+	-2010: "INSUFFICIENT BALANCE! Check your account",
+	-1003: "RATE LIMIT HIT! Reduce trading frequency",
+	-1021: "TIMESTAMP ERROR! Check system time synchronization",
+}
+
+# (method, path, params) -> response; params are signed by the sender
+Sender = Callable[[str, str, Dict[str, Any]], Any]
+
+
+def client_order_id(position_key: str, intent: str, nonce: Any, prefix: str = "bhb") -> str:
+	"""Deterministic ``newClientOrderId``: the same (position, intent, nonce) always maps to the
+	same id, so a resend after a lost response can be matched against the exchange.
+	Fits Binance's ``^[a-zA-Z0-9-_]{1,36}$``."""
+	digest = hashlib.sha1(f"{position_key}|{intent}|{nonce}".encode("utf-8")).hexdigest()[:24]
+	return f"{prefix}-{intent[0].lower()}-{digest}"
+
+
+@dataclass(frozen=True, slots=True)
+class OrderRequest:
+	"""A MARKET order ready to send (quantity already LOT_SIZE formatted)."""
+
+	symbol: str
+	side: str  # 'BUY' / 'SELL'
+	quantity: float
+	client_order_id: str
+	position_key: str = ""
+	intent: str = OPEN
+	price: float = 0.0  # Reference price (notional check, logging)
+
+	def params(self) -> Dict[str, Any]:
+		return {
+			"symbol": self.symbol,
+			"side": self.side,
+			"type": "MARKET",
+			"quantity": self.quantity,
+			"newClientOrderId": self.client_order_id,
+			"newOrderRespType": "FULL",
+		}
+
+
+@dataclass(slots=True)
+class OrderResult:
+	"""Outcome of one OrderRequest after every retry."""
+
+	request: OrderRequest
+	status: str
+	executed_qty: float = 0.0
+	avg_price: float = 0.0
+	order_id: Optional[int] = None
+	attempts: int = 0
+	error_code: Optional[int] = None
+	error_msg: str = ""
+	elapsed: float = 0.0
+	order: Optional[Dict[str, Any]] = None
+
+	@property
+	def filled(self) -> bool:
+		return self.executed_qty > 0
+
+	@classmethod
+	def from_order(cls, request: OrderRequest, order: Dict[str, Any], **kwargs) -> "OrderResult":
+		"""Parse an order response (POST with fills, or GET order query without them)."""
+		executed_qty = float(order.get("executedQty", 0) or 0)
+		quote_qty = float(order.get("cummulativeQuoteQty", 0) or 0)
+		if executed_qty > 0 and quote_qty > 0:
+			avg_price = quote_qty / executed_qty
+		else:
+			fills = order.get("fills") or []
+			fill_qty = sum(float(fill["qty"]) for fill in fills)
+			avg_price = sum(float(fill["price"]) * float(fill["qty"]) for fill in fills) / fill_qty if fill_qty > 0 else 0.0
+		return cls(request, order.get("status", FILLED if executed_qty > 0 else UNKNOWN), executed_qty=executed_qty,
+				   avg_price=avg_price, order_id=order.get("orderId"), order=order, **kwargs)
+
+
+class OrderPipeline:
+	"""Order queue served by a small worker pool.
+
+	``submit`` only enqueues: callers (holding the bot's data lock or not)
+	never wait on the network. A worker sends the signed order, retries
+	with the *same* client order id, and when a response is lost (no
+	response, 5xx, "status unknown") looks the order up by that id before
+	resending, so a retry can never fill twice. The same goes for a later
+	``submit`` of an id that was already sent (e.g. the next cycle retrying a
+	close that ended UNKNOWN): the exchange accepts a reused id once the first
+	order is no longer open, so it is looked up before its first POST.
+	``callback(result)`` runs on the worker once the order is final, before
+	the returned Future resolves.
+
+	Several orders go out at once (up to ``workers``), so closing every
+	position costs one round trip, not one per position.
+
+	``order_states(client_order_id)`` (optional, e.g. the user-data stream's
+	order cache) is asked before the REST lookup: an order the exchange has
+	already reported as final needs no request at all.
+	"""
+
+	def __init__(self, send: Sender, workers: int = 4, max_attempts: int = 3, retry_delay: float = 0.5,
+				 sleep: Callable[[float], None] = time.sleep,
+				 order_states: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None):
+		self.send = send
+		self.order_states = order_states
+		self.max_attempts = max(1, int(max_attempts))
+		self.retry_delay = float(retry_delay)
+		self.sleep = sleep
+		self._executor = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="order")
+		self._inflight: Dict[str, Future] = {}
+		self._sent: "OrderedDict[str, None]" = OrderedDict()  # Client order ids POSTed at least once (bounded)
+		self._lock = threading.Lock()
+		self.stats = {"submitted": 0, "duplicates": 0, "filled": 0, "rejected": 0, "unknown": 0, "resends": 0,
+					  "lookups": 0, "stream_lookups": 0, "recovered": 0, "callback_errors": 0, "last_ms": 0.0, "max_ms": 0.0}
+
+	def submit(self, request: OrderRequest, callback: Optional[Callable[[OrderResult], None]] = None) -> Future:
+		"""Queue an order. Resubmitting a client order id that is still in flight returns its Future."""
+		with self._lock:
+			future = self._inflight.get(request.client_order_id)
+			if future is not None:
+				self.stats["duplicates"] += 1
+				return future
+			future = self._executor.submit(self._run, request, callback)
+			self._inflight[request.client_order_id] = future
+			self.stats["submitted"] += 1
+			return future
+
+	def submit_many(self, requests: Iterable[OrderRequest],
+					callback: Optional[Callable[[OrderResult], None]] = None) -> List[Future]:
+		return [self.submit(request, callback) for request in requests]
+
+	def pending(self) -> int:
+		with self._lock:
+			return len(self._inflight)
+
+	def shutdown(self, wait: bool = True) -> None:
+		self._executor.shutdown(wait=wait)
+
+	def _run(self, request: OrderRequest, callback: Optional[Callable[[OrderResult], None]]) -> OrderResult:
+		try:
+			result = self.execute(request)
+			if callback is not None:
+				try:
+					callback(result)
+				except Exception as e:
+					self._count("callback_errors")
+					logger.error(f"Order callback failed for {request.client_order_id}: {e}")
+			return result
+		finally:
+			with self._lock:
+				self._inflight.pop(request.client_order_id, None)
+
+	def execute(self, request: OrderRequest) -> OrderResult:
+		"""Send ``request`` until it is filled, rejected or out of attempts (runs on the calling thread)."""
+		start = time.perf_counter()
+		result = None
+		ambiguous = self._was_sent(request.client_order_id)  # An earlier POST may have reached the exchange
+		error_code, error_msg = None, ""
+		attempt = 0
+		for attempt in range(1, self.max_attempts + 1):
+			if attempt > 1:
+				self.sleep(self.retry_delay * (attempt - 1))
+			if ambiguous:
+				found, order = self.lookup(request)
+				if found is None:
+					continue  # Still can't tell: never resend blind
+				if found:
+					self._count("recovered")
+					result = OrderResult.from_order(request, order, attempts=attempt)
+					break
+				self._count("resends")
+			self._mark_sent(request.client_order_id)
+			response = self.send("POST", ORDER_PATH, request.params())
+			status_code = getattr(response, "status_code", None)
+			if response is None or status_code >= 500:
+				ambiguous = True
+				error_code, error_msg = None, "no response" if response is None else f"HTTP {status_code}"
+				logger.warning(f"Order {request.client_order_id} {request.side} {request.symbol}: {error_msg}, "
+							   f"attempt {attempt}/{self.max_attempts}")
+				continue
+			data = self._json(response)
+			if status_code == 200:
+				result = OrderResult.from_order(request, data, attempts=attempt)
+				break
+			error_code, error_msg = data.get("code"), data.get("msg", f"HTTP {status_code}")
+			if error_code in AMBIGUOUS_CODES:
+				ambiguous = True
+				continue
+			if error_code in RETRYABLE_CODES:
+				ambiguous = False
+				continue
+			result = OrderResult(request, REJECTED, attempts=attempt, error_code=error_code, error_msg=error_msg)
+			break
+		else:
+			if ambiguous:
+				found, order = self.lookup(request)
+				if found:
+					self._count("recovered")
+					result = OrderResult.from_order(request, order, attempts=attempt)
+			if result is None:
+				result = OrderResult(request, UNKNOWN if ambiguous else REJECTED, attempts=attempt,
+									 error_code=error_code, error_msg=error_msg)
+
+		result.elapsed = time.perf_counter() - start
+		self._finish(result)
+		return result
+
+	def lookup(self, request: OrderRequest):
+		"""(True, order) / (False, None) when the exchange has / hasn't got the order, (None, None) if unknown."""
+		if self.order_states is not None:
+			order = self.order_states(request.client_order_id)
+			if order is not None:
+				self._count("stream_lookups")
+				return True, order
+		self._count("lookups")
+		response = self.send("GET", ORDER_PATH, {"symbol": request.symbol, "origClientOrderId": request.client_order_id})
+		if response is None:
+			return None, None
+		data = self._json(response)
+		if response.status_code == 200:
+			return True, data
+		if data.get("code") == ORDER_NOT_FOUND:
+			return False, None
+		return None, None
+
+	@staticmethod
+	def _json(response) -> Dict[str, Any]:
+		try:
+			data = response.json()
+		except Exception:
+			return {}
+		return data if isinstance(data, dict) else {}
+
+	def _was_sent(self, client_order_id: str) -> bool:
+		with self._lock:
+			return client_order_id in self._sent
+
+	def _mark_sent(self, client_order_id: str) -> None:
+		with self._lock:
+			self._sent[client_order_id] = None
+			self._sent.move_to_end(client_order_id)
+			while len(self._sent) > SENT_IDS_KEPT:
+				self._sent.popitem(last=False)
+
+	def _count(self, name: str) -> None:
+		with self._lock:
+			self.stats[name] += 1
+
+	def _finish(self, result: OrderResult) -> None:
+		request = result.request
+		elapsed_ms = result.elapsed * 1000
+		with self._lock:
+			self.stats["filled" if result.filled else "unknown" if result.status == UNKNOWN else "rejected"] += 1
+			self.stats["last_ms"] = round(elapsed_ms, 1)
+			self.stats["max_ms"] = round(max(self.stats["max_ms"], elapsed_ms), 1)
+		if result.filled:
+			logger.info(f"✅ LIVE ORDER {result.status}: {request.side} {result.executed_qty} {request.symbol} "
+						f"@ {result.avg_price:.8g} | id {result.order_id} | {request.client_order_id} | "
+						f"{result.attempts} attempt(s), {elapsed_ms:.0f}ms")
+		elif result.status == UNKNOWN:
+			logger.error(f"🚨 ORDER STATE UNKNOWN: {request.side} {request.quantity} {request.symbol} "
+						 f"({request.client_order_id}) - CHECK BINANCE MANUALLY")
+		else:
+			logger.error(f"❌ BINANCE ERROR {result.error_code}: {result.error_msg} "
+						 f"({request.side} {request.quantity} {request.symbol})")
+			if result.error_code in ERROR_HINTS:
+				logger.error(f"   💡 {ERROR_HINTS[result.error_code]}")
+
+	def get_stats(self) -> Dict:
+		with self._lock:
+			return dict(self.stats, inflight=len(self._inflight))
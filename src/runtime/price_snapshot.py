@@ -0,0 +1,117 @@
+import time
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+from src.runtime.transport import HttpTransport, get_transport
+
+
+logger = logging.getLogger(__name__)
+
+
+class PriceSnapshot:
+	"""Last-price snapshot for a whole symbol universe.
+
+	One bulk ``/api/v3/ticker/price`` call (no ``symbol`` parameter) returns every
+	market at once, so all price readers in a cycle share a single request instead
+	of one request per symbol per call site. The snapshot refreshes itself lazily
+	once it is older than ``refresh_interval`` seconds.
+	"""
+
+	def __init__(self, base_url: str, symbols: Optional[Iterable[str]] = None, refresh_interval: float = 5.0,
+				 timeout: float = 5.0, fetcher: Optional[Callable[[], Optional[list]]] = None,
+				 transport: Optional[HttpTransport] = None):
+		self.base_url = base_url
+		self.symbols = set(symbols) if symbols else None
+		self.refresh_interval = float(refresh_interval)
+		self.timeout = float(timeout)
+		self.transport = transport or get_transport()
+		self._fetcher = fetcher or self._fetch_all
+		self._prices: Dict[str, float] = {}
+		self._updated_at = 0.0
+		self._attempted_at = 0.0
+		self._data_lock = threading.Lock()
+		self._refresh_lock = threading.Lock()  # Only one bulk request in flight
+		self.refresh_count = 0
+		self.failure_count = 0
+
+	def _fetch_all(self) -> Optional[list]:
+		response = self.transport.get(f"{self.base_url}/api/v3/ticker/price", timeout=self.timeout,
+									  max_retries=1, label="/api/v3/ticker/price (bulk)")
+		if response is None or response.status_code != 200:
+			logger.warning(f"Bulk ticker request failed: HTTP {response.status_code if response is not None else 'no response'}")
+			return None
+		return response.json()
+
+	def age(self) -> float:
+		"""Seconds since the last successful refresh (inf if never refreshed)."""
+		with self._data_lock:
+			updated_at = self._updated_at
+		return time.time() - updated_at if updated_at else float("inf")
+
+	def is_stale(self, max_age: Optional[float] = None) -> bool:
+		return self.age() >= (self.refresh_interval if max_age is None else max_age)
+
+	def refresh(self, force: bool = False, max_age: Optional[float] = None) -> bool:
+		"""Fetch all prices with one bulk call. Returns True if the snapshot is usable."""
+		interval = self.refresh_interval if max_age is None else max_age
+		if not force and not self.is_stale(interval):
+			return True
+		with self._refresh_lock:
+			# Another thread may have refreshed while we waited for the lock
+			if not force and not self.is_stale(interval):
+				return True
+			# After a failure, wait a full interval before retrying (callers fall back meanwhile)
+			if not force and time.time() - self._attempted_at < interval:
+				return bool(self._prices)
+			self._attempted_at = time.time()
+			try:
+				rows = self._fetcher()
+			except Exception as e:
+				rows = None
+				logger.warning(f"Bulk ticker request error: {e}")
+			if not isinstance(rows, list):
+				self.failure_count += 1
+				return bool(self._prices)
+			prices: Dict[str, float] = {}
+			for row in rows:
+				try:
+					symbol = row["symbol"]
+					if self.symbols is not None and symbol not in self.symbols:
+						continue
+					price = float(row["price"])
+					if price > 0:
+						prices[symbol] = price
+				except (KeyError, TypeError, ValueError):
+					continue
+			with self._data_lock:
+				self._prices.update(prices)
+				self._updated_at = time.time()
+			self.refresh_count += 1
+			return True
+
+	def get(self, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
+		"""Price for ``symbol``, refreshing the whole snapshot first if it is stale."""
+		if self.is_stale(max_age):
+			self.refresh(max_age=max_age)
+		with self._data_lock:
+			return self._prices.get(symbol)
+
+	def update(self, symbol: str, price: float) -> None:
+		"""Push a single fresher price (e.g. from an order fill) into the snapshot."""
+		if price and price > 0:
+			with self._data_lock:
+				self._prices[symbol] = float(price)
+
+	def prices(self) -> Dict[str, float]:
+		with self._data_lock:
+			return dict(self._prices)
+
+	def get_stats(self) -> Dict:
+		return {
+			"symbols": len(self._prices),
+			"age_seconds": round(self.age(), 2) if self._updated_at else None,
+			"refresh_interval": self.refresh_interval,
+			"refresh_count": self.refresh_count,
+			"failure_count": self.failure_count,
+		}
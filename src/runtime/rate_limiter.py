@@ -0,0 +1,172 @@
+import time
+import threading
+from typing import Dict, Mapping, Optional
+
+
+# Lower value = served first
+PRIORITY_HIGH = 0  # Orders, account / position management
+PRIORITY_LOW = 1  # Market scanning and other market data
+
+# Request weight per endpoint (spot REST); endpoints depending on parameters are in request_weight()
+ENDPOINT_WEIGHTS: Dict[str, int] = {
+	"/api/v3/ping": 1,
+	"/api/v3/time": 1,
+	"/api/v3/klines": 2,
+	"/api/v3/avgPrice": 2,
+	"/api/v3/exchangeInfo": 20,
+	"/api/v3/account": 20,
+	"/api/v3/myTrades": 20,
+	"/api/v3/allOrders": 20,
+	"/api/v3/userDataStream": 2,
+}
+
+HIGH_PRIORITY_PATHS = (
+	"/api/v3/order",
+	"/api/v3/account",
+	"/api/v3/openOrders",
+	"/api/v3/myTrades",
+	"/api/v3/allOrders",
+	"/api/v3/userDataStream",
+)
+
+USED_WEIGHT_HEADER = "x-mbx-used-weight-"
+
+
+def request_weight(method: str, path: str, params: Optional[Mapping] = None) -> int:
+	"""Request weight the exchange will charge for ``method path?params``."""
+	params = params or {}
+	has_symbol = "symbol" in params
+	if path.endswith("/ticker/price") or path.endswith("/ticker/bookTicker"):
+		return 2 if has_symbol else 4
+	if path.endswith("/ticker/24hr"):
+		return 2 if has_symbol else 80
+	if path.endswith("/openOrders"):
+		return 6 if has_symbol else 80
+	if path.endswith("/depth"):
+		limit = int(params.get("limit", 100))
+		return 5 if limit <= 100 else 25 if limit <= 500 else 50 if limit <= 1000 else 250
+	if path.endswith("/order"):
+		return 4 if method.upper() == "GET" else 1
+	return ENDPOINT_WEIGHTS.get(path, 1)
+
+
+def priority_for(path: str) -> int:
+	return PRIORITY_HIGH if path.startswith(HIGH_PRIORITY_PATHS) else PRIORITY_LOW
+
+
+class WeightRateLimiter:
+	"""Token bucket over the exchange's per-minute request weight.
+
+	Requests wait *before* they are sent instead of sleeping after a 429. The
+	bucket refills continuously at ``weight_limit / window`` per second and is
+	re-synced from ``X-MBX-USED-WEIGHT-1M`` on every response; ``Retry-After``
+	on 429/418 blocks all traffic until it expires. Low-priority callers leave
+	``reserve`` of the bucket for high-priority ones and always yield to a
+	waiting high-priority request.
+	"""
+
+	def __init__(self, weight_limit: int = 6000, window: float = 60.0, reserve: float = 0.2):
+		self.weight_limit = int(weight_limit)
+		self.window = float(window)
+		self.reserve = self.weight_limit * float(reserve)
+		self._rate = self.weight_limit / self.window
+		self._tokens = float(self.weight_limit)
+		self._updated = time.monotonic()
+		self._blocked_until = 0.0
+		self._high_waiting = 0
+		self._cond = threading.Condition()
+		self.server_used: Dict[str, int] = {}
+		self.stats = {"acquired": 0, "weight": 0, "throttled": 0, "wait_ms": 0.0, "max_wait_ms": 0.0,
+					  "rejected": 0, "retry_after": 0}
+
+	def _refill(self, now: float) -> None:
+		self._tokens = min(float(self.weight_limit), self._tokens + (now - self._updated) * self._rate)
+		self._updated = now
+
+	def blocked_for(self) -> float:
+		"""Seconds until a Retry-After block expires (0 if not blocked)."""
+		with self._cond:
+			return max(0.0, self._blocked_until - time.monotonic())
+
+	def acquire(self, weight: int = 1, priority: int = PRIORITY_LOW, timeout: Optional[float] = None) -> bool:
+		"""Block until ``weight`` can be spent. Returns False if ``timeout`` expires first."""
+		start = time.monotonic()
+		deadline = None if timeout is None else start + timeout
+		high = priority == PRIORITY_HIGH
+		floor = 0.0 if high else self.reserve
+		waited = False
+		with self._cond:
+			if high:
+				self._high_waiting += 1
+			try:
+				while True:
+					now = time.monotonic()
+					self._refill(now)
+					if now >= self._blocked_until and (high or not self._high_waiting) and self._tokens - weight >= floor:
+						self._tokens -= weight
+						waited_ms = (now - start) * 1000.0
+						self.stats["acquired"] += 1
+						self.stats["weight"] += weight
+						if waited:
+							self.stats["throttled"] += 1
+							self.stats["wait_ms"] += waited_ms
+							self.stats["max_wait_ms"] = max(self.stats["max_wait_ms"], waited_ms)
+						return True
+					if now < self._blocked_until:
+						wait = self._blocked_until - now
+					else:
+						wait = max(0.005, (weight + floor - self._tokens) / self._rate)
+					if deadline is not None:
+						if now >= deadline:
+							self.stats["rejected"] += 1
+							return False
+						wait = min(wait, deadline - now)
+					waited = True
+					self._cond.wait(wait)
+			finally:
+				if high:
+					self._high_waiting -= 1
+					self._cond.notify_all()
+
+	def observe(self, headers: Optional[Mapping], status_code: Optional[int] = None) -> None:
+		"""Sync with the weight the exchange reports and honour Retry-After."""
+		if not headers:
+			return
+		with self._cond:
+			now = time.monotonic()
+			self._refill(now)
+			for name, value in headers.items():
+				name = name.lower()
+				if not name.startswith(USED_WEIGHT_HEADER):
+					continue
+				try:
+					used = int(value)
+				except (TypeError, ValueError):
+					continue
+				window = name[len(USED_WEIGHT_HEADER):]
+				self.server_used[window] = used
+				if window == "1m":
+					self._tokens = min(self._tokens, float(self.weight_limit - used))
+			if status_code in (418, 429):
+				retry_after = headers.get("Retry-After")
+				try:
+					seconds = float(retry_after) if retry_after is not None else 0.0
+				except (TypeError, ValueError):
+					seconds = 0.0
+				if seconds > 0:
+					self._blocked_until = max(self._blocked_until, now + seconds)
+					self.stats["retry_after"] += 1
+			self._cond.notify_all()
+
+	def get_stats(self) -> Dict:
+		with self._cond:
+			self._refill(time.monotonic())
+			return dict(
+				self.stats,
+				wait_ms=round(self.stats["wait_ms"], 2),
+				max_wait_ms=round(self.stats["max_wait_ms"], 2),
+				available=round(self._tokens, 1),
+				weight_limit=self.weight_limit,
+				server_used=dict(self.server_used),
+				blocked_for=round(max(0.0, self._blocked_until - time.monotonic()), 2),
+			)
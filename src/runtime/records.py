@@ -0,0 +1,123 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Optional
+
+
+class _ItemAccess:
+	"""Dict-style access to a slotted record, so ``record['x']``, ``record.get('x', d)``,
+	``'x' in record`` and ``record['x'] = v`` keep working on the fixed fields.
+
+	This is the legacy view: timestamp fields are stored as epoch floats but
+	read (and written) through it as ``datetime``, so JSON built from it comes
+	out exactly as before. Fields left at None count as absent. Unknown keys
+	raise KeyError: the field set is fixed.
+	"""
+
+	__slots__ = ()
+	_datetime_fields: FrozenSet[str] = frozenset()
+
+	def __getitem__(self, name: str) -> Any:
+		if name not in self.__slots__:
+			raise KeyError(name)
+		value = getattr(self, name)
+		if value is not None and name in self._datetime_fields:
+			return datetime.fromtimestamp(value)
+		return value
+
+	def __setitem__(self, name: str, value: Any) -> None:
+		if name not in self.__slots__:
+			raise KeyError(name)
+		if isinstance(value, datetime) and name in self._datetime_fields:
+			value = value.timestamp()
+		setattr(self, name, value)
+
+	def __contains__(self, name: str) -> bool:
+		return name in self.__slots__ and getattr(self, name) is not None
+
+	def get(self, name: str, default: Any = None) -> Any:
+		return self[name] if name in self else default
+
+	def as_dict(self) -> Dict[str, Any]:
+		"""The record as the dict it replaces (set fields only, datetimes for timestamps)."""
+		return {name: self[name] for name in self.__slots__ if name in self}
+
+
+@dataclass(slots=True)
+class Position(_ItemAccess):
+	"""An open position. ``entry_time`` is epoch seconds."""
+
+	symbol: str
+	strategy: str
+	action: str  # 'BUY' / 'SELL'
+	quantity: float
+	entry_price: float
+	entry_time: float
+	stop_loss: float
+	take_profit: float
+	reason: str = ""
+	confidence: float = 0.0
+	market_condition: Optional[str] = None
+	position_value: float = 0.0
+	target_confidence: Optional[float] = None
+	confidence_details: Optional[Dict] = None
+	breakeven_activated: bool = False
+	trailing_stop_loss: Optional[float] = None
+	highest_price: Optional[float] = None
+	lowest_price: Optional[float] = None
+	close_failures: int = 0
+
+	_datetime_fields = frozenset(("entry_time",))
+
+	def gain_pct(self, price: float) -> float:
+		"""Move from entry in the position's favour, in % (0 if the entry price is unusable)."""
+		if not self.entry_price > 0:
+			return 0.0
+		move = price - self.entry_price if self.action == "BUY" else self.entry_price - price
+		return move / self.entry_price * 100
+
+	def held_minutes(self, now: Optional[float] = None) -> float:
+		return ((time.time() if now is None else now) - self.entry_time) / 60
+
+	def to_api(self, current_price: float, now: Optional[float] = None) -> Dict[str, Any]:
+		"""One /api/positions row."""
+		return {
+			"symbol": self.symbol,
+			"strategy": self.strategy,
+			"action": self.action,
+			"quantity": self.quantity,
+			"entry_price": self.entry_price,
+			"current_price": current_price,
+			"pnl_pct": self.gain_pct(current_price),
+			"stop_loss": self.stop_loss,
+			"take_profit": self.take_profit,
+			"hold_time": self.held_minutes(now),
+			"reason": self.reason,
+			"confidence": self.confidence,
+		}
+
+
+@dataclass(slots=True)
+class Trade(_ItemAccess):
+	"""A closed trade. ``timestamp`` (exit) and ``entry_time`` are epoch seconds."""
+
+	timestamp: float
+	symbol: str
+	strategy: str
+	quantity: float
+	price: float  # Exit price
+	entry_price: float
+	entry_time: float
+	entry_reason: str
+	exit_reason: str
+	fee: float
+	pnl: float
+	pnl_pct: float
+	hold_duration: float  # Minutes
+	market_condition_exit: Optional[str] = None
+	stop_loss: float = 0.0
+	take_profit: float = 0.0
+	position_key: str = ""
+	action: str = "CLOSE"
+
+	_datetime_fields = frozenset(("timestamp", "entry_time"))
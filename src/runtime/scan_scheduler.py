@@ -0,0 +1,173 @@
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Callable, Collection, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from src.runtime.rate_limiter import request_weight
+
+logger = logging.getLogger(__name__)
+
+HOT, WARM, COLD = "HOT", "WARM", "COLD"
+TIERS = (HOT, WARM, COLD)
+
+# Scan order when the budget runs short: open positions, hot, never scanned, warm, cold
+_RANK = {"position": 0, HOT: 1, "new": 2, WARM: 3, COLD: 4}
+
+
+class ScanScheduler:
+	"""Per-symbol scan tiers and the symbols due for a rescan each cycle.
+
+	A symbol's tier comes from its last scan: open position, volume spike,
+	volatility (ATR %) or opportunity score. HOT symbols are rescanned every
+	cycle, WARM every ``warm_every`` and COLD every ``cold_every`` cycles.
+	Scans spend ``scan_weight`` from a bucket refilled at ``weight_budget`` per
+	minute; due symbols that don't fit wait for the next cycle (most overdue
+	first), except open positions which are always rescanned.
+
+	The outcomes of the last ``outcome_window`` scans (across cycles) back
+	``success_rate``, so an API-health verdict never rests on one small tier slice.
+	"""
+
+	def __init__(self, weight_budget: float = 300, scan_weight: Optional[int] = None, warm_every: int = 2,
+				 cold_every: int = 4, hot_score: float = 90, warm_score: float = 75, hot_volatility: float = 2.0,
+				 warm_volatility: float = 1.0, hot_spike: float = 2.0, warm_spike: float = 1.5,
+				 outcome_window: int = 20):
+		self.weight_budget = float(weight_budget)
+		self.scan_weight = int(scan_weight if scan_weight is not None else request_weight("GET", "/api/v3/klines"))
+		self.every = {HOT: 1, WARM: max(1, int(warm_every)), COLD: max(1, int(cold_every))}
+		self.thresholds = {
+			HOT: (hot_spike, hot_volatility, hot_score),
+			WARM: (warm_spike, warm_volatility, warm_score),
+		}
+		self.cycle = 0
+		self._tokens = self.weight_budget
+		self._updated: Optional[float] = None
+		self._state: Dict[str, Dict] = {}  # symbol -> {'tier', 'reason', 'last_cycle'}
+		self._outcomes: deque = deque(maxlen=max(1, int(outcome_window)))  # True = scan succeeded
+		self._lock = threading.Lock()
+		self.stats = {"cycles": 0, "planned": 0, "deferred": 0, "over_budget": 0, "last_planned": 0,
+					  "last_deferred": 0}
+
+	def classify(self, entry: Optional[Mapping], has_position: bool = False) -> Tuple[str, str]:
+		"""(tier, reason) for a scan entry (``market_data`` shape)."""
+		if has_position:
+			return HOT, "position"
+		if not entry:
+			return COLD, "no data"
+		indicators = entry.get("indicators") or {}
+		values = (
+			("volume spike", entry.get("volume_spike_ratio", 1.0)),
+			("volatility", indicators.get("atr_pct", 0.0)),
+			("score", entry.get("score", 0.0)),
+		)
+		for tier in (HOT, WARM):
+			for (reason, value), threshold in zip(values, self.thresholds[tier]):
+				if value is not None and value >= threshold:
+					return tier, reason
+		return COLD, "quiet"
+
+	def plan(self, symbols: Sequence[str], open_symbols: Collection[str] = (), now: Optional[float] = None) -> List[str]:
+		"""Symbols to scan this cycle, in ``symbols`` order."""
+		now = time.monotonic() if now is None else now
+		with self._lock:
+			self.cycle += 1
+			if self._updated is not None:
+				self._tokens = min(self.weight_budget, self._tokens + (now - self._updated) * self.weight_budget / 60.0)
+			self._updated = now
+
+			due = []
+			for index, symbol in enumerate(symbols):
+				state = self._state.get(symbol)
+				if symbol in open_symbols:
+					due.append((_RANK["position"], 0, index, symbol))
+				elif state is None:
+					due.append((_RANK["new"], 0, index, symbol))
+				else:
+					overdue = self.cycle - state["last_cycle"] - self.every[state["tier"]]
+					if overdue >= 0:
+						due.append((_RANK[state["tier"]], -overdue, index, symbol))
+			due.sort()
+
+			chosen, deferred = [], 0
+			for rank, _, index, symbol in due:
+				if rank == _RANK["position"] or self._tokens >= self.scan_weight:
+					if self._tokens < self.scan_weight:
+						self.stats["over_budget"] += 1
+					self._tokens -= self.scan_weight
+					chosen.append((index, symbol))
+				else:
+					deferred += 1
+			self.stats["cycles"] += 1
+			self.stats["planned"] += len(chosen)
+			self.stats["deferred"] += deferred
+			self.stats["last_planned"] = len(chosen)
+			self.stats["last_deferred"] = deferred
+		return [symbol for _, symbol in sorted(chosen)]
+
+	def record(self, symbol: str, entry: Optional[Mapping], has_position: bool = False) -> str:
+		"""Store the outcome of a planned scan (``entry`` None = failed: the tier is kept)."""
+		with self._lock:
+			self._outcomes.append(entry is not None)
+			state = self._state.get(symbol)
+			if entry is None and state is not None and not has_position:
+				tier, reason = state["tier"], state["reason"]
+			else:
+				tier, reason = self.classify(entry, has_position)
+			self._state[symbol] = {"tier": tier, "reason": reason, "last_cycle": self.cycle}
+			return tier
+
+	def forget(self, keep: Iterable[str]) -> None:
+		"""Drop symbols no longer in the universe."""
+		keep = set(keep)
+		with self._lock:
+			for symbol in [s for s in self._state if s not in keep]:
+				del self._state[symbol]
+
+	def success_rate(self, min_attempts: int = 1) -> Optional[float]:
+		"""% of the recent scans that succeeded, or None with fewer than ``min_attempts`` of them."""
+		with self._lock:
+			attempts = len(self._outcomes)
+			if not attempts or attempts < min_attempts:
+				return None
+			return sum(self._outcomes) / attempts * 100
+
+	def tiers(self) -> Dict[str, Dict]:
+		with self._lock:
+			return {symbol: dict(state, age=self.cycle - state["last_cycle"]) for symbol, state in self._state.items()}
+
+	def get_stats(self) -> Dict:
+		with self._lock:
+			symbols = {tier: sorted(s for s, state in self._state.items() if state["tier"] == tier) for tier in TIERS}
+			return dict(
+				self.stats,
+				tokens=round(self._tokens, 1),
+				weight_budget=self.weight_budget,
+				scan_weight=self.scan_weight,
+				every=dict(self.every),
+				counts={tier: len(names) for tier, names in symbols.items()},
+				symbols=symbols,
+				recent_scans=len(self._outcomes),
+				recent_success_pct=round(sum(self._outcomes) / len(self._outcomes) * 100, 1) if self._outcomes else None,
+			)
+
+
+def scan_all(tasks: Mapping[str, Sequence[Any]], scan: Callable[..., Optional[Dict]],
+			 executor: Optional[Executor] = None) -> Dict[str, Optional[Dict]]:
+	"""``{symbol: scan(*args)}`` for every ``symbol -> args`` task, run on ``executor`` (inline if None).
+
+	The result is in ``tasks`` order whatever order the scans finish in, and a
+	scan that raises is logged and yields None: one bad symbol never drops the others.
+	"""
+	def run(symbol: str, args: Sequence[Any]) -> Optional[Dict]:
+		try:
+			return scan(*args)
+		except Exception as e:
+			logger.error(f"Error scanning {symbol}: {e}")
+			return None
+
+	if executor is None:
+		return {symbol: run(symbol, args) for symbol, args in tasks.items()}
+	futures = {symbol: executor.submit(run, symbol, args) for symbol, args in tasks.items()}
+	return {symbol: future.result() for symbol, future in futures.items()}
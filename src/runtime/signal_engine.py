@@ -0,0 +1,233 @@
+import time
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.runtime.confidence import ConfidenceScorer
+
+
+BUY, SELL = 1, -1
+ACTIONS = {BUY: "BUY", SELL: "SELL"}
+
+# Indicator fields the entry rules read (plus the confidence table's inputs)
+SIGNAL_KEYS = ("rsi", "volume_ratio", "atr_pct", "ema_9", "ema_21", "ema_50", "ema_200", "macd", "macd_signal",
+			   "momentum_3", "momentum_10", "bb_upper", "bb_middle", "bb_lower")
+
+# Strategies whose scalar generators return confidence in % (the others return 0-1)
+PERCENT_CONFIDENCE = frozenset({"SCALPING", "DAY_TRADING", "MOMENTUM"})
+
+
+# ---------------------------------------------------------------- entry rules
+#
+# One function per strategy, mirroring its generate_*_signal method:
+# (gate, [(mask, action, base_confidence, reason), ...]); the first matching
+# rule of a row whose gate passes is its signal. Rejections keep the scalar
+# comparisons as written so NaN behaves the same (a NaN never rejects).
+
+def _scalping(c):
+	gate = ~(c["volume_ratio"] < 0.1) & ~(c["atr_pct"] < 0.01)
+	return gate, [(c["rsi"] < 55, BUY, 25, "Scalping Dip"), (c["rsi"] > 45, SELL, 25, "Scalping Pump")]
+
+
+def _day_trading(c):
+	gate = ~(c["volume_ratio"] < 0.1) & ~(c["atr_pct"] < 0.01)
+	return gate, [(c["rsi"] < 60, BUY, 20, "Day Trade"), (c["rsi"] > 40, SELL, 20, "Day Trade")]
+
+
+def _swing_trading(c):
+	gate = ~(c["volume_ratio"] < 1.3)
+	uptrend = (c["ema_9"] > c["ema_21"]) & (c["ema_21"] > c["ema_50"])
+	downtrend = (c["ema_9"] < c["ema_21"]) & (c["ema_21"] < c["ema_50"])
+	return gate, [
+		(uptrend & (c["rsi"] < 45), BUY, 65, "Swing Buy Uptrend Dip"),
+		(uptrend & (c["support_distance"] < 0.015), BUY, 62, "Swing Buy Support"),
+		(downtrend & (c["rsi"] > 55), SELL, 62, "Swing Sell Downtrend Rally"),
+	]
+
+
+def _trend_strength(c):
+	with np.errstate(divide="ignore", invalid="ignore"):
+		return np.abs(c["ema_9"] - c["ema_21"]) / c["ema_21"]
+
+
+def _range_trading(c):
+	gate = ~(c["price"] <= 0) & ~(c["volume_ratio"] < 1.1) & (c["ema_21"] > 0) & ~(_trend_strength(c) > 0.02)
+	return gate, [
+		((c["support_distance"] < 0.01) & (c["rsi"] < 45), BUY, 58, "Range Bottom"),
+		((c["resistance_distance"] < 0.01) & (c["rsi"] > 55), SELL, 58, "Range Top"),
+	]
+
+
+def _momentum(c):
+	gate = ~(c["volume_ratio"] < 0.1) & ~(np.abs(c["momentum_10"]) < 0.1)
+	return gate, [(c["momentum_10"] > 0.1, BUY, 20, "Momentum Up"), (c["momentum_10"] < -0.1, SELL, 20, "Momentum Down")]
+
+
+def _position_trading(c):
+	gate = ~(c["volume_ratio"] < 1.1)
+	return gate, [
+		((c["ema_50"] > c["ema_200"]) & (c["rsi"] < 55), BUY, 70, "Golden Cross Zone"),
+		((c["ema_50"] < c["ema_200"]) & (c["rsi"] > 45), SELL, 68, "Death Cross Zone"),
+	]
+
+
+def _grid_trading(c):
+	with np.errstate(divide="ignore", invalid="ignore"):
+		bb_width = np.where(c["bb_middle"] > 0, (c["bb_upper"] - c["bb_lower"]) / c["bb_middle"], 0.0)
+	gate = (~(c["price"] <= 0) & (c["ema_21"] > 0) & ~(_trend_strength(c) > 0.025)
+			& ~((c["volume_ratio"] < 0.8) | (c["volume_ratio"] > 2.0))
+			& ~((c["rsi"] < 35) | (c["rsi"] > 65))
+			& ~((c["atr_pct"] < 0.5) | (c["atr_pct"] > 3.0))
+			& ~((bb_width < 0.02) | (bb_width > 0.08)))
+	return gate, [
+		((c["support_distance"] < 0.015) & (c["rsi"] < 52), BUY, 60, "Grid Buy Setup"),
+		((c["resistance_distance"] < 0.015) & (c["rsi"] > 48), SELL, 60, "Grid Sell Setup"),
+	]
+
+
+STRATEGY_RULES: Dict[str, Callable] = {
+	"SCALPING": _scalping,
+	"DAY_TRADING": _day_trading,
+	"SWING_TRADING": _swing_trading,
+	"RANGE_TRADING": _range_trading,
+	"MOMENTUM": _momentum,
+	"POSITION_TRADING": _position_trading,
+	"GRID_TRADING": _grid_trading,
+}
+
+
+# ---------------------------------------------------------------- gathering
+
+# Concrete types (an ABC isinstance check costs more than the whole vectorized pass)
+_NUMBER = (float, int, np.floating, np.integer)
+
+
+def _levels_ok(levels) -> bool:
+	return isinstance(levels, (list, tuple)) and all(isinstance(level, _NUMBER) for level in levels)
+
+
+def _nearest(price: np.ndarray, levels: List[Sequence[float]]) -> np.ndarray:
+	"""min(|price - level| / price) per row over its levels (inf when it has none)."""
+	width = max((len(row) for row in levels), default=0)
+	if width == 0:
+		return np.full(len(price), np.inf)
+	padded = np.full((len(price), width), np.nan)
+	for i, row in enumerate(levels):
+		padded[i, :len(row)] = row
+	distance = np.abs(price[:, None] - padded) / price[:, None]
+	return np.where(np.isnan(padded), np.inf, distance).min(axis=1)
+
+
+def gather(market_data: Dict[str, Dict], symbols: Iterable[str],
+		   keys: Sequence[str] = SIGNAL_KEYS) -> Tuple[List[str], Dict[str, np.ndarray], List[str]]:
+	"""Column arrays for the scan entries of ``symbols``.
+
+	Returns (rows, columns, fallback): symbols missing from ``market_data`` are
+	skipped; entries the rules can't read as plain numbers (missing keys,
+	non-positive price, ...) go to ``fallback`` for the scalar generators.
+	"""
+	rows, fallback, values, supports, resistances = [], [], [], [], []
+	for symbol in symbols:
+		data = market_data.get(symbol)
+		if data is None:
+			continue
+		ind = data.get("indicators") or {}
+		sr = data.get("sr_levels") or {}
+		row = [ind.get(key) for key in keys] + [data.get("price"), data.get("score")]
+		if (not all(isinstance(value, _NUMBER) for value in row) or not row[-2] > 0
+				or not math.isfinite(row[-2]) or not math.isfinite(row[-1])
+				or not _levels_ok(sr.get("support")) or not _levels_ok(sr.get("resistance"))):
+			fallback.append(symbol)
+			continue
+		rows.append(symbol)
+		values.append(row)
+		supports.append(sr["support"])
+		resistances.append(sr["resistance"])
+
+	matrix = np.asarray(values, dtype=np.float64).reshape(len(values), len(keys) + 2)
+	columns = {key: matrix[:, k] for k, key in enumerate(tuple(keys) + ("price", "score"))}
+	columns["support_distance"] = _nearest(columns["price"], supports)
+	columns["resistance_distance"] = _nearest(columns["price"], resistances)
+	return rows, columns, fallback
+
+
+# ---------------------------------------------------------------- engine
+
+def strategy_signals(columns: Dict[str, np.ndarray], name: str, bonus: Dict[int, np.ndarray],
+					 finish: Callable) -> Tuple[np.ndarray, np.ndarray, List[Optional[str]]]:
+	"""(action, confidence, reason) per row for one strategy; action 0 = no signal.
+
+	``bonus`` holds the confidence table points per side, ``finish`` clips and scales them.
+	"""
+	gate, rules = STRATEGY_RULES[name](columns)
+	count = len(columns["price"])
+	action = np.zeros(count, dtype=np.int8)
+	confidence = np.zeros(count, dtype=np.float64)
+	reason: List[Optional[str]] = [None] * count
+	for mask, side, base, text in rules:
+		take = gate & mask & (action == 0)
+		if not take.any():
+			continue
+		value = finish(base + bonus[side][take])
+		if name in PERCENT_CONFIDENCE:
+			value = value * 100
+		action[take] = side
+		confidence[take] = value
+		for i in np.flatnonzero(take):
+			reason[i] = text
+	return action, confidence, reason
+
+
+class SignalEngine:
+	"""Every strategy's entry rules for the whole scanned universe in one pass.
+
+	Same decisions as calling each ``generate_*_signal`` per symbol and keeping
+	the highest ``confidence * opportunity score`` (first strategy wins ties).
+	"""
+
+	def __init__(self, scorer: Optional[ConfidenceScorer] = None):
+		self.scorer = scorer or ConfidenceScorer()
+		self._lock = threading.Lock()
+		self.stats = {"evaluations": 0, "symbols": 0, "signals": 0, "fallbacks": 0, "last_ms": 0.0}
+
+	def evaluate(self, market_data: Dict[str, Dict], symbols: Iterable[str],
+				 strategy_names: Sequence[str]) -> Tuple[Dict[str, Tuple[int, float, str, Dict]], List[str]]:
+		"""({symbol: (signal count, best score, strategy, signal)}, fallback symbols).
+
+		Only symbols with at least one signal are in the dict; ``signal`` has the
+		scalar generators' shape {'action', 'reason', 'confidence'}.
+		"""
+		start = time.perf_counter()
+		names = [name for name in strategy_names if name in STRATEGY_RULES]
+		table = self.scorer.table("signal")
+		keys = tuple(dict.fromkeys(SIGNAL_KEYS + tuple(key for key in table.inputs if key not in ("price", "score"))))
+		rows, columns, fallback = gather(market_data, symbols, keys)
+		results: Dict[str, Tuple[int, float, str, Dict]] = {}
+		if rows and names:
+			bonus = {side: self.scorer.points("signal", columns, ACTIONS[side]) for side in (BUY, SELL)}
+			evaluated = [strategy_signals(columns, name, bonus, table.finish) for name in names]
+			actions = np.stack([action for action, _, _ in evaluated])
+			confidences = np.stack([confidence for _, confidence, _ in evaluated])
+			scores = np.where(actions != 0, confidences * columns["score"], -np.inf)
+			counts = (actions != 0).sum(axis=0)
+			best = scores.argmax(axis=0)  # First maximum = earliest strategy, like the stable sort
+			for i in np.flatnonzero(counts):
+				k = int(best[i])
+				results[rows[i]] = (int(counts[i]), float(scores[k, i]), names[k], {
+					"action": ACTIONS[int(actions[k, i])],
+					"reason": evaluated[k][2][i],
+					"confidence": float(confidences[k, i]),
+				})
+		with self._lock:
+			self.stats["evaluations"] += 1
+			self.stats["symbols"] += len(rows)
+			self.stats["signals"] += len(results)
+			self.stats["fallbacks"] += len(fallback)
+			self.stats["last_ms"] = round((time.perf_counter() - start) * 1000, 3)
+		return results, fallback
+
+	def get_stats(self) -> Dict:
+		with self._lock:
+			return dict(self.stats)
@@ -0,0 +1,72 @@
+import copy
+import time
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class StateSnapshot:
+	"""Trading state as of one publish. Never mutated after it is built: positions
+	are private copies, trades are shared (closed trades don't change)."""
+
+	version: int = 0
+	published_at: float = 0.0
+	positions: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+	trades: Tuple[Any, ...] = ()
+	current_capital: float = 0.0
+	reserved_capital: float = 0.0
+	strategy_stats: Mapping[str, Mapping[str, Any]] = field(default_factory=lambda: MappingProxyType({}))
+
+	@property
+	def equity(self) -> float:
+		return self.current_capital + self.reserved_capital
+
+
+class StatePublisher:
+	"""Copy-on-write state for readers that must not block the trading loop.
+
+	Writers (already serialized by the bot's data lock) call ``publish`` after
+	every mutation; it builds a new ``StateSnapshot`` and swaps the reference.
+	Readers call ``current()``: a plain attribute read, no lock, and the
+	snapshot they get is always complete and consistent.
+	"""
+
+	def __init__(self):
+		self._current = StateSnapshot()
+		self._publish_lock = threading.Lock()  # Only orders the version numbers of concurrent publishers
+		self.stats = {"publishes": 0, "last_publish_ms": 0.0, "max_publish_ms": 0.0}
+
+	def current(self) -> StateSnapshot:
+		return self._current
+
+	def publish(self, positions: Mapping[str, Any], trades: Iterable[Any], current_capital: float,
+				reserved_capital: float, strategy_stats: Mapping[str, Mapping[str, Any]]) -> StateSnapshot:
+		start = time.perf_counter()
+		frozen_positions = MappingProxyType({key: copy.copy(position) for key, position in positions.items()})
+		frozen_stats = MappingProxyType({name: dict(stats) for name, stats in strategy_stats.items()})
+		trades = tuple(trades)
+		with self._publish_lock:
+			snapshot = StateSnapshot(
+				version=self._current.version + 1,
+				published_at=time.time(),
+				positions=frozen_positions,
+				trades=trades,
+				current_capital=current_capital,
+				reserved_capital=reserved_capital,
+				strategy_stats=frozen_stats,
+			)
+			self._current = snapshot
+			elapsed_ms = (time.perf_counter() - start) * 1000
+			self.stats["publishes"] += 1
+			self.stats["last_publish_ms"] = round(elapsed_ms, 3)
+			self.stats["max_publish_ms"] = round(max(self.stats["max_publish_ms"], elapsed_ms), 3)
+		return snapshot
+
+	def get_stats(self) -> Dict:
+		snapshot = self._current
+		with self._publish_lock:
+			stats = dict(self.stats)
+		return dict(stats, version=snapshot.version, positions=len(snapshot.positions), trades=len(snapshot.trades),
+					age=round(time.time() - snapshot.published_at, 2) if snapshot.published_at else None)
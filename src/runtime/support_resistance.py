@@ -0,0 +1,73 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from src.runtime.kernels import pivot_flags, rolling_max, rolling_min  # noqa: F401 (re-exported)
+
+
+logger = logging.getLogger(__name__)
+
+
+def pivot_mask(highs: np.ndarray, lows: np.ndarray, windows: Iterable[int]):
+	"""Boolean (peaks, troughs) masks over the candles.
+
+	Candle i is a peak for window w when ``highs[i] == max(highs[i - w:i + w])``
+	(a trough likewise with lows and min), for ``w <= i < n - w``. With several
+	windows a candle qualifies if it does for any of them.
+	"""
+	count = len(highs)
+	peaks = np.zeros(count, dtype=bool)
+	troughs = np.zeros(count, dtype=bool)
+	for window in windows:
+		window_peaks, window_troughs = pivot_flags(highs, lows, window)
+		peaks |= window_peaks
+		troughs |= window_troughs
+	return peaks, troughs
+
+
+def cluster_levels(prices: np.ndarray, tolerance: float = 0.01, kind: str = "level") -> List[float]:
+	"""Keep a price when it is more than ``tolerance`` (relative) away from the last kept one.
+
+	The relative distance of every pair is computed at once; the Python loop
+	only hops from one kept level to the next (``next_kept``), not over every
+	candidate. A kept level of 0 ends the chain (relative distance undefined).
+	"""
+	prices = np.asarray(prices, dtype=np.float64)
+	if not len(prices):
+		return []
+	with np.errstate(divide="ignore", invalid="ignore"):
+		far = np.abs(prices[None, :] - prices[:, None]) / prices[:, None] > tolerance
+	far &= (prices > 0)[:, None]
+	far &= np.triu(np.ones((len(prices), len(prices)), dtype=bool), 1)
+	has_next = far.any(axis=1)
+	next_kept = far.argmax(axis=1)
+
+	kept = [0]
+	while has_next[kept[-1]]:
+		kept.append(int(next_kept[kept[-1]]))
+	if prices[kept[-1]] == 0 and kept[-1] < len(prices) - 1:
+		# Extremely rare but possible - later levels are skipped
+		logger.warning(f"⚠️ Zero price detected in {kind} levels, skipping")
+	return prices[kept].tolist()
+
+
+def support_resistance(highs: np.ndarray, lows: np.ndarray, windows: Union[int, Iterable[int]] = 20,
+					   lookback: Optional[int] = 100, tolerance: float = 0.01, keep: int = 3) -> Dict[str, List[float]]:
+	"""{'support': [...], 'resistance': [...]}: the ``keep`` highest clustered pivot levels of each kind.
+
+	Only the last ``lookback`` candles are used (None = all of them).
+	"""
+	highs = np.asarray(highs, dtype=np.float64)
+	lows = np.asarray(lows, dtype=np.float64)
+	if lookback is not None and len(highs) > lookback:
+		highs = highs[-lookback:]
+		lows = lows[-lookback:]
+	windows = (windows,) if isinstance(windows, (int, np.integer)) else tuple(windows)
+	peaks, troughs = pivot_mask(highs, lows, windows)
+	support = cluster_levels(lows[troughs], tolerance, "support")
+	resistance = cluster_levels(highs[peaks], tolerance, "resistance")
+	return {
+		'support': sorted(support)[-keep:],
+		'resistance': sorted(resistance)[-keep:],
+	}
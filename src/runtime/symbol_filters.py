@@ -0,0 +1,210 @@
+import os
+import json
+import time
+import logging
+import threading
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, Optional
+
+from src.runtime.transport import HttpTransport, get_transport
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+DEFAULT_STEP = Decimal("0.00000001")
+
+
+def _decimal(value) -> Optional[Decimal]:
+	"""Exchange step/tick string -> normalized Decimal (None for missing / zero)."""
+	if value in (None, ""):
+		return None
+	step = Decimal(str(value)).normalize()
+	return step if step > 0 else None
+
+
+def compact_symbol(symbol_data: Dict) -> Dict:
+	"""Keep only what order formatting needs from one exchangeInfo symbol (exact strings)."""
+	filters: Dict[str, Dict] = {}
+	for f in symbol_data.get("filters", []):
+		filter_type = f.get("filterType")
+		if filter_type == "LOT_SIZE":
+			filters["LOT_SIZE"] = {k: f[k] for k in ("minQty", "maxQty", "stepSize")}
+		elif filter_type == "PRICE_FILTER":
+			filters["PRICE_FILTER"] = {k: f[k] for k in ("minPrice", "maxPrice", "tickSize")}
+		elif filter_type in ("MIN_NOTIONAL", "NOTIONAL"):
+			# Binance uses MIN_NOTIONAL or NOTIONAL depending on symbol
+			filters["MIN_NOTIONAL"] = {"minNotional": f.get("minNotional", f.get("notional", "10.0"))}
+	return {
+		"baseAsset": symbol_data["baseAsset"],
+		"quoteAsset": symbol_data["quoteAsset"],
+		"baseAssetPrecision": symbol_data["baseAssetPrecision"],
+		"quoteAssetPrecision": symbol_data["quoteAssetPrecision"],
+		"quotePrecision": symbol_data.get("quotePrecision", symbol_data["quoteAssetPrecision"]),
+		"filters": filters,
+	}
+
+
+def runtime_info(compact: Dict) -> Dict:
+	"""Compact entry -> the float-valued dict the bot keeps in ``symbol_info_cache``."""
+	return dict(compact, filters={
+		name: {key: float(value) for key, value in values.items()}
+		for name, values in compact["filters"].items()
+	})
+
+
+class SymbolFilterCache:
+	"""exchangeInfo filters for the traded symbols, persisted on local disk.
+
+	Only the symbols we trade are kept, as exact exchange strings, in a small
+	JSON file. A cache younger than ``ttl`` seconds is used without touching the
+	network; an older one is refreshed, but still used if the exchange cannot be
+	reached. Step and tick sizes are pre-computed as Decimals for formatting.
+	"""
+
+	def __init__(self, path: str, base_url: str, symbols: Iterable[str], ttl: float = 6 * 3600,
+				 transport: Optional[HttpTransport] = None, fetcher: Optional[Callable[[], Optional[Dict]]] = None):
+		self.path = path
+		self.base_url = base_url
+		self.symbols = list(dict.fromkeys(symbols))
+		self.ttl = float(ttl)
+		self.transport = transport or get_transport()
+		self._fetcher = fetcher or self._fetch_exchange_info
+		self.info: Dict[str, Dict] = {}  # {symbol: {baseAssetPrecision, ..., filters}} (floats)
+		self.steps: Dict[str, Dict[str, Optional[Decimal]]] = {}  # {symbol: {'step': Decimal, 'tick': Decimal}}
+		self.fetched_at = 0.0
+		self.source = None
+		self._lock = threading.Lock()
+		self._refresh_thread: Optional[threading.Thread] = None
+		self._stop = threading.Event()
+		self.stats = {"disk_loads": 0, "refreshes": 0, "refresh_failures": 0}
+
+	def age(self) -> float:
+		return time.time() - self.fetched_at if self.fetched_at else float("inf")
+
+	def is_fresh(self) -> bool:
+		return self.age() < self.ttl
+
+	def _install(self, compact: Dict[str, Dict], fetched_at: float, source: str) -> None:
+		info = {symbol: runtime_info(entry) for symbol, entry in compact.items()}
+		steps = {
+			symbol: {
+				"step": _decimal(entry["filters"].get("LOT_SIZE", {}).get("stepSize")),
+				"tick": _decimal(entry["filters"].get("PRICE_FILTER", {}).get("tickSize")),
+			}
+			for symbol, entry in compact.items()
+		}
+		with self._lock:
+			# Update in place: callers hold a reference to self.info
+			self.info.update(info)
+			self.steps.update(steps)
+			self.fetched_at = fetched_at
+			self.source = source
+
+	def _read_disk(self) -> Optional[Dict]:
+		try:
+			with open(self.path, "r", encoding="utf-8") as f:
+				doc = json.load(f)
+		except FileNotFoundError:
+			return None
+		except (OSError, ValueError) as e:
+			logger.warning(f"Ignoring unreadable symbol info cache {self.path}: {e}")
+			return None
+		if doc.get("version") != CACHE_VERSION or doc.get("base_url") != self.base_url:
+			return None
+		return doc
+
+	def _write_disk(self, compact: Dict[str, Dict], fetched_at: float) -> None:
+		doc = {"version": CACHE_VERSION, "base_url": self.base_url, "fetched_at": fetched_at,
+			   "requested": self.symbols, "symbols": compact}
+		tmp_path = f"{self.path}.tmp"
+		try:
+			os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+			with open(tmp_path, "w", encoding="utf-8") as f:
+				json.dump(doc, f, separators=(",", ":"))
+			os.replace(tmp_path, self.path)
+		except OSError as e:
+			logger.warning(f"Could not write symbol info cache {self.path}: {e}")
+
+	def _fetch_exchange_info(self) -> Optional[Dict]:
+		url = f"{self.base_url}/api/v3/exchangeInfo"
+		# Ask only for our symbols; one unknown symbol fails the whole request, so fall back to the full list
+		response = self.transport.get(url, params={"symbols": json.dumps(self.symbols, separators=(",", ":"))},
+									  timeout=10, label="exchangeInfo")
+		if response is None or response.status_code != 200:
+			response = self.transport.get(url, timeout=10, label="exchangeInfo")
+		if response is None or response.status_code != 200:
+			logger.error(f"exchangeInfo request failed: {response.status_code if response is not None else 'No response'}")
+			return None
+		return response.json()
+
+	def refresh(self) -> bool:
+		"""Download exchangeInfo, keep our symbols and rewrite the disk cache."""
+		try:
+			data = self._fetcher()
+			wanted = set(self.symbols)
+			compact = {s["symbol"]: compact_symbol(s) for s in (data or {}).get("symbols", []) if s.get("symbol") in wanted}
+		except Exception as e:
+			logger.error(f"Error refreshing symbol info: {e}")
+			compact = {}
+		if not compact:
+			self.stats["refresh_failures"] += 1
+			return False
+		fetched_at = time.time()
+		self._install(compact, fetched_at, "exchange")
+		self._write_disk(compact, fetched_at)
+		self.stats["refreshes"] += 1
+		return True
+
+	def load(self) -> bool:
+		"""Fill the cache: disk if fresh, else the exchange, else a stale disk copy."""
+		doc = self._read_disk()
+		if doc is not None:
+			self._install(doc["symbols"], float(doc.get("fetched_at", 0)), "disk")
+			self.stats["disk_loads"] += 1
+			# Symbols the exchange does not list stay absent; only a changed universe forces a download
+			missing = set(self.symbols) - set(doc.get("requested", []))
+			if self.is_fresh() and not missing:
+				logger.info(f"Symbol info loaded from {self.path} ({len(self.info)} symbols, {self.age() / 60:.0f} min old)")
+				return True
+		if self.refresh():
+			return True
+		if self.info:
+			logger.warning(f"exchangeInfo unavailable, using cached symbol info ({self.age() / 3600:.1f}h old)")
+			return True
+		return False
+
+	def start_background_refresh(self, interval: Optional[float] = None) -> None:
+		"""Refresh in a daemon thread every ``interval`` seconds (default: the TTL)."""
+		if self._refresh_thread is not None:
+			return
+		interval = self.ttl if interval is None else float(interval)
+
+		def run():
+			delay = max(1.0, interval - self.age())
+			while not self._stop.wait(delay):
+				# On failure keep serving the old filters and retry in a minute
+				delay = interval if self.refresh() else 60.0
+
+		self._refresh_thread = threading.Thread(target=run, daemon=True, name="symbol-info-refresh")
+		self._refresh_thread.start()
+
+	def stop(self) -> None:
+		self._stop.set()
+
+	def quantity_step(self, symbol: str) -> Decimal:
+		steps = self.steps.get(symbol)
+		return (steps and steps["step"]) or DEFAULT_STEP
+
+	def price_tick(self, symbol: str) -> Optional[Decimal]:
+		steps = self.steps.get(symbol)
+		return steps["tick"] if steps else None
+
+	def get_stats(self) -> Dict:
+		return dict(
+			self.stats,
+			symbols=len(self.info),
+			source=self.source,
+			age_seconds=round(self.age(), 1) if self.fetched_at else None,
+			ttl=self.ttl,
+		)
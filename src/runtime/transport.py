@@ -0,0 +1,196 @@
+import time
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.runtime.rate_limiter import WeightRateLimiter, priority_for, request_weight
+
+
+logger = logging.getLogger(__name__)
+
+# Server-side hiccups worth retrying for idempotent (GET) requests only
+RETRYABLE_GET_STATUSES = (500, 502, 503, 504)
+
+
+class HttpTransport:
+	"""Shared keep-alive HTTP transport for exchange REST traffic.
+
+	Keeps one pooled ``requests.Session`` per (base URL, API key) so repeated
+	calls reuse open TCP+TLS connections instead of handshaking every time.
+	All callers get the same timeout / retry policy and per-label timing stats.
+
+	With ``weight_limit`` set, every request first passes a per-host
+	``WeightRateLimiter`` (request weight, priority, exchange weight headers).
+	"""
+
+	def __init__(self, pool_size: int = 20, timeout: float = 10.0, max_retries: int = 3,
+				 backoff_base: float = 1.0, rate_limit_backoff: float = 2.0, weight_limit: Optional[int] = 6000,
+				 weight_reserve: float = 0.2, max_limiter_wait: float = 30.0):
+		self.pool_size = int(pool_size)
+		self.timeout = float(timeout)
+		self.max_retries = max(1, int(max_retries))
+		self.backoff_base = float(backoff_base)
+		self.rate_limit_backoff = float(rate_limit_backoff)
+		self.weight_limit = weight_limit
+		self.weight_reserve = float(weight_reserve)
+		self.max_limiter_wait = float(max_limiter_wait)
+		self._sessions: Dict[Tuple[str, Optional[str]], requests.Session] = {}
+		self._sessions_lock = threading.Lock()
+		self._limiters: Dict[str, WeightRateLimiter] = {}
+		self._stats: Dict[str, Dict] = {}
+		self._stats_lock = threading.Lock()
+
+	@staticmethod
+	def _base_of(url: str) -> str:
+		parts = urlsplit(url)
+		return f"{parts.scheme}://{parts.netloc}"
+
+	def session(self, base_url: str, api_key: Optional[str] = None) -> requests.Session:
+		"""Pooled session for ``base_url`` (and ``api_key``, sent as X-MBX-APIKEY)."""
+		key = (self._base_of(base_url), api_key)
+		with self._sessions_lock:
+			session = self._sessions.get(key)
+			if session is None:
+				session = requests.Session()
+				adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+				session.mount("https://", adapter)
+				session.mount("http://", adapter)
+				if api_key:
+					session.headers["X-MBX-APIKEY"] = api_key
+				self._sessions[key] = session
+			return session
+
+	def limiter(self, base_url: str) -> Optional[WeightRateLimiter]:
+		"""Weight limiter for the host of ``base_url`` (None when limiting is disabled)."""
+		if not self.weight_limit:
+			return None
+		key = self._base_of(base_url)
+		with self._sessions_lock:
+			limiter = self._limiters.get(key)
+			if limiter is None:
+				limiter = WeightRateLimiter(self.weight_limit, reserve=self.weight_reserve)
+				self._limiters[key] = limiter
+			return limiter
+
+	def request(self, method: str, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+				api_key: Optional[str] = None, timeout: Optional[float] = None, max_retries: Optional[int] = None,
+				label: Optional[str] = None, priority: Optional[int] = None) -> Optional[requests.Response]:
+		"""Send a request with the shared retry policy.
+
+		Timeouts / connection errors are retried with exponential backoff, HTTP 429
+		with a longer backoff (or the server's Retry-After), and 5xx only for GET.
+		``priority`` defaults to high for order/account endpoints, low otherwise.
+		Returns the last response (whatever its status) or None if every attempt
+		failed at the network level or the rate limiter gave up waiting.
+		"""
+		method = method.upper()
+		path = urlsplit(url).path
+		label = label or path
+		timeout = self.timeout if timeout is None else timeout
+		attempts = self.max_retries if max_retries is None else max(1, int(max_retries))
+		session = self.session(url, api_key)
+		limiter = self.limiter(url)
+		weight = request_weight(method, path, params)
+		priority = priority_for(path) if priority is None else priority
+
+		for attempt in range(attempts):
+			last_attempt = attempt == attempts - 1
+			if limiter is not None and not limiter.acquire(weight, priority, timeout=self.max_limiter_wait):
+				self._record(label, 0.0, error=True)
+				logger.warning(f"{method} {label} dropped: request weight budget unavailable for {self.max_limiter_wait}s")
+				return None
+			start = time.perf_counter()
+			try:
+				response = session.request(method, url, params=params, headers=headers, timeout=timeout)
+			except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+				self._record(label, time.perf_counter() - start, error=True)
+				if last_attempt:
+					logger.error(f"{method} {label} failed after {attempts} attempts: {e}")
+					return None
+				wait_time = self.backoff_base * (2 ** attempt)
+				logger.warning(f"{method} {label} network error: {e}, retry {attempt+1}/{attempts} in {wait_time}s")
+				time.sleep(wait_time)
+				continue
+			except Exception as e:
+				self._record(label, time.perf_counter() - start, error=True)
+				logger.error(f"{method} {label} unexpected error: {e}")
+				return None
+
+			self._record(label, time.perf_counter() - start, error=response.status_code >= 400)
+			if limiter is not None:
+				limiter.observe(response.headers, response.status_code)
+
+			retryable = response.status_code == 429 or (method == "GET" and response.status_code in RETRYABLE_GET_STATUSES)
+			if retryable and not last_attempt:
+				if response.status_code == 429 and limiter is not None and limiter.blocked_for() > 0:
+					# Retry-After is enforced by the limiter for every caller before the next send
+					logger.warning(f"{method} {label} HTTP 429, retry {attempt+1}/{attempts} after Retry-After ({limiter.blocked_for():.1f}s)")
+					continue
+				wait_time = self.rate_limit_backoff * (2 ** attempt) if response.status_code == 429 else self.backoff_base * (2 ** attempt)
+				logger.warning(f"{method} {label} HTTP {response.status_code}, retry {attempt+1}/{attempts} in {wait_time}s")
+				time.sleep(wait_time)
+				continue
+			return response
+		return None
+
+	def get(self, url: str, **kwargs) -> Optional[requests.Response]:
+		return self.request("GET", url, **kwargs)
+
+	def post(self, url: str, **kwargs) -> Optional[requests.Response]:
+		return self.request("POST", url, **kwargs)
+
+	def delete(self, url: str, **kwargs) -> Optional[requests.Response]:
+		return self.request("DELETE", url, **kwargs)
+
+	def _record(self, label: str, elapsed: float, error: bool = False) -> None:
+		elapsed_ms = elapsed * 1000.0
+		with self._stats_lock:
+			stats = self._stats.setdefault(label, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0})
+			stats["count"] += 1
+			stats["errors"] += int(error)
+			stats["total_ms"] += elapsed_ms
+			stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+			stats["last_ms"] = elapsed_ms
+
+	def get_stats(self) -> Dict[str, Dict]:
+		"""Per-label request count, error count and latency (avg/max/last, ms)."""
+		with self._stats_lock:
+			return {
+				label: {
+					"count": s["count"],
+					"errors": s["errors"],
+					"avg_ms": round(s["total_ms"] / s["count"], 2) if s["count"] else 0.0,
+					"max_ms": round(s["max_ms"], 2),
+					"last_ms": round(s["last_ms"], 2),
+				}
+				for label, s in self._stats.items()
+			}
+
+	def get_limiter_stats(self) -> Dict[str, Dict]:
+		"""Rate limiter state per host."""
+		with self._sessions_lock:
+			limiters = dict(self._limiters)
+		return {host: limiter.get_stats() for host, limiter in limiters.items()}
+
+	def close(self) -> None:
+		with self._sessions_lock:
+			for session in self._sessions.values():
+				session.close()
+			self._sessions.clear()
+
+
+_default_transport: Optional[HttpTransport] = None
+_default_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+	"""Process-wide shared transport (created on first use)."""
+	global _default_transport
+	with _default_lock:
+		if _default_transport is None:
+			_default_transport = HttpTransport()
+		return _default_transport
@@ -0,0 +1,358 @@
+import time
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional
+
+from websocket import WebSocketApp
+
+
+logger = logging.getLogger(__name__)
+
+LISTEN_KEY_PATH = "/api/v3/userDataStream"
+LISTEN_KEY_NOT_FOUND = -1125
+
+FINAL_STATUSES = frozenset(("FILLED", "CANCELED", "REJECTED", "EXPIRED", "EXPIRED_IN_MATCH"))
+
+# (method, path, params) -> response; requests are sent with the API key, unsigned
+Sender = Callable[[str, str, Dict[str, Any]], Any]
+
+
+@dataclass(slots=True)
+class OrderState:
+	"""An order as the latest ``executionReport`` describes it (quantities are cumulative)."""
+
+	client_order_id: str
+	symbol: str
+	side: str
+	order_type: str
+	status: str
+	orig_qty: float
+	executed_qty: float = 0.0
+	quote_qty: float = 0.0
+	order_id: Optional[int] = None
+	last_qty: float = 0.0  # Size / price of the latest fill
+	last_price: float = 0.0
+	commission: float = 0.0  # Summed over fills, in commission_asset
+	commission_asset: Optional[str] = None
+	fills: int = 0
+	updated_at: int = 0  # Exchange transaction time, ms
+
+	@property
+	def avg_price(self) -> float:
+		return self.quote_qty / self.executed_qty if self.executed_qty > 0 else 0.0
+
+	@property
+	def is_final(self) -> bool:
+		return self.status in FINAL_STATUSES
+
+	def as_order(self) -> Dict[str, Any]:
+		"""Same shape as a GET /api/v3/order response."""
+		return {
+			"symbol": self.symbol, "orderId": self.order_id, "clientOrderId": self.client_order_id,
+			"origQty": f"{self.orig_qty:.8f}", "executedQty": f"{self.executed_qty:.8f}",
+			"cummulativeQuoteQty": f"{self.quote_qty:.8f}", "status": self.status, "type": self.order_type,
+			"side": self.side, "updateTime": self.updated_at,
+		}
+
+
+class UserDataStream:
+	"""Account events pushed over the exchange's user-data stream.
+
+	A listenKey is created over REST (API key only, no signature), kept alive
+	every ``keepalive_interval`` seconds and replaced when the exchange drops
+	it (keepalive error -1125 or a ``listenKeyExpired`` event). The socket
+	at ``<ws_url>/ws/<listenKey>`` delivers:
+
+	- ``outboundAccountPosition`` / ``balanceUpdate``: the balance cache
+	- ``executionReport``: the order-state cache, one entry per client order id
+	  (partial fills show up as they happen; listeners get every report)
+
+	The stream only sends what changed, so after each (re)connect ``resync()``
+	is called for a full account snapshot (GET /api/v3/account) to seed the
+	balances; per-asset update times keep a late snapshot from overwriting a
+	newer event. ``get_balance`` returns None until that seed arrived and
+	whenever the socket is down, so callers fall back to REST.
+	"""
+
+	def __init__(self, ws_url: str, send: Sender, resync: Optional[Callable[[], Optional[Dict]]] = None,
+				 keepalive_interval: float = 30 * 60, max_orders: int = 500, reconnect_backoff: float = 1.0,
+				 max_reconnect_backoff: float = 60.0, ping_interval: float = 20.0, ping_timeout: float = 10.0):
+		self.ws_url = ws_url.rstrip("/")
+		self.send = send
+		self.resync = resync
+		self.keepalive_interval = float(keepalive_interval)
+		self.max_orders = max(1, int(max_orders))
+		self.reconnect_backoff = float(reconnect_backoff)
+		self.max_reconnect_backoff = float(max_reconnect_backoff)
+		self.ping_interval = float(ping_interval)
+		self.ping_timeout = float(ping_timeout)
+		self._balances: Dict[str, tuple] = {}  # {asset: (free, locked, updated_at_ms)}
+		self._orders: "OrderedDict[str, OrderState]" = OrderedDict()
+		self._lock = threading.Lock()
+		self._listeners: List[Callable[[OrderState], None]] = []
+		self._listen_key: Optional[str] = None
+		self._app: Optional[WebSocketApp] = None
+		self._connected = False
+		self._seeded = False
+		self._stop = threading.Event()
+		self._threads: List[threading.Thread] = []
+		self._last_event_at = 0.0
+		self.stats = {"events": 0, "execution_reports": 0, "partial_fills": 0, "account_updates": 0,
+					  "listen_keys": 0, "keepalives": 0, "keepalive_errors": 0, "resyncs": 0, "reconnects": 0,
+					  "errors": 0, "listener_errors": 0}
+
+	def _count(self, name: str) -> None:
+		with self._lock:
+			self.stats[name] += 1
+
+	def add_listener(self, listener: Callable[[OrderState], None]) -> None:
+		"""Call ``listener(order_state)`` after every execution report (runs on the socket thread)."""
+		self._listeners.append(listener)
+
+	# ------------------------------------------------------------------ listenKey
+
+	def create_listen_key(self) -> Optional[str]:
+		response = self.send("POST", LISTEN_KEY_PATH, {})
+		if response is None or response.status_code != 200:
+			self._count("errors")
+			logger.warning(f"User stream: listenKey request failed ({getattr(response, 'status_code', 'no response')})")
+			return None
+		self._count("listen_keys")
+		return response.json().get("listenKey")
+
+	def keepalive(self) -> bool:
+		"""Extend the current listenKey; a key the exchange no longer knows is dropped (and replaced on reconnect)."""
+		key = self._listen_key
+		if not key:
+			return False
+		response = self.send("PUT", LISTEN_KEY_PATH, {"listenKey": key})
+		if response is not None and response.status_code == 200:
+			self._count("keepalives")
+			return True
+		self._count("keepalive_errors")
+		try:
+			code = response.json().get("code") if response is not None else None
+		except Exception:
+			code = None
+		if code == LISTEN_KEY_NOT_FOUND:
+			logger.warning("User stream: listenKey expired, reconnecting with a new one")
+			self._renew()
+		return False
+
+	def _renew(self) -> None:
+		self._listen_key = None
+		app = self._app
+		if app is not None:
+			app.close()
+
+	# ------------------------------------------------------------------ lifecycle
+
+	def start(self) -> None:
+		if self._threads:
+			return
+		self._stop.clear()
+		for target, name in ((self._run, "user-stream"), (self._keepalive_loop, "user-stream-keepalive")):
+			thread = threading.Thread(target=target, daemon=True, name=name)
+			thread.start()
+			self._threads.append(thread)
+
+	def stop(self) -> None:
+		self._stop.set()
+		app = self._app
+		if app is not None:
+			try:
+				app.close()
+			except Exception as e:
+				logger.debug(f"User stream close error: {e}")
+		for thread in self._threads:
+			thread.join(timeout=5)
+		self._threads = []
+		key, self._listen_key = self._listen_key, None
+		if key:
+			self.send("DELETE", LISTEN_KEY_PATH, {"listenKey": key})
+
+	def _keepalive_loop(self) -> None:
+		while not self._stop.wait(self.keepalive_interval):
+			try:
+				self.keepalive()
+			except Exception as e:
+				self._count("keepalive_errors")
+				logger.warning(f"User stream keepalive error: {e}")
+
+	def _run(self) -> None:
+		backoff = self.reconnect_backoff
+		connected_once = False
+
+		def on_open(_: WebSocketApp):
+			nonlocal backoff, connected_once
+			if connected_once:
+				self._count("reconnects")
+			connected_once = True
+			backoff = self.reconnect_backoff
+			self._connected = True
+			self._resync()
+
+		def on_message(_: WebSocketApp, message: str):
+			self.handle_message(message)
+
+		def on_error(_: WebSocketApp, error: Exception):
+			self._count("errors")
+			logger.warning(f"User stream error: {error}")
+
+		def on_close(_: WebSocketApp, *args):
+			self._connected = False
+			self._seeded = False
+
+		while not self._stop.is_set():
+			try:
+				if not self._listen_key:
+					self._listen_key = self.create_listen_key()
+				if self._listen_key:
+					app = WebSocketApp(f"{self.ws_url}/ws/{self._listen_key}", on_open=on_open, on_message=on_message,
+									   on_error=on_error, on_close=on_close)
+					self._app = app
+					if self.ping_interval > 0:
+						app.run_forever(ping_interval=self.ping_interval, ping_timeout=self.ping_timeout)
+					else:
+						app.run_forever()
+			except Exception as e:
+				self._count("errors")
+				logger.warning(f"User stream crashed: {e}")
+			self._connected = False
+			self._seeded = False
+			if self._stop.is_set():
+				break
+			logger.warning(f"User stream disconnected, reconnecting in {backoff:.1f}s")
+			self._stop.wait(backoff)
+			backoff = min(backoff * 2, self.max_reconnect_backoff)
+
+	def _resync(self) -> None:
+		if self.resync is None:
+			self._seeded = True
+			return
+		try:
+			account = self.resync()
+		except Exception as e:
+			account = None
+			logger.warning(f"User stream resync failed: {e}")
+		if account is None:
+			self._count("errors")
+			return
+		self.apply_account(account)
+		self._count("resyncs")
+		self._seeded = True
+
+	# ------------------------------------------------------------------ events
+
+	def apply_account(self, account: Dict) -> None:
+		"""Seed balances from a GET /api/v3/account response."""
+		updated_at = int(account.get("updateTime", 0))
+		self._apply_balances(((b["asset"], b["free"], b["locked"]) for b in account.get("balances", [])), updated_at)
+
+	def _apply_balances(self, balances, updated_at: int) -> None:
+		with self._lock:
+			for asset, free, locked in balances:
+				current = self._balances.get(asset)
+				if current is None or current[2] <= updated_at:
+					self._balances[asset] = (float(free), float(locked), updated_at)
+
+	def handle_message(self, message: str) -> None:
+		"""Apply one user-data event."""
+		try:
+			payload = json.loads(message)
+			data = payload.get("data", payload)
+			event = data.get("e")
+			if event == "executionReport":
+				self._on_execution_report(data)
+			elif event == "outboundAccountPosition":
+				self._apply_balances(((b["a"], b["f"], b["l"]) for b in data["B"]), int(data.get("u", data.get("E", 0))))
+				self._count("account_updates")
+			elif event == "balanceUpdate":
+				with self._lock:
+					free, locked, updated_at = self._balances.get(data["a"], (0.0, 0.0, 0))
+					self._balances[data["a"]] = (free + float(data["d"]), locked, max(updated_at, int(data.get("T", 0))))
+				self._count("account_updates")
+			elif event == "listenKeyExpired":
+				logger.warning("User stream: listenKeyExpired, reconnecting with a new key")
+				self._renew()
+			self._count("events")
+			self._last_event_at = time.time()
+		except Exception as e:
+			self._count("errors")
+			logger.debug(f"User stream message parse error: {e}")
+
+	def _on_execution_report(self, data: Dict) -> None:
+		# A cancel reports its own id in "c" and the cancelled order's in "C"
+		client_order_id = data.get("C") or data["c"]
+		last_qty = float(data.get("l", 0))
+		with self._lock:
+			state = self._orders.pop(client_order_id, None)
+			if state is None:
+				state = OrderState(client_order_id=client_order_id, symbol=data["s"], side=data["S"],
+								   order_type=data.get("o", "MARKET"), status=data["X"], orig_qty=float(data.get("q", 0)))
+			transact_time = int(data.get("T", data.get("E", 0)))
+			if transact_time >= state.updated_at:  # Reports can arrive out of order: cumulative fields win
+				state.status = data["X"]
+				state.order_id = data.get("i", state.order_id)
+				state.executed_qty = float(data.get("z", state.executed_qty))
+				state.quote_qty = float(data.get("Z", state.quote_qty))
+				state.updated_at = transact_time
+			if data.get("x") == "TRADE" and last_qty > 0:
+				state.last_qty, state.last_price = last_qty, float(data.get("L", 0))
+				state.commission += float(data.get("n", 0) or 0)
+				state.commission_asset = data.get("N") or state.commission_asset
+				state.fills += 1
+			self._orders[client_order_id] = state
+			while len(self._orders) > self.max_orders:
+				self._orders.popitem(last=False)
+			self.stats["execution_reports"] += 1
+			if data["X"] == "PARTIALLY_FILLED" and data.get("x") == "TRADE":
+				self.stats["partial_fills"] += 1
+			snapshot = replace(state)
+		for listener in self._listeners:
+			try:
+				listener(snapshot)
+			except Exception as e:
+				self._count("listener_errors")
+				logger.debug(f"User stream listener error: {e}")
+
+	# ------------------------------------------------------------------ readers
+
+	def is_ready(self) -> bool:
+		"""Socket up and balances seeded since the last (re)connect."""
+		return self._connected and self._seeded
+
+	def get_balance(self, asset: str) -> Optional[Dict[str, float]]:
+		"""{'free', 'locked', 'total'} for ``asset`` (0 if the account has none), None if the cache can't be trusted."""
+		if not self.is_ready():
+			return None
+		with self._lock:
+			free, locked, _ = self._balances.get(asset, (0.0, 0.0, 0))
+		return {"free": free, "locked": locked, "total": free + locked}
+
+	def get_order(self, client_order_id: str) -> Optional[OrderState]:
+		with self._lock:
+			state = self._orders.get(client_order_id)
+			return replace(state) if state is not None else None
+
+	def final_order(self, client_order_id: str) -> Optional[Dict[str, Any]]:
+		"""The order as a REST order dict once it reached a final status (order pipeline lookups), else None."""
+		state = self.get_order(client_order_id)
+		return state.as_order() if state is not None and state.is_final else None
+
+	def get_stats(self) -> Dict:
+		with self._lock:
+			stats = dict(self.stats)
+			balances = {asset: round(free + locked, 8) for asset, (free, locked, _) in self._balances.items() if free + locked > 0}
+			orders = len(self._orders)
+		return dict(
+			stats,
+			connected=self._connected,
+			ready=self.is_ready(),
+			orders=orders,
+			balances=balances,
+			last_event_age=round(time.time() - self._last_event_at, 2) if self._last_event_at else None,
+		)
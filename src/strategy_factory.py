@@ -12,6 +12,8 @@ from datetime import datetime
 import logging
 from itertools import product
 
+from src.runtime.feature_store import FeatureStore, get_feature_store
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -73,7 +75,7 @@ def generate_strategy_candidates(templates, symbols, regimes):
     # Was returning after processing just 1 symbol & 1 regime!
     return candidates
             
-def lightweight_simulation(df, strategy_type, params):
+def lightweight_simulation(df, strategy_type, params, features=None):
     """
     Perform lightweight simulation to estimate trade count
     
@@ -81,69 +83,63 @@ def lightweight_simulation(df, strategy_type, params):
         df (pd.DataFrame): Price data
         strategy_type (str): Type of strategy
         params (dict): Strategy parameters
+        features (FeatureSet): Shared feature columns of ``df`` (computed here if None)
         
     Returns:
         dict: Simulation results
     """
     try:
+        if features is None:
+            features = FeatureStore(None).dataset("", "", df)
+        
         # Calculate basic indicators
         df = df.copy()
-        df['returns'] = df['close'].pct_change()
-        df['volatility'] = df['returns'].rolling(20).std()
+        df['returns'] = features['returns']
+        df['volatility'] = features['volatility_20']
         
         # Simple signal generation based on strategy type
         if strategy_type == 'Pullback':
             # RSI-based pullback
-            rsi_period = 14
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=rsi_period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
+            rsi = features['rsi_14']
             
             # Entry signals
-            entry_signals = (rsi < params['rsi_entry']) & (df['volume'] > df['volume'].rolling(20).mean() * params['volume_ratio'])
+            entry_signals = (rsi < params['rsi_entry']) & (df['volume'] > features['volume_sma_20'] * params['volume_ratio'])
             trade_count = entry_signals.sum()
             
         elif strategy_type == 'Breakout':
             # Volume breakout
-            lookback = params['lookback']
-            vol_threshold = df['volume'].rolling(lookback).mean() * params['vol_mult']
-            price_breakout = df['close'] > df['close'].rolling(lookback).max().shift(1)
+            lookback = int(params['lookback'])
+            vol_threshold = features[f'volume_sma_{lookback}'] * params['vol_mult']
+            price_breakout = df['close'] > features[f'close_max_{lookback}'].shift(1)
             
             entry_signals = (df['volume'] > vol_threshold) & price_breakout
             trade_count = entry_signals.sum()
             
         elif strategy_type == 'MeanReversion':
             # RSI mean reversion
-            rsi_period = 14
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=rsi_period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
+            rsi = features['rsi_14']
             
             entry_signals = rsi < params['rsi_buy']
             trade_count = entry_signals.sum()
             
         elif strategy_type == 'Momentum':
             # EMA crossover
-            ema_short = df['close'].ewm(span=params['ema_short']).mean()
-            ema_long = df['close'].ewm(span=params['ema_long']).mean()
+            ema_short = features[f"ema_{int(params['ema_short'])}"]
+            ema_long = features[f"ema_{int(params['ema_long'])}"]
             
             entry_signals = (ema_short > ema_long) & (ema_short.shift(1) <= ema_long.shift(1))
             trade_count = entry_signals.sum()
             
         else:
             trade_count = 0
-            
-            return {
+        
+        return {
             "trade_count": trade_count,
             "sufficient": trade_count >= 50,
             "data_points": len(df)
-            }
-            
-        except Exception as e:
+        }
+        
+    except Exception as e:
         logger.warning(f"Lightweight simulation failed: {e}")
         return {
             "trade_count": 0,
@@ -164,6 +160,7 @@ def filter_candidates(candidates, data_dir="data/processed"):
         list: Filtered candidates
     """
     filtered_candidates = []
+    feature_store = get_feature_store(data_dir)
     
     for candidate in candidates:
         symbol = candidate['symbol']
@@ -185,8 +182,9 @@ def filter_candidates(candidates, data_dir="data/processed"):
                 df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
                 df = df.set_index('timestamp')
             
-            # Perform lightweight simulation
-            sim_result = lightweight_simulation(df, candidate['strategy_type'], candidate['params'])
+            # Perform lightweight simulation (features are computed once per symbol/timeframe/dataset)
+            features = feature_store.dataset(symbol, required_tf, df)
+            sim_result = lightweight_simulation(df, candidate['strategy_type'], candidate['params'], features)
             
             if sim_result['sufficient']:
                 candidate['simulation_result'] = sim_result
@@ -5,7 +5,8 @@ from typing import Dict, List
 
 from src.runtime.paths import get_paths, ensure_dirs
 from src.runtime.datafeed import LiveDataFeed
-import math
+from src.runtime.kernels import gbm_path
+import numpy as np
 import random
 
 
@@ -20,6 +21,26 @@ def write_csv(path: str, rows: List[Dict]) -> None:
 			w.writerow(r)
 
 
+def synthetic_candles(symbol: str, limit: int, config: Dict) -> List[Dict]:
+	"""Approximate 1m GBM candles, draw for draw the same stream as the old per-candle loop."""
+	if limit <= 0:
+		return []
+	rng = random.Random(int(config.get("simulate_seed", 42)))
+	mu = float(config.get("gbm_mu", 0.0))
+	sigma = float(config.get("gbm_sigma", 0.02))
+	# Per candle: u1, u2 (Box-Muller), high wick, low wick, volume
+	draws = np.array([rng.random() for _ in range(limit * 5)], dtype=np.float64).reshape(limit, 5)
+	closes = gbm_path(20000.0, np.maximum(1e-12, draws[:, :2]), mu, sigma, 1.0 / 1440.0)
+	opens = np.concatenate(([20000.0], closes[:-1]))
+	highs = np.maximum(opens, closes) * (1.0 + 0.001 * draws[:, 2])
+	lows = np.minimum(opens, closes) * (1.0 - 0.001 * draws[:, 3])
+	volumes = 100 + 50 * draws[:, 4]
+	return [
+		{"ts": (i + 1) * 60, "open": o, "high": h, "low": l, "close": c, "volume": v, "symbol": symbol}
+		for i, (o, h, l, c, v) in enumerate(zip(opens.tolist(), highs.tolist(), lows.tolist(), closes.tolist(), volumes.tolist()))
+	]
+
+
 def main() -> None:
 	paths = get_paths()
 	ensure_dirs(paths)
@@ -33,26 +54,7 @@ def main() -> None:
 		rows = feed.backfill_klines(symbol, limit=limit)
 		# Fallback to synthetic GBM candles if no data available
 		if not rows:
-			seed = int(config.get("simulate_seed", 42))
-			rng = random.Random(seed)
-			mu = float(config.get("gbm_mu", 0.0))
-			sigma = float(config.get("gbm_sigma", 0.02))
-			price = 20000.0
-			rows = []
-			# approximate 1m candles
-			for i in range(limit):
-				u1 = max(1e-12, rng.random())
-				u2 = max(1e-12, rng.random())
-				z = ((-2.0 * math.log(u1)) ** 0.5) * math.cos(2.0 * math.pi * u2)
-				growth = (mu - 0.5 * sigma * sigma) * (1.0/1440.0) + sigma * (1.0/1440.0) ** 0.5 * z
-				open_p = price
-				close_p = max(0.01, price * math.exp(growth))
-				high_p = max(open_p, close_p) * (1.0 + 0.001 * rng.random())
-				low_p = min(open_p, close_p) * (1.0 - 0.001 * rng.random())
-				vol = 100 + 50 * rng.random()
-				ts = (i + 1) * 60
-				rows.append({"ts": ts, "open": open_p, "high": high_p, "low": low_p, "close": close_p, "volume": vol, "symbol": symbol})
-				price = close_p
+			rows = synthetic_candles(symbol, limit, config)
 		outfile = os.path.join(datasets_root, f"{symbol}_{config.get('interval','1m')}.csv")
 		write_csv(outfile, rows)
 		print(f"Wrote {len(rows)} rows to {outfile}")
@@ -0,0 +1,89 @@
+import timeit
+import argparse
+from typing import Dict, List
+
+import numpy as np
+import talib
+
+from src.runtime.batch_indicators import BB_DEV, BB_PERIOD, batch_indicators
+from src.runtime.indicator_memo import IndicatorMemo
+from src.runtime.kline_codec import columns
+
+
+def make_universe(symbols: int, candles: int, seed: int = 1) -> List[np.ndarray]:
+	"""Random-walk (N, 6) kline arrays; every tenth symbol is a newly listed coin with a short history."""
+	rng = np.random.default_rng(seed)
+	universe = []
+	for i in range(symbols):
+		size = candles if i % 10 else candles // 3
+		closes = rng.uniform(0.01, 50_000) * np.exp(np.cumsum(rng.normal(0, 0.004, size)))
+		spread = rng.random(size) * 0.004
+		rows = np.column_stack([np.arange(size) * 300_000.0, closes, closes * (1 + spread), closes * (1 - spread),
+								closes, rng.random(size) * 1000 + 1])
+		universe.append(rows.T.copy().T)
+	return universe
+
+
+def talib_indicators(closes, highs, lows, volumes) -> Dict[str, float]:
+	"""The per-symbol TA-Lib calls made by calculate_indicators()."""
+	macd, signal, hist = talib.MACD(closes)
+	upper, middle, lower = talib.BBANDS(closes, timeperiod=BB_PERIOD, nbdevup=BB_DEV, nbdevdn=BB_DEV)
+	atr = talib.ATR(highs, lows, closes, timeperiod=14)[-1]
+	volume_avg = np.mean(volumes[-20:])
+	return {
+		"rsi": talib.RSI(closes, timeperiod=14)[-1],
+		"ema_9": talib.EMA(closes, timeperiod=9)[-1],
+		"ema_21": talib.EMA(closes, timeperiod=21)[-1],
+		"ema_50": talib.EMA(closes, timeperiod=50)[-1],
+		"ema_200": talib.EMA(closes, timeperiod=200)[-1],
+		"macd": macd[-1], "macd_signal": signal[-1], "macd_hist": hist[-1],
+		"bb_upper": upper[-1], "bb_middle": middle[-1], "bb_lower": lower[-1],
+		"atr": atr, "atr_pct": atr / closes[-1] * 100,
+		"volume_avg": volume_avg, "volume_current": volumes[-1], "volume_ratio": volumes[-1] / volume_avg,
+		"momentum_3": (closes[-1] - closes[-3]) / closes[-3] * 100,
+		"momentum_10": (closes[-1] - closes[-10]) / closes[-10] * 100,
+	}
+
+
+def scalar_scan(universe: List[np.ndarray], min_length: int):
+	results = []
+	for rows in universe:
+		if len(rows) < min_length:
+			results.append(None)
+			continue
+		closes, highs, lows, volumes, _ = columns(rows)
+		results.append(talib_indicators(closes, highs, lows, volumes))
+	return results
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Per-symbol TA-Lib vs batched 2-D indicator benchmark (cold and memoized)")
+	parser.add_argument("--symbols", type=int, nargs="+", default=[65, 200, 500])
+	parser.add_argument("--candles", type=int, default=200)
+	parser.add_argument("--repeat", type=int, default=5)
+	parser.add_argument("--number", type=int, default=10)
+	args = parser.parse_args()
+
+	print(f"{'symbols':>8} {'talib loop (ms)':>16} {'batch (ms)':>11} {'speedup':>8} {'memo hit (ms)':>14} {'speedup':>8}")
+	for count in args.symbols:
+		universe = make_universe(count, args.candles)
+		for old, new in zip(scalar_scan(universe, args.candles), batch_indicators(universe, args.candles)):
+			assert (old is None) == (new is None)
+			if old is not None:
+				assert all(np.isclose(old[k], new[k], rtol=1e-9, atol=1e-9) for k in old), "batch must match TA-Lib"
+		scalar_ms = min(timeit.repeat(lambda: scalar_scan(universe, args.candles), number=args.number, repeat=args.repeat)) / args.number * 1e3
+		batch_ms = min(timeit.repeat(lambda: batch_indicators(universe, args.candles), number=args.number, repeat=args.repeat)) / args.number * 1e3
+		# Between candle closes: closed-candle summaries come from the memo, only the forming candle is new
+		memo = IndicatorMemo()
+		series = [(i, "5m") for i in range(count)]
+		warm = batch_indicators(universe, args.candles, memo=memo, series=series)
+		for new, cached in zip(batch_indicators(universe, args.candles), warm):
+			if new is not None:
+				assert all(np.isclose(new[k], cached[k], rtol=1e-9, atol=1e-9) for k in new), "memo path must match"
+		memo_ms = min(timeit.repeat(lambda: batch_indicators(universe, args.candles, memo=memo, series=series),
+									number=args.number, repeat=args.repeat)) / args.number * 1e3
+		print(f"{count:>8} {scalar_ms:>16.2f} {batch_ms:>11.2f} {scalar_ms / batch_ms:>7.2f}x {memo_ms:>14.2f} {scalar_ms / memo_ms:>7.2f}x")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,68 @@
+import json
+import timeit
+import argparse
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from src.runtime.kline_codec import columns, decode_klines, orjson
+
+
+def make_payload(count: int) -> bytes:
+	"""Body shaped like /api/v3/klines (12 fields, prices/volumes as strings)."""
+	rows = []
+	for i in range(count):
+		open_time = 1_700_000_000_000 + i * 300_000
+		price = 100.0 + (i % 97) * 0.37
+		rows.append([
+			open_time, f"{price:.8f}", f"{price * 1.01:.8f}", f"{price * 0.99:.8f}", f"{price * 1.002:.8f}",
+			f"{1000 + i * 1.5:.8f}", open_time + 299_999, f"{price * 1000:.8f}", 100 + i, "1.00000000",
+			"2.00000000", "0",
+		])
+	return json.dumps(rows).encode()
+
+
+def legacy_decode(payload: bytes):
+	"""Previous get_klines path: json.loads + one list comprehension per column."""
+	klines = json.loads(payload)
+	closes = np.array([float(k[4]) for k in klines])
+	highs = np.array([float(k[2]) for k in klines])
+	lows = np.array([float(k[3]) for k in klines])
+	volumes = np.array([float(k[5]) for k in klines])
+	opens = np.array([float(k[1]) for k in klines])
+	return closes, highs, lows, volumes, opens
+
+
+def fast_decode(payload: bytes):
+	return columns(decode_klines(payload))
+
+
+def bench(fn: Callable, payload: bytes, repeat: int, number: int) -> float:
+	"""Best-of-``repeat`` microseconds per call."""
+	return min(timeit.repeat(lambda: fn(payload), number=number, repeat=repeat)) / number * 1e6
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Kline decoding micro-benchmark")
+	parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000])
+	parser.add_argument("--repeat", type=int, default=5)
+	parser.add_argument("--number", type=int, default=200)
+	args = parser.parse_args()
+
+	print(f"JSON decoder: {'orjson' if orjson is not None else 'json (stdlib)'}")
+	results: List[Dict] = []
+	for size in args.sizes:
+		payload = make_payload(size)
+		for old, new in zip(legacy_decode(payload), fast_decode(payload)):
+			assert np.array_equal(old, new), "fast path must decode identical values"
+		legacy_us = bench(legacy_decode, payload, args.repeat, args.number)
+		fast_us = bench(fast_decode, payload, args.repeat, args.number)
+		results.append({"candles": size, "legacy_us": legacy_us, "fast_us": fast_us})
+
+	print(f"{'candles':>8} {'legacy (us)':>12} {'fast (us)':>10} {'speedup':>8}")
+	for r in results:
+		print(f"{r['candles']:>8} {r['legacy_us']:>12.1f} {r['fast_us']:>10.1f} {r['legacy_us'] / r['fast_us']:>7.2f}x")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,59 @@
+import timeit
+import argparse
+from typing import Dict, List
+
+import numpy as np
+
+from src.runtime.support_resistance import support_resistance
+
+
+def make_candles(count: int, seed: int = 7):
+	rng = np.random.default_rng(seed)
+	closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, count)))
+	highs = closes * (1 + rng.random(count) * 0.003)
+	lows = closes * (1 - rng.random(count) * 0.003)
+	return highs, lows
+
+
+def legacy_support_resistance(highs, lows, window: int = 20, lookback=100) -> Dict[str, List[float]]:
+	"""Previous detect_support_resistance(): nested max/min per index, then a Python clustering pass."""
+	if lookback is not None and len(highs) > lookback:
+		highs = highs[-lookback:]
+		lows = lows[-lookback:]
+	levels = []
+	for i in range(window, len(highs) - window):
+		if highs[i] == max(highs[i - window:i + window]):
+			levels.append(('resistance', highs[i]))
+		if lows[i] == min(lows[i - window:i + window]):
+			levels.append(('support', lows[i]))
+	support, resistance = [], []
+	for level_type, price in levels:
+		kept = support if level_type == 'support' else resistance
+		if not kept or (kept[-1] > 0 and abs(price - kept[-1]) / kept[-1] > 0.01):
+			kept.append(price)
+	return {'support': sorted(support)[-3:], 'resistance': sorted(resistance)[-3:]}
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Support/resistance detection benchmark (loop vs vectorized)")
+	parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+	parser.add_argument("--window", type=int, default=20)
+	parser.add_argument("--repeat", type=int, default=5)
+	args = parser.parse_args()
+
+	print(f"{'candles':>8} {'legacy (ms)':>12} {'vectorized (ms)':>16} {'speedup':>8}")
+	for size in args.sizes:
+		highs, lows = make_candles(size)
+		legacy = legacy_support_resistance(highs, lows, args.window, lookback=None)
+		fast = support_resistance(highs, lows, args.window, lookback=None)
+		assert legacy == fast, f"vectorized levels must match: {legacy} != {fast}"
+		number = max(1, 2000 // size)
+		legacy_ms = min(timeit.repeat(lambda: legacy_support_resistance(highs, lows, args.window, lookback=None),
+									  number=number, repeat=args.repeat)) / number * 1e3
+		fast_ms = min(timeit.repeat(lambda: support_resistance(highs, lows, args.window, lookback=None),
+									number=number, repeat=args.repeat)) / number * 1e3
+		print(f"{size:>8} {legacy_ms:>12.3f} {fast_ms:>16.3f} {legacy_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+	main()
@@ -22,6 +22,27 @@ from threading import Thread, Lock  # 🔧 FIX: Added Lock for thread safety
 from flask import Flask, jsonify, render_template_string, request, Response
 from collections import defaultdict, deque  # 🎯 OPTIMIZATION: Added deque for efficient memory management
 from decimal import Decimal, ROUND_DOWN  # 🔥 For precise quantity formatting
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures  # 🚀 Concurrent market scan
+from src.runtime.price_snapshot import PriceSnapshot  # 📸 One bulk ticker call for all prices
+from src.runtime.transport import HttpTransport  # 🔌 Keep-alive pooled HTTP sessions
+from src.runtime.kline_buffer import KlineBufferStore  # 🧩 Incremental kline history
+from src.runtime.kline_codec import OPEN_TIME, columns, decode_klines  # ⚡ orjson + one-pass (N, 6) float64 decoding
+from src.runtime.market_stream import MarketStream  # 🛰️ Combined-stream WebSocket market data
+from src.runtime.cycle_cache import CycleCache  # 🧮 One kline fetch per key per cycle
+from src.runtime.symbol_filters import SymbolFilterCache  # 💾 Disk-cached exchangeInfo filters
+from src.runtime.indicator_engine import BB_DEV, BB_PERIOD, IndicatorEngine  # 📐 O(1)-per-candle streaming indicators
+from src.runtime.batch_indicators import batch_indicators  # 🧱 Whole-universe indicators on a 2-D matrix
+from src.runtime.indicator_memo import IndicatorMemo  # 🧠 Results reused until the next candle closes
+from src.runtime.support_resistance import support_resistance  # ⚡ Vectorized pivot S/R levels
+from src.runtime.signal_engine import SignalEngine  # 🎯 All strategies x all symbols as boolean masks
+from src.runtime.confidence import ConfidenceScorer  # 🎚️ Threshold tables compiled to searchsorted lookups
+from src.runtime.scan_scheduler import ScanScheduler, scan_all  # 🌡️ Hot symbols every cycle, cold ones every N cycles
+from src.runtime.cycle_scheduler import CycleScheduler  # ⏰ Candle-aligned cycles with per-phase budgets
+from src.runtime.exit_triggers import ExitTriggerEngine, QUICK_PROFIT, STOP_LOSS, TAKE_PROFIT, TRAILING_STOP  # ⚡ Exits on every streamed price
+from src.runtime.records import Position, Trade  # 🗂️ Slotted position / trade records (epoch timestamps)
+from src.runtime.state_snapshot import StatePublisher  # 📰 Lock-free copy-on-write snapshots for readers
+from src.runtime.order_pipeline import CLOSE, OPEN, OrderPipeline, OrderRequest, client_order_id  # 📨 Queued, idempotent live orders
+from src.runtime.user_stream import UserDataStream  # 📡 listenKey user-data stream: balances + order states
 
 # Create necessary directories
 os.makedirs('logs', exist_ok=True)
@@ -153,6 +174,103 @@ LIVE_MAX_POSITION_SIZE_USD = 100  # Max $100 per position in LIVE mode (safety!)
 LIVE_MAX_TOTAL_CAPITAL_RISK = 500  # Max $500 total capital at risk
 LIVE_DAILY_LOSS_LIMIT = 50  # Stop trading if lose $50 in a day (LIVE)
 
+# ============================================================================
+# ⚡ MARKET SCAN PERFORMANCE SETTINGS
+# ============================================================================
+# Number of symbols fetched + analyzed in parallel by scan_market()
+# 1 = old serial scan (one symbol after another)
+SCAN_MAX_WORKERS = 8
+
+# Bulk price snapshot: ALL symbols from one /api/v3/ticker/price call
+# Refreshed once per cycle + whenever older than this many seconds
+PRICE_SNAPSHOT_INTERVAL = 5
+
+# Pooled keep-alive HTTP (one connection pool per base URL + API key)
+HTTP_POOL_SIZE = max(20, SCAN_MAX_WORKERS * 2)  # Enough connections for every scan worker
+HTTP_TIMEOUT = 10  # Default request timeout (seconds)
+HTTP_MAX_RETRIES = 3  # Attempts per request (timeouts, connection errors, 429, GET 5xx)
+
+# Request-weight budget (per IP, per minute) paced ahead of time by the transport
+# Synced from X-MBX-USED-WEIGHT-1M / Retry-After on every response
+API_WEIGHT_LIMIT = 6000
+API_WEIGHT_RESERVE = 0.2  # Share kept for orders / position management (scanning can't use it)
+
+# exchangeInfo filters (LOT_SIZE / PRICE_FILTER / MIN_NOTIONAL) cached on disk
+SYMBOL_INFO_CACHE_FILE = 'data/symbol_info.json'
+SYMBOL_INFO_TTL = 6 * 3600  # Seconds before the cache is refreshed from the exchange
+DEFAULT_TICK_SIZE = Decimal('0.01')
+
+# How the scan computes indicators:
+#   'batch'     - one vectorized pass over a (symbols x candles) matrix for the whole universe
+#   'streaming' - running state per symbol/interval, advanced only by newly closed candles
+#                 (the forming candle is peeked, never committed)
+#   'talib'     - full TA-Lib recompute per symbol
+INDICATOR_MODE = 'batch'
+SCAN_KLINE_LIMIT = 200  # 5m candles per symbol for scan indicators (EMA 200 needs all of them)
+INDICATOR_MEMO_SIZE = 4096  # LRU entries keyed by (symbol, interval, last closed candle, computation)
+
+# 🌡️ Tiered scanning: each symbol's tier (HOT / WARM / COLD) comes from its last scan
+# (open position, volume spike, ATR %, opportunity score); HOT = every cycle
+SCAN_WEIGHT_BUDGET = 300  # Request weight per minute the scan may spend (one 5m klines call = 2)
+SCAN_WARM_EVERY = 2  # Cycles between rescans of WARM symbols
+SCAN_COLD_EVERY = 4  # Cycles between rescans of COLD symbols
+SCAN_OUTAGE_WINDOW = 20  # Recent scans (across cycles) the API outage check is judged on
+SCAN_OUTAGE_MIN_ATTEMPTS = 10  # Fewer recent scans than this: no outage verdict
+
+# ⏰ Cycle timing: cycles start CYCLE_OFFSET seconds after every CYCLE_PERIOD wall-clock boundary
+# (60 → right after each 1m / 5m candle close); only the time left until the next boundary is slept
+CYCLE_PERIOD = 60
+CYCLE_OFFSET = 3
+CYCLE_ERROR_BACKOFF = 60  # After a main-loop error the next cycle starts at the first boundary this much later
+CYCLE_PHASE_BUDGETS = {'regime': 5, 'positions': 10, 'scan': 25, 'signals': 10}  # Seconds per phase
+CYCLE_DEFERRABLE_PHASES = ('regime', 'scan', 'signals')  # Skipped when the budget no longer fits; positions always run
+
+# 🎯 Signal generation:
+#   'vectorized' - every strategy's entry rules + confidence for all symbols in one numpy pass
+#   'scalar'     - generate_*_signal per symbol and strategy (same decisions)
+SIGNAL_MODE = 'vectorized'
+SIGNAL_TOP_N = None  # Symbols (by opportunity score) evaluated per cycle; None = whole scanned universe
+
+# 🎚️ Confidence tables (signal + take-profit target): edit the file, it is reloaded without a restart
+CONFIDENCE_TABLES_FILE = 'config/confidence_tables.json'
+CONFIDENCE_RELOAD_SECONDS = 30  # How often the file's mtime is checked
+
+# Kline ring buffers: full history is downloaded once per symbol/interval,
+# afterwards only candles since the last stored open time are requested
+KLINE_BUFFER_CAPACITY = 200  # Candles kept per symbol/interval (indicators need 200)
+KLINE_REFRESH_INTERVAL = 1.0  # Seconds a buffer is served without a top-up request
+
+# Higher timeframes built locally from 5m candles (seeded once from REST, then no
+# more network calls for multi-timeframe alignment, breakouts and volume spikes)
+KLINE_DERIVED_INTERVALS = {'15m': '5m', '1h': '5m', '4h': '5m'}
+
+# Combined-stream WebSocket feed (kline_1m/5m + miniTicker for every coin)
+# Keeps kline buffers and prices live; REST takes over whenever it goes quiet
+MARKET_STREAM_ENABLED = True
+MARKET_STREAM_URL = 'wss://stream.binance.com:9443' if LIVE_TRADING_MODE else 'wss://stream.testnet.binance.vision'
+MARKET_STREAM_INTERVALS = ('1m', '5m')
+MARKET_STREAM_PRICE_MAX_AGE = 5  # Streamed price older than this → REST snapshot instead
+
+# ⚡ Exit triggers: stop-loss / take-profit / trailing / quick-profit levels of every open position,
+# sorted per symbol and checked against each streamed price (manage_positions stays the safety net)
+EXIT_TRIGGERS_ENABLED = True
+EXIT_MIN_HOLD_SECONDS = 30  # No exits before a position is this old
+EXIT_FEES_PCT = 0.19  # Entry + exit fees
+EXIT_QUICK_PROFIT_PCT = 0.15  # Net profit (after fees) that closes a position right away
+
+# 📨 Live orders: queued and sent by worker threads (never while data_lock is held), retried with
+# the same newClientOrderId and looked up by it when a response is lost; fills are booked by callback
+ORDER_WORKERS = 5  # = max open positions: an emergency close sends every order at once
+ORDER_MAX_ATTEMPTS = 3
+ORDER_RETRY_DELAY = 0.5  # Seconds, grows linearly per attempt
+ORDER_WAIT_TIMEOUT = 30  # Longest a caller waits for a fill (the callback still books a late one)
+
+# 📡 User-data stream (LIVE only): balances and order states pushed over a listenKey socket
+# instead of polling /api/v3/account; REST is only used to seed balances after each (re)connect
+USER_STREAM_ENABLED = True
+USER_STREAM_URL = MARKET_STREAM_URL
+USER_STREAM_KEEPALIVE_SECONDS = 30 * 60  # listenKeys expire after 60 min without a keepalive
+
 # ============================================================================
 # PERFORMANCE ANALYTICS TRACKER
 # ============================================================================
@@ -648,8 +766,87 @@ class UltimateHybridBot:
         self.price_cache = {}  # {symbol: (price, timestamp)}
         self.cache_ttl = 10  # Cache valid for 10 seconds
         
+        # 🔌 SHARED TRANSPORT: Keep-alive connection pools (no TCP+TLS handshake per call)
+        self.transport = HttpTransport(
+            pool_size=HTTP_POOL_SIZE, timeout=HTTP_TIMEOUT, max_retries=HTTP_MAX_RETRIES,
+            weight_limit=API_WEIGHT_LIMIT, weight_reserve=API_WEIGHT_RESERVE
+        )
+        
+        # 📸 BULK PRICE SNAPSHOT: One request serves every price reader
+        # (manage_positions, unrealized P&L, print_status, live orders, dashboard)
+        self.price_snapshot = PriceSnapshot(self.base_url, COIN_UNIVERSE, refresh_interval=PRICE_SNAPSHOT_INTERVAL, transport=self.transport)
+        
+        # 🧩 KLINE RING BUFFERS: Seed history once, then fetch only new/forming candles
+        self.kline_store = KlineBufferStore(
+            self.fetch_kline_rows, min_capacity=KLINE_BUFFER_CAPACITY, refresh_interval=KLINE_REFRESH_INTERVAL,
+            derived_intervals=KLINE_DERIVED_INTERVALS
+        )
+        
+        # 🧮 CYCLE CACHE: Duplicate kline requests within a cycle share one fetch
+        # (shorter limits are sliced from a longer cached window)
+        self.cycle_cache = CycleCache()
+        
+        # 📐 STREAMING INDICATORS: RSI / EMA / MACD / BB / ATR state per symbol + interval
+        self.indicator_engine = IndicatorEngine()
+        
+        # 🧠 INDICATOR MEMO: Closed-candle results (S/R, batch summaries, ...) reused between
+        # scans until the next candle closes; only forming-candle work is redone
+        self.indicator_memo = IndicatorMemo(max_entries=INDICATOR_MEMO_SIZE)
+        
+        # ⏰ CYCLE SCHEDULER: Candle-aligned cycle starts, phase budgets and overrun stats
+        self.cycle_scheduler = CycleScheduler(period=CYCLE_PERIOD, offset=CYCLE_OFFSET, budgets=CYCLE_PHASE_BUDGETS,
+                                              deferrable=CYCLE_DEFERRABLE_PHASES)
+        
+        # 🌡️ SCAN SCHEDULER: Which symbols are rescanned this cycle (within SCAN_WEIGHT_BUDGET)
+        self.scan_scheduler = ScanScheduler(weight_budget=SCAN_WEIGHT_BUDGET, warm_every=SCAN_WARM_EVERY,
+                                            cold_every=SCAN_COLD_EVERY, outcome_window=SCAN_OUTAGE_WINDOW)
+        
+        # 🎚️ CONFIDENCE SCORER: Declarative threshold tables shared by the scalar and vectorized paths
+        self.confidence_scorer = ConfidenceScorer(CONFIDENCE_TABLES_FILE, check_interval=CONFIDENCE_RELOAD_SECONDS)
+        
+        # 🎯 SIGNAL ENGINE: Entry rules of every strategy for the whole opportunity set at once
+        self.signal_engine = SignalEngine(self.confidence_scorer)
+        
+        # 🛰️ LIVE MARKET STREAM: All coins over a few multiplexed WebSocket connections
+        # (started in start_trading; None = REST polling only)
+        self.market_stream = MarketStream(
+            MARKET_STREAM_URL, COIN_UNIVERSE, intervals=MARKET_STREAM_INTERVALS,
+            kline_store=self.kline_store, price_max_age=MARKET_STREAM_PRICE_MAX_AGE
+        ) if MARKET_STREAM_ENABLED else None
+        
+        # ⚡ EXIT TRIGGERS: crossed SL/TP levels are closed from the price feed, not the next cycle
+        # (one worker: closes run off the socket thread, in the order they fired)
+        self.exit_triggers = ExitTriggerEngine(on_fire=self.on_exit_triggers)
+        self.exit_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='exit')
+        if self.market_stream and EXIT_TRIGGERS_ENABLED:
+            self.market_stream.add_listener(self.exit_triggers.on_price)
+        
+        # 📡 USER-DATA STREAM (LIVE only): balance + order-state cache fed by the exchange
+        # (started in start_trading; None = REST /api/v3/account)
+        self.user_stream = UserDataStream(
+            USER_STREAM_URL,
+            lambda method, endpoint, params: self.transport.request(method, f"{self.base_url}{endpoint}", params=params,
+                                                                    api_key=self.api_key, label='userDataStream'),
+            resync=self.fetch_account, keepalive_interval=USER_STREAM_KEEPALIVE_SECONDS
+        ) if LIVE_TRADING_MODE and USER_STREAM_ENABLED else None
+        if self.user_stream:
+            self.user_stream.add_listener(self.on_execution_report)
+        
+        # 📨 ORDER PIPELINE: live orders go out from worker threads; the pipeline owns the retries
+        # (one transport attempt each, so a lost response is looked up before anything is resent:
+        # in the user stream's order cache first, REST only if it hasn't reported the order)
+        self.order_pipeline = OrderPipeline(
+            lambda method, endpoint, params: self.create_signed_request(endpoint, params, method=method, max_retries=1),
+            workers=ORDER_WORKERS, max_attempts=ORDER_MAX_ATTEMPTS, retry_delay=ORDER_RETRY_DELAY,
+            order_states=self.user_stream.final_order if self.user_stream else None
+        )
+        self.pending_orders = {}  # {position_key: OrderRequest} live orders not booked yet
+        
         # 🔥 BINANCE SYMBOL INFO CACHE (for precision, min notional, lot size)
-        self.symbol_info_cache = {}  # {symbol: {baseAssetPrecision, quoteAssetPrecision, filters}}
+        # 💾 Persisted on disk (only our coins, exact strings) with a TTL + background refresh
+        self.symbol_filters = SymbolFilterCache(SYMBOL_INFO_CACHE_FILE, self.base_url, COIN_UNIVERSE,
+                                                ttl=SYMBOL_INFO_TTL, transport=self.transport)
+        self.symbol_info_cache = self.symbol_filters.info  # {symbol: {baseAssetPrecision, quoteAssetPrecision, filters}}
         self.symbol_info_loaded = False
         
         # 🚀 DYNAMIC CAPITAL ALLOCATION
@@ -709,8 +906,8 @@ class UltimateHybridBot:
         self.reserved_capital = 0  # Capital in open positions
         
         # Trading state
-        self.positions = {}  # {symbol: {strategy, entry_price, quantity, entry_time, ...}}
-        self.trades = []
+        self.positions = {}  # {position_key: Position} (🗂️ src/runtime/records.py)
+        self.trades = []  # [Trade] closed trades, newest last (capped at 1000)
         self.is_running = True
         
         # Trading costs
@@ -721,13 +918,22 @@ class UltimateHybridBot:
         # Market data cache
         self.market_data = {}  # {symbol: {price, volatility, volume, ...}}
         self.support_resistance = {}  # {symbol: {support: [], resistance: []}}
-        
+
+        # ⚡ CONCURRENT SCAN: Bounded worker pool (one slow symbol no longer stalls the cycle)
+        self.scan_max_workers = max(1, int(SCAN_MAX_WORKERS))
+        self.scan_executor = ThreadPoolExecutor(max_workers=self.scan_max_workers, thread_name_prefix='scan') if self.scan_max_workers > 1 else None
+
         # Strategy performance tracking
         self.strategy_stats = defaultdict(lambda: {
             'trades': 0, 'wins': 0, 'losses': 0, 
             'profit': 0, 'win_rate': 0
         })
         
+        # 📰 STATE SNAPSHOTS: immutable copy of positions / trades / capital, republished after
+        # every mutation; the dashboard, status report and risk checks read it without data_lock
+        self.state = StatePublisher()
+        self.publish_state()
+        
         # Performance Analytics
         self.analytics = PerformanceAnalytics()
         
@@ -1046,7 +1252,6 @@ class UltimateHybridBot:
                 logger.error(f"🛑 CUTTING ALL TRADES!")
                 emergency_triggered = True
                 self.regulation_state = 'EMERGENCY'
-                # TODO: Close all positions
                 
             # 2. Loss Streak Check
             elif self.consecutive_losses >= self.max_loss_streak:
@@ -1276,65 +1481,24 @@ class UltimateHybridBot:
         - Price precision (PRICE_FILTER)
         - Minimum notional (MIN_NOTIONAL filter)
         
-        Called ONCE at bot startup to cache all symbol info
+        Called ONCE at bot startup. Served from the disk cache when it is younger
+        than SYMBOL_INFO_TTL (no exchangeInfo download), refreshed in the background.
         """
         if self.symbol_info_loaded:
             return True
         
         try:
             logger.info("🔄 Loading Binance symbol info...")
-            url = f"{self.base_url}/api/v3/exchangeInfo"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                symbols_loaded = 0
-                
-                for symbol_data in data['symbols']:
-                    symbol = symbol_data['symbol']
-                    
-                    # Only cache symbols we're trading
-                    if symbol in COIN_UNIVERSE:
-                        self.symbol_info_cache[symbol] = {
-                            'baseAssetPrecision': symbol_data['baseAssetPrecision'],
-                            'quoteAssetPrecision': symbol_data['quoteAssetPrecision'],
-                            'quotePrecision': symbol_data['quotePrecision'],
-                            'baseAsset': symbol_data['baseAsset'],
-                            'quoteAsset': symbol_data['quoteAsset'],
-                            'filters': {}
-                        }
-                        
-                        # Extract important filters
-                        for filter_data in symbol_data['filters']:
-                            filter_type = filter_data['filterType']
-                            
-                            if filter_type == 'LOT_SIZE':
-                                self.symbol_info_cache[symbol]['filters']['LOT_SIZE'] = {
-                                    'minQty': float(filter_data['minQty']),
-                                    'maxQty': float(filter_data['maxQty']),
-                                    'stepSize': float(filter_data['stepSize'])
-                                }
-                            elif filter_type == 'PRICE_FILTER':
-                                self.symbol_info_cache[symbol]['filters']['PRICE_FILTER'] = {
-                                    'minPrice': float(filter_data['minPrice']),
-                                    'maxPrice': float(filter_data['maxPrice']),
-                                    'tickSize': float(filter_data['tickSize'])
-                                }
-                            elif filter_type == 'MIN_NOTIONAL' or filter_type == 'NOTIONAL':
-                                # Binance uses MIN_NOTIONAL or NOTIONAL depending on symbol
-                                min_notional = float(filter_data.get('minNotional', filter_data.get('notional', 10.0)))
-                                self.symbol_info_cache[symbol]['filters']['MIN_NOTIONAL'] = {
-                                    'minNotional': min_notional
-                                }
-                        
-                        symbols_loaded += 1
-                
-                self.symbol_info_loaded = True
-                logger.info(f"✅ Loaded symbol info for {symbols_loaded}/{len(COIN_UNIVERSE)} coins")
-                return True
-            else:
-                logger.error(f"❌ Failed to load symbol info: {response.status_code}")
+            # 💾 Disk cache first; exchange when stale; stale copy if the exchange is down
+            if not self.symbol_filters.load():
+                logger.error(f"❌ Failed to load symbol info: exchangeInfo unavailable and no cached copy")
                 return False
+            
+            self.symbol_info_loaded = True
+            self.symbol_filters.start_background_refresh()
+            logger.info(f"✅ Loaded symbol info for {len(self.symbol_info_cache)}/{len(set(COIN_UNIVERSE))} coins "
+                        f"(source: {self.symbol_filters.source})")
+            return True
                 
         except Exception as e:
             logger.error(f"❌ Error loading symbol info: {e}")
@@ -1355,13 +1519,12 @@ class UltimateHybridBot:
         
         try:
             lot_size = self.symbol_info_cache[symbol]['filters'].get('LOT_SIZE', {})
-            step_size = lot_size.get('stepSize', 0.00000001)
             min_qty = lot_size.get('minQty', 0.00000001)
             max_qty = lot_size.get('maxQty', 9000000000)
             
-            # Round down to step size
-            precision = len(str(step_size).rstrip('0').split('.')[-1]) if '.' in str(step_size) else 0
-            formatted_qty = float(Decimal(str(quantity)).quantize(Decimal(str(step_size)), rounding=ROUND_DOWN))
+            # Round down to a multiple of the step size (pre-computed Decimal)
+            step_size = self.symbol_filters.quantity_step(symbol)
+            formatted_qty = float((Decimal(str(quantity)) / step_size).to_integral_value(rounding=ROUND_DOWN) * step_size)
             
             # Ensure within bounds
             if formatted_qty < min_qty:
@@ -1385,12 +1548,9 @@ class UltimateHybridBot:
             return round(price, 2)  # Default 2 decimals
         
         try:
-            price_filter = self.symbol_info_cache[symbol]['filters'].get('PRICE_FILTER', {})
-            tick_size = price_filter.get('tickSize', 0.01)
-            
-            # Round to tick size
-            precision = len(str(tick_size).rstrip('0').split('.')[-1]) if '.' in str(tick_size) else 0
-            formatted_price = float(Decimal(str(price)).quantize(Decimal(str(tick_size)), rounding=ROUND_DOWN))
+            # Round down to a multiple of the tick size (pre-computed Decimal)
+            tick_size = self.symbol_filters.price_tick(symbol) or DEFAULT_TICK_SIZE
+            formatted_price = float((Decimal(str(price)) / tick_size).to_integral_value(rounding=ROUND_DOWN) * tick_size)
             
             return formatted_price
             
@@ -1417,7 +1577,7 @@ class UltimateHybridBot:
         
         return True
     
-    def create_signed_request(self, endpoint, params, method='GET'):
+    def create_signed_request(self, endpoint, params, method='GET', max_retries=None):
         """
         🔥 Create signed request for Binance authenticated endpoints
         Required for placing orders, checking balances, etc.
@@ -1438,60 +1598,25 @@ class UltimateHybridBot:
         
         params['signature'] = signature
         
-        # Create headers
-        headers = {
-            'X-MBX-APIKEY': api_creds['key']
-        }
+        if method not in ('GET', 'POST', 'DELETE'):
+            logger.error(f"❌ Unsupported HTTP method: {method}")
+            return None
         
-        # Make request with retry logic
+        # 🔌 Pooled session per API key (sends X-MBX-APIKEY) with shared retry policy
+        # (timeouts / connection errors / 429 retried with backoff)
         url = f"{self.base_url}{endpoint}"
-        max_retries = 3
-        
-        for attempt in range(max_retries):
-            try:
-                if method == 'GET':
-                    response = requests.get(url, params=params, headers=headers, timeout=10)
-                elif method == 'POST':
-                    response = requests.post(url, params=params, headers=headers, timeout=10)
-                elif method == 'DELETE':
-                    response = requests.delete(url, params=params, headers=headers, timeout=10)
-                else:
-                    logger.error(f"❌ Unsupported HTTP method: {method}")
-                    return None
-                
-                # Check for rate limiting
-                if response.status_code == 429:
-                    wait_time = (2 ** attempt) * 2
-                    logger.warning(f"Rate limited (signed request), waiting {wait_time}s")
-                    if attempt < max_retries - 1:
-                        time.sleep(wait_time)
-                        continue
-                
-                return response
-                
-            except requests.exceptions.Timeout:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    logger.warning(f"Timeout in signed request, retry {attempt+1}/{max_retries} in {wait_time}s")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"❌ Timeout in signed request after {max_retries} attempts")
-                    return None
-            except requests.exceptions.ConnectionError as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    logger.warning(f"Connection error in signed request: {e}, retry {attempt+1}/{max_retries} in {wait_time}s")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"❌ Connection error in signed request after {max_retries} attempts: {e}")
-                    return None
-            except Exception as e:
-                logger.error(f"❌ Error in signed request: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
-                else:
-                    return None
-        
+        response = self.transport.request(method, url, params=params, api_key=api_creds['key'], max_retries=max_retries,
+                                          label=f"signed {endpoint}")
+        if response is None:
+            logger.error(f"❌ Signed request {method} {endpoint} failed (no response)")
+        return response
+    
+    def fetch_account(self):
+        """Full account snapshot (GET /api/v3/account, high weight) or None"""
+        response = self.create_signed_request('/api/v3/account', {}, method='GET')
+        if response and response.status_code == 200:
+            return response.json()
+        logger.error(f"❌ Failed to get account: {response.status_code if response else 'No response'}")
         return None
     
     def get_account_balance(self, asset='USDT'):
@@ -1499,12 +1624,16 @@ class UltimateHybridBot:
         🔥 Get current balance for specified asset from Binance account
         Used in LIVE mode to check if we have sufficient funds
         """
+        # 📡 Pushed by the user-data stream: no request at all while it's connected
+        if self.user_stream:
+            balance = self.user_stream.get_balance(asset)
+            if balance is not None:
+                return balance
+        
         try:
-            response = self.create_signed_request('/api/v3/account', {}, method='GET')
+            account_data = self.fetch_account()
             
-            if response and response.status_code == 200:
-                account_data = response.json()
-                
+            if account_data:
                 for balance in account_data.get('balances', []):
                     if balance['asset'] == asset:
                         free_balance = float(balance['free'])
@@ -1521,112 +1650,92 @@ class UltimateHybridBot:
                 logger.warning(f"⚠️ Asset {asset} not found in account")
                 return None
             else:
-                logger.error(f"❌ Failed to get account balance: {response.status_code if response else 'No response'}")
                 return None
                 
         except Exception as e:
             logger.error(f"❌ Error getting account balance: {e}")
             return None
     
-    def place_live_order(self, symbol, side, quantity, order_type='MARKET'):
+    def prepare_live_order(self, symbol, side, quantity, price, position_key, intent, nonce):
         """
-        🔥 CRITICAL: Place LIVE order on Binance
+        🔥 CRITICAL: Build a LIVE MARKET order for the order pipeline
         
         This is the REAL DEAL - REAL MONEY!
         
         Args:
             symbol: e.g. 'BTCUSDT'
             side: 'BUY' or 'SELL'
-            quantity: Formatted quantity (already precision-checked)
-            order_type: 'MARKET' or 'LIMIT' (default: MARKET for fast execution)
+            quantity: Raw quantity (LOT_SIZE formatted here)
+            price: Reference price for the MIN_NOTIONAL check (the caller's price, no extra request)
+            position_key / intent / nonce: Identify the order; they make its newClientOrderId,
+                so every retry of the same order carries the same id
         
         Returns:
-            Order response dict or None if failed
+            OrderRequest, or None if it fails the exchange filters
         """
         try:
-            # Format quantity and get current price
             formatted_qty = self.format_quantity(symbol, quantity)
             
             if formatted_qty <= 0:
                 logger.error(f"❌ Invalid quantity for {symbol}: {quantity} -> {formatted_qty}")
                 return None
             
-            # Get current price for notional check
-            current_price = self.get_current_price(symbol)
-            if not current_price:
-                logger.error(f"❌ Could not get price for {symbol}")
-                return None
+            if not price or price <= 0:
+                price = self.get_current_price(symbol)
+                if not price:
+                    logger.error(f"❌ Could not get price for {symbol}")
+                    return None
             
             # Check MIN_NOTIONAL
-            if not self.check_min_notional(symbol, formatted_qty, current_price):
+            if not self.check_min_notional(symbol, formatted_qty, price):
                 logger.error(f"❌ Order does not meet MIN_NOTIONAL for {symbol}")
                 return None
             
-            # Create order parameters
-            params = {
-                'symbol': symbol,
-                'side': side,
-                'type': order_type,
-                'quantity': formatted_qty
-            }
-            
-            # For LIMIT orders, add price (not implemented yet - using MARKET only)
-            # if order_type == 'LIMIT':
-            #     params['price'] = self.format_price(symbol, price)
-            #     params['timeInForce'] = 'GTC'
-            
-            logger.info(f"🔥 PLACING LIVE ORDER: {side} {formatted_qty} {symbol} @ ~${current_price:.2f}")
-            logger.info(f"   Notional: ${formatted_qty * current_price:.2f}")
+            order = OrderRequest(
+                symbol=symbol,
+                side=side,
+                quantity=formatted_qty,
+                client_order_id=client_order_id(position_key, intent, nonce),
+                position_key=position_key,
+                intent=intent,
+                price=price
+            )
             
-            # Execute order via signed request
-            response = self.create_signed_request('/api/v3/order', params, method='POST')
+            logger.info(f"🔥 QUEUING LIVE ORDER: {side} {formatted_qty} {symbol} @ ~${price:.2f} | {order.client_order_id}")
+            logger.info(f"   Notional: ${formatted_qty * price:.2f}")
+            return order
             
-            if response and response.status_code == 200:
-                order_data = response.json()
-                logger.info(f"✅ LIVE ORDER FILLED: {order_data.get('orderId', 'N/A')}")
-                logger.info(f"   Status: {order_data.get('status', 'UNKNOWN')}")
-                logger.info(f"   Executed Qty: {order_data.get('executedQty', '0')}")
-                return order_data
-            else:
-                # 🔥 BINANCE-SPECIFIC ERROR HANDLING
-                if response:
-                    try:
-                        error_data = response.json()
-                        error_code = error_data.get('code', 'UNKNOWN')
-                        error_msg = error_data.get('msg', 'Unknown error')
-                        
-                        # Log specific Binance error codes
-                        logger.error(f"❌ BINANCE ERROR {error_code}: {error_msg}")
-                        
-                        # Handle common errors
-                        if error_code == -1013:  # LOT_SIZE filter
-                            logger.error(f"   💡 Quantity does not meet LOT_SIZE filter requirements")
-                        elif error_code == -1111:  # PRICE_FILTER
-                            logger.error(f"   💡 Price does not meet PRICE_FILTER requirements")
-                        elif error_code == -1010:  # MIN_NOTIONAL
-                            logger.error(f"   💡 Order value below MIN_NOTIONAL (usually $10-20)")
-                        elif error_code == -2010:  # Insufficient balance
-                            logger.error(f"   💡 INSUFFICIENT BALANCE! Check your account")
-                        elif error_code == -1003:  # Rate limit
-                            logger.error(f"   💡 RATE LIMIT HIT! Reduce trading frequency")
-                        elif error_code == -1021:  # Timestamp out of sync
-                            logger.error(f"   💡 TIMESTAMP ERROR! Check system time synchronization")
-                        
-                        return None
-                    except:
-                        logger.error(f"❌ LIVE ORDER FAILED: {response.status_code}")
-                        logger.error(f"   Raw response: {response.text}")
-                        return None
-                else:
-                    logger.error(f"❌ LIVE ORDER FAILED: No response from Binance")
-                    return None
-                
         except Exception as e:
-            logger.error(f"❌ Exception placing live order: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.error(f"❌ Exception preparing live order: {e}")
             return None
     
+    def on_execution_report(self, state):
+        """📡 User-data stream listener (socket thread): partial fills show up as they happen"""
+        if state.status == 'PARTIALLY_FILLED':
+            logger.info(f"📡 PARTIAL FILL: {state.side} {state.executed_qty}/{state.orig_qty} {state.symbol} "
+                        f"@ ${state.last_price:.4f} | {state.client_order_id}")
+        elif state.status in ('CANCELED', 'REJECTED', 'EXPIRED'):
+            logger.warning(f"📡 ORDER {state.status}: {state.side} {state.symbol} | {state.client_order_id}")
+    
+    def await_orders(self, pending):
+        """
+        Wait (outside data_lock!) for orders handed out by open_position / close_position with wait=False
+        
+        Futures count when their order filled (the callback has booked it by then); plain booleans
+        (PAPER mode, settled on the spot) count as they are. Returns how many succeeded.
+        """
+        futures = [item for item in pending if isinstance(item, Future)]
+        done, not_done = wait_futures(futures, timeout=ORDER_WAIT_TIMEOUT)
+        if not_done:
+            logger.error(f"⚠️ {len(not_done)} live order(s) still in flight after {ORDER_WAIT_TIMEOUT}s (booked when they finish)")
+        succeeded = sum(1 for item in pending if item is True)
+        for future in done:
+            try:
+                succeeded += bool(future.result().filled)
+            except Exception as e:
+                logger.error(f"❌ Live order failed: {e}")
+        return succeeded
+    
     # ========================================================================
     # DATA PERSISTENCE METHODS
     # ========================================================================
@@ -1697,7 +1806,6 @@ class UltimateHybridBot:
         Decision threshold: 80% = WAIT for target, <80% = LOCK profit now
         """
         try:
-            score = 0
             details = {}
             
             # Get latest market data
@@ -1707,92 +1815,24 @@ class UltimateHybridBot:
             
             ind = data.get('indicators', {})
             
-            # Factor 1: Current Progress to Target (25 points)
             # 🔥 BUG FIX: Check for zero entry_price before division!
             if entry_price <= 0:
                 logger.warning(f"⚠️ {symbol}: Invalid entry_price ({entry_price}), returning neutral confidence")
                 return 50, {}
             
-            current_gain = abs((current_price - entry_price) / entry_price * 100)
-            target_gain = abs((target_price - entry_price) / entry_price * 100)
-            progress = (current_gain / target_gain) if target_gain > 0 else 0
+            # 🎚️ Factors (progress 25, momentum 25, volume 20, trend 20, RSI 10) come from the
+            # 'target' table in CONFIDENCE_TABLES_FILE
+            values = dict(ind, price=current_price, entry_price=entry_price, target_price=target_price)
+            side = 'BUY' if strategy == 'BUY' else 'SELL'
+            confidence, parts, row = self.confidence_scorer.explain('target', values, side)
+            
+            details['progress'] = f"{row['progress']*100:.1f}%"
+            details['momentum'] = f"{row['momentum_10']:.2f}"
+            details['volume'] = f"{row['volume_ratio']:.2f}x"
+            trend_score = sum(parts.get(name, 0) for name in ('progress', 'momentum', 'volume', 'trend'))
+            details['trend'] = 'Aligned' if trend_score >= 15 else 'Weak'
+            details['rsi'] = f"{row['rsi']:.1f}"
             
-            if progress >= 0.75:
-                score += 25  # Almost there!
-            elif progress >= 0.50:
-                score += 15  # Halfway
-            elif progress >= 0.25:
-                score += 8
-            else:
-                score += 3  # Just started
-            details['progress'] = f"{progress*100:.1f}%"
-            
-            # Factor 2: Momentum Strength (25 points)
-            momentum_3 = ind.get('momentum_3', 0)
-            momentum_10 = ind.get('momentum_10', 0)
-            
-            if strategy == 'BUY':
-                if momentum_10 > 2 and momentum_3 > 0:
-                    score += 25
-                elif momentum_10 > 1:
-                    score += 15
-                elif momentum_10 > 0:
-                    score += 8
-            else:  # SELL
-                if momentum_10 < -2 and momentum_3 < 0:
-                    score += 25
-                elif momentum_10 < -1:
-                    score += 15
-                elif momentum_10 < 0:
-                    score += 8
-            details['momentum'] = f"{momentum_10:.2f}"
-            
-            # Factor 3: Volume Trend (20 points)
-            volume_ratio = ind.get('volume_ratio', 1.0)
-            if volume_ratio > 1.5:
-                score += 20  # High volume = strong move
-            elif volume_ratio > 1.2:
-                score += 12
-            elif volume_ratio > 0.8:
-                score += 5
-            details['volume'] = f"{volume_ratio:.2f}x"
-            
-            # Factor 4: Trend Alignment (20 points)
-            ema_9 = ind.get('ema_9', current_price)
-            ema_21 = ind.get('ema_21', current_price)
-            ema_50 = ind.get('ema_50', current_price)
-            
-            if strategy == 'BUY':
-                if ema_9 > ema_21 > ema_50:
-                    score += 20  # Perfect alignment
-                elif ema_9 > ema_21:
-                    score += 10
-                else:
-                    score += 3
-            else:  # SELL
-                if ema_9 < ema_21 < ema_50:
-                    score += 20
-                elif ema_9 < ema_21:
-                    score += 10
-                else:
-                    score += 3
-            details['trend'] = 'Aligned' if score >= 15 else 'Weak'
-            
-            # Factor 5: RSI Sustainability (10 points)
-            rsi = ind.get('rsi', 50)
-            if strategy == 'BUY':
-                if 40 < rsi < 70:  # Sustainable uptrend
-                    score += 10
-                elif rsi < 75:
-                    score += 5
-            else:  # SELL
-                if 30 < rsi < 60:  # Sustainable downtrend
-                    score += 10
-                elif rsi > 25:
-                    score += 5
-            details['rsi'] = f"{rsi:.1f}"
-            
-            confidence = min(100, max(0, score))
             return confidence, details
             
         except Exception as e:
@@ -2014,124 +2054,140 @@ class UltimateHybridBot:
             return "UNKNOWN"
     
     def get_current_price(self, symbol, max_retries=3):
-        """Get current price with retry logic and exponential backoff"""
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(
-                    f"{self.base_url}/api/v3/ticker/price",
-                    params={'symbol': symbol},
-                    timeout=5  # Shorter timeout for faster retries
-                )
-                if response.status_code == 200:
-                    # 🔥 BUG FIX: Safe JSON parsing with get()
-                    json_data = response.json()
-                    if 'price' in json_data:
-                        return float(json_data['price'])
-                    else:
-                        logger.error(f"❌ Unexpected response format for {symbol}: missing 'price' key")
-                        return None
-                elif response.status_code == 429:  # Rate limit
-                    wait_time = (2 ** attempt) * 2  # Longer wait for rate limits
-                    logger.warning(f"Rate limited for {symbol}, waiting {wait_time}s")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    logger.warning(f"HTTP {response.status_code} for {symbol}")
-            except requests.exceptions.Timeout:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                    logger.warning(f"Timeout for {symbol}, retry {attempt+1}/{max_retries} in {wait_time}s")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"Failed to get price for {symbol} after {max_retries} attempts (timeout)")
-            except requests.exceptions.ConnectionError as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    logger.warning(f"Connection error for {symbol}: {e}, retry {attempt+1}/{max_retries} in {wait_time}s")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"Connection error for {symbol} after {max_retries} attempts: {e}")
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    logger.warning(f"Error for {symbol}: {e}, retry {attempt+1}/{max_retries} in {wait_time}s")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"Failed to get price for {symbol} after {max_retries} attempts: {e}")
+        """Get current price (live stream, then bulk snapshot, single-symbol request as fallback)"""
+        # 🛰️ Sub-second price from the WebSocket stream (None when stale/disconnected)
+        if self.market_stream:
+            price = self.market_stream.get_price(symbol)
+            if price:
+                return price
+        
+        # 📸 Served from the bulk snapshot (refreshes itself when stale)
+        price = self.price_snapshot.get(symbol)
+        if price:
+            return price
         
-        return None  # All retries failed
+        return self.fetch_symbol_price(symbol, max_retries)
+    
+    def fetch_symbol_price(self, symbol, max_retries=3):
+        """Get current price for ONE symbol with retry logic and exponential backoff"""
+        # 🔌 Retries / backoff handled by the shared transport
+        response = self.transport.get(
+            f"{self.base_url}/api/v3/ticker/price",
+            params={'symbol': symbol},
+            timeout=5,  # Shorter timeout for faster retries
+            max_retries=max_retries,
+            label='ticker/price'
+        )
+        if response is None:
+            logger.error(f"Failed to get price for {symbol} after {max_retries} attempts")
+            return None
+        if response.status_code != 200:
+            logger.warning(f"HTTP {response.status_code} for {symbol}")
+            return None
+        
+        try:
+            # 🔥 BUG FIX: Safe JSON parsing with get()
+            json_data = response.json()
+            if 'price' in json_data:
+                return float(json_data['price'])
+            logger.error(f"❌ Unexpected response format for {symbol}: missing 'price' key")
+        except Exception as e:
+            logger.error(f"Failed to parse price for {symbol}: {e}")
+        return None
     
     def get_cached_price(self, symbol):
         """
         🎯 OPTIMIZATION: Get price from cache if valid, otherwise fetch fresh
         Reduces API calls by 70% (3x same symbol → 1x API call)
         """
-        import time
+        # 🛰️ Live stream first, then the bulk snapshot (one request for ALL symbols)
+        if self.market_stream:
+            price = self.market_stream.get_price(symbol)
+            if price:
+                return price
+        
+        price = self.price_snapshot.get(symbol)
+        if price:
+            return price
+        
         now = time.time()
         
-        # Check cache
+        # Check per-symbol cache (fallback when the bulk snapshot is unavailable)
         if symbol in self.price_cache:
             cached_price, cached_time = self.price_cache[symbol]
             if now - cached_time < self.cache_ttl:
                 return cached_price  # Cache hit!
         
         # Cache miss or expired - fetch fresh price
-        price = self.get_current_price(symbol)
+        price = self.fetch_symbol_price(symbol)
         if price:
             self.price_cache[symbol] = (price, now)
         
         return price
     
-    def get_klines(self, symbol, interval='5m', limit=200, max_retries=3):
-        """Get candlestick data with retry logic and exponential backoff"""
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(
-                    f"{self.base_url}/api/v3/klines",
-                    params={
-                        'symbol': symbol,
-                        'interval': interval,
-                        'limit': limit
-                    },
-                    timeout=10
-                )
-                if response.status_code == 200:
-                    klines = response.json()
-                    closes = np.array([float(k[4]) for k in klines])
-                    highs = np.array([float(k[2]) for k in klines])
-                    lows = np.array([float(k[3]) for k in klines])
-                    volumes = np.array([float(k[5]) for k in klines])
-                    opens = np.array([float(k[1]) for k in klines])
-                    return closes, highs, lows, volumes, opens
-                elif response.status_code == 429:  # Rate limit
-                    wait_time = (2 ** attempt) * 2
-                    logger.warning(f"Rate limited (klines) for {symbol}, waiting {wait_time}s")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    logger.warning(f"HTTP {response.status_code} for klines {symbol}")
-            except requests.exceptions.Timeout:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    logger.warning(f"Timeout (klines) for {symbol}, retry {attempt+1}/{max_retries} in {wait_time}s")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"Failed to get klines for {symbol} after {max_retries} attempts (timeout)")
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt
-                    logger.warning(f"Error (klines) for {symbol}: {e}, retry {attempt+1}/{max_retries} in {wait_time}s")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"Failed to get klines for {symbol} after {max_retries} attempts: {e}")
+    def fetch_kline_rows(self, symbol, interval, limit, start_time=None, max_retries=3):
+        """Raw klines from REST as an (N, 6) array, or None on failure"""
+        params = {
+            'symbol': symbol,
+            'interval': interval,
+            'limit': limit
+        }
+        if start_time is not None:
+            params['startTime'] = int(start_time)  # 🧩 Top-up: only candles since the last stored one
+        # 🔌 Pooled keep-alive session; retries / backoff handled by the shared transport
+        response = self.transport.get(
+            f"{self.base_url}/api/v3/klines",
+            params=params,
+            timeout=10,
+            max_retries=max_retries,
+            label='klines'
+        )
+        if response is None:
+            logger.error(f"Failed to get klines for {symbol} after {max_retries} attempts")
+            return None
+        if response.status_code != 200:
+            logger.warning(f"HTTP {response.status_code} for klines {symbol}")
+            return None
         
-        return None, None, None, None, None  # All retries failed
+        try:
+            return decode_klines(response.content)
+        except Exception as e:
+            logger.error(f"Failed to parse klines for {symbol}: {e}")
+            return None
     
-    def calculate_indicators(self, closes, highs, lows, volumes):
-        """Calculate all technical indicators with NaN/None validation"""
+    def get_klines(self, symbol, interval='5m', limit=200):
+        """Get candlestick data (closes, highs, lows, volumes, opens) from the kline ring buffers"""
+        rows = self.get_kline_rows(symbol, interval, limit)
+        return columns(rows) if rows is not None else (None, None, None, None, None)
+    
+    def get_kline_rows(self, symbol, interval='5m', limit=200):
+        """Newest candles as an (N, 6) array [open_time, open, high, low, close, volume], or None"""
+        # 🧮 Same (symbol, interval) within one cycle → one load, shared by all callers
+        return self.cycle_cache.get(
+            (symbol, interval), limit,
+            loader=lambda size: self._load_klines(symbol, interval, size),
+            slicer=lambda rows, size: rows[-size:]
+        )
+    
+    def _load_klines(self, symbol, interval, limit):
+        # 🧩 Seeded once per symbol/interval, then topped up with only the newest candles
+        return self.kline_store.get_rows(symbol, interval, limit)
+    
+    def calculate_indicators(self, closes, highs, lows, volumes, symbol=None, interval='5m', open_times=None):
+        """Calculate all technical indicators with NaN/None validation
+        
+        With ``symbol`` and ``open_times`` the streaming engine is used: only candles
+        closed since the last scan advance its state, the last (forming) one is peeked.
+        """
         try:
             if len(closes) < 200:
                 return None
+            
+            # 📐 STREAMING PATH: O(1) per new candle instead of a full TA-Lib pass
+            if INDICATOR_MODE == 'streaming' and symbol is not None and open_times is not None:
+                indicators = self.indicator_engine.update((symbol, interval), open_times, closes, highs, lows, volumes)
+                if indicators is not None:
+                    return self.validate_indicators(indicators)
                 
             indicators = {}
             
@@ -2167,7 +2223,7 @@ class UltimateHybridBot:
                 indicators['macd_hist'] = 0.0
             
             # 🔧 FIX: Bollinger Bands with NaN protection AND length validation
-            upper, middle, lower = talib.BBANDS(closes)
+            upper, middle, lower = talib.BBANDS(closes, timeperiod=BB_PERIOD, nbdevup=BB_DEV, nbdevdn=BB_DEV)
             if len(upper) > 0 and len(middle) > 0 and len(lower) > 0:
                 indicators['bb_upper'] = float(upper[-1]) if not np.isnan(upper[-1]) else closes[-1] * 1.02
                 indicators['bb_middle'] = float(middle[-1]) if not np.isnan(middle[-1]) else closes[-1]
@@ -2203,18 +2259,21 @@ class UltimateHybridBot:
             else:
                 indicators['momentum_10'] = 0.0
             
-            # 🔧 VALIDATION: Check all indicators are valid numbers
-            for key, value in indicators.items():
-                if value is None or np.isnan(value) or np.isinf(value):
-                    logger.warning(f"Invalid indicator {key}={value}, using default")
-                    indicators[key] = 0.0 if 'momentum' in key or 'macd' in key else 50.0
-            
-            return indicators
+            return self.validate_indicators(indicators)
             
         except Exception as e:
             logger.error(f"Error calculating indicators: {e}", exc_info=True)
             return None
     
+    def validate_indicators(self, indicators):
+        """🔧 VALIDATION: Check all indicators are valid numbers"""
+        for key, value in indicators.items():
+            if value is None or np.isnan(value) or np.isinf(value):
+                logger.warning(f"Invalid indicator {key}={value}, using default")
+                indicators[key] = 0.0 if 'momentum' in key or 'macd' in key else 50.0
+        
+        return indicators
+    
     def analyze_market_regime(self):
         """
         🚀 DYNAMIC MARKET REGIME DETECTION 🚀
@@ -2354,54 +2413,11 @@ class UltimateHybridBot:
         """
         🎯 OPTIMIZATION: Detect support/resistance from recent data only
         Uses last 100 candles instead of 200 → More relevant levels
+        ⚡ Vectorized: sliding-window max/min pivots + one-shot level clustering
+        (``window`` may also be a list of windows, pivots of all of them are merged)
         """
         try:
-            # Use recent data only (last 100 candles)
-            if len(highs) > 100:
-                highs = highs[-100:]
-                lows = lows[-100:]
-                closes = closes[-100:]
-            
-            levels = []
-            
-            # Find local maxima (resistance) and minima (support)
-            for i in range(window, len(closes) - window):
-                # Check if it's a peak (resistance)
-                if highs[i] == max(highs[i-window:i+window]):
-                    levels.append(('resistance', highs[i]))
-                
-                # Check if it's a trough (support)
-                if lows[i] == min(lows[i-window:i+window]):
-                    levels.append(('support', lows[i]))
-            
-            # Cluster nearby levels
-            support = []
-            resistance = []
-            
-            for level_type, price in levels:
-                if level_type == 'support':
-                    # 🔥 BUG FIX: Check for zero/near-zero prices before division!
-                    if not support:
-                        support.append(price)
-                    elif support[-1] > 0 and abs(price - support[-1]) / support[-1] > 0.01:
-                        support.append(price)
-                    elif support[-1] == 0:
-                        # Extremely rare but possible - skip this level
-                        logger.warning(f"⚠️ Zero price detected in support levels, skipping")
-                else:
-                    # 🔥 BUG FIX: Check for zero/near-zero prices before division!
-                    if not resistance:
-                        resistance.append(price)
-                    elif resistance[-1] > 0 and abs(price - resistance[-1]) / resistance[-1] > 0.01:
-                        resistance.append(price)
-                    elif resistance[-1] == 0:
-                        # Extremely rare but possible - skip this level
-                        logger.warning(f"⚠️ Zero price detected in resistance levels, skipping")
-            
-            return {
-                'support': sorted(support)[-3:],  # Last 3 support levels
-                'resistance': sorted(resistance)[-3:]  # Last 3 resistance levels
-            }
+            return support_resistance(highs, lows, windows=window, lookback=100, tolerance=0.01, keep=3)
             
         except Exception as e:
             logger.error(f"Error detecting S/R: {e}")
@@ -2419,97 +2435,173 @@ class UltimateHybridBot:
         
         return None
     
+    def scan_symbol(self, symbol, rows=None, indicators=None):
+        """
+        Fetch klines and compute all scan data for ONE symbol
+        Safe to run in a worker thread: only reads shared state, returns the
+        market_data entry (or None on failure) instead of writing it
+        
+        ``rows`` / ``indicators`` are passed in when the scan already fetched the
+        candles and computed the indicators for the whole universe (batch mode).
+        """
+        # Get data
+        if rows is None:
+            rows = self.get_kline_rows(symbol, '5m', SCAN_KLINE_LIMIT)
+            if rows is None:
+                return None
+        closes, highs, lows, volumes, opens = columns(rows)
+        
+        # 🧠 Memo key: the last CLOSED candle (the last row is still forming)
+        series = (symbol, '5m')
+        closed_time = float(rows[-2, OPEN_TIME]) if len(rows) >= 2 else None
+        forming = tuple(rows[-1, 1:].tolist())  # open, high, low, close, volume
+
+        # Calculate indicators (📐 streaming engine keyed by symbol, candles identified by open time)
+        if indicators is not None:
+            indicators = self.validate_indicators(indicators)
+        else:
+            indicators = self.indicator_memo.get_or_compute(
+                series, closed_time, 'indicators', (INDICATOR_MODE, len(rows), forming),
+                lambda: self.calculate_indicators(closes, highs, lows, volumes, symbol=symbol, interval='5m',
+                                                  open_times=rows[:, OPEN_TIME])
+            )
+            indicators = dict(indicators) if indicators is not None else None  # Callers may modify their copy
+        if indicators is None:
+            return None
+
+        # Detect S/R levels (peaks / troughs never include the forming candle → reused until the next close)
+        sr_levels = self.indicator_memo.get_or_compute(
+            series, closed_time, 'support_resistance', (len(rows),),
+            lambda: self.detect_support_resistance(highs, lows, closes)
+        )
+
+        # Calculate opportunity score
+        score = self.calculate_opportunity_score(closes[-1], indicators, sr_levels)
+
+        # Detect market condition (last 20 closes: closed candles + the forming close)
+        market_condition = self.indicator_memo.get_or_compute(
+            series, closed_time, 'market_condition', (float(closes[-1]),),
+            lambda: performance_analytics.detect_market_condition(closes)
+        )
+
+        # 📈 VOLUME SPIKE DETECTION
+        # Detects when volume is significantly higher than average
+        current_volume = volumes[-1] if len(volumes) > 0 else 0
+        avg_volume = np.mean(volumes[-20:]) if len(volumes) >= 20 else current_volume
+        volume_spike_ratio = (current_volume / avg_volume) if avg_volume > 0 else 1.0
+        has_volume_spike = volume_spike_ratio > 2.0  # 2x average = spike!
+
+        # 🎯 OPTIMIZATION: Store only last 20 candles (need for market_condition detection)
+        # Reduces memory by 80%: 200 candles → 20 candles
+        return {
+            'price': closes[-1],
+            'history': closes[-20:],  # 🔥 FIX: Add 'history' for calculate_mhi()!
+            'closes': closes[-20:],  # Only last 20! (was 200)
+            'highs': highs[-20:],     # Only last 20!
+            'lows': lows[-20:],       # Only last 20!
+            'volumes': volumes[-20:],  # Store volumes for strategies
+            'indicators': indicators,
+            'sr_levels': sr_levels,
+            'score': score,
+            'market_condition': market_condition,
+            'volume_spike_ratio': volume_spike_ratio,  # 📈 NEW!
+            'has_volume_spike': has_volume_spike,  # 📈 NEW!
+            'timestamp': time.time()  # For future cache invalidation
+        }
+
+    def _fetch_scan_rows(self, symbol):
+        try:
+            return self.get_kline_rows(symbol, '5m', SCAN_KLINE_LIMIT)
+        except Exception as e:
+            logger.error(f"Error fetching klines for {symbol}: {e}")
+            return None
+
+    def prepare_batch_scan(self, symbols=None):
+        """
+        🧱 BATCH MODE: fetch every symbol's candles, then compute indicators for the
+        whole universe in one vectorized pass (ragged histories are masked)
+        Returns {symbol: (rows, indicators)}; rows None = fetch failed,
+        indicators None = not enough history (same as calculate_indicators)
+        """
+        symbols = COIN_UNIVERSE if symbols is None else symbols
+        if self.scan_executor is not None:
+            rows_list = list(self.scan_executor.map(self._fetch_scan_rows, symbols))
+        else:
+            rows_list = [self._fetch_scan_rows(symbol) for symbol in symbols]
+
+        compute_start = time.time()
+        indicators_list = batch_indicators(rows_list, min_length=200, width=SCAN_KLINE_LIMIT, memo=self.indicator_memo,
+                                           series=[(symbol, '5m') for symbol in symbols])
+        logger.debug(f"🧱 Batch indicators for {len(rows_list)} symbols in {(time.time() - compute_start) * 1000:.1f}ms")
+        return dict(zip(symbols, zip(rows_list, indicators_list)))
+
     def scan_market(self):
-        """Scan all coins and rank by opportunity"""
+        """Scan the coins due this cycle (🌡️ scan tiers) and rank them by opportunity"""
+        open_symbols = {position.symbol for position in self.state.current().positions.values()}
+        due = self.scan_scheduler.plan(COIN_UNIVERSE, open_symbols)
+        tier_counts = self.scan_scheduler.get_stats()['counts']
+        
         logger.info(f"\n{'='*70}")
-        logger.info(f"🔍 SCANNING {len(COIN_UNIVERSE)} COINS...")
+        logger.info(f"🔍 SCANNING {len(due)}/{len(COIN_UNIVERSE)} COINS... (workers: {self.scan_max_workers}) "
+                    f"🌡️ HOT {tier_counts['HOT']} | WARM {tier_counts['WARM']} | COLD {tier_counts['COLD']}")
         logger.info(f"{'='*70}")
-        
+        if not due:
+            logger.info("🌡️ No coins due this cycle (weight budget spent / all cold)")
+            return []
+
         opportunities = []
         symbols_scanned = 0
         symbols_failed = 0
-        
-        for symbol in COIN_UNIVERSE:
-            try:
-                # Get data
-                closes, highs, lows, volumes, opens = self.get_klines(symbol, '5m', 200)
-                if closes is None:
-                    symbols_failed += 1
-                    continue
-                
-                # Calculate indicators
-                indicators = self.calculate_indicators(closes, highs, lows, volumes)
-                if indicators is None:
-                    symbols_failed += 1
-                    continue
-                
-                symbols_scanned += 1
-                
-                # Detect S/R levels
-                sr_levels = self.detect_support_resistance(highs, lows, closes)
-                
-                # Calculate opportunity score
-                score = self.calculate_opportunity_score(closes[-1], indicators, sr_levels)
-                
-                # Detect market condition
-                market_condition = performance_analytics.detect_market_condition(closes)
-                
-                # 📈 VOLUME SPIKE DETECTION
-                # Detects when volume is significantly higher than average
-                current_volume = volumes[-1] if len(volumes) > 0 else 0
-                avg_volume = np.mean(volumes[-20:]) if len(volumes) >= 20 else current_volume
-                volume_spike_ratio = (current_volume / avg_volume) if avg_volume > 0 else 1.0
-                has_volume_spike = volume_spike_ratio > 2.0  # 2x average = spike!
-                
-                # 🎯 OPTIMIZATION: Store only last 20 candles (need for market_condition detection)
-                # Reduces memory by 80%: 200 candles → 20 candles
-                import time
-                self.market_data[symbol] = {
-                    'price': closes[-1],
-                    'history': closes[-20:],  # 🔥 FIX: Add 'history' for calculate_mhi()!
-                    'closes': closes[-20:],  # Only last 20! (was 200)
-                    'highs': highs[-20:],     # Only last 20!
-                    'lows': lows[-20:],       # Only last 20!
-                    'volumes': volumes[-20:],  # Store volumes for strategies
-                    'indicators': indicators,
-                    'sr_levels': sr_levels,
-                    'score': score,
-                    'market_condition': market_condition,
-                    'volume_spike_ratio': volume_spike_ratio,  # 📈 NEW!
-                    'has_volume_spike': has_volume_spike,  # 📈 NEW!
-                    'timestamp': time.time()  # For future cache invalidation
-                }
-                
-                opportunities.append((symbol, score, indicators))
-                
-                logger.info(f"✓ {symbol}: Score={score:.2f}, RSI={indicators['rsi']:.1f}, Vol={indicators['atr_pct']:.2f}%")
-                
-                # 🎯 OPTIMIZATION: Removed individual sleep - much faster!
-                # Was: time.sleep(0.1) × 22 = 2.2s wasted
-                # Now: One sleep at end = 0.5s
-                
-            except Exception as e:
-                logger.error(f"Error scanning {symbol}: {e}")
+        scan_start = time.time()
+
+        # ⚡ CONCURRENT SCAN: Fetch + analyze many symbols at once
+        # Results are collected first, then applied in COIN_UNIVERSE order,
+        # so market_data/opportunities are identical to the serial scan
+        # 🧱 Batch mode: candles + indicators for every symbol up front, workers do the rest
+        prepared = self.prepare_batch_scan(due) if INDICATOR_MODE == 'batch' else {}
+        tasks = {}
+        for symbol in due:
+            rows, indicators = prepared.get(symbol, (None, None))
+            if symbol in prepared and (rows is None or indicators is None):
+                continue  # Fetch failed / not enough history → counted as failed below
+            tasks[symbol] = (symbol, rows, indicators)
+
+        results = scan_all(tasks, self.scan_symbol, self.scan_executor)  # A symbol that raises comes back as None
+
+        for symbol in due:
+            entry = results.get(symbol)
+            self.scan_scheduler.record(symbol, entry, symbol in open_symbols)
+            if entry is None:
                 symbols_failed += 1
                 continue
-        
+
+            symbols_scanned += 1
+            self.market_data[symbol] = entry
+            opportunities.append((symbol, entry['score'], entry['indicators']))
+
+            logger.info(f"✓ {symbol}: Score={entry['score']:.2f}, RSI={entry['indicators']['rsi']:.1f}, Vol={entry['indicators']['atr_pct']:.2f}%")
+
+        logger.info(f"⏱️ Scan took {time.time() - scan_start:.2f}s")
+
         # 🎯 OPTIMIZATION: Single sleep at end instead of 22 individual sleeps
         # Savings: 2.2s → 0.5s = 340% faster scanning!
         time.sleep(0.5)
         
         # 🔥 CRITICAL: API OUTAGE DETECTION
-        total_symbols = len(COIN_UNIVERSE)
-        success_rate = (symbols_scanned / total_symbols * 100) if total_symbols > 0 else 0
+        # Judged on the last SCAN_OUTAGE_WINDOW scans, not this cycle's tier slice (often only 1-3 symbols)
+        total_symbols = len(due)
+        success_rate = self.scan_scheduler.success_rate(min_attempts=SCAN_OUTAGE_MIN_ATTEMPTS)
+        recent = f"{success_rate:.1f}%" if success_rate is not None else "too few scans to judge"
         
-        logger.info(f"📊 Scan Results: {symbols_scanned}/{total_symbols} successful ({success_rate:.1f}%), {symbols_failed} failed")
+        logger.info(f"📊 Scan Results: {symbols_scanned}/{total_symbols} successful, {symbols_failed} failed (recent: {recent})")
         
-        if success_rate < 30:  # Less than 30% success = likely API outage!
+        if success_rate is not None and success_rate < 30:  # Less than 30% success = likely API outage!
             logger.error(f"🚨 CRITICAL: API OUTAGE DETECTED!")
-            logger.error(f"   Only {symbols_scanned}/{total_symbols} symbols scanned successfully")
+            logger.error(f"   Only {success_rate:.1f}% of the last {SCAN_OUTAGE_WINDOW} scans succeeded ({symbols_scanned}/{total_symbols} this cycle)")
             logger.error(f"   Binance API may be down or rate limits exceeded")
             logger.error(f"   Returning empty opportunities to pause trading")
             return []  # Return empty list to prevent trading during outage
-        elif success_rate < 70:
+        elif success_rate is not None and success_rate < 70:
             logger.warning(f"⚠️ WARNING: High failure rate ({100-success_rate:.1f}%)")
             logger.warning(f"   API may be experiencing issues or rate limiting")
             logger.warning(f"   Proceeding with caution...")
@@ -2597,105 +2689,10 @@ class UltimateHybridBot:
         🎯 IMPROVEMENT: Dynamic confidence calculation based on signal strength
         Returns confidence as float 0-1
         """
-        confidence = base_confidence
-        
         try:
-            if signal_type == 'BUY':
-                # RSI strength (lower = stronger buy signal)
-                if indicators['rsi'] < 25:
-                    confidence += 20
-                elif indicators['rsi'] < 30:
-                    confidence += 15
-                elif indicators['rsi'] < 35:
-                    confidence += 12
-                elif indicators['rsi'] < 40:
-                    confidence += 8
-                elif indicators['rsi'] < 45:
-                    confidence += 5
-                
-                # Volume confirmation (crucial!)
-                if indicators['volume_ratio'] > 2.5:
-                    confidence += 15
-                elif indicators['volume_ratio'] > 2.0:
-                    confidence += 12
-                elif indicators['volume_ratio'] > 1.5:
-                    confidence += 8
-                elif indicators['volume_ratio'] > 1.2:
-                    confidence += 4
-                
-                # Trend alignment
-                if indicators['ema_9'] > indicators['ema_21'] > indicators['ema_50']:
-                    confidence += 12  # Strong uptrend
-                elif indicators['ema_9'] > indicators['ema_21']:
-                    confidence += 6  # Weak uptrend
-                
-                # MACD confirmation
-                if indicators['macd'] > indicators['macd_signal']:
-                    macd_strength = abs(indicators['macd'] - indicators['macd_signal'])
-                    if macd_strength > 10:
-                        confidence += 8
-                    else:
-                        confidence += 4
-                
-                # Momentum confirmation
-                if indicators['momentum_3'] > 0:
-                    confidence += 3
-                if indicators['momentum_10'] > 0:
-                    confidence += 3
-            
-            elif signal_type == 'SELL':
-                # RSI strength (higher = stronger sell signal)
-                if indicators['rsi'] > 75:
-                    confidence += 20
-                elif indicators['rsi'] > 70:
-                    confidence += 15
-                elif indicators['rsi'] > 65:
-                    confidence += 12
-                elif indicators['rsi'] > 60:
-                    confidence += 8
-                elif indicators['rsi'] > 55:
-                    confidence += 5
-                
-                # Volume confirmation
-                if indicators['volume_ratio'] > 2.5:
-                    confidence += 15
-                elif indicators['volume_ratio'] > 2.0:
-                    confidence += 12
-                elif indicators['volume_ratio'] > 1.5:
-                    confidence += 8
-                elif indicators['volume_ratio'] > 1.2:
-                    confidence += 4
-                
-                # Trend alignment
-                if indicators['ema_9'] < indicators['ema_21'] < indicators['ema_50']:
-                    confidence += 12  # Strong downtrend
-                elif indicators['ema_9'] < indicators['ema_21']:
-                    confidence += 6  # Weak downtrend
-                
-                # MACD confirmation
-                if indicators['macd'] < indicators['macd_signal']:
-                    macd_strength = abs(indicators['macd'] - indicators['macd_signal'])
-                    if macd_strength > 10:
-                        confidence += 8
-                    else:
-                        confidence += 4
-                
-                # Momentum confirmation
-                if indicators['momentum_3'] < 0:
-                    confidence += 3
-                if indicators['momentum_10'] < 0:
-                    confidence += 3
-            
-            # Volatility factor (higher volatility = slightly lower confidence)
-            if indicators['atr_pct'] > 5:
-                confidence -= 5  # Very volatile, less predictable
-            elif indicators['atr_pct'] > 3:
-                confidence -= 3
-            
-            # Cap at 95% (never 100% certain)
-            confidence = min(95, max(30, confidence))
-            
-            return confidence / 100  # Return as 0-1
+            # 🎚️ RSI / volume / trend / MACD / momentum / ATR ladders live in the 'signal' table
+            # of CONFIDENCE_TABLES_FILE (compiled once, also used by the vectorized engine)
+            return self.confidence_scorer.score_one('signal', indicators, signal_type, base_confidence)
             
         except Exception as e:
             logger.warning(f"Error calculating signal confidence: {e}")
@@ -2949,6 +2946,55 @@ class UltimateHybridBot:
         
         return None
     
+    def collect_signals(self, symbol, data, strategies_to_try):
+        """
+        Run every strategy's signal generator on one symbol
+        Returns (signal count, best score, best strategy, best signal) or None
+        """
+        # Collect all valid signals with scores
+        all_signals = []
+        for strategy_name, signal_func in strategies_to_try:
+            signal = signal_func(symbol, data)
+            if signal:
+                # Score = confidence × opportunity_score
+                # Higher = better signal!
+                signal_score = signal['confidence'] * data['score']
+                all_signals.append((signal_score, strategy_name, signal))
+        
+        if not all_signals:
+            return None
+        
+        # Pick BEST signal (highest score)
+        all_signals.sort(reverse=True, key=lambda x: x[0])  # Sort by score
+        best_score, best_strategy, best_signal = all_signals[0]
+        return len(all_signals), best_score, best_strategy, best_signal
+    
+    def evaluate_signals(self, symbols, strategies_to_try):
+        """
+        🎯 Best signal per symbol: {symbol: (signal count, best score, strategy, signal)}
+        Vectorized mode scores all symbols x strategies in one pass; entries it
+        can't read as plain numbers go through the scalar generators
+        """
+        if SIGNAL_MODE != 'vectorized':
+            best = {}
+            for symbol in symbols:
+                if symbol in self.market_data:
+                    result = self.collect_signals(symbol, self.market_data[symbol], strategies_to_try)
+                    if result:
+                        best[symbol] = result
+            return best
+        
+        best, fallback = self.signal_engine.evaluate(
+            self.market_data, symbols, [name for name, _ in strategies_to_try]
+        )
+        for symbol in fallback:
+            result = self.collect_signals(symbol, self.market_data[symbol], strategies_to_try)
+            if result:
+                best[symbol] = result
+        logger.debug(f"🎯 Signals for {len(symbols)} symbols: {len(best)} with a signal, {len(fallback)} scalar fallbacks "
+                     f"({self.signal_engine.get_stats()['last_ms']:.2f}ms)")
+        return best
+    
     # ========================================================================
     # POSITION MANAGEMENT
     # ========================================================================
@@ -3060,8 +3106,16 @@ class UltimateHybridBot:
             logger.error(f"Error calculating position size: {e}")
             return 0
     
-    def open_position(self, symbol, strategy_name, action, price, reason, confidence):
-        """Open a new position with comprehensive safety checks"""
+    def publish_state(self):
+        """📰 Publish a new state snapshot (call with data_lock held, right after changing the state)"""
+        return self.state.publish(self.positions, self.trades, self.current_capital, self.reserved_capital,
+                                  self.strategy_stats)
+    
+    def open_position(self, symbol, strategy_name, action, price, reason, confidence, wait=True):
+        """Open a new position with comprehensive safety checks
+        
+        LIVE: the order is queued and booked by its callback; wait=False returns its Future
+        """
         # 🔧 FIX: Thread-safe position opening
         with self.data_lock:
             try:
@@ -3094,19 +3148,20 @@ class UltimateHybridBot:
                 
                 # 🔧 FIX: Check MAX_TOTAL_POSITIONS (most critical!)
                 MAX_TOTAL_POSITIONS = 5  # Never more than 5 positions total!
-                if len(self.positions) >= MAX_TOTAL_POSITIONS:
+                pending_opens = [order for order in self.pending_orders.values() if order.intent == OPEN]  # 📨 Entries in flight count too
+                if len(self.positions) + len(pending_opens) >= MAX_TOTAL_POSITIONS:
                     logger.warning(f"⚠️ Max total positions ({MAX_TOTAL_POSITIONS}) reached, skipping {symbol}")
                     return False
                 
                 # 🔧 FIX: Check if symbol already has ANY position (avoid double exposure)
                 symbol_positions = [p for p in self.positions.values() if p['symbol'] == symbol]
-                if symbol_positions:
+                if symbol_positions or any(order.symbol == symbol for order in pending_opens):
                     logger.warning(f"⚠️ Already have position in {symbol}, skipping to avoid double exposure")
                     return False
                 
                 # Check if already have position with this strategy
                 position_key = f"{symbol}_{strategy_name}"
-                if position_key in self.positions:
+                if position_key in self.positions or position_key in self.pending_orders:
                     logger.debug(f"⏸️ {symbol}: Already have {strategy_name} position, skipping")
                     return False
                 
@@ -3180,43 +3235,39 @@ class UltimateHybridBot:
                         stop_loss_price = price * (1 + strategy['stop_loss'])
                         take_profit_price = price * (1 - strategy['take_profit'])
                 
+                entry = dict(
+                    symbol=symbol,
+                    strategy=strategy_name,
+                    action=action,
+                    stop_loss=stop_loss_price,  # 🔥 BUSS V2: ATR-based!
+                    take_profit=take_profit_price,  # 🔥 BUSS V2: ATR-based!
+                    reason=reason,
+                    confidence=confidence,
+                    market_condition=market_condition
+                )
+                
                 # 🔥 NOW PLACE ORDER (last step after all prep is done)
                 if LIVE_TRADING_MODE:
-                    # 🔴 LIVE TRADING: Place REAL order on Binance!
+                    # 🔴 LIVE TRADING: Queue a REAL order on Binance!
                     logger.warning(f"🔥 ATTEMPTING LIVE ORDER: {action} {quantity:.6f} {symbol}")
                     
-                    # Place live order - this is the CRITICAL STEP!
-                    order_result = self.place_live_order(symbol, action, quantity)
-                    
-                    if not order_result:
+                    order = self.prepare_live_order(symbol, action, quantity, price, position_key, OPEN, time.time())
+                    if order is None:
                         logger.error(f"❌ LIVE ORDER FAILED for {symbol}, aborting position")
                         return False
                     
-                    # 🔥 ORDER IS NOW ON BINANCE! Must track it!
-                    # Extract executed price and quantity from order response
-                    try:
-                        exec_price = float(order_result.get('fills', [{}])[0].get('price', price)) if order_result.get('fills') else price
-                        executed_qty = float(order_result.get('executedQty', quantity))
-                        
-                        # Use executed values (actual fill)
-                        quantity = executed_qty
-                        position_value = quantity * exec_price
-                        fee = position_value * self.fee_rate  # Binance fee already deducted
-                        total_cost = position_value + fee
-                        
-                        logger.info(f"✅ LIVE ORDER EXECUTED: {symbol} | Price: ${exec_price:.2f} | Qty: {quantity:.6f} | Cost: ${total_cost:.2f}")
-                    except Exception as e:
-                        # 🔴 CRITICAL ERROR: Order is filled but we can't parse response!
-                        logger.error(f"❌ CRITICAL: Live order filled but failed to parse response!")
-                        logger.error(f"❌ Order response: {order_result}")
-                        logger.error(f"❌ Exception: {e}")
-                        # Use fallback values to still track the position
-                        exec_price = price
-                        position_value = quantity * exec_price
-                        fee = position_value * self.fee_rate
-                        total_cost = position_value + fee
-                        logger.warning(f"⚠️ Using fallback values to track position: {symbol}")
+                    # 💰 Enough free balance? Only checked from the 📡 user-data stream cache:
+                    # no account request under data_lock (the exchange rejects it anyway if not)
+                    asset, needed = ('USDT', order.quantity * price * (1 + self.fee_rate)) if action == 'BUY' else (symbol[:-4], order.quantity)
+                    balance = self.user_stream.get_balance(asset) if self.user_stream else None
+                    if balance is not None and balance['free'] < needed:
+                        logger.error(f"❌ INSUFFICIENT {asset} BALANCE for {symbol}: free {balance['free']:.6f} < {needed:.6f}, aborting position")
+                        return False
                     
+                    # 📨 Sent by an order worker; book_open_fill creates the position once it fills
+                    # (pending_orders keeps the limits above honest until then)
+                    self.pending_orders[position_key] = order
+                    future = self.order_pipeline.submit(order, callback=lambda result: self.book_open_fill(position_key, entry, result))
                 else:
                     # ✅ PAPER TRADING: Simulate order with realistic costs
                     if action == 'BUY':
@@ -3224,51 +3275,107 @@ class UltimateHybridBot:
                     else:
                         exec_price = price * (1 - self.slippage_rate - self.spread_pct)  # Sell at bid - spread
                     
-                    position_value = quantity * exec_price
-                    fee = position_value * self.fee_rate
-                    total_cost = position_value + fee
-                
-                # Deduct from capital (both LIVE and PAPER)
-                self.current_capital -= total_cost
-                self.reserved_capital += position_value
-                
-                # Create position (safely after order is placed)
-                self.positions[position_key] = {
-                    'symbol': symbol,
-                    'strategy': strategy_name,
-                    'action': action,
-                    'quantity': quantity,
-                    'entry_price': exec_price,
-                    'entry_time': datetime.now(),
-                    'stop_loss': stop_loss_price,  # 🔥 BUSS V2: ATR-based!
-                    'take_profit': take_profit_price,  # 🔥 BUSS V2: ATR-based!
-                    'reason': reason,
-                    'confidence': confidence,
-                    'market_condition': market_condition,
-                    'target_confidence': None,  # Will be calculated when in profit
-                    'position_value': position_value  # 🔧 FIX: Store original position value for accurate capital tracking
-                }
-                
-                # 🔧 CRITICAL FIX: Don't add to trades list on OPEN!
-                # Trades should ONLY be added on CLOSE when we have P&L
-                # This prevents duplicate entries and incorrect P&L calculation
-                
-                # 🎯 ROUND 7 FIX #6: Increment daily trade counter
-                self.daily_trade_count += 1
-                
-                logger.info(f"✅ OPENED {action} | {symbol} | {strategy_name} | {quantity:.4f} @ ${exec_price:.2f} | {reason} | Trade #{self.daily_trade_count}/20")
-                
-                return True
+                    self.add_position(position_key, quantity, exec_price, **entry)
+                    return True
                 
             except Exception as e:
                 logger.error(f"Error opening position: {e}")
                 return False
+        
+        # 📨 Lock released: wait for the fill here, never inside data_lock
+        return self.await_orders([future]) > 0 if wait else future
     
-    def close_position(self, position_key, current_price, reason):
-        """Close an existing position with thread safety"""
-        # 🔧 FIX: Thread-safe position closing
+    def book_open_fill(self, position_key, entry, result):
+        """📨 Order pipeline callback for entry orders: book the fill as a position"""
         with self.data_lock:
             try:
+                self.pending_orders.pop(position_key, None)
+                symbol = entry['symbol']
+                if not result.filled:
+                    logger.error(f"❌ LIVE ORDER FAILED for {symbol} ({result.status}), aborting position")
+                    return
+                
+                # 🔥 ORDER IS NOW ON BINANCE! Must track it! (average fill price / executed quantity)
+                exec_price = result.avg_price or result.request.price
+                self.add_position(position_key, result.executed_qty, exec_price, **entry)
+                logger.info(f"✅ LIVE ORDER EXECUTED: {symbol} | Price: ${exec_price:.2f} | Qty: {result.executed_qty:.6f}")
+            except Exception as e:
+                # 🔴 CRITICAL ERROR: Order is filled but we can't track it!
+                logger.error(f"❌ CRITICAL: Live order {result.request.client_order_id} filled but booking failed: {e}")
+    
+    def add_position(self, position_key, quantity, exec_price, **entry):
+        """Book a filled entry (call with data_lock held): capital, position record, exit triggers, snapshot"""
+        position_value = quantity * exec_price
+        fee = position_value * self.fee_rate
+        total_cost = position_value + fee
+        
+        # Deduct from capital (both LIVE and PAPER)
+        self.current_capital -= total_cost
+        self.reserved_capital += position_value
+        
+        # Create position (safely after order is filled)
+        self.positions[position_key] = Position(
+            quantity=quantity,
+            entry_price=exec_price,
+            entry_time=time.time(),
+            target_confidence=None,  # Will be calculated when in profit
+            position_value=position_value,  # 🔧 FIX: Store original position value for accurate capital tracking
+            **entry
+        )
+        self.arm_exit_triggers(position_key, self.positions[position_key])  # ⚡ Guarded from the price feed right away
+        self.publish_state()
+        
+        # 🔧 CRITICAL FIX: Don't add to trades list on OPEN!
+        # Trades should ONLY be added on CLOSE when we have P&L
+        # This prevents duplicate entries and incorrect P&L calculation
+        
+        # 🎯 ROUND 7 FIX #6: Increment daily trade counter
+        self.daily_trade_count += 1
+        
+        logger.info(f"✅ OPENED {entry['action']} | {entry['symbol']} | {entry['strategy']} | {quantity:.4f} @ ${exec_price:.2f} | {entry['reason']} | Trade #{self.daily_trade_count}/20")
+    
+    def close_position(self, position_key, current_price, reason, wait=True):
+        """Close an existing position with thread safety
+        
+        LIVE: the close order is queued and settled by its callback; wait=False returns its Future
+        """
+        if not LIVE_TRADING_MODE:
+            return self.settle_close(position_key, current_price, reason)
+        
+        with self.data_lock:
+            position = self.positions.get(position_key)
+            if position is None:
+                logger.warning(f"Position {position_key} not found, may have been closed already")
+                return False
+            if position_key in self.pending_orders:
+                logger.debug(f"📨 {position_key}: close order already in flight")
+                return False
+            
+            # 🔴 LIVE TRADING: Close with REAL order on Binance!
+            close_side = 'SELL' if position['action'] == 'BUY' else 'BUY'
+            logger.warning(f"🔥 ATTEMPTING LIVE CLOSE: {close_side} {position['quantity']:.6f} {position['symbol']}")
+            
+            # Same position + remaining quantity → same close id, even when a later cycle retries the close
+            # (after a partial fill the remainder gets its own id)
+            order = self.prepare_live_order(position['symbol'], close_side, position['quantity'], current_price,
+                                            position_key, CLOSE, f"{position.entry_time}:{position['quantity']}")
+            if order is not None:
+                self.pending_orders[position_key] = order
+        
+        if order is None:
+            return self.settle_close(position_key, current_price, reason)  # Counts as a failed close attempt
+        
+        # 📨 Sent by an order worker, settled by settle_close (data_lock is not held while it's out)
+        future = self.order_pipeline.submit(order, callback=lambda result: self.settle_close(position_key, current_price, reason, result))
+        return self.await_orders([future]) > 0 if wait else future
+    
+    def settle_close(self, position_key, current_price, reason, order_result=None):
+        """Book a close: PAPER simulates the fill, LIVE books order_result (None / not filled = failed attempt)"""
+        with self.data_lock:
+            try:
+                if LIVE_TRADING_MODE:
+                    self.pending_orders.pop(position_key, None)
+                
                 if position_key not in self.positions:
                     logger.warning(f"Position {position_key} not found, may have been closed already")
                     return False
@@ -3279,14 +3386,7 @@ class UltimateHybridBot:
                 
                 # 🔥 CRITICAL: LIVE vs PAPER CLOSE EXECUTION
                 if LIVE_TRADING_MODE:
-                    # 🔴 LIVE TRADING: Close with REAL order on Binance!
-                    close_side = 'SELL' if position['action'] == 'BUY' else 'BUY'
-                    logger.warning(f"🔥 ATTEMPTING LIVE CLOSE: {close_side} {position['quantity']:.6f} {symbol}")
-                    
-                    # Place live close order
-                    order_result = self.place_live_order(symbol, close_side, position['quantity'])
-                    
-                    if not order_result:
+                    if not order_result or not order_result.filled:
                         # 🔥 CRITICAL BUG FIX: Track failed close attempts!
                         logger.error(f"❌ LIVE CLOSE ORDER FAILED for {symbol}, position may be stuck!")
                         
@@ -3308,7 +3408,8 @@ class UltimateHybridBot:
                             else:
                                 exec_price = current_price * (1 + self.slippage_rate + self.spread_pct)
                             
-                            position_value = position['quantity'] * exec_price
+                            closed_qty = position['quantity']
+                            position_value = closed_qty * exec_price
                             fee = position_value * self.fee_rate
                             proceeds = position_value - fee
                             
@@ -3319,30 +3420,15 @@ class UltimateHybridBot:
                             logger.warning(f"⚠️ Will retry close on next cycle (failure {position['close_failures']}/3)")
                             return False
                     else:
-                        # Extract executed price from order response
-                        try:
-                            exec_price = float(order_result.get('fills', [{}])[0].get('price', current_price)) if order_result.get('fills') else current_price
-                            executed_qty = float(order_result.get('executedQty', position['quantity']))
-                            
-                            position_value = executed_qty * exec_price
-                            fee = position_value * self.fee_rate
-                            proceeds = position_value - fee
-                            
-                            logger.info(f"✅ LIVE CLOSE EXECUTED: {symbol} | Price: ${exec_price:.2f} | Qty: {executed_qty:.6f} | Proceeds: ${proceeds:.2f}")
-                        except Exception as e:
-                            # 🔴 CRITICAL: Order executed but parsing failed!
-                            logger.error(f"❌ CRITICAL: Close order executed but response parsing failed!")
-                            logger.error(f"❌ Order response: {order_result}")
-                            logger.error(f"❌ Exception: {e}")
-                            # Use fallback to still process the close
-                            if position['action'] == 'BUY':
-                                exec_price = current_price * (1 - self.slippage_rate - self.spread_pct)
-                            else:
-                                exec_price = current_price * (1 + self.slippage_rate + self.spread_pct)
-                            position_value = position['quantity'] * exec_price
-                            fee = position_value * self.fee_rate
-                            proceeds = position_value - fee
-                            logger.warning(f"⚠️ Using fallback price for close: ${exec_price:.2f}")
+                        # Average fill price / executed quantity of the close order
+                        exec_price = order_result.avg_price or current_price
+                        closed_qty = min(order_result.executed_qty, position['quantity'])
+                        
+                        position_value = closed_qty * exec_price
+                        fee = position_value * self.fee_rate
+                        proceeds = position_value - fee
+                        
+                        logger.info(f"✅ LIVE CLOSE EXECUTED: {symbol} | Price: ${exec_price:.2f} | Qty: {closed_qty:.6f} | Proceeds: ${proceeds:.2f}")
                     
                 else:
                     # ✅ PAPER TRADING: Simulate close with realistic costs
@@ -3353,18 +3439,23 @@ class UltimateHybridBot:
                         # Closing SELL position = BUY at ask + spread
                         exec_price = current_price * (1 + self.slippage_rate + self.spread_pct)
                     
-                    position_value = position['quantity'] * exec_price
+                    closed_qty = position['quantity']
+                    position_value = closed_qty * exec_price
                     fee = position_value * self.fee_rate
                     proceeds = position_value - fee
                 
+                # Partial fill: book the executed part, the rest stays open
+                closed_fraction = closed_qty / position['quantity'] if position['quantity'] > 0 else 1.0
+                partial = closed_fraction < 1 - 1e-9
+                
                 # Calculate P&L
                 if position['action'] == 'BUY':
-                    pnl = proceeds - (position['quantity'] * position['entry_price'])
+                    pnl = proceeds - (closed_qty * position['entry_price'])
                 else:
-                    pnl = (position['quantity'] * position['entry_price']) - proceeds
+                    pnl = (closed_qty * position['entry_price']) - proceeds
                 
                 # 🔧 FIX: Validate entry_price before division
-                entry_value = position['quantity'] * position['entry_price']
+                entry_value = closed_qty * position['entry_price']
                 if entry_value > 0:
                     pnl_pct = (pnl / entry_value) * 100
                 else:
@@ -3374,7 +3465,8 @@ class UltimateHybridBot:
                 # Update capital
                 self.current_capital += proceeds
                 # 🔧 FIX: Use stored position_value for accurate capital tracking
-                self.reserved_capital -= position.get('position_value', position['quantity'] * position['entry_price'])
+                released_capital = position.get('position_value', position['quantity'] * position['entry_price']) * closed_fraction
+                self.reserved_capital -= released_capital
                 
                 # Update strategy stats
                 self.strategy_stats[strategy_name]['trades'] += 1
@@ -3391,37 +3483,29 @@ class UltimateHybridBot:
                 # Detect market condition at exit
                 market_condition_exit = self.detect_market_condition(symbol)
                 
-                # Calculate hold duration
-                # 🔧 FIX: Validate entry_time before datetime subtraction
-                try:
-                    if isinstance(position['entry_time'], datetime):
-                        hold_duration = (datetime.now() - position['entry_time']).total_seconds() / 60  # minutes
-                    else:
-                        hold_duration = 0.0  # Safe default if entry_time is invalid
-                except (TypeError, AttributeError):
-                    hold_duration = 0.0
+                # Calculate hold duration (minutes)
+                hold_duration = position.held_minutes()
                 
                 # Log close with full details
-                trade = {
-                    'timestamp': datetime.now(),
-                    'symbol': symbol,
-                    'strategy': strategy_name,
-                    'action': 'CLOSE',
-                    'quantity': position['quantity'],
-                    'price': exec_price,
-                    'entry_price': position['entry_price'],
-                    'entry_time': position['entry_time'],
-                    'entry_reason': position['reason'],
-                    'exit_reason': reason,
-                    'fee': fee,
-                    'pnl': pnl,
-                    'pnl_pct': pnl_pct,
-                    'hold_duration': hold_duration,
-                    'market_condition_exit': market_condition_exit,
-                    'stop_loss': position['stop_loss'],
-                    'take_profit': position['take_profit'],
-                    'position_key': position_key
-                }
+                trade = Trade(
+                    timestamp=time.time(),
+                    symbol=symbol,
+                    strategy=strategy_name,
+                    quantity=closed_qty,
+                    price=exec_price,
+                    entry_price=position.entry_price,
+                    entry_time=position.entry_time,
+                    entry_reason=position.reason,
+                    exit_reason=reason,
+                    fee=fee,
+                    pnl=pnl,
+                    pnl_pct=pnl_pct,
+                    hold_duration=hold_duration,
+                    market_condition_exit=market_condition_exit,
+                    stop_loss=position.stop_loss,
+                    take_profit=position.take_profit,
+                    position_key=position_key
+                )
                 # 🔧 FIX: Thread-safe trades list append with memory cap
                 # This prevents race conditions when Flask reads trades simultaneously
                 self.trades.append(trade)
@@ -3431,7 +3515,6 @@ class UltimateHybridBot:
                     self.trades = self.trades[-1000:]
                 
                 # 🔥 BUSS V2: UPDATE EPRU AFTER EACH TRADE! 🔥
-                entry_value = position['quantity'] * position['entry_price']
                 self.update_epru(pnl, entry_value)  # Track profit per risk unit
                 
                 # 🔥 BUSS V2: FEEDBACK LOOP REVIEW (Every 20 Trades)! 🔥
@@ -3450,7 +3533,7 @@ class UltimateHybridBot:
                     'action': position['action'],
                     'entry_price': f"{position['entry_price']:.8f}",
                     'exit_price': f"{exec_price:.8f}",
-                    'quantity': f"{position['quantity']:.8f}",
+                    'quantity': f"{closed_qty:.8f}",
                     'pnl': f"{pnl:.4f}",
                     'pnl_pct': f"{pnl_pct:.4f}",
                     'fees': f"{fee:.4f}",
@@ -3513,6 +3596,16 @@ class UltimateHybridBot:
                 self.recent_trades_window.append(is_win)
                 # Update threshold will be called at start of next cycle
                 
+                if partial:
+                    # Keep the remainder open with its triggers armed; the next close sends a new order for it
+                    position.quantity -= closed_qty
+                    position.position_value -= released_capital
+                    position.close_failures = 0
+                    self.arm_exit_triggers(position_key, position)
+                    self.publish_state()
+                    logger.warning(f"⚠️ PARTIAL CLOSE: {symbol} | Closed {closed_qty:.6f}, {position.quantity:.6f} still open")
+                    return True
+                
                 # 🎯 ROUND 7 FIX #4: Add cooldown after closing to prevent re-entry
                 from datetime import timedelta
                 COOLDOWN_MINUTES = 10  # Don't re-enter same symbol for 10 minutes
@@ -3520,7 +3613,9 @@ class UltimateHybridBot:
                 logger.debug(f"🕒 Cooldown set for {symbol}: {COOLDOWN_MINUTES} minutes")
                 
                 # Remove position
+                self.exit_triggers.disarm(position_key)
                 del self.positions[position_key]
+                self.publish_state()
                 
                 return True
                 
@@ -3528,6 +3623,88 @@ class UltimateHybridBot:
                 logger.error(f"Error closing position: {e}")
                 return False
     
+    # ========================================================================
+    # ⚡ EXIT TRIGGERS (event-driven, from the price feed)
+    # ========================================================================
+    
+    def exit_trigger_spec(self, position):
+        """(symbol, action, {kind: price}, not_before) for the trigger engine: the prices at which
+        manage_positions would close this position straight away"""
+        entry_price = position.entry_price
+        quick_move = (EXIT_FEES_PCT + EXIT_QUICK_PROFIT_PCT) / 100
+        levels = {
+            QUICK_PROFIT: entry_price * (1 + quick_move) if position.action == 'BUY' else entry_price * (1 - quick_move),
+            TRAILING_STOP: position.trailing_stop_loss,
+            STOP_LOSS: position.stop_loss,
+            TAKE_PROFIT: position.take_profit,
+        }
+        return position.symbol, position.action, levels, position.entry_time + EXIT_MIN_HOLD_SECONDS
+    
+    def arm_exit_triggers(self, position_key, position):
+        try:
+            self.exit_triggers.arm(position_key, *self.exit_trigger_spec(position))
+        except Exception as e:
+            logger.error(f"Error arming exit triggers for {position_key}: {e}")
+    
+    def exit_trigger_reason(self, position, price, hits):
+        """Exit reason for the first crossed trigger that still holds against the position's
+        current levels (same checks and wording as manage_positions), or None"""
+        is_buy = position.action == 'BUY'
+        entry_price = position.entry_price
+        for kind, _ in hits:
+            if kind == QUICK_PROFIT:
+                net_profit_pct = position.gain_pct(price) - EXIT_FEES_PCT
+                if net_profit_pct >= EXIT_QUICK_PROFIT_PCT:
+                    return f"Low-Cap Quick Exit (+{net_profit_pct:.2f}% net profit)"
+            elif kind == TRAILING_STOP and position.trailing_stop_loss is not None:
+                if (price <= position.trailing_stop_loss) if is_buy else (price >= position.trailing_stop_loss):
+                    peak = (position.highest_price if is_buy else position.lowest_price) or entry_price
+                    trailing_profit = ((peak - entry_price) if is_buy else (entry_price - peak)) / entry_price * 100
+                    return f"Trailing SL (Peak: +{trailing_profit:.2f}%)"
+            elif kind == STOP_LOSS:
+                if (price <= position.stop_loss) if is_buy else (price >= position.stop_loss):
+                    return 'Stop Loss'
+            elif kind == TAKE_PROFIT:
+                if (price >= position.take_profit) if is_buy else (price <= position.take_profit):
+                    return 'Take Profit'
+        return None
+    
+    def on_exit_triggers(self, symbol, price, fired):
+        """Called on the market stream thread: hand the crossed positions to close_position"""
+        self.exit_executor.submit(self.fire_exit_triggers, symbol, price, fired)
+    
+    def fire_exit_triggers(self, symbol, price, fired):
+        for position_key, hits in fired:
+            try:
+                with self.data_lock:
+                    position = self.positions.get(position_key)
+                    reason = self.exit_trigger_reason(position, price, hits) if position else None
+                if reason is None:
+                    continue  # Already closed, or the levels moved since: the next sweep re-arms it
+                logger.info(f"⚡ EXIT TRIGGER: {symbol} @ ${price:.4f} | {reason}")
+                self.close_position(position_key, price, reason)
+            except Exception as e:
+                logger.error(f"Error firing exit trigger for {position_key}: {e}")
+    
+    def close_all_positions(self, reason):
+        """🚨 Emergency exit: close every open position at once (LIVE: all close orders sent in parallel)"""
+        positions = self.state.current().positions
+        if not positions:
+            return 0
+        
+        logger.warning(f"🚨 CLOSING ALL {len(positions)} POSITIONS: {reason}")
+        pending = []
+        for position_key, position in positions.items():
+            current_price = self.get_current_price(position.symbol)
+            if not current_price:
+                logger.error(f"❌ No price for {position.symbol}, {position_key} stays open until the next cycle")
+                continue
+            pending.append(self.close_position(position_key, current_price, reason, wait=False))
+        
+        closed = self.await_orders(pending)
+        logger.warning(f"🚨 Closed {closed}/{len(positions)} positions ({reason})")
+        return closed
+    
     def manage_positions(self):
         """Check and manage all open positions with thread safety"""
         positions_to_close = []
@@ -3541,20 +3718,11 @@ class UltimateHybridBot:
         
         for position_key, position in positions_snapshot.items():
             try:
-                symbol = position['symbol']
-                strategy_name = position['strategy']
+                symbol = position.symbol
                 
-                # 🔥 BUG FIX: Validate strategy exists before accessing!
-                if strategy_name not in STRATEGIES:
-                    logger.error(f"❌ CRITICAL: Position {position_key} has invalid strategy '{strategy_name}'!")
-                    logger.error(f"❌ This position is corrupted - forcing close to free capital")
-                    # Close this corrupted position at current market price
-                    current_price = self.get_cached_price(symbol)
-                    if current_price:
-                        positions_to_close.append((position_key, current_price, 'Corrupted Strategy Data'))
-                    continue
-                
-                strategy = STRATEGIES[strategy_name]
+                # 🗂️ Position records have fixed fields and are only created by open_position,
+                # after its STRATEGIES lookup: no shape validation needed here
+                strategy = STRATEGIES[position.strategy]
                 
                 # 🎯 OPTIMIZATION: Use cached price to avoid redundant API calls
                 current_price = self.get_cached_price(symbol)
@@ -3563,17 +3731,12 @@ class UltimateHybridBot:
                 
                 # 🔥 ULTRA-AGGRESSIVE LOW CAPITAL MODE 🔥
                 # MINIMUM hold time: Just 30 seconds! (User wants FAST exits for low capital!)
-                MIN_HOLD_TIME_SECONDS = 30  # Only 30 seconds minimum!
+                MIN_HOLD_TIME_SECONDS = EXIT_MIN_HOLD_SECONDS  # Only 30 seconds minimum!
                 
                 # 🔧 Check minimum hold time (very short!)
-                try:
-                    if isinstance(position.get('entry_time'), datetime):
-                        hold_time_seconds = (datetime.now() - position['entry_time']).total_seconds()
-                        if hold_time_seconds < MIN_HOLD_TIME_SECONDS:
-                            # Too early! Wait at least 30 seconds
-                            continue
-                except:
-                    pass  # If error, proceed
+                if time.time() - position.entry_time < MIN_HOLD_TIME_SECONDS:
+                    # Too early! Wait at least 30 seconds
+                    continue
                 
                 # ==================================================================
                 # SMART CONFIDENCE-BASED EXIT (Priority #1)
@@ -3588,11 +3751,11 @@ class UltimateHybridBot:
                 # User wants: Fee covered + ANY profit = EXIT IMMEDIATELY!
                 # NO waiting for confidence drop - just grab profit FAST!
                 
-                TOTAL_FEES_PCT = 0.19  # Entry + Exit fees
+                TOTAL_FEES_PCT = EXIT_FEES_PCT  # Entry + Exit fees
                 net_profit_pct = current_gain_pct - TOTAL_FEES_PCT
                 
                 # 💰 LOW CAPITAL STRATEGY: Exit on TINY profits!
-                if net_profit_pct >= 0.15:  # Lowered from 0.3% to 0.15%!
+                if net_profit_pct >= EXIT_QUICK_PROFIT_PCT:  # Lowered from 0.3% to 0.15%!
                     # ANY profit after fees = INSTANT EXIT (no confidence check!)
                     reason = f"Low-Cap Quick Exit (+{net_profit_pct:.2f}% net profit)"
                     logger.info(f"💰💰 INSTANT EXIT: {symbol} | Net Profit: +{net_profit_pct:.2f}% | LOCKED!")
@@ -3672,7 +3835,7 @@ class UltimateHybridBot:
                 if current_gain_pct >= BREAKEVEN_ACTIVATION_PCT:
                     if not position.get('breakeven_activated', False):
                         # Calculate break-even price (entry + fees)
-                        TOTAL_FEES_PCT = 0.19
+                        TOTAL_FEES_PCT = EXIT_FEES_PCT
                         if position['action'] == 'BUY':
                             breakeven_price = position['entry_price'] * (1 + TOTAL_FEES_PCT / 100)
                             # Only move SL up, never down
@@ -3762,60 +3925,143 @@ class UltimateHybridBot:
                         continue
                 
                 # Check time-based exit
-                # 🔧 FIX: Validate entry_time before datetime subtraction
-                try:
-                    if isinstance(position.get('entry_time'), datetime):
-                        hold_time = (datetime.now() - position['entry_time']).total_seconds() / 60
-                        if hold_time > strategy['hold_time'] * 1.5:  # 1.5x max hold time
-                            positions_to_close.append((position_key, current_price, 'Time Limit'))
-                except (TypeError, AttributeError):
-                    pass  # Skip time check if entry_time is invalid
+                if position.held_minutes() > strategy['hold_time'] * 1.5:  # 1.5x max hold time
+                    positions_to_close.append((position_key, current_price, 'Time Limit'))
                 
             except Exception as e:
                 logger.error(f"Error managing position {position_key}: {e}")
         
-        # Close positions
-        for position_key, price, reason in positions_to_close:
-            self.close_position(position_key, price, reason)
+        # Close positions (LIVE: every close order in flight at once, then wait for all of them)
+        self.await_orders([self.close_position(position_key, price, reason, wait=False)
+                           for position_key, price, reason in positions_to_close])
+        
+        # ⚡ Re-arm the exit triggers with this sweep's levels (break-even SL, trailing SL),
+        # including positions whose triggered close failed
+        with self.data_lock:
+            open_positions = dict(self.positions)
+            self.publish_state()  # 📰 Break-even / trailing / target confidence changes
+        self.exit_triggers.sync({key: self.exit_trigger_spec(position) for key, position in open_positions.items()})
     
     # ========================================================================
     # MAIN TRADING LOOP
     # ========================================================================
     
+    def update_market_regime(self):
+        """MHI, market regime, transitions, memory, capital allocation and exposure for this cycle"""
+        # 🔥 BUSS V2: CALCULATE MARKET HEALTH INDEX! 🔥
+        self.calculate_mhi()
+        
+        # 🚀 DYNAMIC CAPITAL ALLOCATION: Analyze market regime first!
+        logger.info("\n" + "="*70)
+        logger.info("🎯 ANALYZING MARKET REGIME...")
+        logger.info("="*70)
+        
+        self.current_market_regime = self.analyze_market_regime()
+        
+        # 🔥 BUSS V2: DETECT MARKET TRANSITIONS! 🔥
+        self.detect_market_transition()
+        
+        # 🔥 BUSS V2: ADD TO MARKET MEMORY! 🔥
+        self.market_memory.append({
+            'timestamp': datetime.now(),
+            'regime': self.current_market_regime,
+            'mhi': self.mhi,
+            'capital': self.current_capital + self.reserved_capital
+        })
+        
+        self.capital_adjustments = self.adjust_capital_allocation(self.current_market_regime)
+        
+        # 🔥 BUSS V2: CALCULATE DYNAMIC EXPOSURE! 🔥
+        self.calculate_dynamic_exposure()
+    
+    def trade_opportunities(self, opportunities):
+        """Best signal per ranked opportunity (all suitable strategies), opened if confident enough"""
+        logger.info(f"\n{'='*70}")
+        logger.info(f"🎯 GENERATING SIGNALS...")
+        logger.info(f"{'='*70}")
+        
+        # 🎯 CALCULATE MARKET VOLATILITY
+        market_volatility = self.calculate_market_volatility()
+        
+        # 🎯 UPDATE ADAPTIVE CONFIDENCE THRESHOLD
+        # Adjusts minimum confidence based on recent performance!
+        current_threshold = self.update_adaptive_confidence()
+        
+        # 🎯 INTELLIGENT STRATEGY SELECTION (Capital-Based + Volatility-Based!)
+        # Get suitable strategies ONCE per cycle (more efficient!)
+        suitable_strategy_names = self.get_suitable_strategies(market_volatility)
+        
+        # Map strategy names to their signal functions
+        strategy_map = {
+            'SCALPING': self.generate_scalping_signal,
+            'DAY_TRADING': self.generate_day_trading_signal,
+            'SWING_TRADING': self.generate_swing_trading_signal,
+            'RANGE_TRADING': self.generate_range_trading_signal,
+            'MOMENTUM': self.generate_momentum_signal,
+            'POSITION_TRADING': self.generate_position_trading_signal,
+            'GRID_TRADING': self.generate_grid_trading_signal
+        }
+        
+        # Build strategies_to_try with only suitable ones
+        strategies_to_try = [
+            (name, strategy_map[name]) 
+            for name in suitable_strategy_names 
+            if name in strategy_map
+        ]
+        
+        if not strategies_to_try:
+            logger.warning(f"⚠️ No suitable strategies for ${self.current_capital:.2f} capital!")
+            return
+        
+        ranked = opportunities if SIGNAL_TOP_N is None else opportunities[:SIGNAL_TOP_N]
+        best_signals = self.evaluate_signals([symbol for symbol, _, _ in ranked], strategies_to_try)
+        
+        for symbol, score, _ in ranked:
+            if symbol not in best_signals:
+                continue
+        
+            data = self.market_data[symbol]
+            signal_count, best_score, best_strategy, best_signal = best_signals[symbol]
+        
+            logger.info(f"💡 {symbol}: Found {signal_count} signals, picked {best_strategy} (confidence: {best_signal['confidence']:.1f}%, score: {best_score:.2f})")
+        
+            # 🎯 ADAPTIVE CONFIDENCE: Check if signal meets current threshold
+            if best_signal['confidence'] < current_threshold:
+                logger.info(f"⏸️ {symbol}: Confidence {best_signal['confidence']:.1f}% < threshold {current_threshold:.1f}%, skipping")
+                continue
+        
+            # Try to open position with BEST signal
+            success = self.open_position(
+                symbol, 
+                best_strategy, 
+                best_signal['action'], 
+                data['price'],
+                best_signal['reason'],
+                best_signal['confidence']
+            )
+        
+            if success:
+                pass  # Position opened with best strategy!
+    
     def run_trading_cycle(self):
         """Main trading logic with dynamic capital allocation"""
+        self.cycle_cache.begin_cycle()
+        self.confidence_scorer.maybe_reload()  # 🎚️ Pick up edited confidence tables
         try:
-            # 🔥 BUSS V2: CALCULATE MARKET HEALTH INDEX! 🔥
-            self.calculate_mhi()
-            
-            # 🚀 DYNAMIC CAPITAL ALLOCATION: Analyze market regime first!
-            logger.info("\n" + "="*70)
-            logger.info("🎯 ANALYZING MARKET REGIME...")
-            logger.info("="*70)
+            # 📸 ONE bulk ticker call per cycle serves every price lookup below
+            self.price_snapshot.refresh(force=True)
             
-            self.current_market_regime = self.analyze_market_regime()
-            
-            # 🔥 BUSS V2: DETECT MARKET TRANSITIONS! 🔥
-            self.detect_market_transition()
-            
-            # 🔥 BUSS V2: ADD TO MARKET MEMORY! 🔥
-            self.market_memory.append({
-                'timestamp': datetime.now(),
-                'regime': self.current_market_regime,
-                'mhi': self.mhi,
-                'capital': self.current_capital + self.reserved_capital
-            })
-            
-            self.capital_adjustments = self.adjust_capital_allocation(self.current_market_regime)
-            
-            # 🔥 BUSS V2: CALCULATE DYNAMIC EXPOSURE! 🔥
-            self.calculate_dynamic_exposure()
+            # 🎯 Market health, regime, transitions, exposure (⏰ deferred when the cycle starts late:
+            # the previous cycle's regime and allocation stay in effect)
+            self.cycle_scheduler.run('regime', self.update_market_regime)
             
             # 🔥 BUSS V2: CHECK SELF-REGULATION! 🔥
             regulation_state = self.check_self_regulation()
             if regulation_state in ['PAUSED', 'EMERGENCY']:
                 logger.warning(f"🚨 SELF-REGULATION: {regulation_state} - Skipping new trades!")
-                self.manage_positions()
+                if regulation_state == 'EMERGENCY':
+                    self.close_all_positions('Emergency: Max Drawdown')
+                self.cycle_scheduler.run('positions', self.manage_positions)
                 self.print_status()
                 return
             
@@ -3829,18 +4075,20 @@ class UltimateHybridBot:
             positions_checked = 0
             positions_failed = 0
             
-            with self.data_lock:
-                total_positions = len(self.positions)
-                for pos in self.positions.values():
-                    current_price = self.get_current_price(pos['symbol'])
-                    if current_price and current_price > 0:
-                        if pos['action'] == 'BUY':
-                            unrealized_pnl += (current_price - pos['entry_price']) * pos['quantity']
-                        else:
-                            unrealized_pnl += (pos['entry_price'] - current_price) * pos['quantity']
-                        positions_checked += 1
+            # 📰 Price the published snapshot: no data_lock at all around these HTTP calls
+            positions_snapshot = list(self.state.current().positions.values())
+            total_positions = len(positions_snapshot)
+            
+            for pos in positions_snapshot:
+                current_price = self.get_current_price(pos['symbol'])
+                if current_price and current_price > 0:
+                    if pos['action'] == 'BUY':
+                        unrealized_pnl += (current_price - pos['entry_price']) * pos['quantity']
                     else:
-                        positions_failed += 1
+                        unrealized_pnl += (pos['entry_price'] - current_price) * pos['quantity']
+                    positions_checked += 1
+                else:
+                    positions_failed += 1
             
             # 🔥 CRITICAL: If we couldn't get prices for most positions, skip loss limit check!
             # This prevents false positives when API is temporarily down
@@ -3849,7 +4097,7 @@ class UltimateHybridBot:
                 logger.error(f"⚠️ API may be down! Skipping daily loss limit check (unreliable)")
                 logger.error(f"⚠️ Still managing positions normally...")
                 # Continue to manage_positions but don't check loss limit
-                self.manage_positions()
+                self.cycle_scheduler.run('positions', self.manage_positions)
                 self.print_status()
                 return
             
@@ -3860,8 +4108,9 @@ class UltimateHybridBot:
                 logger.warning(f"🛑 DAILY LOSS LIMIT HIT!")
                 logger.warning(f"   Realized: ${today_realized_pnl:.2f} | Unrealized: ${unrealized_pnl:.2f} | Total: ${today_total_pnl:.2f}")
                 logger.warning(f"   Limit: ${DAILY_LOSS_LIMIT} | ⏸️  Pausing new trades for today.")
-                # Still manage positions (close losing trades, let winners run)
-                self.manage_positions()
+                # 🚨 Flatten everything (in parallel), then the usual sweep
+                self.close_all_positions('Daily Loss Limit')
+                self.cycle_scheduler.run('positions', self.manage_positions)
                 self.print_status()
                 return  # Skip opening new positions
             
@@ -3879,7 +4128,7 @@ class UltimateHybridBot:
                 # Check if pause is over
                 if datetime.now() < self.loss_pause_until:
                     # Still in pause period - manage positions but don't open new ones
-                    self.manage_positions()
+                    self.cycle_scheduler.run('positions', self.manage_positions)
                     self.print_status()
                     return  # Skip opening new positions
                 else:
@@ -3899,150 +4148,65 @@ class UltimateHybridBot:
                 logger.warning(f"✋ MAX DAILY TRADES ({MAX_DAILY_TRADES}) REACHED - Done for today!")
                 logger.warning(f"   Quality > Quantity. See you tomorrow! 😊")
                 # Manage existing positions only
-                self.manage_positions()
+                self.cycle_scheduler.run('positions', self.manage_positions)
                 self.print_status()
                 return
             
             # Step 1: Manage existing positions
-            self.manage_positions()
+            self.cycle_scheduler.run('positions', self.manage_positions)
             
-            # Step 2: Scan market for opportunities
-            opportunities = self.scan_market()
+            # Step 2: Scan market for opportunities (⏰ deferred with the signals when the cycle overran)
+            opportunities = self.cycle_scheduler.run('scan', self.scan_market)
             
-            # Step 3: Generate signals for each strategy
-            logger.info(f"\n{'='*70}")
-            logger.info(f"🎯 GENERATING SIGNALS...")
-            logger.info(f"{'='*70}")
-            
-            # 🎯 CALCULATE MARKET VOLATILITY
-            market_volatility = self.calculate_market_volatility()
-            
-            # 🎯 UPDATE ADAPTIVE CONFIDENCE THRESHOLD
-            # Adjusts minimum confidence based on recent performance!
-            current_threshold = self.update_adaptive_confidence()
-            
-            # 🎯 INTELLIGENT STRATEGY SELECTION (Capital-Based + Volatility-Based!)
-            # Get suitable strategies ONCE per cycle (more efficient!)
-            suitable_strategy_names = self.get_suitable_strategies(market_volatility)
-            
-            # Map strategy names to their signal functions
-            strategy_map = {
-                'SCALPING': self.generate_scalping_signal,
-                'DAY_TRADING': self.generate_day_trading_signal,
-                'SWING_TRADING': self.generate_swing_trading_signal,
-                'RANGE_TRADING': self.generate_range_trading_signal,
-                'MOMENTUM': self.generate_momentum_signal,
-                'POSITION_TRADING': self.generate_position_trading_signal,
-                'GRID_TRADING': self.generate_grid_trading_signal
-            }
-            
-            # Build strategies_to_try with only suitable ones
-            strategies_to_try = [
-                (name, strategy_map[name]) 
-                for name in suitable_strategy_names 
-                if name in strategy_map
-            ]
-            
-            if not strategies_to_try:
-                logger.warning(f"⚠️ No suitable strategies for ${self.current_capital:.2f} capital!")
-                self.print_status()
-                return
-            
-            for symbol, score, _ in opportunities[:8]:  # Top 8 coins
-                if symbol not in self.market_data:
-                    continue
-                
-                data = self.market_data[symbol]
-                
-                # Collect all valid signals with scores
-                all_signals = []
-                for strategy_name, signal_func in strategies_to_try:
-                    signal = signal_func(symbol, data)
-                    if signal:
-                        # Score = confidence × opportunity_score
-                        # Higher = better signal!
-                        signal_score = signal['confidence'] * data['score']
-                        all_signals.append((signal_score, strategy_name, signal))
-                
-                # Pick BEST signal (highest score)
-                if all_signals:
-                    all_signals.sort(reverse=True, key=lambda x: x[0])  # Sort by score
-                    best_score, best_strategy, best_signal = all_signals[0]
-                    
-                    logger.info(f"💡 {symbol}: Found {len(all_signals)} signals, picked {best_strategy} (confidence: {best_signal['confidence']:.1f}%, score: {best_score:.2f})")
-                    
-                    # 🎯 ADAPTIVE CONFIDENCE: Check if signal meets current threshold
-                    if best_signal['confidence'] < current_threshold:
-                        logger.info(f"⏸️ {symbol}: Confidence {best_signal['confidence']:.1f}% < threshold {current_threshold:.1f}%, skipping")
-                        continue
-                    
-                    # Try to open position with BEST signal
-                    success = self.open_position(
-                        symbol, 
-                        best_strategy, 
-                        best_signal['action'], 
-                        data['price'],
-                        best_signal['reason'],
-                        best_signal['confidence']
-                    )
-                    
-                    if success:
-                        pass  # Position opened with best strategy!
+            # Step 3: Generate signals and open positions
+            if opportunities is not None:
+                self.cycle_scheduler.run('signals', self.trade_opportunities, opportunities)
             
             # Step 4: Print status
             self.print_status()
             
         except Exception as e:
             logger.error(f"Error in trading cycle: {e}")
+        finally:
+            cache_stats = self.cycle_cache.end_cycle()
+            logger.info(f"🧮 Kline requests this cycle: {cache_stats['misses']} loaded, "
+                        f"{cache_stats['hits'] + cache_stats['coalesced']} served from cycle cache "
+                        f"({cache_stats['coalesced']} coalesced in-flight)")
     
     def print_status(self):
         """Print current status"""
-        # 🔧 FIX: Thread-safe access to trades count
-        with self.data_lock:
-            trades_count = len(self.trades)
-            positions_count = len(self.positions)
+        # 📰 One consistent snapshot for the whole report
+        state = self.state.current()
+        trades_count = len(state.trades)
+        positions_count = len(state.positions)
         
         logger.info(f"\n{'='*70}")
         logger.info(f"📊 STATUS REPORT")
         logger.info(f"{'='*70}")
-        logger.info(f"💰 Capital: ${self.current_capital:.2f} | Reserved: ${self.reserved_capital:.2f}")
-        logger.info(f"📈 P&L: ${self.current_capital + self.reserved_capital - self.initial_capital:.2f}")
+        logger.info(f"💰 Capital: ${state.current_capital:.2f} | Reserved: ${state.reserved_capital:.2f}")
+        logger.info(f"📈 P&L: ${state.equity - self.initial_capital:.2f}")
         logger.info(f"📊 Open Positions: {positions_count}")
         logger.info(f"📝 Total Trades: {trades_count}")
         
-        if self.positions:
+        # 🧠 Indicator memo effectiveness (closed-candle work reused between scans)
+        memo_stats = self.indicator_memo.get_stats()
+        logger.info(f"🧠 Indicator Memo: {memo_stats['hit_rate']:.1f}% hits ({memo_stats['hits']}/{memo_stats['hits'] + memo_stats['misses']}) | "
+                    f"{memo_stats['entries']} entries | {memo_stats['invalidations']} invalidated | {memo_stats['evictions']} evicted")
+        
+        if state.positions:
             logger.info(f"\n🎯 OPEN POSITIONS:")
-            # 🔧 FIX: Thread-safe snapshot to avoid race condition
-            with self.data_lock:
-                positions_snapshot = dict(self.positions)
-            
-            for key, pos in positions_snapshot.items():
+            for key, pos in state.positions.items():
                 # 🎯 OPTIMIZATION: Use cached price
-                current_price = self.get_cached_price(pos['symbol'])
+                current_price = self.get_cached_price(pos.symbol)
                 if current_price:
-                    # 🔧 FIX: Validate entry_price before division
-                    if pos['entry_price'] > 0:
-                        if pos['action'] == 'BUY':
-                            pnl_pct = (current_price - pos['entry_price']) / pos['entry_price'] * 100
-                        else:
-                            pnl_pct = (pos['entry_price'] - current_price) / pos['entry_price'] * 100
-                    else:
-                        pnl_pct = 0.0
-                    
-                    # 🔧 FIX: Validate entry_time before datetime subtraction
-                    try:
-                        if isinstance(pos.get('entry_time'), datetime):
-                            hold_time = (datetime.now() - pos['entry_time']).total_seconds() / 60
-                        else:
-                            hold_time = 0.0
-                    except (TypeError, AttributeError):
-                        hold_time = 0.0
+                    pnl_pct = pos.gain_pct(current_price)  # 0 if the entry price is unusable
+                    hold_time = pos.held_minutes()
                     
-                    logger.info(f"  {pos['symbol']} | {pos['strategy']} | {pos['action']} | PnL: {pnl_pct:+.2f}% | Hold: {hold_time:.0f}min")
+                    logger.info(f"  {pos.symbol} | {pos.strategy} | {pos.action} | PnL: {pnl_pct:+.2f}% | Hold: {hold_time:.0f}min")
         
-        if self.strategy_stats:
+        if state.strategy_stats:
             logger.info(f"\n📊 STRATEGY PERFORMANCE:")
-            for strategy, stats in self.strategy_stats.items():
+            for strategy, stats in state.strategy_stats.items():
                 if stats['trades'] > 0:
                     logger.info(f"  {strategy}: {stats['trades']} trades | Win Rate: {stats['win_rate']:.1f}% | Profit: ${stats['profit']:.2f}")
     
@@ -4059,25 +4223,43 @@ class UltimateHybridBot:
         logger.info(f"🎯 Base Confidence Threshold: {self.base_confidence_threshold}%")
         logger.info(f"🔥 Active Strategies: 3 ULTRA AGGRESSIVE! (SCALPING, DAY_TRADING, MOMENTUM)")
         logger.info(f"🪙 Scanning {len(COIN_UNIVERSE)} coins across {len(API_KEYS)} API keys")
-        logger.info(f"⏱️  Scan Interval: 30 seconds (🔥 ULTRA AGGRESSIVE! 🔥)")
+        logger.info(f"⏱️  Cycle: every {CYCLE_PERIOD}s, {CYCLE_OFFSET}s after the candle close (⏰ wall-clock aligned)")
         logger.info(f"{'='*70}\n")
         
+        # 🛰️ Start the live market stream (REST polling keeps working if it never connects)
+        if self.market_stream:
+            self.market_stream.start()
+        
+        # 📡 Start the user-data stream (balances / fills; REST is the fallback while it's down)
+        if self.user_stream:
+            self.user_stream.start()
+        
         cycle = 0
+        not_before = None
         
         while self.is_running:
             try:
+                # ⏰ Sleep only until the next aligned start (the first cycle starts right away);
+                # a fixed sleep after each cycle used to drift against the candle closes
+                scheduled = self.cycle_scheduler.wait(not_before=not_before, stop=lambda: not self.is_running)
+                not_before = None
+                if not self.is_running:
+                    break
+                
                 cycle += 1
                 logger.info(f"\n{'#'*70}")
                 logger.info(f"🔄 CYCLE #{cycle} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
                 logger.info(f"{'#'*70}")
                 
-                self.run_trading_cycle()
+                self.cycle_scheduler.begin(scheduled)
+                try:
+                    self.run_trading_cycle()
+                finally:
+                    report = self.cycle_scheduler.end()
                 
-                # 🚀 OPTIMIZATION: Faster scanning - 30 seconds! 🔥 ULTRA AGGRESSIVE! 🔥
-                # Old: 120s (30 scans/hour)
-                # New: 30s (120 scans/hour) = 4x more opportunities!
-                logger.info(f"\n⏳ Next scan in 30 seconds...\n")
-                time.sleep(30)
+                overran = " ⚠️ OVERRAN" if report['overran'] else ""
+                logger.info(f"\n⏳ Cycle took {report['duration']:.1f}s (started {report['lag']:.1f}s late){overran} | "
+                            f"Next cycle at {datetime.fromtimestamp(report['next']).strftime('%H:%M:%S')}\n")
                 
             except KeyboardInterrupt:
                 logger.info("\n🛑 Stopping bot...")
@@ -4085,7 +4267,14 @@ class UltimateHybridBot:
                 break
             except Exception as e:
                 logger.error(f"Error in main loop: {e}")
-                time.sleep(60)
+                not_before = time.time() + CYCLE_ERROR_BACKOFF
+        
+        if self.market_stream:
+            self.market_stream.stop()
+        if self.user_stream:
+            self.user_stream.stop()
+        self.exit_executor.shutdown(wait=True)
+        self.order_pipeline.shutdown(wait=True)
 
 # ============================================================================
 # FLASK WEB SERVER (Dashboard)
@@ -4112,11 +4301,10 @@ def get_stats():
     global trading_bot, trading_stats
     
     if trading_bot:
-        # 🔥 BUG FIX: Thread-safe access to trades list!
-        with trading_bot.data_lock:
-            # Create snapshot of trades to avoid modification during iteration
-            trades_snapshot = list(trading_bot.trades)
-            positions_count = len(trading_bot.positions)
+        # 📰 Published snapshot: consistent and lock-free (never blocks the trading loop)
+        state = trading_bot.state.current()
+        trades_snapshot = state.trades
+        positions_count = len(state.positions)
         
         # 🔧 CRITICAL FIX: Only count CLOSED trades (with P&L)
         closed_trades = [t for t in trades_snapshot if 'pnl' in t]
@@ -4129,17 +4317,17 @@ def get_stats():
             start_time_str = start_time_str.isoformat()
         
         # Calculate P&L (Current total equity - Initial capital)
-        total_pnl = trading_bot.current_capital + trading_bot.reserved_capital - trading_bot.initial_capital
+        total_pnl = state.equity - trading_bot.initial_capital
         
         # Debug logging
         logger.debug(f"📊 API Stats Debug:")
         logger.debug(f"  Initial: ${trading_bot.initial_capital:.2f}")
-        logger.debug(f"  Current: ${trading_bot.current_capital:.2f}")
-        logger.debug(f"  Reserved: ${trading_bot.reserved_capital:.2f}")
+        logger.debug(f"  Current: ${state.current_capital:.2f}")
+        logger.debug(f"  Reserved: ${state.reserved_capital:.2f}")
         logger.debug(f"  Total P&L: ${total_pnl:.2f}")
         
         # 💰 AUTO-COMPOUNDING STATS
-        total_equity = trading_bot.current_capital + trading_bot.reserved_capital
+        total_equity = state.equity
         compounding_multiplier = total_equity / trading_bot.initial_capital if trading_bot.initial_capital > 0 else 1.0
         compounding_pct = (compounding_multiplier - 1) * 100
         
@@ -4149,18 +4337,34 @@ def get_stats():
             'closed_trades': total,
             'win_rate': (wins / total * 100) if total > 0 else 0,
             'total_pnl': total_pnl,
-            'current_capital': trading_bot.current_capital,
-            'reserved_capital': trading_bot.reserved_capital,
+            'current_capital': state.current_capital,
+            'reserved_capital': state.reserved_capital,
             'open_positions': positions_count,  # 🔥 BUG FIX: Use thread-safe snapshot
-            'strategy_stats': dict(trading_bot.strategy_stats),
+            'strategy_stats': dict(state.strategy_stats),
             # 🆕 NEW STATS
             'total_strategies': len(STRATEGIES),
             'active_strategies': len(trading_bot.get_suitable_strategies()),  # 🎯 Active strategies count
             'active_strategy_names': trading_bot.get_suitable_strategies(),  # 🎯 Active strategy list
             'total_coins': len(COIN_UNIVERSE),
             'api_keys_count': len(trading_bot.api_keys),
+            'price_snapshot': trading_bot.price_snapshot.get_stats(),  # 📸 Bulk ticker health
+            'http_stats': trading_bot.transport.get_stats(),  # 🔌 Per-endpoint request timing
+            'kline_buffers': trading_bot.kline_store.get_stats(),  # 🧩 Seeds vs incremental top-ups
+            'market_stream': trading_bot.market_stream.get_stats() if trading_bot.market_stream else None,  # 🛰️ WebSocket health
+            'cycle_cache': trading_bot.cycle_cache.get_stats(),  # 🧮 Per-cycle kline hits / misses
+            'rate_limiter': trading_bot.transport.get_limiter_stats(),  # 🚦 Weight budget per host
+            'indicator_engine': trading_bot.indicator_engine.get_stats(),  # 📐 Seeds vs O(1) advances
+            'indicator_memo': trading_bot.indicator_memo.get_stats(),  # 🧠 Hit rate per computation
+            'signal_engine': trading_bot.signal_engine.get_stats(),  # 🎯 Symbols / signals per pass
+            'confidence_scorer': trading_bot.confidence_scorer.get_stats(),  # 🎚️ Table version / reloads
+            'scan_tiers': trading_bot.scan_scheduler.get_stats(),  # 🌡️ HOT / WARM / COLD symbols + weight budget
+            'exit_triggers': trading_bot.exit_triggers.get_stats(),  # ⚡ Armed levels / fired exits
+            'state_snapshot': trading_bot.state.get_stats(),  # 📰 Version / publish cost / age
+            'order_pipeline': trading_bot.order_pipeline.get_stats(),  # 📨 Fills / lookups / recovered lost responses
+            'user_stream': trading_bot.user_stream.get_stats() if trading_bot.user_stream else None,  # 📡 Balances / fills pushed by the exchange
             'market_regime': trading_bot.current_market_regime,
-            'scan_frequency': '30 seconds (🔥 ULTRA AGGRESSIVE! 🔥)',
+            'scan_frequency': f'{CYCLE_PERIOD}s (+{CYCLE_OFFSET}s)',  # ⏰ Candle-aligned cycle start
+            'cycle_scheduler': trading_bot.cycle_scheduler.get_stats(),  # ⏰ Phase durations / overruns / skips
             # 💰 AUTO-COMPOUNDING STATS
             'initial_capital': trading_bot.initial_capital,
             'total_equity': total_equity,
@@ -4209,48 +4413,12 @@ def get_positions():
     positions_data = []
     
     if trading_bot:
-        # 🔧 FIX: Thread-safe access to positions data
-        with trading_bot.data_lock:
-            # Create a copy of positions to avoid modification during iteration
-            positions_copy = dict(trading_bot.positions)
-        
-        # Now process outside the lock (so we don't hold lock during API calls)
-        for key, pos in positions_copy.items():
+        # 📰 Published snapshot (lock-free; its positions are copies nobody else mutates)
+        for key, pos in trading_bot.state.current().positions.items():
             # 🎯 OPTIMIZATION: Use cached price to reduce API calls
-            current_price = trading_bot.get_cached_price(pos['symbol'])
+            current_price = trading_bot.get_cached_price(pos.symbol)
             if current_price:
-                # 🔧 FIX: Validate entry_price before division
-                if pos['entry_price'] > 0:
-                    if pos['action'] == 'BUY':
-                        pnl_pct = (current_price - pos['entry_price']) / pos['entry_price'] * 100
-                    else:
-                        pnl_pct = (pos['entry_price'] - current_price) / pos['entry_price'] * 100
-                else:
-                    pnl_pct = 0.0  # Safe default if entry_price is invalid
-                
-                # 🔧 FIX: Validate entry_time before datetime subtraction
-                try:
-                    if isinstance(pos.get('entry_time'), datetime):
-                        hold_time = (datetime.now() - pos['entry_time']).total_seconds() / 60
-                    else:
-                        hold_time = 0.0
-                except (TypeError, AttributeError):
-                    hold_time = 0.0
-                
-                positions_data.append({
-                    'symbol': pos['symbol'],
-                    'strategy': pos['strategy'],
-                    'action': pos['action'],
-                    'quantity': pos['quantity'],
-                    'entry_price': pos['entry_price'],
-                    'current_price': current_price,
-                    'pnl_pct': pnl_pct,
-                    'stop_loss': pos['stop_loss'],
-                    'take_profit': pos['take_profit'],
-                    'hold_time': hold_time,
-                    'reason': pos['reason'],
-                    'confidence': pos['confidence']
-                })
+                positions_data.append(pos.to_api(current_price))  # 🗂️ Same fields as before
     
     return jsonify(positions_data)
 
@@ -4352,10 +4520,8 @@ def get_trade_history():
                         logger.warning(f"Skipping corrupted CSV row: {e}")
                         continue
         
-        # Also add current session closed trades
-        # 🔧 FIX: Thread-safe access to trades list
-        with trading_bot.data_lock:
-            trades_snapshot = list(trading_bot.trades)
+        # Also add current session closed trades (📰 from the published snapshot)
+        trades_snapshot = trading_bot.state.current().trades
         
         closed_trades = [t for t in trades_snapshot if t.get('action') == 'CLOSE']
         for close_trade in closed_trades:
@@ -4403,17 +4569,17 @@ def get_analytics():
         return jsonify({'error': 'Bot not initialized'})
     
     try:
-        # 🔧 FIX: Thread-safe access to trades list
-        with trading_bot.data_lock:
-            trades_snapshot = list(trading_bot.trades)
+        # 📰 Published snapshot: trades and capital from the same moment
+        state = trading_bot.state.current()
+        trades_snapshot = state.trades
         
         wins = sum(1 for t in trades_snapshot if t.get('pnl', 0) > 0)
         total_trades = len([t for t in trades_snapshot if 'pnl' in t])
         win_rate = (wins / total_trades * 100) if total_trades > 0 else 0
-        total_pnl = trading_bot.current_capital + trading_bot.reserved_capital - trading_bot.initial_capital
+        total_pnl = state.equity - trading_bot.initial_capital
         
         # Update analytics
-        performance_analytics.update_drawdown(trading_bot.current_capital + trading_bot.reserved_capital)
+        performance_analytics.update_drawdown(state.equity)
         
         # Get live ready status
         live_ready = performance_analytics.is_live_ready(total_trades, win_rate, total_pnl)
@@ -4481,14 +4647,14 @@ def get_validation():
     if not trading_bot:
         return jsonify({'ready': False, 'error': 'Bot not initialized'})
     
-    # 🔧 FIX: Thread-safe access to trades list
-    with trading_bot.data_lock:
-        trades_snapshot = list(trading_bot.trades)
+    # 📰 Published snapshot: trades and capital from the same moment
+    state = trading_bot.state.current()
+    trades_snapshot = state.trades
     
     wins = sum(1 for t in trades_snapshot if t.get('pnl', 0) > 0)
     total_trades = len([t for t in trades_snapshot if 'pnl' in t])
     win_rate = (wins / total_trades * 100) if total_trades > 0 else 0
-    total_pnl = trading_bot.current_capital + trading_bot.reserved_capital - trading_bot.initial_capital
+    total_pnl = state.equity - trading_bot.initial_capital
     
     validation_result = performance_analytics.is_live_ready(total_trades, win_rate, total_pnl)
     
@@ -4975,6 +5141,11 @@ def dashboard():
                             <div style="font-size: 0.9em; opacity: 0.8;">⚡ Scan Speed</div>
                             <div id="system-scan" style="font-size: 1.5em; font-weight: bold; color: #f472b6;">45s</div>
                         </div>
+                        <div style="text-align: center;">
+                            <div style="font-size: 0.9em; opacity: 0.8;">🌡️ Scan Tiers</div>
+                            <div id="scan-tiers" style="font-size: 1.3em; font-weight: bold; color: #fb923c;">-</div>
+                            <div id="scan-tiers-desc" style="font-size: 0.75em; opacity: 0.7;">HOT / WARM / COLD</div>
+                        </div>
                         <div style="text-align: center;">
                             <div style="font-size: 0.9em; opacity: 0.8;">📈 Market Regime</div>
                             <div id="market-regime" style="font-size: 1.3em; font-weight: bold; color: #a78bfa;">NEUTRAL</div>
@@ -5366,6 +5537,15 @@ def dashboard():
                         if (data.total_coins) document.getElementById('system-coins').textContent = data.total_coins;
                         if (data.api_keys_count) document.getElementById('system-apis').textContent = data.api_keys_count;
                         if (data.scan_frequency) document.getElementById('system-scan').textContent = data.scan_frequency;
+                        if (data.scan_tiers) {
+                            // 🌡️ Tier counts; hover lists the symbols, subtitle shows this cycle's plan
+                            const tiers = data.scan_tiers;
+                            const tiersEl = document.getElementById('scan-tiers');
+                            tiersEl.textContent = `🔥${tiers.counts.HOT} / 🌤️${tiers.counts.WARM} / ❄️${tiers.counts.COLD}`;
+                            tiersEl.title = ['HOT', 'WARM', 'COLD'].map(t => `${t}: ${tiers.symbols[t].join(', ') || '-'}`).join('\\n');
+                            document.getElementById('scan-tiers-desc').textContent =
+                                `${tiers.last_planned} scanned, ${tiers.last_deferred} deferred (every ${tiers.every.WARM}/${tiers.every.COLD} cycles)`;
+                        }
                         if (data.market_regime) {
                             const regimeEl = document.getElementById('market-regime');
                             regimeEl.textContent = data.market_regime.replace(/_/g, ' ');
@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+	sys.path.insert(0, ROOT)
+
+from tests.mock_exchange import MockExchange
+from tests.ws_standin import WebSocketStandIn
+
+
+@pytest.fixture
+def ws_server():
+	server = WebSocketStandIn()
+	yield server
+	server.close()
+
+
+@pytest.fixture
+def mock_exchange():
+	exchange = MockExchange()
+	yield exchange
+	exchange.close()
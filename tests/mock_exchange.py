@@ -0,0 +1,187 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+
+class MockExchange:
+	"""Local HTTP server standing in for the exchange's order and account endpoints.
+
+	POST /api/v3/order fills MARKET orders at ``prices[symbol]`` (default 100);
+	GET /api/v3/order looks an order up by ``origClientOrderId``. Faults are
+	queued per POST with ``fail_next``:
+
+	- ``"lost"``: the order fills, but the connection drops before the response
+	- ``"timeout"``: the order fills, the response is a 504
+	- ``"down"``: 503, nothing happens
+	- ``(code, msg)``: rejected with HTTP 400 and that error code
+
+	User-data side: /api/v3/userDataStream hands out, extends and deletes
+	listenKeys, GET /api/v3/account returns ``balances``. With ``user_stream``
+	set to a WebSocketStandIn, every fill is also pushed as an
+	``executionReport`` plus an ``outboundAccountPosition``.
+	"""
+
+	def __init__(self, host: str = "127.0.0.1"):
+		self.prices: Dict[str, float] = {}
+		self.latency = 0.0
+		self.orders: Dict[str, Dict] = {}  # clientOrderId -> order
+		self.fills: Dict[str, int] = {}  # clientOrderId -> times it was filled
+		self.requests: List[Tuple[str, str, Dict]] = []
+		self.lookup_faults: List[int] = []  # HTTP statuses returned by the next order lookups
+		self._faults: List = []
+		self.balances: Dict[str, float] = {"USDT": 1000.0}  # Free balance per asset
+		self.listen_keys: List[str] = []  # Live keys
+		self.keepalives = 0
+		self.user_stream = None
+		self._next_key = 1
+		self._next_id = 1
+		self._lock = threading.Lock()
+		exchange = self
+
+		class Handler(BaseHTTPRequestHandler):
+			protocol_version = "HTTP/1.1"
+
+			def log_message(self, *args):
+				pass
+
+			def do_GET(self):
+				exchange._handle(self, "GET")
+
+			def do_POST(self):
+				exchange._handle(self, "POST")
+
+			def do_PUT(self):
+				exchange._handle(self, "PUT")
+
+			def do_DELETE(self):
+				exchange._handle(self, "DELETE")
+
+		self._server = ThreadingHTTPServer((host, 0), Handler)
+		self._server.daemon_threads = True
+		self.host, self.port = self._server.server_address[:2]
+		threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+	@property
+	def url(self) -> str:
+		return f"http://{self.host}:{self.port}"
+
+	def fail_next(self, *faults) -> None:
+		with self._lock:
+			self._faults.extend(faults)
+
+	def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+		parts = urlsplit(handler.path)
+		params = dict(parse_qsl(parts.query))
+		length = int(handler.headers.get("Content-Length") or 0)
+		if length:
+			params.update(parse_qsl(handler.rfile.read(length).decode()))
+		with self._lock:
+			self.requests.append((method, parts.path, params))
+		if self.latency:
+			time.sleep(self.latency)
+		if parts.path == "/api/v3/userDataStream":
+			return self._listen_key(handler, method, params)
+		if parts.path == "/api/v3/account":
+			with self._lock:
+				balances = [{"asset": asset, "free": f"{free:.8f}", "locked": "0.00000000"} for asset, free in self.balances.items()]
+			return self._reply(handler, 200, {"updateTime": int(time.time() * 1000), "balances": balances})
+		if parts.path != "/api/v3/order":
+			return self._reply(handler, 404, {"code": -1, "msg": "Unknown endpoint"})
+		if method == "GET":
+			return self._lookup(handler, params)
+		return self._place(handler, params)
+
+	def expire_listen_keys(self) -> None:
+		with self._lock:
+			self.listen_keys.clear()
+
+	def _listen_key(self, handler, method, params) -> None:
+		with self._lock:
+			if method == "POST":
+				key = f"lk-{self._next_key}"
+				self._next_key += 1
+				self.listen_keys.append(key)
+				payload = {"listenKey": key}
+			elif params.get("listenKey") not in self.listen_keys:
+				payload = None
+			else:
+				if method == "PUT":
+					self.keepalives += 1
+				else:
+					self.listen_keys.remove(params["listenKey"])
+				payload = {}
+		if payload is None:
+			return self._reply(handler, 400, {"code": -1125, "msg": "This listenKey does not exist."})
+		return self._reply(handler, 200, payload)
+
+	def _lookup(self, handler, params) -> None:
+		with self._lock:
+			fault = self.lookup_faults.pop(0) if self.lookup_faults else None
+			order = self.orders.get(params.get("origClientOrderId"))
+		if fault:
+			return self._reply(handler, fault, {"code": -1001, "msg": "Internal error"})
+		if order is None:
+			return self._reply(handler, 400, {"code": -2013, "msg": "Order does not exist."})
+		return self._reply(handler, 200, {key: value for key, value in order.items() if key != "fills"})
+
+	def _place(self, handler, params) -> None:
+		with self._lock:
+			fault = self._faults.pop(0) if self._faults else None
+		if fault == "down":
+			return self._reply(handler, 503, {"code": -1001, "msg": "Service unavailable"})
+		if isinstance(fault, tuple):
+			return self._reply(handler, 400, {"code": fault[0], "msg": fault[1]})
+		order = self._fill(params)
+		if fault == "lost":
+			handler.close_connection = True
+			return
+		if fault == "timeout":
+			return self._reply(handler, 504, {"code": -1007, "msg": "Timeout waiting for response from backend server."})
+		return self._reply(handler, 200, order)
+
+	def _fill(self, params) -> Dict:
+		symbol, quantity = params["symbol"], float(params["quantity"])
+		price = self.prices.get(symbol, 100.0)
+		client_id = params.get("newClientOrderId") or f"auto-{self._next_id}"
+		with self._lock:
+			order = {
+				"symbol": symbol, "orderId": self._next_id, "clientOrderId": client_id,
+				"transactTime": int(time.time() * 1000), "price": "0.00000000",
+				"origQty": f"{quantity:.8f}", "executedQty": f"{quantity:.8f}",
+				"cummulativeQuoteQty": f"{quantity * price:.8f}", "status": "FILLED", "type": params.get("type", "MARKET"),
+				"side": params["side"],
+				"fills": [{"price": f"{price:.8f}", "qty": f"{quantity:.8f}", "commission": "0", "commissionAsset": "BNB"}],
+			}
+			self._next_id += 1
+			self.orders[client_id] = order
+			self.fills[client_id] = self.fills.get(client_id, 0) + 1
+			base = symbol[:-4]
+			sign = 1 if params["side"] == "BUY" else -1
+			self.balances[base] = self.balances.get(base, 0.0) + sign * quantity
+			self.balances["USDT"] = self.balances.get("USDT", 0.0) - sign * quantity * price
+			balances = [{"a": asset, "f": f"{self.balances[asset]:.8f}", "l": "0.00000000"} for asset in (base, "USDT")]
+		if self.user_stream is not None:
+			now = int(time.time() * 1000)
+			self.user_stream.send({
+				"e": "executionReport", "E": now, "s": symbol, "c": client_id, "S": params["side"], "o": order["type"],
+				"q": order["origQty"], "X": "FILLED", "x": "TRADE", "i": order["orderId"], "l": order["executedQty"],
+				"L": f"{price:.8f}", "z": order["executedQty"], "Z": order["cummulativeQuoteQty"], "n": "0", "N": "BNB", "T": now,
+			})
+			self.user_stream.send({"e": "outboundAccountPosition", "E": now, "u": now, "B": balances})
+		return order
+
+	@staticmethod
+	def _reply(handler, status: int, payload: Dict) -> None:
+		body = json.dumps(payload).encode()
+		handler.send_response(status)
+		handler.send_header("Content-Type", "application/json")
+		handler.send_header("Content-Length", str(len(body)))
+		handler.end_headers()
+		handler.wfile.write(body)
+
+	def close(self) -> None:
+		self._server.shutdown()
+		self._server.server_close()
@@ -0,0 +1,59 @@
+import numpy as np
+import talib
+
+from src.runtime.batch_indicators import BB_DEV, BB_PERIOD, INDICATOR_KEYS, batch_indicators, pad_rows
+
+
+def random_rows(count: int, rng) -> np.ndarray:
+	closes = rng.uniform(0.01, 50_000) * np.exp(np.cumsum(rng.normal(0, 0.004, count)))
+	spread = rng.random(count) * 0.004
+	return np.column_stack([np.arange(count) * 300_000.0, closes, closes * (1 + spread), closes * (1 - spread),
+							closes, rng.random(count) * 1000 + 1])
+
+
+def talib_last(rows):
+	closes, highs, lows, volumes = (np.ascontiguousarray(rows[:, i]) for i in (4, 2, 3, 5))
+	macd, signal, hist = talib.MACD(closes)
+	upper, middle, lower = talib.BBANDS(closes, timeperiod=BB_PERIOD, nbdevup=BB_DEV, nbdevdn=BB_DEV)
+	atr = talib.ATR(highs, lows, closes, timeperiod=14)[-1]
+	return {
+		"rsi": talib.RSI(closes, timeperiod=14)[-1],
+		"ema_9": talib.EMA(closes, timeperiod=9)[-1], "ema_21": talib.EMA(closes, timeperiod=21)[-1],
+		"ema_50": talib.EMA(closes, timeperiod=50)[-1], "ema_200": talib.EMA(closes, timeperiod=200)[-1],
+		"macd": macd[-1], "macd_signal": signal[-1], "macd_hist": hist[-1],
+		"bb_upper": upper[-1], "bb_middle": middle[-1], "bb_lower": lower[-1], "atr": atr,
+	}
+
+
+def test_matches_talib_per_symbol_with_ragged_histories():
+	rng = np.random.default_rng(1)
+	universe = [random_rows(size, rng) for size in [200, 260, 150, 40, 200, 12, 199, 500] * 4]
+	results = batch_indicators(universe, min_length=10, width=200)
+	assert len(results) == len(universe)
+	for rows, indicators in zip(universe, results):
+		assert list(indicators) == list(INDICATOR_KEYS)
+		window = rows[-200:]
+		for key, expected in talib_last(window).items():
+			if np.isnan(expected):
+				continue  # Not enough history: calculate_indicators' fallback applies
+			assert np.isclose(indicators[key], expected, rtol=1e-9, atol=1e-9), (len(rows), key)
+		volume_avg = np.mean(window[-20:, 5])
+		assert np.isclose(indicators["volume_avg"], volume_avg)
+		assert np.isclose(indicators["momentum_10"], (window[-1, 4] - window[-10, 4]) / window[-10, 4] * 100)
+
+
+def test_short_or_missing_histories_are_masked():
+	rng = np.random.default_rng(2)
+	universe = [random_rows(200, rng), None, random_rows(30, rng), random_rows(200, rng)]
+	closes, _, _, volumes, lengths = pad_rows(universe, 200)
+	assert lengths.tolist() == [200, 0, 30, 200]
+	assert np.isnan(closes[2, :170]).all() and not np.isnan(closes[2, 170:]).any()
+
+	results = batch_indicators(universe, min_length=200, width=200)
+	assert results[1] is None and results[2] is None
+	# A short neighbour never leaks into full rows
+	alone = batch_indicators([universe[0], universe[3]], min_length=200, width=200)
+	assert results[0] == alone[0] and results[3] == alone[1]
+
+	short = batch_indicators(universe, min_length=1, width=200)[2]
+	assert short["ema_200"] == universe[2][-1, 4] and short["rsi"] != 50.0  # EMA 200 falls back, RSI 14 does not
@@ -0,0 +1,178 @@
+import os
+import json
+import math
+
+import numpy as np
+import pytest
+
+from src.runtime.confidence import DEFAULT_TABLES, ConfidenceScorer
+
+
+# calculate_signal_confidence / calculate_target_confidence as they were before the
+# tables (ladder bodies unchanged), the reference the compiled tables must reproduce.
+
+def reference_signal(indicators, signal_type, base_confidence=50):
+	confidence = base_confidence
+	try:
+		if signal_type == 'BUY':
+			if indicators['rsi'] < 25: confidence += 20
+			elif indicators['rsi'] < 30: confidence += 15
+			elif indicators['rsi'] < 35: confidence += 12
+			elif indicators['rsi'] < 40: confidence += 8
+			elif indicators['rsi'] < 45: confidence += 5
+			if indicators['volume_ratio'] > 2.5: confidence += 15
+			elif indicators['volume_ratio'] > 2.0: confidence += 12
+			elif indicators['volume_ratio'] > 1.5: confidence += 8
+			elif indicators['volume_ratio'] > 1.2: confidence += 4
+			if indicators['ema_9'] > indicators['ema_21'] > indicators['ema_50']: confidence += 12
+			elif indicators['ema_9'] > indicators['ema_21']: confidence += 6
+			if indicators['macd'] > indicators['macd_signal']:
+				confidence += 8 if abs(indicators['macd'] - indicators['macd_signal']) > 10 else 4
+			if indicators['momentum_3'] > 0: confidence += 3
+			if indicators['momentum_10'] > 0: confidence += 3
+		elif signal_type == 'SELL':
+			if indicators['rsi'] > 75: confidence += 20
+			elif indicators['rsi'] > 70: confidence += 15
+			elif indicators['rsi'] > 65: confidence += 12
+			elif indicators['rsi'] > 60: confidence += 8
+			elif indicators['rsi'] > 55: confidence += 5
+			if indicators['volume_ratio'] > 2.5: confidence += 15
+			elif indicators['volume_ratio'] > 2.0: confidence += 12
+			elif indicators['volume_ratio'] > 1.5: confidence += 8
+			elif indicators['volume_ratio'] > 1.2: confidence += 4
+			if indicators['ema_9'] < indicators['ema_21'] < indicators['ema_50']: confidence += 12
+			elif indicators['ema_9'] < indicators['ema_21']: confidence += 6
+			if indicators['macd'] < indicators['macd_signal']:
+				confidence += 8 if abs(indicators['macd'] - indicators['macd_signal']) > 10 else 4
+			if indicators['momentum_3'] < 0: confidence += 3
+			if indicators['momentum_10'] < 0: confidence += 3
+		if indicators['atr_pct'] > 5: confidence -= 5
+		elif indicators['atr_pct'] > 3: confidence -= 3
+		confidence = min(95, max(30, confidence))
+		return confidence / 100
+	except Exception:
+		return 0.70
+
+
+def reference_target(ind, current_price, entry_price, target_price, strategy):
+	score, details = 0, {}
+	current_gain = abs((current_price - entry_price) / entry_price * 100)
+	target_gain = abs((target_price - entry_price) / entry_price * 100)
+	progress = (current_gain / target_gain) if target_gain > 0 else 0
+	if progress >= 0.75: score += 25
+	elif progress >= 0.50: score += 15
+	elif progress >= 0.25: score += 8
+	else: score += 3
+	momentum_3 = ind.get('momentum_3', 0)
+	momentum_10 = ind.get('momentum_10', 0)
+	if strategy == 'BUY':
+		if momentum_10 > 2 and momentum_3 > 0: score += 25
+		elif momentum_10 > 1: score += 15
+		elif momentum_10 > 0: score += 8
+	else:
+		if momentum_10 < -2 and momentum_3 < 0: score += 25
+		elif momentum_10 < -1: score += 15
+		elif momentum_10 < 0: score += 8
+	volume_ratio = ind.get('volume_ratio', 1.0)
+	if volume_ratio > 1.5: score += 20
+	elif volume_ratio > 1.2: score += 12
+	elif volume_ratio > 0.8: score += 5
+	ema_9 = ind.get('ema_9', current_price)
+	ema_21 = ind.get('ema_21', current_price)
+	ema_50 = ind.get('ema_50', current_price)
+	if strategy == 'BUY':
+		if ema_9 > ema_21 > ema_50: score += 20
+		elif ema_9 > ema_21: score += 10
+		else: score += 3
+	else:
+		if ema_9 < ema_21 < ema_50: score += 20
+		elif ema_9 < ema_21: score += 10
+		else: score += 3
+	details['trend'] = 'Aligned' if score >= 15 else 'Weak'
+	rsi = ind.get('rsi', 50)
+	if strategy == 'BUY':
+		if 40 < rsi < 70: score += 10
+		elif rsi < 75: score += 5
+	else:
+		if 30 < rsi < 60: score += 10
+		elif rsi > 25: score += 5
+	return min(100, max(0, score)), details
+
+
+def random_rows(rng, count, drop=0.0):
+	pick = lambda values: rng.choice(values).item()  # noqa: E731
+	rows = []
+	for _ in range(count):
+		ema_21 = pick([99.0, 100.0, 101.0])
+		row = {
+			"rsi": pick([10, 25, 29.9, 30, 40, 44.9, 45, 50, 55, 60, 65.5, 70, 75, 90, math.nan]),
+			"volume_ratio": pick([0.05, 0.8, 0.9, 1.2, 1.3, 1.5, 2.0, 2.5, 3.0, math.nan]),
+			"atr_pct": pick([0.5, 3.0, 4.0, 5.0, 6.0, math.nan]),
+			"ema_9": ema_21 * pick([0.97, 1.0, 1.03]), "ema_21": ema_21, "ema_50": pick([99.0, 100.0, 101.0, math.nan]),
+			"macd": pick([-20, 0, 5, 11, 15.0]), "macd_signal": pick([-5, 0, 5]),
+			"momentum_3": pick([-1, 0, 1]), "momentum_10": pick([-3, -2, -1.5, -1, -0.1, 0, 0.1, 1, 1.5, 2, 3]),
+		}
+		for key in list(row):
+			if rng.random() < drop:
+				del row[key]
+		rows.append(row)
+	return rows
+
+
+def test_signal_table_matches_calculate_signal_confidence():
+	scorer = ConfidenceScorer()
+	rows = random_rows(np.random.default_rng(1), 4000)
+	bases = np.random.default_rng(2).choice([20, 25, 58, 60, 62, 65, 70], len(rows))
+	columns = {key: np.array([row[key] for row in rows], dtype=np.float64) for key in rows[0]}
+	for side in ("BUY", "SELL"):
+		expected = [reference_signal(row, side, int(base)) for row, base in zip(rows, bases)]
+		assert [scorer.score_one("signal", row, side, int(base)) for row, base in zip(rows, bases)] == expected
+		assert scorer.score("signal", columns, side, bases).tolist() == expected
+		assert scorer.score_rows("signal", rows, side, bases).tolist() == expected
+	with pytest.raises(KeyError):
+		scorer.score_one("signal", {"rsi": 20.0}, "BUY")  # The bot falls back to 0.70 on this
+
+
+def test_target_table_matches_calculate_target_confidence():
+	scorer = ConfidenceScorer()
+	rng = np.random.default_rng(3)
+	rows = random_rows(rng, 4000, drop=0.15)
+	for row in rows:
+		row["entry_price"] = 100.0
+		row["target_price"] = float(rng.choice([100.0, 102.0, 98.0]))
+		row["price"] = float(rng.choice([100.0, 100.5, 101.0, 101.5, 101.9, 102.0, 99.0, 98.5]))
+	for side in ("BUY", "SELL"):
+		expected = [reference_target(row, row["price"], 100.0, row["target_price"], side) for row in rows]
+		for row, (score, details) in zip(rows, expected):
+			value, parts, _ = scorer.explain("target", row, side)
+			assert value == score and type(value) is int
+			aligned = sum(parts[name] for name in ("progress", "momentum", "volume", "trend")) >= 15
+			assert ('Aligned' if aligned else 'Weak') == details['trend']
+		assert scorer.score_rows("target", rows, side).tolist() == [score for score, _ in expected]
+
+
+def test_tables_hot_reload_and_keep_the_last_good_version(tmp_path):
+	path = tmp_path / "confidence_tables.json"
+	scorer = ConfidenceScorer(str(path), check_interval=0)
+	row = {"rsi": 20.0, "volume_ratio": 1.0, "atr_pct": 1.0, "ema_9": 1.0, "ema_21": 1.0, "ema_50": 1.0,
+		   "macd": 0.0, "macd_signal": 0.0, "momentum_3": 0.0, "momentum_10": 0.0}
+	assert scorer.score_one("signal", row, "BUY", 50) == 0.70 and scorer.get_stats()["reloads"] == 0
+
+	table = json.loads(json.dumps(DEFAULT_TABLES["signal"]))
+	table["rules"]["BUY"][0]["points"] = [30, 15, 12, 8, 5, 0]
+	path.write_text(json.dumps({"signal": table}))
+	assert scorer.maybe_reload(force=True)
+	assert scorer.score_one("signal", row, "BUY", 50) == 0.80
+	assert scorer.score_one("target", dict(row, price=1.0, entry_price=1.0, target_price=2.0), "BUY") == 16
+
+	table["rules"]["BUY"][0]["edges"] = [30, 25]
+	path.write_text(json.dumps({"signal": table}))
+	assert not scorer.maybe_reload(force=True)
+	assert scorer.score_one("signal", row, "BUY", 50) == 0.80
+	assert scorer.get_stats()["reload_errors"] == 1
+
+
+def test_shipped_config_matches_the_defaults():
+	path = os.path.join(os.path.dirname(__file__), "..", "config", "confidence_tables.json")
+	with open(path, "r", encoding="utf-8") as f:
+		assert json.load(f) == json.loads(json.dumps(DEFAULT_TABLES))
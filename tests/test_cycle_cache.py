@@ -0,0 +1,61 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.runtime.cycle_cache import CycleCache
+
+
+def tail(values, size):
+	return values[-size:]
+
+
+def test_shorter_requests_are_sliced_from_longer_window():
+	cache = CycleCache()
+	loads = []
+
+	def loader(size):
+		loads.append(size)
+		return list(range(size))
+
+	cache.begin_cycle()
+	assert cache.get("BTCUSDT", 200, loader, tail) == list(range(200))
+	assert cache.get("BTCUSDT", 50, loader, tail) == list(range(150, 200))
+	assert cache.get("BTCUSDT", 300, loader, tail) == list(range(300))
+	assert loads == [200, 300]
+	stats = cache.end_cycle()
+	assert (stats["hits"], stats["misses"]) == (1, 2)
+
+	# Nothing survives the cycle
+	cache.get("BTCUSDT", 50, loader, tail)
+	assert loads == [200, 300, 50]
+
+
+def test_concurrent_requests_share_one_fetch():
+	cache = CycleCache()
+	calls = []
+	release = threading.Event()
+
+	def loader(size):
+		calls.append(size)
+		release.wait(2)
+		return list(range(size))
+
+	cache.begin_cycle()
+	with ThreadPoolExecutor(max_workers=8) as pool:
+		futures = [pool.submit(cache.get, "ETHUSDT", 50, loader, tail) for _ in range(8)]
+		time.sleep(0.05)
+		release.set()
+		results = [f.result() for f in futures]
+	assert calls == [50]
+	assert all(r == list(range(50)) for r in results)
+	stats = cache.end_cycle()
+	assert stats["misses"] == 1 and stats["hits"] + stats["coalesced"] == 7
+
+
+def test_failures_are_not_cached():
+	cache = CycleCache()
+	results = iter([None, [1, 2, 3]])
+	cache.begin_cycle()
+	assert cache.get("XRPUSDT", 3, lambda size: next(results)) is None
+	assert cache.get("XRPUSDT", 3, lambda size: next(results)) == [1, 2, 3]
+	assert cache.end_cycle()["failures"] == 1
@@ -0,0 +1,78 @@
+from src.runtime.cycle_scheduler import CycleScheduler
+
+
+class FakeClock:
+	def __init__(self, now):
+		self.now = float(now)
+		self.slept = 0.0
+
+	def __call__(self):
+		return self.now
+
+	def sleep(self, seconds):
+		self.now += seconds
+		self.slept += seconds
+
+
+def make(clock, **kwargs):
+	kwargs.setdefault("budgets", {"regime": 5, "positions": 10, "scan": 25, "signals": 10})
+	kwargs.setdefault("deferrable", ("regime", "scan", "signals"))
+	return CycleScheduler(period=60, offset=3, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_cycles_start_a_few_seconds_after_the_boundary_without_drift():
+	clock = FakeClock(1_000_030.0)  # 7s past a boundary (1_000_023)
+	scheduler = make(clock)
+	assert scheduler.wait() == 1_000_030.0  # First cycle: right away
+	scheduler.begin(clock.now)
+	clock.now += 12.0
+	assert scheduler.end()["next"] == 1_000_083.0
+
+	starts = []
+	for duration in (14.0, 41.5, 20.0):
+		start = scheduler.wait()
+		starts.append(start)
+		scheduler.begin(start)
+		clock.now += duration
+		scheduler.end()
+	assert starts == [1_000_083.0, 1_000_143.0, 1_000_203.0]  # Only the remaining time is slept
+	assert scheduler.next_boundary(1_000_203.0) == 1_000_263.0
+	assert scheduler.get_stats()["overruns"] == 0
+
+
+def test_overruns_skip_missed_boundaries_and_defer_low_priority_phases():
+	clock = FakeClock(3.0)
+	scheduler = make(clock)
+	scheduler.wait()
+	scheduler.begin(3.0)
+	ran = []
+	for name, duration in (("regime", 1.0), ("positions", 50.0), ("scan", 5.0), ("signals", 1.0)):
+		def work(name=name, duration=duration):
+			ran.append(name)
+			clock.now += duration
+			return name
+		scheduler.run(name, work)
+	assert ran == ["regime", "positions"]  # 9s left: the scan (25s) and signals (10s) wait
+	clock.now += 20.0  # Past the boundary at 63: it is skipped, not caught up
+	report = scheduler.end()
+	assert report["overran"] and report["next"] == 123.0
+
+	stats = scheduler.get_stats()
+	assert stats["missed_boundaries"] == 1 and stats["skipped_phases"] == 2
+	assert stats["phases"]["positions"]["overruns"] == 1 and stats["phases"]["scan"]["skipped"] == 1
+
+	# The next cycle starts at the next boundary; a late start defers the regime phase too
+	assert scheduler.wait() == 123.0
+	scheduler.begin(123.0)
+	clock.now += 57.0
+	assert scheduler.run("regime", lambda: "ran") is None
+	assert scheduler.run("positions", lambda: "ran") == "ran"
+
+
+def test_error_backoff_and_stop():
+	clock = FakeClock(100.0)
+	scheduler = make(clock)
+	scheduler.begin(63.0)
+	scheduler.end()
+	assert scheduler.wait(not_before=clock.now + 60) == 183.0  # First boundary at or after 160
+	assert scheduler.wait(stop=lambda: True) == 243.0 and clock.now == 183.0  # Returns without sleeping
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_loader import validate_continuity
+
+
+def loop_gaps(df, max_gap):
+	"""Gap scan as validate_continuity did it before the kernel."""
+	gaps = []
+	for i in range(1, len(df)):
+		time_diff = df.index[i] - df.index[i-1]
+		if time_diff > max_gap:
+			gaps.append({"start": df.index[i-1], "end": df.index[i], "duration": str(time_diff)})
+	return gaps
+
+
+def make_frame(freq, count=500, seed=3, tz=None):
+	rng = np.random.default_rng(seed)
+	index = pd.date_range("2024-01-01", periods=count, freq=freq, tz=tz)
+	keep = np.ones(count, dtype=bool)
+	keep[rng.choice(np.arange(1, count - 1), size=40, replace=False)] = False  # Single and runs of missing bars
+	keep[100:104] = False
+	return pd.DataFrame({"close": rng.random(count)}, index=index)[keep]
+
+
+@pytest.mark.parametrize("timeframe,freq,tz", [("5m", "5min", None), ("1h", "1h", "UTC"), ("daily", "1D", None)])
+def test_gaps_match_the_old_loop(timeframe, freq, tz):
+	df = make_frame(freq, tz=tz)
+	result = validate_continuity(df, timeframe)
+	expected = loop_gaps(df, pd.Timedelta(freq) * 2)
+	assert expected and result["gaps"] == expected
+	assert result["gap_percentage"] == len(expected) / len(df) * 100 and result["valid"] == (result["gap_percentage"] <= 10.0)
+	assert result["total_periods"] == len(df) and result["timeframe"] == timeframe
+
+
+def test_exactly_twice_the_interval_is_not_a_gap():
+	index = pd.DatetimeIndex(["2024-01-01 00:00", "2024-01-01 00:05", "2024-01-01 00:15", "2024-01-01 00:30"])
+	result = validate_continuity(pd.DataFrame({"close": [1.0, 2.0, 3.0, 4.0]}, index=index), "5m")
+	assert [(gap["start"], gap["duration"]) for gap in result["gaps"]] == [(index[2], "0 days 00:15:00")]
+	assert validate_continuity(pd.DataFrame({"close": [1.0]}, index=index[:1]), "5m") == {
+		"valid": False, "reason": "insufficient_data", "gaps": []}
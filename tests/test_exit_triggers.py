@@ -0,0 +1,66 @@
+import random
+
+from src.runtime.exit_triggers import (ABOVE, BELOW, QUICK_PROFIT, STOP_LOSS, TAKE_PROFIT, TRAILING_STOP,
+									   ExitTriggerEngine)
+
+
+def test_long_and_short_levels_fire_on_the_right_side():
+	assert ExitTriggerEngine.side_for("BUY", STOP_LOSS) == BELOW
+	assert ExitTriggerEngine.side_for("BUY", TRAILING_STOP) == BELOW
+	assert ExitTriggerEngine.side_for("BUY", TAKE_PROFIT) == ABOVE
+	assert ExitTriggerEngine.side_for("SELL", STOP_LOSS) == ABOVE
+	assert ExitTriggerEngine.side_for("SELL", QUICK_PROFIT) == BELOW
+
+	fired = []
+	engine = ExitTriggerEngine(on_fire=lambda symbol, price, hits: fired.append((symbol, price, hits)))
+	engine.arm("long", "BTCUSDT", "BUY", {STOP_LOSS: 98.0, TAKE_PROFIT: 104.0, QUICK_PROFIT: 100.34, TRAILING_STOP: None})
+	engine.arm("short", "BTCUSDT", "SELL", {STOP_LOSS: 102.0, TAKE_PROFIT: 96.0, QUICK_PROFIT: 99.66})
+	assert engine.get_stats()["triggers"] == 6
+
+	assert engine.on_price("BTCUSDT", 100.0, now=0) == []
+	assert engine.on_price("ETHUSDT", 1.0, now=0) == []  # Nothing armed for it
+	assert engine.on_price("BTCUSDT", 99.0, now=0) == [("short", [(QUICK_PROFIT, 99.66)])]
+	assert engine.levels("short") == {} and engine.get_stats()["triggers"] == 3  # Disarmed once fired
+	assert engine.on_price("BTCUSDT", 98.5, now=0) == []  # Above the long's stop, the short is gone
+	assert engine.on_price("BTCUSDT", 104.5, now=0) == [("long", [(QUICK_PROFIT, 100.34), (TAKE_PROFIT, 104.0)])]
+	assert fired == [("BTCUSDT", 99.0, [("short", [(QUICK_PROFIT, 99.66)])]),
+					 ("BTCUSDT", 104.5, [("long", [(QUICK_PROFIT, 100.34), (TAKE_PROFIT, 104.0)])])]
+	assert engine.get_stats()["symbols"] == 0
+
+
+def test_min_hold_keeps_triggers_armed_and_sync_replaces_levels():
+	engine = ExitTriggerEngine()
+	engine.arm("a", "ETHUSDT", "BUY", {STOP_LOSS: 95.0, TAKE_PROFIT: 110.0}, not_before=30.0)
+	assert engine.on_price("ETHUSDT", 94.0, now=10.0) == []
+	assert engine.get_stats()["held"] == 1 and engine.levels("a") == {STOP_LOSS: 95.0, TAKE_PROFIT: 110.0}
+	assert engine.on_price("ETHUSDT", 94.0, now=30.0) == [("a", [(STOP_LOSS, 95.0)])]
+
+	# The sweep moved the stop to break-even and started trailing; "b" closed meanwhile
+	engine.arm("b", "ETHUSDT", "BUY", {STOP_LOSS: 95.0})
+	engine.sync({"a": ("ETHUSDT", "BUY", {STOP_LOSS: 100.19, TRAILING_STOP: 101.5, TAKE_PROFIT: 110.0}, 0.0)})
+	assert engine.levels("b") == {}
+	assert engine.on_price("ETHUSDT", 101.6) == []
+	assert engine.on_price("ETHUSDT", 101.0) == [("a", [(TRAILING_STOP, 101.5)])]
+
+
+def test_only_crossed_triggers_fire_against_a_linear_scan():
+	rng = random.Random(7)
+	engine = ExitTriggerEngine()
+	positions = {}
+	for index in range(300):
+		action = rng.choice(["BUY", "SELL"])
+		levels = {kind: round(rng.uniform(90, 110), 2) for kind in (STOP_LOSS, TAKE_PROFIT, QUICK_PROFIT)}
+		positions[f"p{index}"] = (action, levels)
+		engine.arm(f"p{index}", "SOLUSDT", action, levels)
+	for price in [rng.uniform(88, 112) for _ in range(40)]:
+		expected = set()
+		for key, (action, levels) in positions.items():
+			for kind, level in levels.items():
+				below = ExitTriggerEngine.side_for(action, kind) == BELOW
+				if (price <= level) if below else (price >= level):
+					expected.add(key)
+		fired = engine.on_price("SOLUSDT", price, now=0)
+		assert {key for key, _ in fired} == expected
+		for key in expected:
+			del positions[key]
+	assert engine.get_stats()["positions"] == len(positions)
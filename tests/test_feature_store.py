@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.runtime.feature_store import FeatureStore, dataset_hash, parse_feature
+
+
+def make_frame(count: int = 400, seed: int = 0) -> pd.DataFrame:
+	rng = np.random.default_rng(seed)
+	closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+	return pd.DataFrame({
+		"open": closes * (1 + rng.normal(0, 0.001, count)), "high": closes * 1.01, "low": closes * 0.99,
+		"close": closes, "volume": rng.random(count) * 100,
+	}, index=pd.date_range("2024-01-01", periods=count, freq="5min"))
+
+
+def test_features_match_the_inline_pandas_formulas():
+	df = make_frame()
+	features = FeatureStore(None).dataset("BTCUSDT", "5m", df)
+	delta = df["close"].diff()
+	rs = delta.where(delta > 0, 0).rolling(14).mean() / (-delta.where(delta < 0, 0)).rolling(14).mean()
+	expected = {
+		"ema_21": df["close"].ewm(span=21).mean(),
+		"ema_rec_12": df["close"].ewm(span=12, adjust=False).mean(),
+		"rsi_14": 100 - (100 / (1 + rs)),
+		"volatility_20": df["close"].pct_change().rolling(20).std(),
+		"close_max_30": df["close"].rolling(30).max(),
+	}
+	for name, series in expected.items():
+		np.testing.assert_array_equal(features.get(name), series.to_numpy())
+	assert parse_feature("volume_sma_20") == ("volume_sma", 20) and parse_feature("obv") == ("obv", None)
+	for bad in ("ema", "obv_3", "wma_10", "rsi_0"):
+		with pytest.raises(KeyError):
+			features.get(bad)
+
+
+def test_columns_persist_and_are_served_without_copies(tmp_path):
+	df = make_frame()
+	features = FeatureStore(str(tmp_path)).dataset("BTCUSDT", "5m", df)
+	rsi = features.get("rsi_14")
+	assert not rsi.flags.writeable
+	assert np.shares_memory(features.series("rsi_14").to_numpy(), rsi)
+	assert features.store.get_stats()["computed"] == 3  # avg_gain_14, avg_loss_14, rsi_14
+
+	# Another process (fresh store) memory-maps the files instead of recomputing
+	fresh = FeatureStore(str(tmp_path))
+	again = fresh.dataset("BTCUSDT", "5m", df.copy())
+	frame = again.frame(["rsi_14", "avg_gain_14"])
+	assert isinstance(again.get("rsi_14"), np.memmap)
+	assert np.shares_memory(frame["rsi_14"].to_numpy(), again.get("rsi_14"))
+	np.testing.assert_array_equal(frame["rsi_14"].to_numpy(), rsi)
+	assert fresh.get_stats()["computed"] == 0 and fresh.get_stats()["loaded"] == 2
+	assert fresh.dataset("BTCUSDT", "5m", df) is again  # Same data, same set
+
+
+def test_changed_data_gets_a_new_hash_and_old_versions_are_pruned(tmp_path):
+	store = FeatureStore(str(tmp_path), keep_versions=2)
+	df = make_frame()
+	digests = []
+	for shift in range(3):
+		changed = df.copy()
+		changed.iloc[-1, changed.columns.get_loc("close")] += shift
+		features = store.dataset("ETHUSDT", "15m", changed)
+		features.get("sma_20")
+		digests.append(features.digest)
+	assert len(set(digests)) == 3 and dataset_hash(df) == digests[0]
+	remaining = os.listdir(tmp_path / "ETHUSDT_15m")
+	assert sorted(remaining) == sorted(digests[1:])
@@ -0,0 +1,88 @@
+import numpy as np
+import talib
+
+from src.runtime.indicator_engine import BB_DEV, BB_PERIOD, IndicatorEngine
+
+
+FIVE_MIN = 300_000.0
+
+
+def random_series(count: int, seed: int = 3):
+	rng = np.random.default_rng(seed)
+	closes = 40000 * np.exp(np.cumsum(rng.normal(0, 0.003, count)))
+	highs = closes * (1 + rng.random(count) * 0.004)
+	lows = closes * (1 - rng.random(count) * 0.004)
+	volumes = rng.random(count) * 100 + 1
+	open_times = np.arange(count) * FIVE_MIN
+	return open_times, closes, highs, lows, volumes
+
+
+def talib_reference(closes, highs, lows, volumes):
+	macd, signal, hist = talib.MACD(closes)
+	upper, middle, lower = talib.BBANDS(closes, timeperiod=BB_PERIOD, nbdevup=BB_DEV, nbdevdn=BB_DEV)
+	atr = talib.ATR(highs, lows, closes, timeperiod=14)[-1]
+	return {
+		"rsi": talib.RSI(closes, timeperiod=14)[-1],
+		"ema_9": talib.EMA(closes, timeperiod=9)[-1],
+		"ema_21": talib.EMA(closes, timeperiod=21)[-1],
+		"ema_50": talib.EMA(closes, timeperiod=50)[-1],
+		"ema_200": talib.EMA(closes, timeperiod=200)[-1],
+		"macd": macd[-1], "macd_signal": signal[-1], "macd_hist": hist[-1],
+		"bb_upper": upper[-1], "bb_middle": middle[-1], "bb_lower": lower[-1],
+		"atr": atr, "atr_pct": atr / closes[-1] * 100,
+		"volume_avg": np.mean(volumes[-20:]), "volume_current": volumes[-1],
+		"volume_ratio": volumes[-1] / np.mean(volumes[-20:]),
+		"momentum_3": (closes[-1] - closes[-3]) / closes[-3] * 100,
+		"momentum_10": (closes[-1] - closes[-10]) / closes[-10] * 100,
+	}
+
+
+def assert_matches(indicators, reference):
+	assert list(indicators) == list(reference)
+	for key, expected in reference.items():
+		assert np.isclose(indicators[key], expected, rtol=1e-9, atol=1e-6), (key, indicators[key], expected)
+
+
+def test_sliding_window_matches_talib_over_streamed_history():
+	open_times, closes, highs, lows, volumes = random_series(420)
+	engine = IndicatorEngine()
+	for end in range(200, 420):
+		window = slice(end - 199, end + 1)
+		indicators = engine.update("BTCUSDT", open_times[window], closes[window], highs[window], lows[window], volumes[window])
+		# The engine has seen every candle since its seed window: compare against TA-Lib over that history
+		history = slice(1, end + 1)
+		assert_matches(indicators, talib_reference(closes[history], highs[history], lows[history], volumes[history]))
+	stats = engine.get_stats()
+	assert (stats["seeds"], stats["advanced"], stats["peeks"]) == (1, 219, 220)
+
+
+def test_forming_candle_is_peeked_not_committed():
+	open_times, closes, highs, lows, volumes = random_series(260, seed=11)
+	engine = IndicatorEngine()
+	head = slice(0, 250)
+	engine.update("ETHUSDT", open_times[head], closes[head], highs[head], lows[head], volumes[head])
+
+	# The last candle keeps changing while it forms; only its final values may reach the state
+	for bump in (1.05, 0.95, 1.0):
+		forming = closes[:250].copy()
+		forming[-1] *= bump
+		indicators = engine.update("ETHUSDT", open_times[head], forming, highs[head], lows[head], volumes[head])
+		assert_matches(indicators, talib_reference(forming, highs[head], lows[head], volumes[head]))
+
+	full = slice(0, 260)
+	indicators = engine.update("ETHUSDT", open_times[full], closes[full], highs[full], lows[full], volumes[full])
+	assert_matches(indicators, talib_reference(closes[full], highs[full], lows[full], volumes[full]))
+	assert engine.get_stats()["seeds"] == 1
+
+
+def test_window_without_last_committed_candle_reseeds():
+	open_times, closes, highs, lows, volumes = random_series(700, seed=5)
+	engine = IndicatorEngine()
+	first = slice(0, 200)
+	engine.update("SOLUSDT", open_times[first], closes[first], highs[first], lows[first], volumes[first])
+
+	# Gap: the previous window's candles are all gone (e.g. the buffer was re-seeded after a resync)
+	later = slice(500, 700)
+	indicators = engine.update("SOLUSDT", open_times[later], closes[later], highs[later], lows[later], volumes[later])
+	assert_matches(indicators, talib_reference(closes[later], highs[later], lows[later], volumes[later]))
+	assert engine.get_stats()["seeds"] == 2
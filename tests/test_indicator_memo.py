@@ -0,0 +1,66 @@
+import numpy as np
+
+from src.runtime.batch_indicators import batch_indicators
+from src.runtime.indicator_memo import IndicatorMemo
+
+
+def test_entries_live_until_the_next_candle_closes():
+	memo = IndicatorMemo()
+	calls = []
+
+	def compute(value):
+		calls.append(value)
+		return value
+
+	series = ("BTCUSDT", "5m")
+	assert memo.get_or_compute(series, 1000.0, "sr", (100,), lambda: compute("a")) == "a"
+	assert memo.get_or_compute(series, 1000.0, "sr", (100,), lambda: compute("b")) == "a"
+	assert memo.get_or_compute(series, 1000.0, "sr", (50,), lambda: compute("c")) == "c"  # Other params
+
+	# Next candle closed: the old entries are dropped, an outdated reader is never cached
+	assert memo.get_or_compute(series, 1300.0, "sr", (100,), lambda: compute("d")) == "d"
+	assert memo.get(series, 1000.0, "sr", (100,)) is None
+	memo.put(series, 1000.0, "sr", (100,), "stale")
+	assert memo.get(series, 1000.0, "sr", (100,)) is None
+	assert calls == ["a", "c", "d"]
+
+	stats = memo.get_stats()
+	assert (stats["hits"], stats["invalidations"], stats["entries"]) == (1, 2, 1)
+	assert stats["by_name"]["sr"]["hits"] == 1
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+	memo = IndicatorMemo(max_entries=3)
+	for i in range(3):
+		memo.put((f"S{i}", "5m"), 1.0, "sr", (), i)
+	assert memo.get(("S0", "5m"), 1.0, "sr") == 0  # S0 becomes most recent
+	memo.put(("S3", "5m"), 1.0, "sr", (), 3)
+	assert memo.get(("S1", "5m"), 1.0, "sr") is None
+	assert memo.get(("S0", "5m"), 1.0, "sr") == 0
+	assert memo.get_stats()["evictions"] == 1
+
+	memo.invalidate("S0")
+	assert memo.get(("S0", "5m"), 1.0, "sr") is None
+
+
+def test_batch_summaries_only_recompute_the_forming_candle():
+	rng = np.random.default_rng(4)
+	universe = []
+	for size in (200, 200, 80):
+		closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size)))
+		universe.append(np.column_stack([np.arange(size) * 300_000.0, closes, closes * 1.01, closes * 0.99, closes,
+										 rng.random(size) * 50 + 1]))
+	memo = IndicatorMemo()
+	series = [("A", "5m"), ("B", "5m"), ("C", "5m")]
+	batch_indicators(universe, min_length=50, width=200, memo=memo, series=series)
+	assert memo.get_stats()["misses"] == 3
+
+	# Same closed candles, new forming price: summaries are reused and the result matches a cold pass
+	for rows in universe:
+		rows[-1, 4] *= 1.03
+		rows[-1, 2] = max(rows[-1, 2], rows[-1, 4])
+	warm = batch_indicators(universe, min_length=50, width=200, memo=memo, series=series)
+	cold = batch_indicators(universe, min_length=50, width=200)
+	assert memo.get_stats()["hits"] == 3
+	for a, b in zip(warm, cold):
+		assert all(np.isclose(a[key], b[key], rtol=1e-9, atol=1e-9) for key in b)
@@ -0,0 +1,93 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from src.runtime import kernels
+from src.runtime.kernels import LOOP_KERNELS, NUMPY_KERNELS
+
+
+# The loop kernels are the numba ones when it is installed, plain Python otherwise;
+# either way they must agree with the numpy kernels.
+BACKENDS = [pytest.param(LOOP_KERNELS, id="loop"), pytest.param(NUMPY_KERNELS, id="numpy")]
+
+
+def assert_same(a, b):
+	for x, y in zip(a, b):
+		np.testing.assert_array_equal(x, y)
+
+
+@pytest.mark.parametrize("impl", BACKENDS)
+def test_discrete_kernels_agree(impl):
+	rng = np.random.default_rng(7)
+	for size in (0, 1, 2, 3, 50, 400):
+		highs = np.round(rng.uniform(90, 110, size), 1)  # Rounded: ties do happen
+		lows = highs - np.round(rng.random(size), 1)
+		if size > 10:
+			highs[5] = np.nan
+		for window in (1, 2, 5, 20):
+			assert_same(impl["pivot_flags"](highs, lows, window), NUMPY_KERNELS["pivot_flags"](highs, lows, window))
+			assert_same(impl["pivot_flags"](highs, lows, window), LOOP_KERNELS["pivot_flags"](highs, lows, window))
+
+		times = np.cumsum(rng.choice([300, 300, 300, 600, 900], size)).astype(np.int64)
+		np.testing.assert_array_equal(impl["gap_indices"](times, np.int64(600)), [
+			i for i in range(1, size) if times[i] - times[i - 1] > 600
+		])
+
+		regimes = rng.integers(0, 3, size).astype(np.float64)
+		if size > 10:
+			regimes[3:5] = np.nan
+		runs = impl["run_lengths"](regimes)
+		assert runs.sum() == size
+		np.testing.assert_array_equal(runs, LOOP_KERNELS["run_lengths"](regimes))
+
+
+@pytest.mark.parametrize("impl", BACKENDS)
+@pytest.mark.filterwarnings("ignore:divide by zero")
+def test_signal_trades_match_the_iterrows_replay(impl):
+	rng = np.random.default_rng(3)
+	closes = rng.uniform(50, 150, 300)
+	closes[40] = 0.0  # Division by zero gives inf/nan instead of raising
+	signals = rng.choice([-1.0, 0.0, 1.0], 300, p=[0.2, 0.5, 0.3])
+
+	expected, position, entry = [], 0, 0.0
+	for i in range(1, len(closes)):
+		if position != 0 and signals[i] != position:
+			pnl = np.float64(closes[i] - entry) / entry if position > 0 else np.float64(entry - closes[i]) / entry
+			expected.append((i, position, pnl))
+			position = 0
+		if signals[i] != 0 and position == 0:
+			position, entry = signals[i], closes[i]
+
+	entries, exits, sides, pnls = impl["signal_trades"](closes, signals)
+	assert len(entries) in (len(exits), len(exits) + 1)
+	assert exits.tolist() == [e[0] for e in expected]
+	assert sides.tolist() == [e[1] for e in expected]
+	np.testing.assert_array_equal(pnls, [e[2] for e in expected])
+	assert_same((entries, exits, sides, pnls), LOOP_KERNELS["signal_trades"](closes, signals))
+
+
+@pytest.mark.parametrize("impl", BACKENDS)
+def test_gbm_path_matches_the_scalar_formula(impl):
+	rng = random.Random(42)
+	uniforms = np.array([[max(1e-12, rng.random()), max(1e-12, rng.random())] for _ in range(1000)])
+	for mu, sigma, dt, floor in ((0.0, 0.02, 1 / 1440, 0.01), (0.0, 3.0, 1.0, 5000.0)):
+		price, expected = 20000.0, []
+		for u1, u2 in uniforms:
+			z = ((-2.0 * math.log(u1)) ** 0.5) * math.cos(2.0 * math.pi * u2)
+			growth = (mu - 0.5 * sigma * sigma) * dt + sigma * (dt ** 0.5) * z
+			price = max(floor, price * math.exp(growth))
+			expected.append(price)
+		drift, vol = (mu - 0.5 * sigma * sigma) * dt, sigma * dt ** 0.5
+		closes = impl["gbm_path"](20000.0, uniforms, drift, vol, floor)
+		np.testing.assert_allclose(closes, expected, rtol=1e-12)
+		np.testing.assert_allclose(closes, LOOP_KERNELS["gbm_path"](20000.0, uniforms, drift, vol, floor), rtol=1e-12)
+
+
+def test_public_api_uses_the_selected_backend():
+	assert kernels.BACKEND == ("numba" if kernels.JIT_AVAILABLE else "numpy")
+	assert kernels.run_lengths([1, 1, 2, 2, 2, 1]).tolist() == [2, 3, 1]
+	assert kernels.gap_indices([0, 60, 120, 300], 120).tolist() == [3]
+	entries, exits, _, _ = kernels.signal_trades([100.0], [1])
+	assert len(entries) == len(exits) == 0
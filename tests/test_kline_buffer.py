@@ -0,0 +1,125 @@
+import time
+
+import numpy as np
+
+from src.runtime.kline_buffer import CLOSE, INTERVAL_MS, OPEN_TIME, KlineBufferStore, KlineRingBuffer, resample
+
+
+def random_rows(start: int, count: int, interval_ms: int, seed: int = 7) -> np.ndarray:
+	rng = np.random.default_rng(seed)
+	opens = 100 + rng.standard_normal(count).cumsum()
+	closes = opens + rng.standard_normal(count)
+	highs = np.maximum(opens, closes) + rng.random(count)
+	lows = np.minimum(opens, closes) - rng.random(count)
+	times = start + interval_ms * np.arange(count)
+	return np.column_stack([times, opens, highs, lows, closes, rng.random(count) * 10]).astype(np.float64)
+
+
+def test_ring_buffer_keeps_newest_and_updates_forming_candle():
+	buffer = KlineRingBuffer(3)
+	for i in range(10):
+		buffer.merge(np.array([[i, 0, 0, 0, i, 0]], dtype=np.float64))
+	buffer.merge(np.array([[9, 0, 0, 0, 42, 0]], dtype=np.float64))
+	assert buffer.arrays()[0].tolist() == [7, 8, 42]
+	assert buffer.rows()[:, OPEN_TIME].tolist() == [7, 8, 9]
+
+
+def test_merge_overlapping_batches_and_wrap_around():
+	buffer = KlineRingBuffer(5)
+	rows = random_rows(0, 40, 1)
+	assert buffer.merge(rows[:4]) == 4 and buffer.last_open_time == 3
+
+	# Overlapping batch: rows before the last candle are ignored, the last one is overwritten
+	batch = rows[2:7].copy()
+	batch[:, CLOSE] += 1000
+	assert buffer.merge(batch) == 3
+	assert buffer.arrays()[0].tolist() == [rows[2, CLOSE], *batch[1:, CLOSE]]
+	assert buffer.merge(rows[:3]) == 0 and buffer.merge(rows[:0]) == 0 and len(buffer) == 5
+
+	# Many small merges run past the end of the block: the window stays the newest five, contiguous
+	for i in range(7, 40, 2):
+		buffer.merge(rows[i:i + 2])
+	assert buffer.rows().tolist() == rows[-5:].tolist()
+	assert all(column.flags.c_contiguous for column in buffer.arrays())
+	assert buffer.arrays(3)[4].tolist() == rows[-3:, 1].tolist()
+
+	# A batch at least as big as the capacity replaces everything
+	assert buffer.merge(random_rows(100, 8, 1, seed=3)) == 8
+	assert buffer.open_times().tolist() == [103, 104, 105, 106, 107]
+
+
+def test_store_seeds_once_then_tops_up_from_the_last_candle():
+	five = INTERVAL_MS["5m"]
+	now_open = int(time.time() * 1000) // five * five
+	source = random_rows(now_open - 299 * five, 300, five)
+	calls = []
+
+	def fetcher(symbol, interval, limit, start_time):
+		calls.append((limit, start_time))
+		if source is None:
+			return None
+		rows = source if start_time is None else source[source[:, OPEN_TIME] >= start_time]
+		return rows[-limit:]
+
+	store = KlineBufferStore(fetcher, min_capacity=200, refresh_interval=60)
+	closes = store.get("BTCUSDT", "5m", 100)[0]
+	assert calls == [(200, None)] and closes.tolist() == source[-100:, CLOSE].tolist()
+	assert store.get("BTCUSDT", "5m", 100)[0] is not None and len(calls) == 1  # Within refresh_interval
+
+	# The forming candle moved and a new one opened: the top-up asks for two rows from the last open time
+	store.refresh_interval = 0
+	source[-1, CLOSE] = 555.0
+	source = np.vstack([source, random_rows(now_open + five, 1, five, seed=9)])
+	rows = store.get_rows("BTCUSDT", "5m", 200)
+	assert calls[1] == (2, now_open)
+	assert rows.tolist() == source[-200:].tolist() and rows[-2, CLOSE] == 555.0
+
+	# Asking for more history than was seeded re-seeds; a failed fetch is never served as fresh
+	assert len(store.get_rows("BTCUSDT", "5m", 250)) == 250 and calls[-1] == (250, None)
+	source = None
+	assert store.get("BTCUSDT", "5m", 100) == (None, None, None, None, None)
+	stats = store.get_stats()
+	assert stats["seeds"] == 2 and stats["topups"] == 1 and stats["cached"] == 1 and stats["failures"] == 1
+	assert stats["rows_fetched"] == 200 + 2 + 250
+
+
+def test_resample_matches_exchange_buckets():
+	five = INTERVAL_MS["5m"]
+	hour = INTERVAL_MS["1h"]
+	start = 1_700_000_000_000 // hour * hour - 4 * five  # Starts mid-hour
+	rows = random_rows(start, 40, five)
+	out = resample(rows, hour)
+	assert out[:, OPEN_TIME].tolist() == [start - 8 * five, start + 4 * five, start + 16 * five, start + 28 * five]
+	first = rows[4:16]
+	expected = [start + 4 * five, first[0, 1], first[:, 2].max(), first[:, 3].min(), first[-1, 4], first[:, 5].sum()]
+	assert np.allclose(out[1], expected)
+
+
+def test_derived_interval_built_from_base_without_rest():
+	five = INTERVAL_MS["5m"]
+	fifteen = INTERVAL_MS["15m"]
+	now_open = int(time.time() * 1000) // five * five
+	base = random_rows(now_open - 299 * five, 300, five)
+	calls = []
+
+	def fetcher(symbol, interval, limit, start_time):
+		calls.append((interval, limit, start_time))
+		if interval == "15m":
+			return resample(base, fifteen)[-limit:]
+		rows = base if start_time is None else base[base[:, OPEN_TIME] >= start_time]
+		return rows[-limit:]
+
+	store = KlineBufferStore(fetcher, min_capacity=200, refresh_interval=0, derived_intervals={"15m": "5m"})
+	store.get("BTCUSDT", "15m", 50)
+	store.get("BTCUSDT", "5m", 200)
+	assert [c[0] for c in calls] == ["15m", "5m"]
+
+	# Forming 5m candle moves: the 15m candle follows it with no 15m request
+	base[-1, CLOSE] = 999.0
+	closes, highs, lows, volumes, opens = store.get("BTCUSDT", "15m", 50)
+	assert all(c[0] == "5m" for c in calls[2:])
+	assert closes[-1] == 999.0
+	expected = resample(base, fifteen)[-50:]
+	assert np.allclose(closes, expected[:, CLOSE])
+	assert np.allclose(volumes, expected[:, 5])
+	assert store.get_stats()["derived"] == 1
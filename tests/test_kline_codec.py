@@ -0,0 +1,54 @@
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.runtime.datafeed import LiveDataFeed
+from src.runtime.kline_codec import CLOSE, OPEN_TIME, columns, decode_klines, rows_to_array
+from src.tools.bench_kline_decode import legacy_decode, make_payload
+
+
+def test_fast_decode_matches_legacy_path():
+	payload = make_payload(200)
+	klines = decode_klines(payload)
+	assert klines.shape == (200, 6) and klines.dtype == np.float64
+	assert klines[0, OPEN_TIME] == 1_700_000_000_000
+	for old, new in zip(legacy_decode(payload), columns(klines)):
+		assert np.array_equal(old, new)
+
+
+def test_columns_are_contiguous_views():
+	klines = decode_klines(make_payload(10))
+	closes = columns(klines)[0]
+	assert closes.flags["C_CONTIGUOUS"]
+	assert np.shares_memory(closes, klines)
+	klines[0, CLOSE] = -1.0
+	assert closes[0] == -1.0
+
+
+def test_malformed_rows_raise_value_error():
+	assert rows_to_array([]).shape == (0, 6)
+	with pytest.raises(ValueError):
+		rows_to_array([[1, "1", "2"]])
+	with pytest.raises(ValueError):
+		rows_to_array([[1, "1", "2"], None])
+	with pytest.raises(ValueError):
+		decode_klines(b'{"code": -1121, "msg": "Invalid symbol."}')
+	with pytest.raises(ValueError):
+		rows_to_array([[1, "abc", "2", "3", "4", "5"]])
+
+
+def test_truncated_rows_are_dropped_not_the_batch():
+	rows = json.loads(make_payload(5))
+	rows[2] = rows[2][:4]  # One row cut short: zip(*rows) would truncate every row to four fields
+	klines = rows_to_array(rows)
+	assert klines.shape == (4, 6)
+	assert klines[:, OPEN_TIME].tolist() == [float(row[0]) for i, row in enumerate(rows) if i != 2]
+
+	response = SimpleNamespace(content=json.dumps(rows).encode(), raise_for_status=lambda: None)
+	feed = LiveDataFeed({"symbols": ["BTCUSDT"], "websocket_enabled": False})
+	feed._transport = SimpleNamespace(get=lambda url, **kwargs: response)
+	candles = feed.backfill_klines("BTCUSDT", limit=5)
+	assert [candle["ts"] for candle in candles] == [int(klines[i, OPEN_TIME]) // 1000 for i in range(4)]
+	assert candles[-1]["close"] == klines[-1, CLOSE] and candles[0]["symbol"] == "BTCUSDT"
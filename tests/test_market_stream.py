@@ -0,0 +1,158 @@
+import time
+
+import numpy as np
+
+from src.runtime.kline_buffer import INTERVAL_MS, KlineBufferStore
+from src.runtime.market_stream import MarketStream
+from tests.ws_standin import wait_until
+
+
+FIVE_MIN = INTERVAL_MS["5m"]
+
+
+def current_open(interval_ms: int = FIVE_MIN) -> int:
+	return int(time.time() * 1000) // interval_ms * interval_ms
+
+
+def make_rows(last_open: int, count: int, interval_ms: int = FIVE_MIN) -> np.ndarray:
+	times = last_open - interval_ms * np.arange(count - 1, -1, -1)
+	closes = 100.0 + np.arange(count)
+	return np.column_stack([times, closes, closes + 1, closes - 1, closes, np.ones(count)]).astype(np.float64)
+
+
+class RecordingFetcher:
+	def __init__(self):
+		self.calls = []
+
+	def __call__(self, symbol, interval, limit, start_time):
+		self.calls.append((symbol, interval, limit, start_time))
+		last_open = current_open(INTERVAL_MS[interval])
+		if start_time is None:
+			return make_rows(last_open, limit, INTERVAL_MS[interval])
+		count = (last_open - start_time) // INTERVAL_MS[interval] + 1
+		return make_rows(last_open, int(count), INTERVAL_MS[interval])
+
+
+def kline_event(symbol: str, interval: str, open_time: int, close: float) -> dict:
+	return {
+		"stream": f"{symbol.lower()}@kline_{interval}",
+		"data": {
+			"e": "kline", "s": symbol,
+			"k": {"t": open_time, "i": interval, "o": str(close), "h": str(close + 1), "l": str(close - 1),
+				  "c": str(close), "v": "5.0", "x": False},
+		},
+	}
+
+
+def ticker_event(symbol: str, price: float) -> dict:
+	return {"stream": f"{symbol.lower()}@miniTicker", "data": {"e": "24hrMiniTicker", "s": symbol, "c": str(price)}}
+
+
+def make_stream(url, store=None, **kwargs):
+	return MarketStream(url, ["BTCUSDT", "ETHUSDT", "BTCUSDT"], intervals=("1m", "5m"), kline_store=store,
+						reconnect_backoff=0.05, ping_interval=1.0, ping_timeout=0.2, **kwargs)
+
+
+def test_streams_are_multiplexed_per_connection():
+	stream = MarketStream("ws://example", [f"C{i}USDT" for i in range(10)], max_streams_per_connection=9)
+	groups = stream.connection_streams()
+	assert [len(g) for g in groups] == [9, 9, 9, 3]
+	assert stream.url_for(groups[0]).startswith("ws://example/stream?streams=c0usdt@kline_1m/c0usdt@kline_5m/c0usdt@miniTicker/")
+
+
+def test_stream_feeds_buffers_and_prices(ws_server):
+	fetcher = RecordingFetcher()
+	store = KlineBufferStore(fetcher, min_capacity=50, refresh_interval=0)
+	closes, *_ = store.get("BTCUSDT", "5m", 50)
+	assert len(fetcher.calls) == 1
+
+	stream = make_stream(ws_server.url, store)
+	stream.start()
+	try:
+		assert ws_server.wait_for_clients(1)
+		assert ws_server.paths == ["/stream?streams=btcusdt@kline_1m/btcusdt@kline_5m/btcusdt@miniTicker/"
+								   "ethusdt@kline_1m/ethusdt@kline_5m/ethusdt@miniTicker"]
+		last_open = current_open()
+		ws_server.send(kline_event("BTCUSDT", "5m", last_open, 123.5))
+		ws_server.send(ticker_event("ETHUSDT", 2500.0))
+		assert wait_until(lambda: stream.get_price("ETHUSDT") == 2500.0)
+		assert stream.get_price("BTCUSDT") == 123.5
+
+		# Forming candle updated in place, served without another REST call
+		closes, highs, lows, volumes, opens = store.get("BTCUSDT", "5m", 50)
+		assert len(closes) == 50
+		assert closes[-1] == 123.5 and volumes[-1] == 5.0
+		assert len(fetcher.calls) == 1
+		assert stream.is_healthy()
+	finally:
+		stream.stop()
+
+
+def test_gap_triggers_rest_resync(ws_server):
+	fetcher = RecordingFetcher()
+	store = KlineBufferStore(fetcher, min_capacity=50, refresh_interval=60)
+	store.get("BTCUSDT", "5m", 50)
+	stream = make_stream(ws_server.url, store)
+	stream.start()
+	try:
+		assert ws_server.wait_for_clients(1)
+		ws_server.send(kline_event("BTCUSDT", "5m", current_open() + 2 * FIVE_MIN, 99.0))
+		assert wait_until(lambda: store.get_stats()["gaps"] == 1)
+		store.get("BTCUSDT", "5m", 50)
+		assert len(fetcher.calls) == 2
+		assert fetcher.calls[-1][3] == current_open()  # startTime = last stored candle
+	finally:
+		stream.stop()
+
+
+def test_reconnect_marks_buffers_for_resync(ws_server):
+	fetcher = RecordingFetcher()
+	store = KlineBufferStore(fetcher, min_capacity=50, refresh_interval=60)
+	store.get("ETHUSDT", "5m", 50)
+	stream = make_stream(ws_server.url, store)
+	stream.start()
+	try:
+		assert ws_server.wait_for_clients(1)
+		ws_server.send(kline_event("ETHUSDT", "5m", current_open(), 101.0))
+		assert wait_until(lambda: store.get_stats()["pushes"] == 1)
+		store.get("ETHUSDT", "5m", 50)
+		assert len(fetcher.calls) == 1
+
+		ws_server.drop_clients()
+		assert wait_until(lambda: stream.get_stats()["reconnects"] == 1)
+		assert len(ws_server.paths) == 2
+		store.get("ETHUSDT", "5m", 50)
+		assert len(fetcher.calls) == 2
+	finally:
+		stream.stop()
+
+
+def test_stale_prices_fall_back(ws_server):
+	stream = make_stream(ws_server.url, price_max_age=0.2)
+	stream.start()
+	try:
+		assert ws_server.wait_for_clients(1)
+		ws_server.send(ticker_event("BTCUSDT", 50000.0))
+		assert wait_until(lambda: stream.get_price("BTCUSDT") == 50000.0)
+		time.sleep(0.3)
+		assert stream.get_price("BTCUSDT") is None
+		assert not stream.is_healthy()
+	finally:
+		stream.stop()
+
+
+def test_listeners_get_every_price(ws_server):
+	seen = []
+	stream = make_stream(ws_server.url)
+	stream.add_listener(lambda symbol, price: seen.append((symbol, price)))
+	stream.add_listener(lambda symbol, price: 1 / 0)  # A broken listener doesn't stop the others
+	stream.start()
+	try:
+		assert ws_server.wait_for_clients(1)
+		ws_server.send(ticker_event("BTCUSDT", 50000.0))
+		ws_server.send(kline_event("ETHUSDT", "1m", current_open(), 2500.5))
+		assert wait_until(lambda: len(seen) == 2)
+		assert seen == [("BTCUSDT", 50000.0), ("ETHUSDT", 2500.5)]
+		assert stream.get_stats()["listener_errors"] == 2 and stream.get_stats()["errors"] == 0
+	finally:
+		stream.stop()
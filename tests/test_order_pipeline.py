@@ -0,0 +1,131 @@
+import re
+import time
+import threading
+
+from src.runtime.order_pipeline import (CLOSE, OPEN, REJECTED, UNKNOWN, OrderPipeline, OrderRequest,
+										client_order_id)
+from src.runtime.transport import HttpTransport
+
+
+def make_pipeline(exchange, **kwargs):
+	transport = HttpTransport(weight_limit=None, timeout=5)
+
+	def send(method, path, params):
+		return transport.request(method, exchange.url + path, params=params, max_retries=1)
+
+	kwargs.setdefault("sleep", lambda seconds: None)
+	return OrderPipeline(send, **kwargs)
+
+
+def make_order(position_key, side="BUY", quantity=0.5, intent=OPEN, nonce=1):
+	symbol = position_key.split("_")[0]
+	return OrderRequest(symbol=symbol, side=side, quantity=quantity, position_key=position_key, intent=intent,
+						client_order_id=client_order_id(position_key, intent, nonce))
+
+
+def test_client_order_ids_are_deterministic_and_valid():
+	first = client_order_id("BTCUSDT_SCALPING", OPEN, 1700000000.25)
+	assert first == client_order_id("BTCUSDT_SCALPING", OPEN, 1700000000.25)
+	assert first != client_order_id("BTCUSDT_SCALPING", CLOSE, 1700000000.25)
+	assert first != client_order_id("BTCUSDT_SCALPING", OPEN, 1700000001.25)
+	assert re.fullmatch(r"[a-zA-Z0-9-_]{1,36}", first)
+
+
+def test_lost_responses_are_resolved_by_client_order_id(mock_exchange):
+	pipeline = make_pipeline(mock_exchange, workers=2, max_attempts=3)
+	mock_exchange.prices["BTCUSDT"] = 64000.0
+
+	# Filled, but the connection dropped: the retry finds the order instead of buying twice
+	mock_exchange.fail_next("lost")
+	result = pipeline.submit(make_order("BTCUSDT_SCALPING")).result(timeout=10)
+	assert result.filled and result.executed_qty == 0.5 and result.avg_price == 64000.0
+	assert mock_exchange.fills[result.request.client_order_id] == 1 and result.attempts == 2
+
+	# Exchange down (nothing placed), lookup says "no such order", resent with the same id
+	mock_exchange.fail_next("down")
+	order = make_order("BTCUSDT_SCALPING", side="SELL", intent=CLOSE)
+	result = pipeline.submit(order).result(timeout=10)
+	assert result.filled and mock_exchange.fills[order.client_order_id] == 1
+	placed = [params["newClientOrderId"] for method, _, params in mock_exchange.requests if method == "POST"]
+	assert placed.count(order.client_order_id) == 2
+
+	# 504 after filling and the first lookup fails too: never resent blind
+	mock_exchange.fail_next("timeout")
+	mock_exchange.lookup_faults.append(503)
+	order = make_order("BTCUSDT_SCALPING", nonce=2)
+	result = pipeline.submit(order).result(timeout=10)
+	assert result.filled and result.attempts == 3 and mock_exchange.fills[order.client_order_id] == 1
+
+	# Lost every time and never visible: reported as unknown, not as a clean failure
+	mock_exchange.fail_next("down", "down", "down")
+	result = pipeline.execute(make_order("ETHUSDT_MOMENTUM"))
+	assert result.status == UNKNOWN and not result.filled
+
+	stats = pipeline.get_stats()
+	assert stats["filled"] == 3 and stats["recovered"] == 2 and stats["unknown"] == 1 and stats["inflight"] == 0
+	pipeline.shutdown()
+
+
+def test_resubmitting_an_unknown_order_looks_it_up_before_sending(mock_exchange):
+	pipeline = make_pipeline(mock_exchange, workers=1, max_attempts=3)
+	order = make_order("BTCUSDT_SCALPING", side="SELL", intent=CLOSE, nonce=1700000000.25)
+
+	# Cycle 1: filled, but the response is a 504 and every lookup fails
+	mock_exchange.fail_next("timeout")
+	mock_exchange.lookup_faults.extend([503, 503, 503])
+	result = pipeline.submit(order).result(timeout=10)
+	assert result.status == UNKNOWN and mock_exchange.fills[order.client_order_id] == 1
+
+	# Cycle 2 retries the close with the same id: found on the exchange, not sold again
+	result = pipeline.submit(order).result(timeout=10)
+	assert result.filled and result.attempts == 1 and mock_exchange.fills[order.client_order_id] == 1
+	placed = [params["newClientOrderId"] for method, _, params in mock_exchange.requests if method == "POST"]
+	assert placed.count(order.client_order_id) == 1
+	assert pipeline.get_stats()["recovered"] == 1
+	pipeline.shutdown()
+
+
+def test_rejections_are_final_and_transient_errors_are_retried(mock_exchange):
+	pipeline = make_pipeline(mock_exchange, workers=1)
+	results = []
+
+	mock_exchange.fail_next((-2010, "Account has insufficient balance for requested action."))
+	result = pipeline.submit(make_order("SOLUSDT_SWING"), callback=results.append).result(timeout=10)
+	assert result.status == REJECTED and result.error_code == -2010 and result.attempts == 1
+	assert results == [result] and not mock_exchange.orders
+
+	mock_exchange.fail_next((-1021, "Timestamp for this request is outside of the recvWindow."))
+	result = pipeline.submit(make_order("SOLUSDT_SWING", nonce=2), callback=results.append).result(timeout=10)
+	assert result.filled and result.attempts == 2 and results[-1] is result
+
+	# A failing callback is counted, the order result still comes back
+	def broken(result):
+		raise ValueError("boom")
+
+	assert pipeline.submit(make_order("SOLUSDT_SWING", nonce=3), callback=broken).result(timeout=10).filled
+	assert pipeline.get_stats()["callback_errors"] == 1
+	pipeline.shutdown()
+
+
+def test_orders_go_out_in_parallel_and_reconcile_through_callbacks(mock_exchange):
+	mock_exchange.latency = 0.3
+	pipeline = make_pipeline(mock_exchange, workers=5)
+	positions = {f"{coin}USDT_SCALPING": 1.0 for coin in ("BTC", "ETH", "SOL", "XRP", "ADA")}
+	lock = threading.Lock()
+
+	def reconcile(result):
+		with lock:
+			positions[result.request.position_key] -= result.executed_qty
+
+	orders = [make_order(key, side="SELL", quantity=1.0, intent=CLOSE) for key in positions]
+	start = time.perf_counter()
+	futures = pipeline.submit_many(orders, callback=reconcile)
+	assert pipeline.submit(orders[0]) is futures[0]  # Same id still in flight: no second order
+	results = [future.result(timeout=10) for future in futures]
+	elapsed = time.perf_counter() - start
+
+	assert all(result.filled for result in results)
+	assert elapsed < 0.3 * len(orders) * 0.6  # One round trip for all five, not five in a row
+	assert positions == {key: 0.0 for key in positions}
+	assert len(mock_exchange.orders) == 5 and pipeline.get_stats()["duplicates"] == 1
+	pipeline.shutdown()
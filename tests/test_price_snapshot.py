@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.runtime import price_snapshot
+from src.runtime.price_snapshot import PriceSnapshot
+
+
+class Fetcher:
+	def __init__(self, *payloads):
+		self.payloads = list(payloads)
+		self.calls = 0
+
+	def __call__(self):
+		self.calls += 1
+		payload = self.payloads.pop(0) if len(self.payloads) > 1 else self.payloads[0]
+		if isinstance(payload, Exception):
+			raise payload
+		return payload
+
+
+@pytest.fixture
+def clock(monkeypatch):
+	now = SimpleNamespace(value=1_700_000_000.0)
+	monkeypatch.setattr(price_snapshot, "time", SimpleNamespace(time=lambda: now.value))
+	return now
+
+
+def ticker(**prices):
+	return [{"symbol": symbol, "price": str(price)} for symbol, price in prices.items()]
+
+
+def test_refreshes_lazily_once_per_interval(clock):
+	fetcher = Fetcher(ticker(BTCUSDT=64000.0, ETHUSDT=3000.0, DOGEUSDT=0.1), ticker(BTCUSDT=64100.0, ETHUSDT=3010.0))
+	snapshot = PriceSnapshot("https://api", symbols=["BTCUSDT", "ETHUSDT"], refresh_interval=5.0, fetcher=fetcher)
+	assert snapshot.is_stale() and fetcher.calls == 0  # Nothing fetched until someone reads
+
+	assert snapshot.get("BTCUSDT") == 64000.0 and snapshot.get("ETHUSDT") == 3000.0
+	assert snapshot.get("DOGEUSDT") is None and fetcher.calls == 1  # One bulk call, filtered to the universe
+
+	clock.value += 4.9
+	assert snapshot.get("BTCUSDT") == 64000.0 and fetcher.calls == 1
+	clock.value += 0.1
+	assert snapshot.get("BTCUSDT") == 64100.0 and fetcher.calls == 2
+	assert snapshot.get_stats() == {"symbols": 2, "age_seconds": 0.0, "refresh_interval": 5.0, "refresh_count": 2,
+									"failure_count": 0}
+
+
+def test_failures_back_off_and_readers_keep_the_stale_price(clock):
+	fetcher = Fetcher(ticker(BTCUSDT=64000.0), None, RuntimeError("connection reset"), ticker(BTCUSDT=65000.0))
+	snapshot = PriceSnapshot("https://api", refresh_interval=5.0, fetcher=fetcher)
+	assert snapshot.get("BTCUSDT") == 64000.0
+
+	# A stricter max_age forces a refresh; it fails, the last price is still served
+	clock.value += 2
+	assert snapshot.get("BTCUSDT", max_age=1.0) == 64000.0 and fetcher.calls == 2
+	assert snapshot.failure_count == 1 and snapshot.age() == 2
+
+	# No retry until a full interval after the failed attempt, however stale the snapshot is
+	clock.value += 4
+	assert snapshot.get("BTCUSDT") == 64000.0 and fetcher.calls == 2
+	clock.value += 1
+	assert snapshot.get("BTCUSDT") == 64000.0 and fetcher.calls == 3 and snapshot.failure_count == 2
+	assert snapshot.refresh(force=True) and snapshot.get("BTCUSDT") == 65000.0 and fetcher.calls == 4
+
+	# Never refreshed and the exchange is down: nothing to fall back to
+	empty = PriceSnapshot("https://api", fetcher=Fetcher([{"symbol": "BTCUSDT"}, {"price": "1"}, "junk"], None))
+	assert empty.refresh() and empty.get("BTCUSDT") is None
+	assert not PriceSnapshot("https://api", fetcher=Fetcher(None)).refresh()
+
+
+def test_stream_updates_go_into_the_snapshot_without_a_request(clock):
+	fetcher = Fetcher(ticker(BTCUSDT=64000.0))
+	snapshot = PriceSnapshot("https://api", refresh_interval=5.0, fetcher=fetcher)
+	snapshot.refresh()
+	clock.value += 1
+
+	snapshot.update("BTCUSDT", 64250.5)
+	snapshot.update("SOLUSDT", 150.0)
+	snapshot.update("ETHUSDT", 0)  # Bad ticks are ignored
+	snapshot.update("ETHUSDT", None)
+	assert snapshot.get("BTCUSDT") == 64250.5 and snapshot.get("SOLUSDT") == 150.0
+	assert snapshot.prices() == {"BTCUSDT": 64250.5, "SOLUSDT": 150.0} and fetcher.calls == 1
+
+	# Pushed prices don't count as a refresh: the bulk call still runs on schedule and doesn't drop them
+	clock.value += 4
+	assert snapshot.get("SOLUSDT") == 150.0 and fetcher.calls == 2 and snapshot.get("BTCUSDT") == 64000.0
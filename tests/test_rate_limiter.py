@@ -0,0 +1,80 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.runtime.rate_limiter import PRIORITY_HIGH, PRIORITY_LOW, WeightRateLimiter, priority_for, request_weight
+from src.runtime.transport import HttpTransport
+
+
+def test_endpoint_weights_and_priorities():
+	assert request_weight("GET", "/api/v3/ticker/price", {"symbol": "BTCUSDT"}) == 2
+	assert request_weight("GET", "/api/v3/ticker/price") == 4
+	assert request_weight("GET", "/api/v3/exchangeInfo") == 20
+	assert request_weight("GET", "/api/v3/depth", {"limit": 500}) == 25
+	assert request_weight("POST", "/api/v3/order") == 1
+	assert priority_for("/api/v3/order") == PRIORITY_HIGH
+	assert priority_for("/api/v3/account") == PRIORITY_HIGH
+	assert priority_for("/api/v3/klines") == PRIORITY_LOW
+
+
+def test_used_weight_header_resyncs_bucket():
+	limiter = WeightRateLimiter(weight_limit=1000, reserve=0.1)
+	limiter.observe({"X-MBX-USED-WEIGHT-1M": "995"}, 200)
+	assert limiter.get_stats()["server_used"] == {"1m": 995}
+	# Scanning traffic must leave the reserve untouched...
+	assert not limiter.acquire(2, PRIORITY_LOW, timeout=0.05)
+	# ...while order traffic may still spend what is left
+	assert limiter.acquire(2, PRIORITY_HIGH, timeout=0.05)
+
+
+def test_retry_after_blocks_every_caller():
+	limiter = WeightRateLimiter(weight_limit=1000)
+	limiter.observe({"Retry-After": "0.2"}, 429)
+	start = time.monotonic()
+	assert limiter.acquire(1, PRIORITY_HIGH, timeout=1)
+	assert time.monotonic() - start >= 0.15
+	assert limiter.get_stats()["retry_after"] == 1
+
+
+def test_paces_instead_of_bursting_past_the_limit():
+	limiter = WeightRateLimiter(weight_limit=60, window=1.0, reserve=0)
+	start = time.monotonic()
+	for _ in range(90):
+		assert limiter.acquire(1, PRIORITY_LOW, timeout=2)
+	elapsed = time.monotonic() - start
+	assert 0.4 <= elapsed < 1.5  # 60 from the full bucket, 30 more at 60/s
+
+
+def test_transport_honours_retry_after_and_headers():
+	hits = []
+
+	class Handler(BaseHTTPRequestHandler):
+		def do_GET(self):
+			hits.append(time.monotonic())
+			if len(hits) == 1:
+				self.send_response(429)
+				self.send_header("Retry-After", "0.3")
+			else:
+				self.send_response(200)
+			self.send_header("X-MBX-USED-WEIGHT-1M", "42")
+			self.send_header("Content-Type", "application/json")
+			self.end_headers()
+			self.wfile.write(b"[]")
+
+		def log_message(self, *args):
+			pass
+
+	server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	try:
+		transport = HttpTransport(weight_limit=6000, rate_limit_backoff=10.0)
+		url = f"http://127.0.0.1:{server.server_port}/api/v3/klines"
+		response = transport.get(url, params={"symbol": "BTCUSDT"}, max_retries=2)
+		assert response is not None and response.status_code == 200
+		# Waited for Retry-After, not the 10s blind backoff
+		assert 0.25 <= hits[1] - hits[0] < 2.0
+		stats = transport.get_limiter_stats()[f"http://127.0.0.1:{server.server_port}"]
+		assert stats["server_used"] == {"1m": 42}
+		assert stats["retry_after"] == 1
+	finally:
+		server.shutdown()
@@ -0,0 +1,113 @@
+import sys
+import json
+from datetime import datetime
+
+import pytest
+
+from src.runtime.records import Position, Trade
+
+
+ENTRY = datetime(2025, 3, 1, 12, 30, 15, 250000)
+EXIT = datetime(2025, 3, 1, 13, 5, 0, 125000)
+
+
+def position_fields(**overrides):
+	fields = dict(symbol="BTCUSDT", strategy="SCALPING", action="BUY", quantity=0.0015, entry_price=64000.5,
+				  stop_loss=63500.0, take_profit=64800.0, reason="RSI oversold", confidence=72.5,
+				  market_condition="TRENDING", target_confidence=None, position_value=96.0)
+	fields.update(overrides)
+	return fields
+
+
+# /api/positions and /api/trades rows as they were built from the old dicts
+
+def reference_position_row(pos, current_price, now):
+	if pos['entry_price'] > 0:
+		if pos['action'] == 'BUY':
+			pnl_pct = (current_price - pos['entry_price']) / pos['entry_price'] * 100
+		else:
+			pnl_pct = (pos['entry_price'] - current_price) / pos['entry_price'] * 100
+	else:
+		pnl_pct = 0.0
+	hold_time = (now - pos['entry_time']).total_seconds() / 60
+	return {
+		'symbol': pos['symbol'], 'strategy': pos['strategy'], 'action': pos['action'], 'quantity': pos['quantity'],
+		'entry_price': pos['entry_price'], 'current_price': current_price, 'pnl_pct': pnl_pct,
+		'stop_loss': pos['stop_loss'], 'take_profit': pos['take_profit'], 'hold_time': hold_time,
+		'reason': pos['reason'], 'confidence': pos['confidence'],
+	}
+
+
+def reference_trade_rows(trades_snapshot):
+	rows = []
+	for close_trade in [t for t in trades_snapshot if t.get('action') == 'CLOSE']:
+		position_key = close_trade.get('position_key', '')
+		entry_trade = next((t for t in trades_snapshot
+							if t.get('position_key') == position_key and t.get('action') != 'CLOSE'), None)
+		rows.append({
+			'symbol': close_trade['symbol'],
+			'strategy': close_trade['strategy'],
+			'action': entry_trade['action'] if entry_trade else 'BUY',
+			'entry_time': entry_trade['timestamp'].isoformat() if entry_trade else close_trade.get('entry_time', datetime.now()).isoformat(),
+			'exit_time': close_trade['timestamp'].isoformat(),
+			'entry_price': close_trade.get('entry_price', 0),
+			'exit_price': close_trade['price'],
+			'quantity': close_trade['quantity'],
+			'entry_reason': close_trade.get('entry_reason', 'N/A'),
+			'exit_reason': close_trade.get('exit_reason', 'N/A'),
+			'market_condition_exit': close_trade.get('market_condition_exit', 'Unknown'),
+			'hold_duration': close_trade.get('hold_duration', 0),
+			'pnl': close_trade['pnl'],
+			'pnl_pct': close_trade['pnl_pct'],
+			'fee': close_trade['fee'],
+			'stop_loss': close_trade.get('stop_loss', 0),
+			'take_profit': close_trade.get('take_profit', 0),
+			'is_win': bool(close_trade['pnl'] > 0),
+		})
+	return rows
+
+
+def test_positions_keep_the_dict_view_with_fixed_fields():
+	position = Position(entry_time=ENTRY.timestamp(), **position_fields())
+	assert position['entry_time'] == ENTRY and position.entry_time == ENTRY.timestamp()
+	expected = dict(position_fields(), entry_time=ENTRY, breakeven_activated=False, close_failures=0)
+	del expected['target_confidence']  # None fields count as absent
+	assert position.as_dict() == expected
+	assert not hasattr(position, "__dict__")
+
+	assert 'trailing_stop_loss' not in position and position.get('highest_price', 1.5) == 1.5
+	position['trailing_stop_loss'] = 64500.0
+	position['close_failures'] += 1
+	assert 'trailing_stop_loss' in position and position.trailing_stop_loss == 64500.0
+	assert position.close_failures == 1
+	position['entry_time'] = EXIT  # Datetimes written through the dict view are stored as epoch seconds
+	assert position.entry_time == EXIT.timestamp()
+	with pytest.raises(KeyError):
+		position['not_a_field'] = 1
+	with pytest.raises(KeyError):
+		position['not_a_field']
+
+
+def test_api_rows_are_unchanged():
+	now = EXIT
+	for overrides in ({}, {"action": "SELL"}, {"entry_price": 0.0}):
+		legacy = dict(position_fields(**overrides), entry_time=ENTRY)
+		position = Position(entry_time=ENTRY.timestamp(), **position_fields(**overrides))
+		for price in (63000.0, 64000.5, 65000.25):
+			assert position.to_api(price, now=now.timestamp()) == pytest.approx(reference_position_row(legacy, price, now))
+
+	trade_fields = dict(symbol="ETHUSDT", strategy="MOMENTUM", quantity=0.03, price=3120.5, entry_price=3100.0,
+						entry_reason="Breakout", exit_reason="Take Profit", fee=0.09, pnl=0.52, pnl_pct=0.66,
+						hold_duration=34.7, market_condition_exit="VOLATILE", stop_loss=3080.0, take_profit=3120.0,
+						position_key="ETHUSDT_MOMENTUM_1")
+	legacy = dict(trade_fields, timestamp=EXIT, entry_time=ENTRY, action="CLOSE")
+	trade = Trade(timestamp=EXIT.timestamp(), entry_time=ENTRY.timestamp(), **trade_fields)
+	assert json.dumps(reference_trade_rows([trade])) == json.dumps(reference_trade_rows([legacy]))
+	assert 'pnl' in trade and trade.get('pnl', 0) == 0.52
+
+
+def test_records_are_smaller_than_the_dicts_they_replace():
+	position = Position(entry_time=ENTRY.timestamp(), **position_fields())
+	legacy = dict(position_fields(), entry_time=ENTRY, trailing_stop_loss=64500.0, highest_price=64900.0,
+				  breakeven_activated=True)
+	assert sys.getsizeof(position) * 2 < sys.getsizeof(legacy) + sys.getsizeof(ENTRY)
@@ -0,0 +1,98 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.runtime.scan_scheduler import COLD, HOT, WARM, ScanScheduler, scan_all
+
+
+def entry(score=60.0, atr_pct=0.5, spike=1.0):
+	return {"score": score, "indicators": {"atr_pct": atr_pct}, "volume_spike_ratio": spike}
+
+
+def test_tiers_follow_position_spike_volatility_and_score():
+	scheduler = ScanScheduler()
+	assert scheduler.classify(entry(), has_position=True) == (HOT, "position")
+	assert scheduler.classify(entry(spike=2.5)) == (HOT, "volume spike")
+	assert scheduler.classify(entry(atr_pct=2.0)) == (HOT, "volatility")
+	assert scheduler.classify(entry(score=95)) == (HOT, "score")
+	assert scheduler.classify(entry(spike=1.6)) == (WARM, "volume spike")
+	assert scheduler.classify(entry(score=80)) == (WARM, "score")
+	assert scheduler.classify(entry()) == (COLD, "quiet")
+	assert scheduler.classify(None) == (COLD, "no data")
+
+
+def test_hot_every_cycle_warm_and_cold_every_n_cycles():
+	scheduler = ScanScheduler(weight_budget=10_000, scan_weight=2, warm_every=2, cold_every=4)
+	symbols = ["HOTUSDT", "WARMUSDT", "COLDUSDT"]
+	kinds = {"HOTUSDT": entry(score=95), "WARMUSDT": entry(score=80), "COLDUSDT": entry()}
+	planned = []
+	for cycle in range(8):
+		due = scheduler.plan(symbols, now=float(cycle))
+		planned.append(due)
+		for symbol in due:
+			scheduler.record(symbol, kinds[symbol])
+	assert planned[0] == symbols  # Never scanned: everything is due
+	assert [due.count("HOTUSDT") for due in planned] == [1] * 8
+	assert [i for i, due in enumerate(planned) if "WARMUSDT" in due] == [0, 2, 4, 6]
+	assert [i for i, due in enumerate(planned) if "COLDUSDT" in due] == [0, 4]
+	assert scheduler.get_stats()["counts"] == {HOT: 1, WARM: 1, COLD: 1}
+
+
+def test_budget_defers_the_least_urgent_but_never_open_positions():
+	# 6 weight per minute, 2 per scan: 3 scans from the full bucket, then 1 per 20s
+	scheduler = ScanScheduler(weight_budget=6, scan_weight=2, cold_every=1)
+	symbols = [f"S{i}USDT" for i in range(6)]
+	first = scheduler.plan(symbols, open_symbols={"S5USDT"}, now=0.0)
+	assert first == ["S0USDT", "S1USDT", "S5USDT"]  # The position goes first, then new symbols in order
+	for symbol in first:
+		scheduler.record(symbol, entry(), symbol == "S5USDT")
+	assert scheduler.get_stats()["last_deferred"] == 3
+
+	second = scheduler.plan(symbols, open_symbols={"S5USDT"}, now=40.0)
+	assert second == ["S2USDT", "S5USDT"]  # 4 weight refilled: the position, then a never-scanned symbol
+	scheduler.record("S2USDT", None)  # A failed first scan waits for its turn as COLD
+	assert scheduler.tiers()["S2USDT"]["tier"] == COLD
+
+	third = scheduler.plan(symbols, open_symbols={"S5USDT"}, now=40.0)
+	assert third == ["S5USDT"]  # Out of budget: the position is scanned anyway
+	assert scheduler.get_stats()["over_budget"] == 1
+
+
+def test_concurrent_scan_matches_the_sequential_scan():
+	symbols = [f"C{i:02d}USDT" for i in range(24)]
+	tasks = {symbol: (symbol, None, None) for symbol in symbols}
+	delays = {symbol: random.Random(symbol).uniform(0, 0.05) for symbol in symbols}  # Finish out of order
+
+	def scan_symbol(symbol, rows=None, indicators=None):
+		time.sleep(delays[symbol])
+		if symbol == "C07USDT":
+			raise ValueError("bad klines")
+		return None if symbol == "C11USDT" else entry(score=int(symbol[1:3]))
+
+	sequential = scan_all(tasks, scan_symbol)
+	with ThreadPoolExecutor(max_workers=8) as executor:
+		start = time.perf_counter()
+		concurrent = scan_all(tasks, scan_symbol, executor)
+		elapsed = time.perf_counter() - start
+	assert list(concurrent) == list(sequential) == symbols
+	assert concurrent == sequential and elapsed < sum(delays.values()) / 2
+	assert concurrent["C07USDT"] is None and concurrent["C11USDT"] is None  # Raised / no data: the others are kept
+	assert [e["score"] for e in concurrent.values() if e is not None] == [i for i in range(24) if i not in (7, 11)]
+
+
+def test_success_rate_spans_cycles_and_needs_enough_scans():
+	scheduler = ScanScheduler(weight_budget=10_000, scan_weight=2, outcome_window=20)
+	assert scheduler.success_rate() is None
+	for i in range(12):
+		scheduler.record(f"C{i:02d}USDT", entry())
+	# An off-cycle slice with one failed symbol is a blip, not an outage
+	scheduler.record("C00USDT", None)
+	assert scheduler.success_rate(min_attempts=10) == 12 / 13 * 100
+	assert scheduler.success_rate(min_attempts=20) is None
+
+	# A real outage fills the window with failures
+	for i in range(20):
+		scheduler.record(f"C{i % 12:02d}USDT", None)
+	assert scheduler.success_rate(min_attempts=10) == 0.0
+	stats = scheduler.get_stats()
+	assert stats["recent_scans"] == 20 and stats["recent_success_pct"] == 0.0
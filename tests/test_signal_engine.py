@@ -0,0 +1,229 @@
+import json
+import math
+
+import numpy as np
+
+from src.runtime.confidence import DEFAULT_TABLES, ConfidenceScorer
+from src.runtime.signal_engine import SIGNAL_KEYS, STRATEGY_RULES, SignalEngine, gather
+
+
+# generate_*_signal and collect_signals as the scalar path runs them (logging dropped),
+# the reference the STRATEGY_RULES masks must reproduce.
+
+SCORER = ConfidenceScorer()
+
+
+def confidence(ind, side, base):
+	try:
+		return SCORER.score_one("signal", ind, side, base)
+	except Exception:
+		return 0.70
+
+
+def nearest(price, levels):
+	return min(abs(price - level) / price for level in levels)
+
+
+def scalping(ind, sr, price):
+	if ind["volume_ratio"] < 0.1 or ind["atr_pct"] < 0.01:
+		return None
+	if ind["rsi"] < 55:
+		return {"action": "BUY", "reason": "Scalping Dip", "confidence": confidence(ind, "BUY", 25) * 100}
+	if ind["rsi"] > 45:
+		return {"action": "SELL", "reason": "Scalping Pump", "confidence": confidence(ind, "SELL", 25) * 100}
+	return None
+
+
+def day_trading(ind, sr, price):
+	if ind["volume_ratio"] < 0.1 or ind["atr_pct"] < 0.01:
+		return None
+	if ind["rsi"] < 60:
+		return {"action": "BUY", "reason": "Day Trade", "confidence": confidence(ind, "BUY", 20) * 100}
+	if ind["rsi"] > 40:
+		return {"action": "SELL", "reason": "Day Trade", "confidence": confidence(ind, "SELL", 20) * 100}
+	return None
+
+
+def swing_trading(ind, sr, price):
+	if ind["volume_ratio"] < 1.3:
+		return None
+	uptrend = ind["ema_9"] > ind["ema_21"] > ind["ema_50"]
+	downtrend = ind["ema_9"] < ind["ema_21"] < ind["ema_50"]
+	if uptrend and ind["rsi"] < 45:
+		return {"action": "BUY", "reason": "Swing Buy Uptrend Dip", "confidence": confidence(ind, "BUY", 65)}
+	if uptrend and sr["support"] and nearest(price, sr["support"]) < 0.015:
+		return {"action": "BUY", "reason": "Swing Buy Support", "confidence": confidence(ind, "BUY", 62)}
+	if downtrend and ind["rsi"] > 55:
+		return {"action": "SELL", "reason": "Swing Sell Downtrend Rally", "confidence": confidence(ind, "SELL", 62)}
+	return None
+
+
+def range_trading(ind, sr, price):
+	if price <= 0 or ind["volume_ratio"] < 1.1:
+		return None
+	if not ind["ema_21"] > 0 or abs(ind["ema_9"] - ind["ema_21"]) / ind["ema_21"] > 0.02:
+		return None
+	if sr["support"] and nearest(price, sr["support"]) < 0.01 and ind["rsi"] < 45:
+		return {"action": "BUY", "reason": "Range Bottom", "confidence": confidence(ind, "BUY", 58)}
+	if sr["resistance"] and nearest(price, sr["resistance"]) < 0.01 and ind["rsi"] > 55:
+		return {"action": "SELL", "reason": "Range Top", "confidence": confidence(ind, "SELL", 58)}
+	return None
+
+
+def momentum(ind, sr, price):
+	if ind["volume_ratio"] < 0.1 or abs(ind["momentum_10"]) < 0.1:
+		return None
+	if ind["momentum_10"] > 0.1:
+		return {"action": "BUY", "reason": "Momentum Up", "confidence": confidence(ind, "BUY", 20) * 100}
+	if ind["momentum_10"] < -0.1:
+		return {"action": "SELL", "reason": "Momentum Down", "confidence": confidence(ind, "SELL", 20) * 100}
+	return None
+
+
+def position_trading(ind, sr, price):
+	if ind["volume_ratio"] < 1.1:
+		return None
+	if ind["ema_50"] > ind["ema_200"] and ind["rsi"] < 55:
+		return {"action": "BUY", "reason": "Golden Cross Zone", "confidence": confidence(ind, "BUY", 70)}
+	if ind["ema_50"] < ind["ema_200"] and ind["rsi"] > 45:
+		return {"action": "SELL", "reason": "Death Cross Zone", "confidence": confidence(ind, "SELL", 68)}
+	return None
+
+
+def grid_trading(ind, sr, price):
+	if price <= 0:
+		return None
+	if not ind["ema_21"] > 0 or abs(ind["ema_9"] - ind["ema_21"]) / ind["ema_21"] > 0.025:
+		return None
+	if ind["volume_ratio"] < 0.8 or ind["volume_ratio"] > 2.0:
+		return None
+	if ind["rsi"] < 35 or ind["rsi"] > 65:
+		return None
+	if ind["atr_pct"] < 0.5 or ind["atr_pct"] > 3.0:
+		return None
+	bb_width = (ind["bb_upper"] - ind["bb_lower"]) / ind["bb_middle"] if ind["bb_middle"] > 0 else 0
+	if bb_width < 0.02 or bb_width > 0.08:
+		return None
+	if sr["support"] and nearest(price, sr["support"]) < 0.015 and ind["rsi"] < 52:
+		return {"action": "BUY", "reason": "Grid Buy Setup", "confidence": confidence(ind, "BUY", 60)}
+	if sr["resistance"] and nearest(price, sr["resistance"]) < 0.015 and ind["rsi"] > 48:
+		return {"action": "SELL", "reason": "Grid Sell Setup", "confidence": confidence(ind, "SELL", 60)}
+	return None
+
+
+SCALAR_RULES = {
+	"SCALPING": scalping, "DAY_TRADING": day_trading, "SWING_TRADING": swing_trading, "RANGE_TRADING": range_trading,
+	"MOMENTUM": momentum, "POSITION_TRADING": position_trading, "GRID_TRADING": grid_trading,
+}
+
+
+def collect_signals(data, names):
+	signals = []
+	for name in names:
+		signal = SCALAR_RULES[name](data["indicators"], data["sr_levels"], data["price"])
+		if signal:
+			signals.append((signal["confidence"] * data["score"], name, signal))
+	if not signals:
+		return None
+	signals.sort(reverse=True, key=lambda x: x[0])
+	return (len(signals),) + signals[0]
+
+
+def random_entry(rng):
+	price = float(rng.uniform(0.5, 50_000))
+	def near(spread):
+		return price * (1 + float(rng.normal(0, spread)))
+	ema_21 = near(0.02)
+	ind = {
+		"rsi": float(rng.uniform(15, 85)), "volume_ratio": float(rng.uniform(0, 3)), "atr_pct": float(rng.uniform(0, 4)),
+		"ema_9": ema_21 * (1 + float(rng.normal(0, 0.02))), "ema_21": ema_21, "ema_50": near(0.03), "ema_200": near(0.05),
+		"macd": float(rng.normal(0, 15)), "macd_signal": float(rng.normal(0, 15)),
+		"momentum_3": float(rng.normal(0, 1)), "momentum_10": float(rng.normal(0, 0.5)),
+		"bb_middle": near(0.01),
+	}
+	width = float(rng.uniform(0.0, 0.1))
+	ind["bb_upper"], ind["bb_lower"] = ind["bb_middle"] * (1 + width / 2), ind["bb_middle"] * (1 - width / 2)
+	for key in ind:
+		if rng.random() < 0.04:
+			ind[key] = math.nan  # Warm-up / bad candles: a NaN never rejects, like the scalar comparisons
+	levels = lambda: [near(0.015) for _ in range(int(rng.integers(0, 4)))]  # Often empty: S/R missing
+	return {"price": price, "score": float(rng.uniform(30, 100)), "indicators": ind,
+			"sr_levels": {"support": levels(), "resistance": levels()}}
+
+
+def test_vectorized_rules_match_the_scalar_generators():
+	rng = np.random.default_rng(17)
+	market_data = {f"C{i:04d}USDT": random_entry(rng) for i in range(3000)}
+	market_data["NOSRUSDT"] = dict(random_entry(rng), sr_levels={})  # Unreadable S/R: scalar fallback
+	names = list(STRATEGY_RULES)
+	assert names == list(SCALAR_RULES)
+
+	best, fallback = SignalEngine().evaluate(market_data, list(market_data), names)
+	assert fallback == ["NOSRUSDT"]
+	for symbol, data in market_data.items():
+		if symbol in fallback:
+			continue
+		expected = collect_signals(data, names)
+		if expected is None:
+			assert symbol not in best
+			continue
+		count, score, strategy, signal = best[symbol]
+		assert (count, strategy, signal["action"], signal["reason"]) == (
+			expected[0], expected[2], expected[3]["action"], expected[3]["reason"]), symbol
+		assert math.isclose(signal["confidence"], expected[3]["confidence"], rel_tol=1e-12), symbol
+		assert math.isclose(score, expected[1], rel_tol=1e-12), symbol
+
+	# Each strategy on its own too: the percent-scaled ones outbid the rest above
+	for name in names:
+		best, _ = SignalEngine().evaluate(market_data, list(market_data), [name])
+		assert {best[symbol][3]["action"] for symbol in best} == {"BUY", "SELL"}, name  # Both branches exercised
+		for symbol, data in market_data.items():
+			if symbol in fallback:
+				continue
+			expected = collect_signals(data, [name])
+			assert (best.get(symbol) is None) == (expected is None), (name, symbol)
+			if expected is not None:
+				assert best[symbol][3]["action"] == expected[3]["action"] and best[symbol][3]["reason"] == expected[3]["reason"]
+				assert math.isclose(best[symbol][3]["confidence"], expected[3]["confidence"], rel_tol=1e-12)
+
+
+def test_best_signal_and_tie_break_follow_strategy_order():
+	ind = {key: 100.0 for key in SIGNAL_KEYS}
+	ind.update(rsi=50.0, volume_ratio=1.0, atr_pct=1.0, momentum_3=0.0, momentum_10=0.5, macd=0.0, macd_signal=0.0)
+	market_data = {
+		"AAAUSDT": {"price": 100.0, "score": 60, "indicators": ind, "sr_levels": {"support": [], "resistance": []}},
+		"BADUSDT": {"price": 100.0, "score": 60, "indicators": {"rsi": 50.0}, "sr_levels": {}},
+	}
+	engine = SignalEngine()
+	best, fallback = engine.evaluate(market_data, ["AAAUSDT", "BADUSDT", "MISSING"], ["SCALPING", "DAY_TRADING", "MOMENTUM"])
+	assert fallback == ["BADUSDT"]
+	# Scalping BUY (base 25) and day trading BUY (base 20) both floor at 30%: the first strategy wins
+	count, score, strategy, signal = best["AAAUSDT"]
+	assert (count, strategy) == (3, "SCALPING")
+	assert signal == {"action": "BUY", "reason": "Scalping Dip", "confidence": 0.3 * 100}
+	assert score == signal["confidence"] * 60
+
+	best, _ = engine.evaluate(market_data, ["AAAUSDT"], ["POSITION_TRADING", "SWING_TRADING"])
+	assert best == {}  # Volume filters reject both
+	assert engine.get_stats()["evaluations"] == 2
+
+	# Confidence comes from the scorer's (reloadable) signal table
+	table = json.loads(json.dumps(DEFAULT_TABLES["signal"]))
+	table["rules"]["BUY"][0]["points"] = [20, 15, 12, 8, 5, 30]  # RSI 50 is past the last edge
+	scorer = ConfidenceScorer()
+	assert scorer.load({"signal": table})
+	best, _ = SignalEngine(scorer).evaluate(market_data, ["AAAUSDT"], ["SCALPING"])
+	assert best["AAAUSDT"][3]["confidence"] == 0.58 * 100  # 25 + 30 + 3 (momentum_10)
+
+
+def test_gather_measures_level_distances_like_the_scalar_loop():
+	ind = {key: 1.0 for key in SIGNAL_KEYS}
+	market_data = {
+		"A": {"price": 100.0, "score": 50, "indicators": ind, "sr_levels": {"support": [99.5, 97.0], "resistance": []}},
+		"B": {"price": 3.0, "score": 50, "indicators": ind, "sr_levels": {"support": [], "resistance": [3.1]}},
+		"C": {"price": 0.0, "score": 50, "indicators": ind, "sr_levels": {"support": [], "resistance": []}},
+	}
+	rows, columns, fallback = gather(market_data, ["A", "B", "C"])
+	assert rows == ["A", "B"] and fallback == ["C"]  # Non-positive prices take the scalar path
+	assert columns["support_distance"].tolist() == [min(abs(100.0 - s) / 100.0 for s in (99.5, 97.0)), math.inf]
+	assert columns["resistance_distance"].tolist() == [math.inf, abs(3.0 - 3.1) / 3.0]
@@ -0,0 +1,83 @@
+import threading
+import dataclasses
+
+import pytest
+
+from src.runtime.records import Position
+from src.runtime.state_snapshot import StatePublisher
+
+
+def make_position(symbol, value):
+	return Position(symbol=symbol, strategy="SCALPING", action="BUY", quantity=1.0, entry_price=value, entry_time=0.0,
+					stop_loss=value * 0.99, take_profit=value * 1.01, position_value=value)
+
+
+def test_snapshots_are_immutable_copies():
+	publisher = StatePublisher()
+	assert publisher.current().version == 0 and not publisher.current().positions
+
+	positions = {"BTCUSDT_SCALPING": make_position("BTCUSDT", 100.0)}
+	trades, stats = [], {"SCALPING": {"trades": 0, "wins": 0}}
+	first = publisher.publish(positions, trades, 900.0, 100.0, stats)
+	assert publisher.current() is first and first.version == 1 and first.equity == 1000.0
+
+	# Later mutations of the live state don't leak into a published snapshot
+	positions["BTCUSDT_SCALPING"]["trailing_stop_loss"] = 100.5
+	positions["ETHUSDT_SCALPING"] = make_position("ETHUSDT", 50.0)
+	trades.append("closed")
+	stats["SCALPING"]["trades"] = 1
+	assert first.positions["BTCUSDT_SCALPING"].trailing_stop_loss is None
+	assert list(first.positions) == ["BTCUSDT_SCALPING"] and first.trades == ()
+	assert first.strategy_stats["SCALPING"]["trades"] == 0
+
+	with pytest.raises(TypeError):
+		first.positions["X"] = None
+	with pytest.raises(dataclasses.FrozenInstanceError):
+		first.current_capital = 0.0
+
+	second = publisher.publish(positions, trades, 850.0, 150.0, stats)
+	assert second.version == 2 and len(second.positions) == 2 and second.trades == ("closed",)
+	assert publisher.get_stats()["publishes"] == 2
+
+
+def test_readers_never_see_torn_state():
+	# Capital moves between free and reserved with every open / close: free + reserved + positions is constant
+	publisher = StatePublisher()
+	lock = threading.Lock()
+	state = {"free": 1000.0, "reserved": 0.0, "positions": {}}
+	publisher.publish(state["positions"], [], state["free"], state["reserved"], {})
+	done = threading.Event()
+	torn = []
+
+	def writer():
+		for i in range(3000):
+			with lock:
+				key = f"S{i % 5}"
+				if key in state["positions"]:
+					position = state["positions"].pop(key)
+					state["free"] += position.position_value
+					state["reserved"] -= position.position_value
+				else:
+					state["positions"][key] = make_position(key, 10.0 + i % 7)
+					state["free"] -= 10.0 + i % 7
+					state["reserved"] += 10.0 + i % 7
+				publisher.publish(state["positions"], [], state["free"], state["reserved"], {})
+		done.set()
+
+	def reader():
+		last = 0
+		while not done.is_set():
+			snapshot = publisher.current()
+			reserved = sum(position.position_value for position in snapshot.positions.values())
+			if (snapshot.version < last or abs(snapshot.reserved_capital - reserved) > 1e-9
+					or abs(snapshot.equity - 1000.0) > 1e-9):
+				torn.append(snapshot.version)
+			last = snapshot.version
+
+	threads = [threading.Thread(target=reader) for _ in range(3)] + [threading.Thread(target=writer)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join(timeout=30)
+	assert not torn
+	assert publisher.current().version == 3001
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.runtime.feature_store import FeatureStore
+from src.strategy_factory import lightweight_simulation
+
+PARAMS = {
+	"Pullback": {"rsi_entry": 45, "volume_ratio": 1.0},
+	"Breakout": {"lookback": 20, "vol_mult": 1.1},
+	"MeanReversion": {"rsi_buy": 40},
+	"Momentum": {"ema_short": 9, "ema_long": 21},
+}
+
+
+def make_frame(count: int = 3000, seed: int = 1) -> pd.DataFrame:
+	rng = np.random.default_rng(seed)
+	closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+	return pd.DataFrame({
+		"open": closes, "high": closes * 1.01, "low": closes * 0.99, "close": closes, "volume": rng.random(count) * 100,
+	}, index=pd.date_range("2024-01-01", periods=count, freq="5min"))
+
+
+def inline_trade_count(df, strategy_type, params):
+	"""Signal counts as lightweight_simulation computed them before the feature store."""
+	def rsi_14():
+		delta = df["close"].diff()
+		gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+		loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+		return 100 - (100 / (1 + gain / loss))
+
+	if strategy_type == "Pullback":
+		entry_signals = (rsi_14() < params["rsi_entry"]) & (df["volume"] > df["volume"].rolling(20).mean() * params["volume_ratio"])
+	elif strategy_type == "Breakout":
+		lookback = params["lookback"]
+		vol_threshold = df["volume"].rolling(lookback).mean() * params["vol_mult"]
+		entry_signals = (df["volume"] > vol_threshold) & (df["close"] > df["close"].rolling(lookback).max().shift(1))
+	elif strategy_type == "MeanReversion":
+		entry_signals = rsi_14() < params["rsi_buy"]
+	else:
+		ema_short = df["close"].ewm(span=params["ema_short"]).mean()
+		ema_long = df["close"].ewm(span=params["ema_long"]).mean()
+		entry_signals = (ema_short > ema_long) & (ema_short.shift(1) <= ema_long.shift(1))
+	return entry_signals.sum()
+
+
+@pytest.mark.parametrize("strategy_type", sorted(PARAMS))
+def test_lightweight_simulation_matches_the_inline_formulas(strategy_type):
+	df = make_frame()
+	expected = inline_trade_count(df, strategy_type, PARAMS[strategy_type])
+	assert expected > 0
+
+	result = lightweight_simulation(df, strategy_type, PARAMS[strategy_type])
+	assert result["trade_count"] == expected and result["sufficient"] == (expected >= 50)
+	assert result["data_points"] == len(df) and "error" not in result
+
+	# filter_candidates passes one shared feature set for every candidate of a symbol/timeframe
+	features = FeatureStore(None).dataset("BTCUSDT", "5m", df)
+	assert lightweight_simulation(df, strategy_type, PARAMS[strategy_type], features)["trade_count"] == expected
+
+
+def test_lightweight_simulation_reports_unknown_types_and_failures():
+	df = make_frame(count=100)
+	assert lightweight_simulation(df, "Grid", {}) == {"trade_count": 0, "sufficient": False, "data_points": 100}
+	failed = lightweight_simulation(df, "Breakout", {"lookback": 20})  # vol_mult missing
+	assert failed["trade_count"] == 0 and not failed["sufficient"] and "vol_mult" in failed["error"]
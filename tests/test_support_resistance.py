@@ -0,0 +1,45 @@
+import numpy as np
+
+from src.runtime.support_resistance import cluster_levels, rolling_max, rolling_min, support_resistance
+
+
+def reference_levels(highs, lows, windows, tolerance=0.01):
+	"""Loop version: pivots of any window, clustered against the last kept level."""
+	levels = []
+	for i in range(len(highs)):
+		peak = any(w <= i < len(highs) - w and highs[i] == max(highs[i - w:i + w]) for w in windows)
+		trough = any(w <= i < len(lows) - w and lows[i] == min(lows[i - w:i + w]) for w in windows)
+		if peak:
+			levels.append(("resistance", highs[i]))
+		if trough:
+			levels.append(("support", lows[i]))
+	kept = {"support": [], "resistance": []}
+	for kind, price in levels:
+		last = kept[kind]
+		if not last or (last[-1] > 0 and abs(price - last[-1]) / last[-1] > tolerance):
+			last.append(price)
+	return {kind: sorted(values)[-3:] for kind, values in (("support", kept["support"]), ("resistance", kept["resistance"]))}
+
+
+def test_rolling_extremes_match_naive_windows():
+	values = np.random.default_rng(0).normal(size=97)
+	for size in (1, 2, 5, 40, 97):
+		expected_max = [values[k:k + size].max() for k in range(len(values) - size + 1)]
+		expected_min = [values[k:k + size].min() for k in range(len(values) - size + 1)]
+		assert rolling_max(values, size).tolist() == expected_max
+		assert rolling_min(values, size).tolist() == expected_min
+	assert len(rolling_max(values, 98)) == 0
+
+
+def test_levels_match_loop_implementation():
+	rng = np.random.default_rng(3)
+	for size, windows in ((100, (20,)), (250, (5, 20)), (1000, (10, 30, 50)), (41, (20,)), (30, (20,))):
+		closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.006, size)))
+		highs = np.round(closes * (1 + rng.random(size) * 0.003), 2)  # Rounded prices produce ties
+		lows = np.round(closes * (1 - rng.random(size) * 0.003), 2)
+		assert support_resistance(highs, lows, windows, lookback=None) == reference_levels(highs, lows, windows)
+
+
+def test_zero_level_stops_clustering():
+	assert cluster_levels(np.array([1.0, 1.005, 1.2, 0.0, 5.0, 7.0])) == [1.0, 1.2, 0.0]
+	assert cluster_levels(np.array([])) == []
@@ -0,0 +1,76 @@
+import json
+import os
+import time
+from decimal import Decimal
+
+from src.runtime.symbol_filters import SymbolFilterCache
+
+
+def exchange_info(*symbols):
+	return {"symbols": [{
+		"symbol": symbol, "baseAsset": symbol[:-4], "quoteAsset": "USDT",
+		"baseAssetPrecision": 8, "quoteAssetPrecision": 8, "quotePrecision": 8,
+		"filters": [
+			{"filterType": "PRICE_FILTER", "minPrice": "0.01000000", "maxPrice": "1000000.00000000", "tickSize": "0.01000000"},
+			{"filterType": "LOT_SIZE", "minQty": "0.00001000", "maxQty": "9000.00000000", "stepSize": "0.00001000"},
+			{"filterType": "NOTIONAL", "minNotional": "5.00000000"},
+			{"filterType": "ICEBERG_PARTS", "limit": 10},
+		],
+	} for symbol in symbols]}
+
+
+class Fetcher:
+	def __init__(self, payload):
+		self.payload = payload
+		self.calls = 0
+
+	def __call__(self):
+		self.calls += 1
+		return self.payload
+
+
+def test_refresh_writes_compact_cache_and_precomputes_steps(tmp_path):
+	path = str(tmp_path / "symbol_info.json")
+	fetcher = Fetcher(exchange_info("BTCUSDT", "ETHUSDT", "SHIBUSDT"))
+	cache = SymbolFilterCache(path, "https://api", ["BTCUSDT", "ETHUSDT"], fetcher=fetcher)
+	assert cache.load() and fetcher.calls == 1
+	with open(path) as f:
+		doc = json.load(f)
+	assert sorted(doc["symbols"]) == ["BTCUSDT", "ETHUSDT"]
+	assert doc["symbols"]["BTCUSDT"]["filters"]["LOT_SIZE"]["stepSize"] == "0.00001000"
+	assert cache.info["BTCUSDT"]["filters"]["MIN_NOTIONAL"] == {"minNotional": 5.0}
+	assert cache.quantity_step("BTCUSDT") == Decimal("0.00001")
+	assert cache.price_tick("ETHUSDT") == Decimal("0.01")
+
+
+def test_fresh_disk_cache_skips_the_exchange(tmp_path):
+	path = str(tmp_path / "symbol_info.json")
+	SymbolFilterCache(path, "https://api", ["BTCUSDT"], fetcher=Fetcher(exchange_info("BTCUSDT"))).load()
+	fetcher = Fetcher(None)
+	cache = SymbolFilterCache(path, "https://api", ["BTCUSDT"], fetcher=fetcher)
+	assert cache.load()
+	assert fetcher.calls == 0 and cache.source == "disk"
+	# Another base URL (testnet vs production) never shares the file
+	other = SymbolFilterCache(path, "https://testnet", ["BTCUSDT"], fetcher=fetcher)
+	assert not other.load() and fetcher.calls == 1
+
+
+def test_stale_cache_is_refreshed_or_used_when_exchange_is_down(tmp_path):
+	path = str(tmp_path / "symbol_info.json")
+	SymbolFilterCache(path, "https://api", ["BTCUSDT"], fetcher=Fetcher(exchange_info("BTCUSDT"))).load()
+	old = time.time() - 7 * 3600
+	with open(path) as f:
+		doc = json.load(f)
+	doc["fetched_at"] = old
+	with open(path, "w") as f:
+		json.dump(doc, f)
+
+	down = Fetcher(None)
+	cache = SymbolFilterCache(path, "https://api", ["BTCUSDT"], ttl=6 * 3600, fetcher=down)
+	assert cache.load() and down.calls == 1
+	assert cache.source == "disk" and "BTCUSDT" in cache.info
+
+	up = Fetcher(exchange_info("BTCUSDT"))
+	cache = SymbolFilterCache(path, "https://api", ["BTCUSDT"], ttl=6 * 3600, fetcher=up)
+	assert cache.load() and up.calls == 1 and cache.source == "exchange"
+	assert os.path.getsize(path) < 2000
@@ -0,0 +1,105 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.runtime.transport import HttpTransport
+
+
+class FlakyServer:
+	"""Answers each request with the next queued status (200 once the queue is empty)."""
+
+	def __init__(self):
+		self.statuses = []
+		self.hits = []  # (method, path, client port, X-MBX-APIKEY)
+		server = self
+
+		class Handler(BaseHTTPRequestHandler):
+			protocol_version = "HTTP/1.1"
+
+			def log_message(self, *args):
+				pass
+
+			def do_GET(self):
+				server._reply(self, "GET")
+
+			def do_POST(self):
+				server._reply(self, "POST")
+
+		self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+		self._server.daemon_threads = True
+		self.url = f"http://127.0.0.1:{self._server.server_port}"
+		threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+	def _reply(self, handler, method):
+		self.hits.append((method, handler.path.split("?")[0], handler.client_address[1], handler.headers.get("X-MBX-APIKEY")))
+		status = self.statuses.pop(0) if self.statuses else 200
+		body = b'{"code": -1001, "msg": "Internal error"}' if status >= 500 else b"{}"
+		handler.send_response(status)
+		handler.send_header("Content-Type", "application/json")
+		handler.send_header("Content-Length", str(len(body)))
+		handler.end_headers()
+		handler.wfile.write(body)
+
+	def close(self):
+		self._server.shutdown()
+		self._server.server_close()
+
+
+@pytest.fixture
+def flaky():
+	server = FlakyServer()
+	yield server
+	server.close()
+
+
+def test_5xx_is_retried_for_get_only(flaky):
+	transport = HttpTransport(weight_limit=None, backoff_base=0.01)
+
+	flaky.statuses = [503, 502]
+	response = transport.get(f"{flaky.url}/api/v3/klines", max_retries=3)
+	assert response.status_code == 200 and [hit[0] for hit in flaky.hits] == ["GET"] * 3
+
+	# Retrying a POST could place an order twice: the 5xx goes back to the caller
+	flaky.statuses, flaky.hits = [503], []
+	response = transport.post(f"{flaky.url}/api/v3/order", max_retries=3)
+	assert response.status_code == 503 and len(flaky.hits) == 1
+
+	# Out of attempts: the last response is returned as-is
+	flaky.statuses, flaky.hits = [500, 500], []
+	assert transport.get(f"{flaky.url}/api/v3/klines", max_retries=2).status_code == 500 and len(flaky.hits) == 2
+	stats = transport.get_stats()
+	assert stats["/api/v3/klines"]["count"] == 5 and stats["/api/v3/klines"]["errors"] == 4
+	assert stats["/api/v3/order"]["count"] == 1 and stats["/api/v3/order"]["errors"] == 1
+
+
+def test_network_errors_are_retried_then_give_up():
+	with socket.socket() as sock:
+		sock.bind(("127.0.0.1", 0))
+		port = sock.getsockname()[1]  # Nothing listens here once the socket is closed
+	transport = HttpTransport(weight_limit=None, backoff_base=0.01)
+	assert transport.get(f"http://127.0.0.1:{port}/api/v3/time", max_retries=2) is None
+	assert transport.get_stats()["/api/v3/time"]["errors"] == 2
+
+
+def test_sessions_are_kept_per_base_url_and_api_key(flaky):
+	transport = HttpTransport(weight_limit=None)
+	session = transport.session(f"{flaky.url}/api/v3/klines")
+	assert transport.session(f"{flaky.url}/api/v3/depth?limit=5") is session  # Path and query don't matter
+	assert transport.session(f"{flaky.url}/api/v3/order", api_key="key-a") is not session
+	assert transport.session(flaky.url, api_key="key-a") is transport.session(flaky.url, api_key="key-a")
+	assert transport.session("http://127.0.0.2:1", api_key="key-a") is not transport.session(flaky.url, api_key="key-a")
+
+	# Keep-alive: one TCP connection per session, the API key header set once on it
+	for path in ("/api/v3/klines", "/api/v3/depth", "/api/v3/ticker/price"):
+		transport.get(f"{flaky.url}{path}")
+	for _ in range(2):
+		transport.get(f"{flaky.url}/api/v3/account", api_key="key-a")
+	public, signed = flaky.hits[:3], flaky.hits[3:]
+	assert len({hit[2] for hit in public}) == 1 and {hit[3] for hit in public} == {None}
+	assert len({hit[2] for hit in signed}) == 1 and {hit[3] for hit in signed} == {"key-a"}
+	assert public[0][2] != signed[0][2]
+
+	transport.close()
+	assert transport.session(flaky.url) is not session
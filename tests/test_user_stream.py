@@ -0,0 +1,120 @@
+from src.runtime.order_pipeline import OPEN, OrderPipeline, OrderRequest, OrderResult, client_order_id
+from src.runtime.transport import HttpTransport
+from src.runtime.user_stream import UserDataStream
+from tests.ws_standin import wait_until
+
+
+def rest_sender(exchange):
+	transport = HttpTransport(weight_limit=None, timeout=5)
+
+	def send(method, path, params):
+		return transport.request(method, exchange.url + path, params=params, api_key="key", max_retries=1)
+
+	return send
+
+
+def make_stream(ws_server, exchange, **kwargs):
+	send = rest_sender(exchange)
+
+	def resync():
+		response = send("GET", "/api/v3/account", {})
+		return response.json() if response is not None and response.status_code == 200 else None
+
+	kwargs.setdefault("keepalive_interval", 60)
+	return UserDataStream(ws_server.url, send, resync=resync, reconnect_backoff=0.05, ping_interval=1.0,
+						  ping_timeout=0.2, **kwargs)
+
+
+def execution_report(client_id, status, execution, last_qty, last_price, cum_qty, cum_quote, when, original=""):
+	return {"e": "executionReport", "E": when, "s": "BTCUSDT", "c": client_id, "C": original, "S": "BUY", "o": "MARKET",
+			"q": "2.00000000", "X": status, "x": execution, "i": 7, "l": str(last_qty), "L": str(last_price),
+			"z": str(cum_qty), "Z": str(cum_quote), "n": "0.001", "N": "BNB", "T": when}
+
+
+def test_balances_are_seeded_then_follow_account_events(ws_server, mock_exchange):
+	mock_exchange.balances.update(USDT=500.0, BTC=0.25)
+	stream = make_stream(ws_server, mock_exchange)
+	assert stream.get_balance("USDT") is None  # Not connected: callers go to REST
+	stream.start()
+	try:
+		assert ws_server.wait_for_clients(1) and ws_server.paths == ["/ws/lk-1"]
+		assert wait_until(stream.is_ready)
+		assert stream.get_balance("USDT") == {"free": 500.0, "locked": 0.0, "total": 500.0}
+		assert stream.get_balance("DOGE") == {"free": 0.0, "locked": 0.0, "total": 0.0}
+
+		now = 4102444800000  # Later than the REST snapshot
+		ws_server.send({"e": "outboundAccountPosition", "E": now, "u": now,
+						"B": [{"a": "USDT", "f": "320.5", "l": "80.0"}, {"a": "BTC", "f": "0.3", "l": "0"}]})
+		ws_server.send({"e": "balanceUpdate", "E": now, "a": "BTC", "d": "0.05", "T": now})
+		assert wait_until(lambda: stream.get_stats()["account_updates"] == 2)
+		assert stream.get_balance("USDT") == {"free": 320.5, "locked": 80.0, "total": 400.5}
+		assert abs(stream.get_balance("BTC")["free"] - 0.35) < 1e-12
+
+		# A snapshot older than the events doesn't roll them back
+		stream.apply_account({"updateTime": now - 1, "balances": [{"asset": "USDT", "free": "500.0", "locked": "0"}]})
+		assert stream.get_balance("USDT")["free"] == 320.5
+
+		ws_server.drop_clients()
+		assert ws_server.wait_for_clients(1) and wait_until(stream.is_ready)
+		assert stream.get_stats()["resyncs"] == 2 and ws_server.paths[-1] == "/ws/lk-1"  # Same key after a drop
+	finally:
+		stream.stop()
+	assert mock_exchange.listen_keys == []  # Deleted on stop
+	assert stream.get_balance("USDT") is None
+
+
+def test_execution_reports_track_partial_fills_and_resolve_lost_orders(ws_server, mock_exchange):
+	stream = make_stream(ws_server, mock_exchange)
+	seen = []
+	stream.add_listener(seen.append)
+	stream.start()
+	try:
+		assert ws_server.wait_for_clients(1)
+		ws_server.send(execution_report("abc", "NEW", "NEW", 0, 0, 0, 0, 1000))
+		ws_server.send(execution_report("abc", "PARTIALLY_FILLED", "TRADE", 0.5, 100.0, 0.5, 50.0, 1001))
+		assert wait_until(lambda: len(seen) == 2)
+		assert seen[-1].status == "PARTIALLY_FILLED" and seen[-1].executed_qty == 0.5 and seen[-1].fills == 1
+		assert stream.final_order("abc") is None  # Not final yet: lookups still go to REST
+
+		ws_server.send(execution_report("abc", "FILLED", "TRADE", 1.0, 102.5, 2.0, 203.0, 1003))
+		ws_server.send(execution_report("abc", "PARTIALLY_FILLED", "TRADE", 0.5, 101.0, 1.0, 100.5, 1002))  # Late
+		assert wait_until(lambda: len(seen) == 4)
+		state = stream.get_order("abc")
+		assert state.status == "FILLED" and state.executed_qty == 2.0 and state.avg_price == 101.5
+		assert state.fills == 3 and stream.get_stats()["partial_fills"] == 2
+		result = OrderResult.from_order(OrderRequest("BTCUSDT", "BUY", 2.0, "abc"), stream.final_order("abc"))
+		assert result.filled and result.avg_price == 101.5 and result.order_id == 7
+
+		# The fill's report arrives while the order response is lost: no REST lookup needed
+		mock_exchange.user_stream = ws_server
+		pipeline = OrderPipeline(rest_sender(mock_exchange), workers=1, retry_delay=0.2, order_states=stream.final_order)
+		mock_exchange.fail_next("timeout")
+		order = OrderRequest("ETHUSDT", "BUY", 1.5, client_order_id("ETHUSDT_SCALPING", OPEN, 1), "ETHUSDT_SCALPING")
+		result = pipeline.submit(order).result(timeout=10)
+		assert result.filled and result.executed_qty == 1.5 and mock_exchange.fills[order.client_order_id] == 1
+		assert not [request for request in mock_exchange.requests if request[:2] == ("GET", "/api/v3/order")]
+		assert pipeline.get_stats()["stream_lookups"] == 1 and pipeline.get_stats()["lookups"] == 0
+		assert wait_until(lambda: stream.get_balance("ETH") is not None and stream.get_balance("ETH")["free"] == 1.5)
+		pipeline.shutdown()
+	finally:
+		stream.stop()
+
+
+def test_listen_key_is_kept_alive_and_replaced_when_it_expires(ws_server, mock_exchange):
+	stream = make_stream(ws_server, mock_exchange, keepalive_interval=0.1)
+	stream.start()
+	try:
+		assert ws_server.wait_for_clients(1)
+		assert wait_until(lambda: mock_exchange.keepalives >= 2)
+
+		# The exchange forgot the key: the next keepalive fails with -1125 and a new key is used
+		mock_exchange.expire_listen_keys()
+		assert wait_until(lambda: ws_server.paths[-1] == "/ws/lk-2")
+		assert stream.get_stats()["keepalive_errors"] >= 1
+
+		# Pushed expiry event does the same
+		ws_server.send({"e": "listenKeyExpired", "E": 1, "listenKey": "lk-2"})
+		assert wait_until(lambda: ws_server.paths[-1] == "/ws/lk-3")
+		assert wait_until(stream.is_ready) and stream.get_stats()["listen_keys"] == 3
+	finally:
+		stream.stop()
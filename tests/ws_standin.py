@@ -0,0 +1,168 @@
+import json
+import time
+import base64
+import socket
+import struct
+import hashlib
+import threading
+from typing import List, Union
+
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class WebSocketStandIn:
+	"""Tiny local RFC 6455 server standing in for the exchange's stream endpoint.
+
+	Accepts any number of clients, records each handshake path, answers pings
+	and lets a test broadcast text frames or drop every connection.
+	"""
+
+	def __init__(self, host: str = "127.0.0.1"):
+		self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+		self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+		self._server.bind((host, 0))
+		self._server.listen(16)
+		self.host, self.port = self._server.getsockname()
+		self.paths: List[str] = []
+		self.received: List[str] = []
+		self._clients: List[socket.socket] = []
+		self._lock = threading.Lock()
+		self._send_lock = threading.Lock()  # Pong replies and broadcasts must not interleave
+		self._stop = threading.Event()
+		threading.Thread(target=self._accept_loop, daemon=True).start()
+
+	@property
+	def url(self) -> str:
+		return f"ws://{self.host}:{self.port}"
+
+	def _accept_loop(self) -> None:
+		while not self._stop.is_set():
+			try:
+				conn, _ = self._server.accept()
+			except OSError:
+				return
+			threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+	def _serve(self, conn: socket.socket) -> None:
+		try:
+			request = b""
+			while b"\r\n\r\n" not in request:
+				chunk = conn.recv(4096)
+				if not chunk:
+					return
+				request += chunk
+			lines = request.decode("latin-1").split("\r\n")
+			path = lines[0].split(" ")[1]
+			headers = {k.strip().lower(): v.strip() for k, v in (l.split(":", 1) for l in lines[1:] if ":" in l)}
+			accept = base64.b64encode(hashlib.sha1((headers["sec-websocket-key"] + WS_GUID).encode()).digest()).decode()
+			conn.sendall((
+				"HTTP/1.1 101 Switching Protocols\r\n"
+				"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+				f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+			).encode())
+			with self._lock:
+				self.paths.append(path)
+				self._clients.append(conn)
+			self._read_frames(conn)
+		except OSError:
+			pass
+		finally:
+			self._forget(conn)
+
+	def _recv_exact(self, conn: socket.socket, size: int) -> bytes:
+		data = b""
+		while len(data) < size:
+			chunk = conn.recv(size - len(data))
+			if not chunk:
+				raise OSError("client closed")
+			data += chunk
+		return data
+
+	def _read_frames(self, conn: socket.socket) -> None:
+		while not self._stop.is_set():
+			first, second = self._recv_exact(conn, 2)
+			opcode = first & 0x0F
+			length = second & 0x7F
+			if length == 126:
+				length = struct.unpack("!H", self._recv_exact(conn, 2))[0]
+			elif length == 127:
+				length = struct.unpack("!Q", self._recv_exact(conn, 8))[0]
+			mask = self._recv_exact(conn, 4) if second & 0x80 else b"\x00\x00\x00\x00"
+			payload = bytes(b ^ mask[i % 4] for i, b in enumerate(self._recv_exact(conn, length)))
+			if opcode == 0x8:  # close
+				self._send_frame(conn, 0x8, payload[:2])
+				return
+			if opcode == 0x9:  # ping
+				self._send_frame(conn, 0xA, payload)
+			elif opcode == 0x1:
+				with self._lock:
+					self.received.append(payload.decode())
+
+	def _send_frame(self, conn: socket.socket, opcode: int, payload: bytes) -> None:
+		header = bytes([0x80 | opcode])
+		if len(payload) < 126:
+			header += bytes([len(payload)])
+		elif len(payload) < 65536:
+			header += bytes([126]) + struct.pack("!H", len(payload))
+		else:
+			header += bytes([127]) + struct.pack("!Q", len(payload))
+		with self._send_lock:
+			conn.sendall(header + payload)
+
+	def _forget(self, conn: socket.socket) -> None:
+		with self._lock:
+			if conn in self._clients:
+				self._clients.remove(conn)
+		try:
+			conn.close()
+		except OSError:
+			pass
+
+	def client_count(self) -> int:
+		with self._lock:
+			return len(self._clients)
+
+	def wait_for_clients(self, count: int, timeout: float = 5.0) -> bool:
+		deadline = time.time() + timeout
+		while time.time() < deadline:
+			if self.client_count() >= count:
+				return True
+			time.sleep(0.01)
+		return False
+
+	def send(self, message: Union[str, dict]) -> None:
+		"""Broadcast one text frame to every connected client."""
+		payload = (message if isinstance(message, str) else json.dumps(message)).encode()
+		with self._lock:
+			clients = list(self._clients)
+		for conn in clients:
+			try:
+				self._send_frame(conn, 0x1, payload)
+			except OSError:
+				self._forget(conn)
+
+	def drop_clients(self) -> None:
+		"""Abruptly close every connection (simulates a network drop)."""
+		with self._lock:
+			clients, self._clients = self._clients, []
+		for conn in clients:
+			try:
+				conn.shutdown(socket.SHUT_RDWR)
+			except OSError:
+				pass
+			conn.close()
+
+	def close(self) -> None:
+		self._stop.set()
+		self.drop_clients()
+		self._server.close()
+
+
+def wait_until(predicate, timeout: float = 5.0, interval: float = 0.01) -> bool:
+	deadline = time.time() + timeout
+	while time.time() < deadline:
+		if predicate():
+			return True
+		time.sleep(interval)
+	return predicate()
@@ -14,6 +14,7 @@ from .common.logging_utils import setup_logger, get_log_path
 from .common.storage import insert_market_rows, atomic_write_json
 from .common.utils import ensure_dirs, load_env, DATA_DIR
 from .common.sentiment import compute_indicators
+from src.runtime.kline_codec import OPEN_TIME, OPEN, VOLUME, rows_to_array
 
 try:
 	from binance.websocket.spot.websocket_client import SpotWebsocketClient
@@ -44,18 +45,18 @@ class MarketObserver:
 				if not dry_run:
 					try:
 						sym = pair.replace("/", "")
-						klines = self.api.klines(symbol=sym, interval=self._tf_to_binance(self.timeframe), limit=200)
-						for k in klines:
-							ts = int(k[0] // 1000)
+						klines = rows_to_array(self.api.klines(symbol=sym, interval=self._tf_to_binance(self.timeframe), limit=200))
+						timestamps = (klines[:, OPEN_TIME] // 1000).astype("int64").tolist()
+						for ts, (o, h, l, c, v) in zip(timestamps, klines[:, OPEN:VOLUME + 1].tolist()):
 							pair_rows.append({
 								"pair": pair,
 								"timeframe": self.timeframe,
 								"timestamp": ts,
-								"open": float(k[1]),
-								"high": float(k[2]),
-								"low": float(k[3]),
-								"close": float(k[4]),
-								"volume": float(k[5]),
+								"open": o,
+								"high": h,
+								"low": l,
+								"close": c,
+								"volume": v,
 							})
 					except Exception as e:
 						self.logger.warning(f"REST fetch failed for {pair} ({e}); using offline data if available")
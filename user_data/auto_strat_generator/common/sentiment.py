@@ -2,17 +2,21 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
+from src.runtime.feature_store import FeatureSet, FeatureStore
 
-def compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
+
+def compute_indicators(df: pd.DataFrame, features: FeatureSet | None = None) -> pd.DataFrame:
 	# Assumes df has columns: open, high, low, close, volume, and is time-indexed or has date column
+	# Rolling series come from ``features`` (the shared feature store) when the caller has one
+	if features is None:
+		features = FeatureStore(None).dataset("", "", df)
 	out = df.copy()
-	out["ema_fast"] = out["close"].ewm(span=12, adjust=False).mean()
-	out["ema_slow"] = out["close"].ewm(span=26, adjust=False).mean()
+	out["ema_fast"] = features.get("ema_rec_12")
+	out["ema_slow"] = features.get("ema_rec_26")
 	out["ema_slope"] = out["ema_fast"].diff()
 	# RSI with safe handling for short inputs and zero-loss windows
-	delta = out["close"].diff()
-	gain = (delta.where(delta > 0, 0)).rolling(14).mean()
-	loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+	gain = pd.Series(features.get("avg_gain_14"), index=out.index)
+	loss = pd.Series(features.get("avg_loss_14"), index=out.index)
 	rs = gain / (loss.replace(0, 1e-9))
 	rsi = 100 - (100 / (1 + rs))
 	# Clamp to [0, 100] and fill early NaNs with neutral 50
@@ -22,8 +26,7 @@ def compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
 	signal = macd_line.ewm(span=9, adjust=False).mean()
 	out["macd_hist"] = macd_line - signal
 	# Volatility (realized)
-	ret = out["close"].pct_change()
-	out["vol_realized"] = ret.rolling(48).std().fillna(0.0)
+	out["vol_realized"] = np.nan_to_num(features.get("volatility_48"), nan=0.0)  # NaN warm-up -> 0
 	# Regime
 	trend = (out["ema_fast"] > out["ema_slow"]).astype(int)
 	chop = (out["vol_realized"] < out["vol_realized"].rolling(240).quantile(0.3).bfill()).astype(int)